@@ -0,0 +1,50 @@
+"""Add sme_signal_snapshots table
+
+Revision ID: 018_add_sme_signal_snapshots
+Revises: 017_add_api_key_prefix
+Create Date: 2026-10-18
+
+One row per SME with every EvidencePackage field plus an evidence hash,
+maintained by services/signal_snapshot_service.py. Existing SMEs are
+backfilled by running the reconcile job once:
+
+    python reconcile_signal_snapshots.py
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision      = "018_add_sme_signal_snapshots"
+down_revision = "017_add_api_key_prefix"
+branch_labels = None
+depends_on    = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sme_signal_snapshots",
+        sa.Column(
+            "sme_id",
+            sa.Integer(),
+            sa.ForeignKey("smes.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.Column("years_active", sa.Integer(), nullable=False),
+        sa.Column("industry", sa.String(), nullable=False),
+        sa.Column("total_invoices", sa.Integer(), nullable=False),
+        sa.Column("paid_on_time", sa.Integer(), nullable=False),
+        sa.Column("unpaid_invoices", sa.Integer(), nullable=False),
+        sa.Column("verifications", sa.JSON(), nullable=False),
+        sa.Column("intent_doc_details", sa.JSON(), nullable=False),
+        sa.Column("overdraft_count", sa.Integer(), nullable=True),
+        sa.Column("income_regularity", sa.Float(), nullable=True),
+        sa.Column("months_analysed", sa.Integer(), nullable=True),
+        sa.Column("province", sa.String(), nullable=True),
+        sa.Column("founder", sa.JSON(), nullable=True),
+        sa.Column("evidence_hash", sa.String(length=32), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sme_signal_snapshots")
@@ -0,0 +1,48 @@
+"""Denormalize the latest credit score onto smes
+
+Revision ID: 019_add_sme_latest_score
+Revises: 018_add_sme_signal_snapshots
+Create Date: 2026-10-18
+
+Adds smes.latest_score_id / latest_score / latest_score_at, kept current by
+the CreditScore events in models/credit_score.py, and backfills them from
+the newest credit_scores row per SME. Also adds the (sme_id, created_at DESC)
+index used by the score history endpoints.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "019_add_sme_latest_score"
+down_revision = "018_add_sme_signal_snapshots"
+branch_labels = None
+depends_on = None
+
+_LATEST = (
+    "(SELECT cs.{column} FROM credit_scores cs WHERE cs.sme_id = smes.id "
+    "ORDER BY cs.created_at DESC, cs.id DESC LIMIT 1)"
+)
+
+
+def upgrade() -> None:
+    op.add_column("smes", sa.Column("latest_score_id", sa.Integer(), nullable=True))
+    op.add_column("smes", sa.Column("latest_score", sa.Float(), nullable=True))
+    op.add_column("smes", sa.Column("latest_score_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_credit_scores_sme_id_created_at",
+        "credit_scores",
+        ["sme_id", sa.text("created_at DESC")],
+    )
+    op.execute(
+        "UPDATE smes SET "
+        f"latest_score_id = {_LATEST.format(column='id')}, "
+        f"latest_score = {_LATEST.format(column='score')}, "
+        f"latest_score_at = {_LATEST.format(column='created_at')}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_credit_scores_sme_id_created_at", table_name="credit_scores")
+    op.drop_column("smes", "latest_score_at")
+    op.drop_column("smes", "latest_score")
+    op.drop_column("smes", "latest_score_id")
@@ -0,0 +1,42 @@
+"""Add rescore_runs table
+
+Revision ID: 020_add_rescore_runs
+Revises: 019_add_sme_latest_score
+Create Date: 2026-10-18
+
+Checkpoints of the batch rescoring job (python rescore_portfolio.py).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "020_add_rescore_runs"
+down_revision = "019_add_sme_latest_score"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rescore_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("strategy_version", sa.String(), nullable=True),
+        sa.Column("chunk_size", sa.Integer(), nullable=False),
+        sa.Column("total_smes", sa.Integer(), nullable=False),
+        sa.Column("last_sme_id", sa.Integer(), nullable=False),
+        sa.Column("scored", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("elapsed_seconds", sa.Float(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_rescore_runs_id", "rescore_runs", ["id"])
+    op.create_index("ix_rescore_runs_status", "rescore_runs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rescore_runs_status", table_name="rescore_runs")
+    op.drop_index("ix_rescore_runs_id", table_name="rescore_runs")
+    op.drop_table("rescore_runs")
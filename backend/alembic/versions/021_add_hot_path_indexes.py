@@ -0,0 +1,52 @@
+"""Add indexes for the hot router filters
+
+Revision ID: 021_add_hot_path_indexes
+Revises: 020_add_rescore_runs
+Create Date: 2026-10-18
+
+Indexes the filters the routers run on every request that previously had
+only primary keys behind them. On PostgreSQL each index is built with
+CREATE INDEX CONCURRENTLY outside a transaction, so writes to the tables
+continue during the build. A concurrent build that fails leaves an INVALID
+index behind; IF NOT EXISTS would then skip it, so drop it first:
+
+    DROP INDEX CONCURRENTLY IF EXISTS <name>;   -- then rerun the upgrade
+
+finance_requests.status is indexed together with sme_id: the status filters
+use its leading column, and the pending-request counts grouped by SME
+(/lenders/available-smes) read it without touching the table.
+sme_outcomes.outcome_status is already indexed by migration 015.
+
+Check the plans afterwards with:
+
+    python verify_query_plans.py --database-url <url>
+"""
+from alembic import op
+
+revision      = "021_add_hot_path_indexes"
+down_revision = "020_add_rescore_runs"
+branch_labels = None
+depends_on    = None
+
+INDEXES = (
+    ("ix_invoices_sme_id_status",                     "invoices",         ["sme_id", "status"]),
+    ("ix_invoices_status",                            "invoices",         ["status"]),
+    ("ix_verifications_sme_id_doc_type_submitted_at", "verifications",    ["sme_id", "doc_type", "submitted_at"]),
+    ("ix_verifications_status",                       "verifications",    ["status"]),
+    ("ix_finance_requests_status_sme_id",             "finance_requests", ["status", "sme_id"]),
+    ("ix_finance_requests_sme_id_status",             "finance_requests", ["sme_id", "status"]),
+    ("ix_smes_user_id",                               "smes",             ["user_id"]),
+    ("ix_smes_cipc_registration_number",              "smes",             ["cipc_registration_number"]),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
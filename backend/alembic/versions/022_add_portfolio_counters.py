@@ -0,0 +1,34 @@
+"""Add portfolio_counters table
+
+Revision ID: 022_add_portfolio_counters
+Revises: 021_add_hot_path_indexes
+Create Date: 2026-10-18
+
+Incrementally maintained portfolio aggregates (models/portfolio_counter.py).
+Until they are built the analytics endpoints keep computing from the source
+tables; build them after upgrading with:
+
+    python rebuild_portfolio_counters.py
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "022_add_portfolio_counters"
+down_revision = "021_add_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "portfolio_counters",
+        sa.Column("metric", sa.String(), primary_key=True),
+        sa.Column("bucket", sa.String(), primary_key=True),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("total", sa.Numeric(20, 4), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("portfolio_counters")
@@ -0,0 +1,31 @@
+"""Add keyset sort indexes for /lenders/available-smes
+
+Revision ID: 023_add_sme_sort_indexes
+Revises: 022_add_portfolio_counters
+Create Date: 2026-10-18
+
+Lenders page through SMEs ordered by score or revenue. These indexes let
+every page be one range scan after the cursor (models/sme.py). Built
+CONCURRENTLY on PostgreSQL, as in migration 021.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision      = "023_add_sme_sort_indexes"
+down_revision = "022_add_portfolio_counters"
+branch_labels = None
+depends_on    = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_smes_score_sort", "smes", [sa.text("coalesce(latest_score, -1)"), "id"],
+                        if_not_exists=True, postgresql_concurrently=True)
+        op.create_index("ix_smes_revenue_id", "smes", ["revenue", "id"],
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_smes_revenue_id", table_name="smes", if_exists=True, postgresql_concurrently=True)
+        op.drop_index("ix_smes_score_sort", table_name="smes", if_exists=True, postgresql_concurrently=True)
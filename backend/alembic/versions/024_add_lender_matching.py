@@ -0,0 +1,104 @@
+"""Add lender sector / province criteria and the matching tables
+
+Revision ID: 024_add_lender_matching
+Revises: 023_add_sme_sort_indexes
+Create Date: 2026-10-18
+
+lenders.sectors / lenders.provinces (JSON lists; NULL = any) and the
+eligibility tables of models/lender_match.py, maintained by
+services/matching_service.py. Existing lenders start out accepting any
+sector and province, so their lender_criteria rows are backfilled here.
+Match keys need each SME's confidence, which takes the assessment engine, so
+/lenders/matches computes matches from the source tables until they are
+built with:
+
+    python rebuild_lender_matches.py
+
+A database without scored SMEs has nothing to build and is marked built.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision      = "024_add_lender_matching"
+down_revision = "023_add_sme_sort_indexes"
+branch_labels = None
+depends_on    = None
+
+
+def upgrade() -> None:
+    op.add_column("lenders", sa.Column("sectors", sa.JSON(), nullable=True))
+    op.add_column("lenders", sa.Column("provinces", sa.JSON(), nullable=True))
+
+    op.create_table(
+        "sme_match_keys",
+        sa.Column("sme_id", sa.Integer(), sa.ForeignKey("smes.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("score_band", sa.Integer(), nullable=False),
+        sa.Column("sector", sa.String(), nullable=False),
+        sa.Column("province", sa.String(), nullable=True),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("requested_amount", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_sme_match_keys_score_band", "sme_match_keys", ["score_band"])
+    op.create_index("ix_sme_match_keys_sector", "sme_match_keys", ["sector"])
+    op.create_index("ix_sme_match_keys_province", "sme_match_keys", ["province"])
+
+    op.create_table(
+        "lender_criteria",
+        sa.Column("field", sa.String(), primary_key=True),
+        sa.Column("value", sa.String(), primary_key=True),
+        sa.Column("lender_id", sa.Integer(), sa.ForeignKey("lenders.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_lender_criteria_lender_id", "lender_criteria", ["lender_id"])
+    op.execute(
+        "INSERT INTO lender_criteria (field, value, lender_id) "
+        "SELECT f.field, '*', lenders.id FROM lenders "
+        "CROSS JOIN (SELECT 'sector' AS field UNION ALL SELECT 'province') f"
+    )
+
+    op.create_table(
+        "lender_matches",
+        sa.Column("lender_id", sa.Integer(), sa.ForeignKey("lenders.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("sme_id", sa.Integer(), sa.ForeignKey("smes.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("matched_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_lender_matches_sme_id", "lender_matches", ["sme_id"])
+    op.create_index(
+        "ix_lender_matches_ranking", "lender_matches",
+        ["lender_id", sa.text("score DESC"), sa.text("confidence DESC"), "sme_id"],
+    )
+
+    op.create_table(
+        "lender_match_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("lender_id", sa.Integer(), sa.ForeignKey("lenders.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("sme_id", sa.Integer(), sa.ForeignKey("smes.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_lender_match_events_id", "lender_match_events", ["id"])
+    op.create_index("ix_lender_match_events_lender_id_id", "lender_match_events", ["lender_id", "id"])
+
+    op.create_table(
+        "lender_match_builds",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("built_at", sa.DateTime(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO lender_match_builds (built_at) SELECT CURRENT_TIMESTAMP "
+        "WHERE NOT EXISTS (SELECT 1 FROM smes WHERE latest_score IS NOT NULL)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("lender_match_builds")
+    op.drop_table("lender_match_events")
+    op.drop_table("lender_matches")
+    op.drop_table("lender_criteria")
+    op.drop_table("sme_match_keys")
+    op.drop_column("lenders", "provinces")
+    op.drop_column("lenders", "sectors")
@@ -0,0 +1,25 @@
+"""Add smes.data_version
+
+Revision ID: 025_add_sme_data_version
+Revises: 024_add_lender_matching
+Create Date: 2026-10-18
+
+A counter incremented with every write that affects an SME (models/sme.py).
+It keys and validates the cached /lenders/sme-intelligence bundles
+(services/intelligence_service.py). Existing rows start at 0.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision      = "025_add_sme_data_version"
+down_revision = "024_add_lender_matching"
+branch_labels = None
+depends_on    = None
+
+
+def upgrade() -> None:
+    op.add_column("smes", sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("smes", "data_version")
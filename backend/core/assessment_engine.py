@@ -11,12 +11,23 @@ Architecture:
   4. ScoreCalculator.calculate(...)        — computes factor scores and dynamic rescaled maxima
   5. ConfidenceCalculator.calculate(inp)    — computes evidence depth confidence
   6. AssessmentBuilder.build(...)           — bundles and explains the result
+
+reassess(previous, old_pkg, new_pkg) re-runs step 4 only for the factors whose
+EvidencePackage fields changed (ScoreCalculator.DEPENDENCIES).
+
+Instrumentation hooks (add_assessment_hook) receive an AssessmentEvent with
+per-stage timings after every assess(). They are opt-in: with no hook
+registered assess() runs uninstrumented.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import logging
+import time
+from dataclasses import dataclass, field, fields
 from enum import Enum
+from functools import cached_property
+from typing import Callable
 
 from core.scoring import (
     ScoringInput,
@@ -25,19 +36,22 @@ from core.scoring import (
     FounderSignalInput,
     COMPLIANCE_POINTS,
     INTENT_BASE_POINTS,
-    LOI_KNOWN_COUNTERPARTY_BONUS,
-    MAX_COMPLIANCE_POINTS,
-    MAX_INTENT_POINTS,
-    MAX_FOUNDER_POINTS,
-    QUALIFICATION_LEVELS,
     determine_decision,
     _scale,
+    _bank_statement_bonus,
+    _founder_points,
 )
-from services.market_data_service import (
-    sector_survival_score,
-    province_market_score,
-    get_market_intelligence,
+from core.factor_registry import (
+    FACTOR_ORDER,
+    REVENUE_CAP,
+    SURVIVAL_RANGE,
+    MARKET_RANGE,
+    ScoringPlan,
+    compile_plan,
 )
+from services.market_data_service import market_signals
+
+logger = logging.getLogger(__name__)
 
 
 # ── Business profiles ─────────────────────────────────────────────────────────
@@ -108,6 +122,20 @@ class WeightStrategy:
             self.compliance_max + self.intent_max  + self.founder_max
         )
 
+    @property
+    def maxima(self) -> dict[str, float]:
+        """Factor maxima keyed by factor name, in FACTOR_ORDER."""
+        return dict(zip(FACTOR_ORDER, (
+            self.revenue_max, self.timeliness_max, self.age_max,
+            self.unpaid_max,  self.industry_max,   self.market_max,
+            self.compliance_max, self.intent_max,  self.founder_max,
+        )))
+
+    @cached_property
+    def plan(self) -> ScoringPlan:
+        """Tier tables compiled against this strategy's maxima."""
+        return compile_plan(self.maxima)
+
 
 # Strategy definitions — weights reflect what evidence matters most per profile
 
@@ -167,6 +195,48 @@ STRATEGIES: dict[BusinessProfile, WeightStrategy] = {
 }
 
 
+# Strategy versions — a new version ships as a new entry here (data, not code)
+CURRENT_STRATEGY_VERSION = "v1"
+CURRENT_INFERENCE_VERSION = "v1"
+
+STRATEGY_VERSIONS: dict[str, dict[BusinessProfile, WeightStrategy]] = {
+    "v1": STRATEGIES,
+}
+
+# Compiled once at import
+SCORING_PLANS: dict[str, dict[BusinessProfile, ScoringPlan]] = {
+    version: {profile: strategy.plan for profile, strategy in strategies.items()}
+    for version, strategies in STRATEGY_VERSIONS.items()
+}
+
+_strategy_listeners: list[Callable[[], None]] = []
+
+
+def on_strategies_changed(listener: Callable[[], None]) -> None:
+    """Registers a callback fired whenever strategies or scoring plans change (e.g. to drop caches)."""
+    _strategy_listeners.append(listener)
+
+
+def register_strategy_version(
+    version: str,
+    strategies: dict[BusinessProfile, WeightStrategy],
+    make_current: bool = False,
+) -> None:
+    """
+    Adds (or replaces) a strategy version at runtime, compiles its plans and
+    notifies listeners so cached assessments are not served from stale weights.
+    Registered WeightStrategy instances are treated as immutable — register
+    new instances rather than editing existing ones in place.
+    """
+    global CURRENT_STRATEGY_VERSION
+    STRATEGY_VERSIONS[version] = strategies
+    SCORING_PLANS[version] = {profile: strategy.plan for profile, strategy in strategies.items()}
+    if make_current:
+        CURRENT_STRATEGY_VERSION = version
+    for listener in _strategy_listeners:
+        listener()
+
+
 # ── Output dataclass ──────────────────────────────────────────────────────────
 
 @dataclass
@@ -190,6 +260,41 @@ class AssessmentResult:
     strategy_version:    str = "v1"
 
 
+class LazyAssessmentResult(AssessmentResult):
+    """
+    Score-only AssessmentResult returned by assess(explain=False).
+    .breakdown is materialised on first access, so consumers that only read
+    .score / .decision / .profile never pay for labels and notes.
+    factor_points holds the per-factor points of the applicable factors (used by reassess()).
+    """
+
+    def __init__(self, explain: Callable[[], dict], factor_points: dict[str, float] | None = None, **fields):
+        self._explain = explain
+        self.factor_points = factor_points
+        super().__init__(breakdown=None, **fields)
+
+    @property
+    def breakdown(self) -> dict[str, dict]:
+        if self._breakdown is None:
+            self._breakdown = self._explain()
+        return self._breakdown
+
+    @breakdown.setter
+    def breakdown(self, value: dict[str, dict] | None) -> None:
+        self._breakdown = value
+
+    @property
+    def is_explained(self) -> bool:
+        return self._breakdown is not None
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AssessmentResult):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(AssessmentResult))
+
+    __hash__ = None
+
+
 # ── Profile Inference Result ──────────────────────────────────────────────────
 
 @dataclass
@@ -224,7 +329,7 @@ class ProfileInferenceService:
                 profile=BusinessProfile.ESTABLISHED,
                 reasoning=reasoning,
                 unavailable_factors=set(),
-                inference_version="v1"
+                inference_version=CURRENT_INFERENCE_VERSION
             )
 
         # 2. GROWTH
@@ -240,7 +345,7 @@ class ProfileInferenceService:
                 profile=BusinessProfile.GROWTH,
                 reasoning=reasoning,
                 unavailable_factors=set(),
-                inference_version="v1"
+                inference_version=CURRENT_INFERENCE_VERSION
             )
 
         # 3. STARTUP
@@ -256,7 +361,7 @@ class ProfileInferenceService:
                 profile=BusinessProfile.STARTUP,
                 reasoning=reasoning,
                 unavailable_factors=set(),
-                inference_version="v1"
+                inference_version=CURRENT_INFERENCE_VERSION
             )
 
         # 4. IDEA
@@ -266,7 +371,7 @@ class ProfileInferenceService:
             profile=BusinessProfile.IDEA,
             reasoning=reasoning,
             unavailable_factors={"Revenue Tier", "Invoice Timeliness", "Unpaid Invoice Ratio"},
-            inference_version="v1"
+            inference_version=CURRENT_INFERENCE_VERSION
         )
 
 
@@ -278,351 +383,367 @@ class StrategyFactory:
         """
         Resolves the scoring weight strategy for the given stage profile.
         """
-        return STRATEGIES[profile], "v1"
+        return STRATEGY_VERSIONS[CURRENT_STRATEGY_VERSION][profile], CURRENT_STRATEGY_VERSION
 
 
 # ── Score Calculator ──────────────────────────────────────────────────────────
 
+_ALL_FACTORS = frozenset(FACTOR_ORDER)
+
+
+def _not_applicable(factor_max: float) -> dict:
+    return {
+        "value": None,
+        "label": "Factor not applicable for this profile",
+        "contribution": 0.0,
+        "max": factor_max,
+        "applicable": False
+    }
+
+
 class ScoreCalculator:
+    # EvidencePackage fields each factor reads (points and labels). A factor
+    # only needs recomputing when one of its fields changes — see reassess().
+    DEPENDENCIES: dict[str, frozenset[str]] = {
+        "Revenue Tier":         frozenset({"revenue", "months_analysed"}),
+        "Invoice Timeliness":   frozenset({"total_invoices", "paid_on_time"}),
+        "Business Age":         frozenset({"years_active"}),
+        "Unpaid Invoice Ratio": frozenset({"total_invoices", "unpaid_invoices"}),
+        "Industry Risk":        frozenset({"industry"}),
+        "Market Viability":     frozenset({"industry", "province"}),
+        "Compliance Documents": frozenset({"verifications", "months_analysed", "overdraft_count", "income_regularity"}),
+        "Intent Documents":     frozenset({"verifications", "intent_doc_details"}),
+        "Founder Signal":       frozenset({"founder"}),
+    }
+
+    @classmethod
+    def affected_factors(cls, changed_fields) -> set[str]:
+        """Factors whose points or explanation depend on any of the given EvidencePackage fields."""
+        changed = set(changed_fields)
+        return {name for name, deps in cls.DEPENDENCIES.items() if deps & changed}
+
     @staticmethod
-    def calculate(inp: EvidencePackage, strategy: WeightStrategy, unavailable: set[str]) -> tuple[dict, float, float]:
+    def calculate(
+        inp: EvidencePackage,
+        strategy: WeightStrategy,
+        unavailable: set[str],
+        factors: set[str] | None = None,
+    ) -> tuple[dict, float, float]:
         """
         Applies all applicable scoring factors, skipping unavailable ones.
         Returns (breakdown dict, raw score sum, applicable raw max sum).
+        Pass `factors` to compute only those factors (sums then cover only them).
         """
         breakdown: dict[str, dict] = {}
         raw = 0.0
         applicable_max = 0.0
-        intel = get_market_intelligence(inp.industry, inp.province)
-
-        # 1. Revenue Tier
-        if "Revenue Tier" in unavailable:
-            breakdown["Revenue Tier"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.revenue_max,
-                "applicable": False
-            }
-        else:
-            applicable_max += strategy.revenue_max
-            revenue_source = "parsed" if inp.months_analysed is not None else "self-reported"
-            rev_ratio = min(inp.revenue / 500_000, 1.0)
-            rev_pts   = round(_scale(rev_ratio, 0.0, 1.0, 0, strategy.revenue_max), 1)
-            if inp.revenue >= 500_000:   rev_label = "≥ R500k"
-            elif inp.revenue >= 200_000: rev_label = "R200k–R500k"
-            elif inp.revenue >= 100_000: rev_label = "R100k–R200k"
-            elif inp.revenue >= 50_000:  rev_label = "R50k–R100k"
-            else:                        rev_label = "< R50k"
-
-            raw += rev_pts
-            breakdown["Revenue Tier"] = {
-                "value": inp.revenue, "label": f"{rev_label} ({revenue_source})",
-                "contribution": rev_pts, "max": strategy.revenue_max, "source": revenue_source,
-                "applicable": True
-            }
-
-        # 2. Invoice Timeliness
-        if "Invoice Timeliness" in unavailable:
-            breakdown["Invoice Timeliness"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.timeliness_max,
-                "applicable": False
-            }
+        plan = strategy.plan
+        signals = market_signals(inp.industry, inp.province)
+
+        for name in FACTOR_ORDER:
+            if factors is not None and name not in factors:
+                continue
+            if name in unavailable:
+                breakdown[name] = _not_applicable(plan.maxima[name])
+                continue
+            applicable_max += plan.maxima[name]
+            entry = _EXPLAINERS[name](inp, strategy, plan, signals)
+            raw += entry["contribution"]
+            breakdown[name] = entry
+
+        return breakdown, raw, applicable_max
+
+    # 1. Revenue Tier
+    @staticmethod
+    def _revenue_tier(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        revenue_source = "parsed" if inp.months_analysed is not None else "self-reported"
+        rev_ratio = min(inp.revenue / REVENUE_CAP, 1.0)
+        rev_pts   = round(_scale(rev_ratio, 0.0, 1.0, 0, strategy.revenue_max), 1)
+        rev_label = plan.revenue.label(inp.revenue)
+        return {
+            "value": inp.revenue, "label": f"{rev_label} ({revenue_source})",
+            "contribution": rev_pts, "max": strategy.revenue_max, "source": revenue_source,
+            "applicable": True
+        }
+
+    # 2. Invoice Timeliness
+    @staticmethod
+    def _invoice_timeliness(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        if inp.total_invoices == 0:
+            time_pts   = plan.no_invoice_timeliness
+            time_label = "No invoices yet"
+            time_ratio = None
         else:
-            applicable_max += strategy.timeliness_max
-            if inp.total_invoices == 0:
-                time_pts   = round(strategy.timeliness_max * 0.5, 1)
-                time_label = "No invoices yet"
-                time_ratio = None
-            else:
-                time_ratio = inp.paid_on_time / inp.total_invoices
-                if time_ratio >= 0.90:   frac = 1.00
-                elif time_ratio >= 0.70: frac = 0.65
-                elif time_ratio >= 0.50: frac = 0.35
-                else:                    frac = 0.15
-                time_pts   = round(strategy.timeliness_max * frac, 1)
-                time_label = f"{time_ratio:.0%} on time"
-
-            raw += time_pts
-            breakdown["Invoice Timeliness"] = {
-                "value": time_ratio, "label": time_label,
-                "contribution": time_pts, "max": strategy.timeliness_max,
-                "applicable": True
-            }
-
-        # 3. Business Age
-        if "Business Age" in unavailable:
-            breakdown["Business Age"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.age_max,
-                "applicable": False
-            }
+            time_ratio = inp.paid_on_time / inp.total_invoices
+            time_pts   = plan.timeliness.lookup(time_ratio)
+            time_label = f"{time_ratio:.0%} on time"
+        return {
+            "value": time_ratio, "label": time_label,
+            "contribution": time_pts, "max": strategy.timeliness_max,
+            "applicable": True
+        }
+
+    # 3. Business Age
+    @staticmethod
+    def _business_age(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        age_idx   = plan.age.index(inp.years_active)
+        age_pts   = plan.age.points[age_idx]
+        age_label = plan.age.label(inp.years_active, age_idx)
+        return {
+            "value": inp.years_active, "label": age_label,
+            "contribution": age_pts, "max": strategy.age_max,
+            "applicable": True
+        }
+
+    # 4. Unpaid Invoice Ratio
+    @staticmethod
+    def _unpaid_ratio(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        if inp.total_invoices == 0:
+            unpaid_pts   = plan.no_invoice_unpaid
+            unpaid_label = "No invoices"
+            unpaid_ratio = None
         else:
-            applicable_max += strategy.age_max
-            if inp.years_active >= 5:   age_frac, age_label = 1.00, f"{inp.years_active} years"
-            elif inp.years_active >= 2: age_frac, age_label = 0.60, f"{inp.years_active} years"
-            elif inp.years_active >= 1: age_frac, age_label = 0.30, f"{inp.years_active} year"
-            else:                       age_frac, age_label = 0.10, "< 1 year"
-            age_pts = round(strategy.age_max * age_frac, 1)
-
-            raw += age_pts
-            breakdown["Business Age"] = {
-                "value": inp.years_active, "label": age_label,
-                "contribution": age_pts, "max": strategy.age_max,
-                "applicable": True
-            }
-
-        # 4. Unpaid Invoice Ratio
-        if "Unpaid Invoice Ratio" in unavailable:
-            breakdown["Unpaid Invoice Ratio"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.unpaid_max,
-                "applicable": False
-            }
+            unpaid_ratio = inp.unpaid_invoices / inp.total_invoices
+            unpaid_pts   = plan.unpaid.lookup(unpaid_ratio)
+            unpaid_label = f"{unpaid_ratio:.0%} unpaid"
+        return {
+            "value": unpaid_ratio, "label": unpaid_label,
+            "contribution": unpaid_pts, "max": strategy.unpaid_max,
+            "applicable": True
+        }
+
+    # 5. Industry Risk
+    @staticmethod
+    def _industry_risk(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        survival     = signals.sector_survival_rate
+        industry_pts = round(_scale(survival, *SURVIVAL_RANGE, *plan.industry_band), 1)
+        return {
+            "value": survival, "label": signals.survival_label,
+            "contribution": industry_pts, "max": strategy.industry_max,
+            "sector_survival_rate": survival,
+            "applicable": True
+        }
+
+    # 6. Market Viability
+    @staticmethod
+    def _market_viability(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        if inp.province:
+            mkt_score    = signals.province_market_score
+            market_pts   = round(_scale(mkt_score, *MARKET_RANGE, *plan.market_band), 1)
+            market_label = signals.market_label
+            market_note  = None
         else:
-            applicable_max += strategy.unpaid_max
-            if inp.total_invoices == 0:
-                unpaid_pts   = round(strategy.unpaid_max * 0.5, 1)
-                unpaid_label = "No invoices"
-                unpaid_ratio = None
+            mkt_score, market_pts = None, plan.market_neutral
+            market_label = "Province not specified — neutral score applied"
+            market_note  = "Add your province to improve this factor"
+        return {
+            "value": mkt_score, "label": market_label,
+            "contribution": market_pts, "max": strategy.market_max,
+            "province": inp.province, "note": market_note,
+            "applicable": True
+        }
+
+    # 7. Compliance Documents
+    @staticmethod
+    def _compliance_documents(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        comp_pts          = 0
+        verified_compliance: list[str] = []
+        missing_compliance:  list[str] = []
+
+        for doc_type, doc_pts in plan.compliance_points.items():
+            if inp.verifications.get(doc_type) == "approved":
+                comp_pts += doc_pts
+                verified_compliance.append(doc_type)
             else:
-                unpaid_ratio = inp.unpaid_invoices / inp.total_invoices
-                if unpaid_ratio <= 0.05:   unpaid_frac = 1.00
-                elif unpaid_ratio <= 0.15: unpaid_frac = 0.60
-                elif unpaid_ratio <= 0.30: unpaid_frac = 0.30
-                else:                      unpaid_frac = 0.00
-                unpaid_pts   = round(strategy.unpaid_max * unpaid_frac, 1)
-                unpaid_label = f"{unpaid_ratio:.0%} unpaid"
-
-            raw += unpaid_pts
-            breakdown["Unpaid Invoice Ratio"] = {
-                "value": unpaid_ratio, "label": unpaid_label,
-                "contribution": unpaid_pts, "max": strategy.unpaid_max,
-                "applicable": True
-            }
-
-        # 5. Industry Risk
-        if "Industry Risk" in unavailable:
-            breakdown["Industry Risk"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.industry_max,
-                "applicable": False
-            }
-        else:
-            applicable_max += strategy.industry_max
-            survival     = sector_survival_score(inp.industry)
-            industry_pts = round(_scale(survival, 0.38, 0.72, strategy.industry_max * 0.3, strategy.industry_max), 1)
-
-            raw += industry_pts
-            breakdown["Industry Risk"] = {
-                "value": survival, "label": intel["survival_label"],
-                "contribution": industry_pts, "max": strategy.industry_max,
-                "sector_survival_rate": survival,
-                "applicable": True
-            }
-
-        # 6. Market Viability
-        if "Market Viability" in unavailable:
-            breakdown["Market Viability"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.market_max,
-                "applicable": False
-            }
-        else:
-            applicable_max += strategy.market_max
-            if inp.province:
-                mkt_score    = province_market_score(inp.province, inp.industry)
-                market_pts   = round(_scale(mkt_score, 0.30, 1.00, strategy.market_max * 0.3, strategy.market_max), 1)
-                market_label = intel["market_label"]
-                market_note  = None
+                missing_compliance.append(doc_type)
+
+        bs_bonus, bs_bonus_detail = 0.0, []
+        if inp.months_analysed is not None:
+            bs_bonus = _bank_statement_bonus(inp, plan, bs_bonus, bs_bonus_detail)
+
+        comp_pts = plan.finish(min(comp_pts + bs_bonus, strategy.compliance_max))
+        return {
+            "value": comp_pts,
+            "label": f"{len(verified_compliance)} of {len(COMPLIANCE_POINTS)} compliance docs verified",
+            "contribution": comp_pts, "max": strategy.compliance_max,
+            "verified": verified_compliance, "missing": missing_compliance,
+            "bank_statement_parsed":  inp.months_analysed is not None,
+            "bank_statement_quality": bs_bonus_detail or None,
+            "applicable": True
+        }
+
+    # 8. Intent Documents
+    @staticmethod
+    def _intent_documents(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        intent_pts        = 0.0
+        verified_intent:  list[str] = []
+        missing_intent:   list[str] = []
+        intent_notes:     list[str] = []
+
+        for doc_type, doc_pts in plan.intent_points.items():
+            details = inp.intent_doc_details.get(doc_type, {})
+            status  = details.get("status") or inp.verifications.get(doc_type)
+            if status == "approved":
+                pts = doc_pts
+                verified_intent.append(doc_type)
+                if doc_type == "letter_of_intent":
+                    known = details.get("loi_counterparty_known")
+                    if known is True:
+                        pts += plan.loi_bonus
+                        intent_notes.append(f"LOI from recognised counterparty (+{round(plan.loi_bonus, 1)} pts)")
+                    elif known is False:
+                        intent_notes.append("LOI counterparty not verified — base points only")
+                    else:
+                        intent_notes.append("LOI counterparty not yet reviewed by admin")
+                intent_pts += pts
             else:
-                mkt_score, market_pts = None, round(strategy.market_max * 0.5, 1)
-                market_label = "Province not specified — neutral score applied"
-                market_note  = "Add your province to improve this factor"
-
-            raw += market_pts
-            breakdown["Market Viability"] = {
-                "value": mkt_score, "label": market_label,
-                "contribution": market_pts, "max": strategy.market_max,
-                "province": inp.province, "note": market_note,
-                "applicable": True
-            }
-
-        # 7. Compliance Documents
-        if "Compliance Documents" in unavailable:
-            breakdown["Compliance Documents"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.compliance_max,
-                "applicable": False
-            }
-        else:
-            applicable_max += strategy.compliance_max
-            comp_pts          = 0
-            verified_compliance: list[str] = []
-            missing_compliance:  list[str] = []
+                missing_intent.append(doc_type)
+
+        intent_pts = plan.finish(min(intent_pts, strategy.intent_max))
+        return {
+            "value": intent_pts,
+            "label": (
+                f"{len(verified_intent)} of {len(INTENT_BASE_POINTS)} intent docs verified"
+                if verified_intent else "No intent documents submitted"
+            ),
+            "contribution": intent_pts, "max": strategy.intent_max,
+            "verified": verified_intent, "missing": missing_intent,
+            "notes": intent_notes or None,
+            "applicable": True
+        }
 
-            comp_scale = strategy.compliance_max / MAX_COMPLIANCE_POINTS
+    # 9. Founder Signal
+    @staticmethod
+    def _founder_signal(inp: EvidencePackage, strategy: WeightStrategy, plan: ScoringPlan, signals) -> dict:
+        founder_pts    = 0.0
+        founder_detail: list[str] = []
 
-            for doc_type, base_pts in COMPLIANCE_POINTS.items():
-                if inp.verifications.get(doc_type) == "approved":
-                    comp_pts += round(base_pts * comp_scale, 1)
-                    verified_compliance.append(doc_type)
-                else:
-                    missing_compliance.append(doc_type)
+        if inp.founder is None:
+            founder_label = "Founder profile not yet completed"
+            founder_note  = "Complete your founder profile to earn up to {:.0f} pts".format(strategy.founder_max)
+        else:
+            founder_pts   = _founder_points(inp.founder, plan, founder_pts, founder_detail)
+            founder_pts   = plan.finish(min(founder_pts, strategy.founder_max))
+            founder_label = (
+                f"Founder profile: {founder_pts:.1f}/{strategy.founder_max} pts"
+                if founder_detail else "Founder profile submitted — no scoreable signals yet"
+            )
+            founder_note  = None
+
+        return {
+            "value":        founder_pts,
+            "label":        founder_label,
+            "contribution": founder_pts,
+            "max":          strategy.founder_max,
+            "detail":       founder_detail or None,
+            "note":         founder_note,
+            "applicable": True
+        }
 
-            bs_bonus, bs_bonus_detail = 0.0, []
+    @staticmethod
+    def points(
+        inp: EvidencePackage,
+        strategy: WeightStrategy,
+        unavailable: set[str],
+        factors: set[str] | None = None,
+    ) -> dict[str, float]:
+        """
+        Score-only twin of calculate(): identical points, but no labels, notes
+        or breakdown dict. Returns {factor: points} for the applicable factors,
+        in FACTOR_ORDER. Pass `factors` to compute only those factors.
+        """
+        plan = strategy.plan
+        signals = market_signals(inp.industry, inp.province)
+        has_invoices = inp.total_invoices != 0
+        todo = (_ALL_FACTORS if factors is None else set(factors)) - unavailable
+        points: dict[str, float] = {}
+
+        if "Revenue Tier" in todo:
+            rev_ratio = min(inp.revenue / REVENUE_CAP, 1.0)
+            points["Revenue Tier"] = round(_scale(rev_ratio, 0.0, 1.0, 0, strategy.revenue_max), 1)
+        if "Invoice Timeliness" in todo:
+            points["Invoice Timeliness"] = (
+                plan.timeliness.lookup(inp.paid_on_time / inp.total_invoices)
+                if has_invoices else plan.no_invoice_timeliness
+            )
+        if "Business Age" in todo:
+            points["Business Age"] = plan.age.lookup(inp.years_active)
+        if "Unpaid Invoice Ratio" in todo:
+            points["Unpaid Invoice Ratio"] = (
+                plan.unpaid.lookup(inp.unpaid_invoices / inp.total_invoices)
+                if has_invoices else plan.no_invoice_unpaid
+            )
+        if "Industry Risk" in todo:
+            points["Industry Risk"] = round(
+                _scale(signals.sector_survival_rate, *SURVIVAL_RANGE, *plan.industry_band), 1
+            )
+        if "Market Viability" in todo:
+            points["Market Viability"] = (
+                round(_scale(signals.province_market_score, *MARKET_RANGE, *plan.market_band), 1)
+                if inp.province else plan.market_neutral
+            )
+        if "Compliance Documents" in todo:
+            comp_pts = 0
+            for doc_type, doc_pts in plan.compliance_points.items():
+                if inp.verifications.get(doc_type) == "approved":
+                    comp_pts += doc_pts
+            bs_bonus = 0.0
             if inp.months_analysed is not None:
-                bonus_scale = strategy.compliance_max / MAX_COMPLIANCE_POINTS
-                if inp.months_analysed >= 6:
-                    bs_bonus += 2 * bonus_scale
-                    bs_bonus_detail.append(f"{inp.months_analysed} months of history")
-                elif inp.months_analysed >= 3:
-                    bs_bonus += 1 * bonus_scale
-                    bs_bonus_detail.append(f"{inp.months_analysed} months of history")
-                if inp.income_regularity is not None:
-                    if inp.income_regularity >= 0.80:
-                        bs_bonus += 2 * bonus_scale
-                        bs_bonus_detail.append("consistent income pattern")
-                    elif inp.income_regularity >= 0.60:
-                        bs_bonus += 1 * bonus_scale
-                        bs_bonus_detail.append("moderate income consistency")
-                if inp.overdraft_count:
-                    bs_bonus -= min(inp.overdraft_count, 2) * bonus_scale
-                    bs_bonus_detail.append(f"{inp.overdraft_count} overdraft month(s) detected")
-
-            comp_pts = round(min(comp_pts + bs_bonus, strategy.compliance_max), 1)
-            raw += comp_pts
-            breakdown["Compliance Documents"] = {
-                "value": comp_pts,
-                "label": f"{len(verified_compliance)} of {len(COMPLIANCE_POINTS)} compliance docs verified",
-                "contribution": comp_pts, "max": strategy.compliance_max,
-                "verified": verified_compliance, "missing": missing_compliance,
-                "bank_statement_parsed":  inp.months_analysed is not None,
-                "bank_statement_quality": bs_bonus_detail or None,
-                "applicable": True
-            }
-
-        # 8. Intent Documents
-        if "Intent Documents" in unavailable:
-            breakdown["Intent Documents"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.intent_max,
-                "applicable": False
-            }
-        else:
-            applicable_max += strategy.intent_max
-            intent_pts        = 0.0
-            verified_intent:  list[str] = []
-            missing_intent:   list[str] = []
-            intent_notes:     list[str] = []
-            intent_scale = strategy.intent_max / MAX_INTENT_POINTS
-
-            for doc_type, base_pts in INTENT_BASE_POINTS.items():
+                bs_bonus = _bank_statement_bonus(inp, plan, bs_bonus, None)
+            points["Compliance Documents"] = plan.finish(min(comp_pts + bs_bonus, strategy.compliance_max))
+        if "Intent Documents" in todo:
+            intent_pts = 0.0
+            for doc_type, doc_pts in plan.intent_points.items():
                 details = inp.intent_doc_details.get(doc_type, {})
-                status  = details.get("status") or inp.verifications.get(doc_type)
-                if status == "approved":
-                    pts = base_pts * intent_scale
-                    verified_intent.append(doc_type)
-                    if doc_type == "letter_of_intent":
-                        known = details.get("loi_counterparty_known")
-                        if known is True:
-                            pts += LOI_KNOWN_COUNTERPARTY_BONUS * intent_scale
-                            intent_notes.append(f"LOI from recognised counterparty (+{round(LOI_KNOWN_COUNTERPARTY_BONUS * intent_scale, 1)} pts)")
-                        elif known is False:
-                            intent_notes.append("LOI counterparty not verified — base points only")
-                        else:
-                            intent_notes.append("LOI counterparty not yet reviewed by admin")
-                    intent_pts += pts
-                else:
-                    missing_intent.append(doc_type)
-
-            intent_pts = round(min(intent_pts, strategy.intent_max), 1)
-            raw += intent_pts
-            breakdown["Intent Documents"] = {
-                "value": intent_pts,
-                "label": (
-                    f"{len(verified_intent)} of {len(INTENT_BASE_POINTS)} intent docs verified"
-                    if verified_intent else "No intent documents submitted"
-                ),
-                "contribution": intent_pts, "max": strategy.intent_max,
-                "verified": verified_intent, "missing": missing_intent,
-                "notes": intent_notes or None,
-                "applicable": True
-            }
-
-        # 9. Founder Signal
-        if "Founder Signal" in unavailable:
-            breakdown["Founder Signal"] = {
-                "value": None,
-                "label": "Factor not applicable for this profile",
-                "contribution": 0.0,
-                "max": strategy.founder_max,
-                "applicable": False
-            }
-        else:
-            applicable_max += strategy.founder_max
-            founder_pts    = 0.0
-            founder_detail: list[str] = []
-            founder_scale  = strategy.founder_max / MAX_FOUNDER_POINTS
-
-            if inp.founder is None:
-                founder_label = "Founder profile not yet completed"
-                founder_note  = "Complete your founder profile to earn up to {:.0f} pts".format(strategy.founder_max)
-            else:
-                f = inp.founder
-                exp = f.years_industry_experience
-                if exp is not None:
-                    if exp >= 5:   founder_pts += 5 * founder_scale; founder_detail.append(f"{exp} years industry experience")
-                    elif exp >= 2: founder_pts += 3 * founder_scale; founder_detail.append(f"{exp} years industry experience")
-                    elif exp >= 1: founder_pts += 1 * founder_scale; founder_detail.append(f"{exp} year industry experience")
-
-                qual     = (f.highest_qualification or "").lower().strip()
-                qual_raw = QUALIFICATION_LEVELS.get(qual, 0)
-                if qual_raw > 0:
-                    founder_pts += qual_raw * founder_scale
-                    founder_detail.append(f"{f.highest_qualification} qualification")
-
-                if f.prior_business_owner is True:
-                    founder_pts += 3 * founder_scale; founder_detail.append("prior business ownership")
-                if f.trade_association_member is True:
-                    founder_pts += 2 * founder_scale; founder_detail.append("trade association member")
-                if f.reference_provided is True:
-                    founder_pts += 1 * founder_scale; founder_detail.append("business reference provided")
-
-                founder_pts   = round(min(founder_pts, strategy.founder_max), 1)
-                founder_label = (
-                    f"Founder profile: {founder_pts:.1f}/{strategy.founder_max} pts"
-                    if founder_detail else "Founder profile submitted — no scoreable signals yet"
-                )
-                founder_note  = None
-
-            raw += founder_pts
-            breakdown["Founder Signal"] = {
-                "value":        founder_pts,
-                "label":        founder_label,
-                "contribution": founder_pts,
-                "max":          strategy.founder_max,
-                "detail":       founder_detail or None,
-                "note":         founder_note,
-                "applicable": True
-            }
+                if (details.get("status") or inp.verifications.get(doc_type)) == "approved":
+                    if doc_type == "letter_of_intent" and details.get("loi_counterparty_known") is True:
+                        doc_pts += plan.loi_bonus
+                    intent_pts += doc_pts
+            points["Intent Documents"] = plan.finish(min(intent_pts, strategy.intent_max))
+        if "Founder Signal" in todo:
+            points["Founder Signal"] = (
+                plan.finish(min(_founder_points(inp.founder, plan, 0.0, None), strategy.founder_max))
+                if inp.founder is not None else 0.0
+            )
+        return points
 
-        return breakdown, raw, applicable_max
+    @staticmethod
+    def total(points: dict[str, float], strategy: WeightStrategy) -> tuple[float, float]:
+        """
+        Sums factor points in FACTOR_ORDER — the same accumulation order as
+        calculate(), so the float result is identical.
+        Returns (raw score sum, applicable raw max sum).
+        """
+        maxima = strategy.plan.maxima
+        raw = 0.0
+        applicable_max = 0.0
+        for name in FACTOR_ORDER:
+            pts = points.get(name)
+            if pts is not None:
+                applicable_max += maxima[name]
+                raw += pts
+        return raw, applicable_max
+
+    @staticmethod
+    def score(inp: EvidencePackage, strategy: WeightStrategy, unavailable: set[str]) -> tuple[float, float]:
+        """
+        Score-only path: points() summed by total().
+        Returns (raw score sum, applicable raw max sum).
+        """
+        return ScoreCalculator.total(ScoreCalculator.points(inp, strategy, unavailable), strategy)
+
+
+_EXPLAINERS: dict[str, Callable[..., dict]] = {
+    "Revenue Tier":         ScoreCalculator._revenue_tier,
+    "Invoice Timeliness":   ScoreCalculator._invoice_timeliness,
+    "Business Age":         ScoreCalculator._business_age,
+    "Unpaid Invoice Ratio": ScoreCalculator._unpaid_ratio,
+    "Industry Risk":        ScoreCalculator._industry_risk,
+    "Market Viability":     ScoreCalculator._market_viability,
+    "Compliance Documents": ScoreCalculator._compliance_documents,
+    "Intent Documents":     ScoreCalculator._intent_documents,
+    "Founder Signal":       ScoreCalculator._founder_signal,
+}
 
 
 # ── Confidence Calculator ─────────────────────────────────────────────────────
@@ -695,7 +816,39 @@ class AssessmentBuilder:
         raw_score = breakdown.pop("_assessment_raw", score)
         applicable_max = breakdown.pop("_assessment_applicable_max", strategy.raw_max)
 
-        # Attach profile metadata to breakdown
+        AssessmentBuilder.attach_metadata(
+            breakdown, profile_res, strategy, strategy_ver,
+            raw_score, applicable_max, confidence, validation_warnings,
+        )
+
+        return AssessmentResult(
+            score              = score,
+            decision           = decision,
+            breakdown          = breakdown,
+            profile            = profile_res.profile,
+            strategy_name      = strategy.name,
+            profile_label      = PROFILE_LABELS[profile_res.profile],
+            profile_description= PROFILE_DESCRIPTIONS[profile_res.profile],
+            profile_reasoning  = profile_res.reasoning,
+            confidence_score   = confidence,
+            inference_version  = profile_res.inference_version,
+            strategy_version   = strategy_ver,
+        )
+
+    @staticmethod
+    def attach_metadata(
+        breakdown: dict,
+        profile_res: ProfileInferenceResult,
+        strategy: WeightStrategy,
+        strategy_ver: str,
+        raw_score: float,
+        applicable_max: float,
+        confidence: float,
+        validation_warnings: list[str]
+    ) -> dict:
+        """
+        Attaches the "_assessment" audit metadata block to a breakdown dict.
+        """
         breakdown["_assessment"] = {
             "profile":            profile_res.profile.value,
             "profile_label":      PROFILE_LABELS[profile_res.profile],
@@ -708,11 +861,37 @@ class AssessmentBuilder:
             "inference_version":  profile_res.inference_version,
             "strategy_version":   strategy_ver,
         }
+        return breakdown
 
-        return AssessmentResult(
+    @staticmethod
+    def build_lazy(
+        inp: EvidencePackage,
+        score: float,
+        decision: str,
+        raw_score: float,
+        applicable_max: float,
+        profile_res: ProfileInferenceResult,
+        strategy: WeightStrategy,
+        strategy_ver: str,
+        confidence: float,
+        validation_warnings: list[str],
+        factor_points: dict[str, float] | None = None,
+    ) -> LazyAssessmentResult:
+        """
+        Assembles a score-only result; the explained breakdown is built on first access.
+        """
+        def explain() -> dict:
+            breakdown, _, _ = ScoreCalculator.calculate(inp, strategy, profile_res.unavailable_factors)
+            return AssessmentBuilder.attach_metadata(
+                breakdown, profile_res, strategy, strategy_ver,
+                raw_score, applicable_max, confidence, validation_warnings,
+            )
+
+        return LazyAssessmentResult(
+            explain            = explain,
+            factor_points      = factor_points,
             score              = score,
             decision           = decision,
-            breakdown          = breakdown,
             profile            = profile_res.profile,
             strategy_name      = strategy.name,
             profile_label      = PROFILE_LABELS[profile_res.profile],
@@ -724,13 +903,78 @@ class AssessmentBuilder:
         )
 
 
+# ── Instrumentation hooks ─────────────────────────────────────────────────────
+
+ASSESSMENT_STAGES: tuple[str, ...] = ("validate", "detect", "strategy", "calculate", "confidence", "build")
+
+
+@dataclass
+class AssessmentEvent:
+    """
+    One assessment as reported to instrumentation hooks.
+    Cache hits carry no stage timings and are not re-validated
+    (validation_warnings is 0); failed validations carry only "validate".
+    reassessed marks an incremental reassess(), whose "calculate" stage only
+    covers the factors the write affected.
+    """
+    profile:             str | None             # None when validation failed
+    strategy_version:    str | None
+    explain:             bool
+    validation_warnings: int
+    cache_hit:           bool = False
+    failed:              bool = False
+    reassessed:          bool = False
+    stage_ns:            dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_ns(self) -> int:
+        return sum(self.stage_ns.values())
+
+
+_assessment_hooks: list[Callable[[AssessmentEvent], None]] = []
+
+
+def add_assessment_hook(hook: Callable[[AssessmentEvent], None]) -> None:
+    """
+    Registers an instrumentation callback, called synchronously with an
+    AssessmentEvent after every assess(), reassess() and assessment cache hit.
+    Hooks must be cheap; exceptions they raise are logged and swallowed.
+    """
+    if hook not in _assessment_hooks:
+        _assessment_hooks.append(hook)
+
+
+def remove_assessment_hook(hook: Callable[[AssessmentEvent], None]) -> None:
+    if hook in _assessment_hooks:
+        _assessment_hooks.remove(hook)
+
+
+def assessment_hooks_active() -> bool:
+    return bool(_assessment_hooks)
+
+
+def emit_assessment_event(event: AssessmentEvent) -> None:
+    for hook in tuple(_assessment_hooks):
+        try:
+            hook(event)
+        except Exception:
+            logger.exception("Assessment hook %r failed", hook)
+
+
 # ── Main Entry Point ──────────────────────────────────────────────────────────
 
-def assess(inp: EvidencePackage) -> AssessmentResult:
+def assess(inp: EvidencePackage, explain: bool = True) -> AssessmentResult:
     """
     Main entry point for the Assessment Engine.
     Orchestrates the modularized assessment pipeline.
+
+    explain=False takes the score-only fast path: score, decision, profile and
+    confidence are computed eagerly, and .breakdown is only built if accessed.
+    The package must not be mutated while the result is still in use.
     """
+    if _assessment_hooks:
+        return _assess_instrumented(inp, explain)
+
     # 1. Validate inputs
     val_res = EvidenceValidator.validate(inp)
     if not val_res.is_valid:
@@ -743,19 +987,57 @@ def assess(inp: EvidencePackage) -> AssessmentResult:
     strategy, strategy_ver = StrategyFactory.get_strategy(profile_res.profile)
 
     # 4. Score Calculation
-    breakdown, raw_score, applicable_max = ScoreCalculator.calculate(inp, strategy, profile_res.unavailable_factors)
-
+    if explain:
+        breakdown, raw_score, applicable_max = ScoreCalculator.calculate(inp, strategy, profile_res.unavailable_factors)
+        points = None
+    else:
+        breakdown = None
+        points = ScoreCalculator.points(inp, strategy, profile_res.unavailable_factors)
+        raw_score, applicable_max = ScoreCalculator.total(points, strategy)
+
+    return _finish(inp, val_res, profile_res, strategy, strategy_ver, raw_score, applicable_max, breakdown, points)
+
+
+def _finish(
+    inp: EvidencePackage,
+    val_res,
+    profile_res: ProfileInferenceResult,
+    strategy: WeightStrategy,
+    strategy_ver: str,
+    raw_score: float,
+    applicable_max: float,
+    breakdown: dict | None,
+    points: dict[str, float] | None,
+    confidence: float | None = None,
+) -> AssessmentResult:
+    """Steps 5–7 of assess(): confidence (unless already computed), rescale and decision, result assembly."""
     # Guard against division by zero
     if applicable_max == 0:
         applicable_max = strategy.raw_max
 
     # 5. Confidence Calculation
-    confidence = ConfidenceCalculator.calculate(inp)
+    if confidence is None:
+        confidence = ConfidenceCalculator.calculate(inp)
 
     # 6. Rescale & Determine Decision
     score = round(min(max((raw_score / applicable_max) * 100, 0), 100), 1)
     decision = determine_decision(score)
 
+    if breakdown is None:
+        return AssessmentBuilder.build_lazy(
+            inp=inp,
+            score=score,
+            decision=decision,
+            raw_score=raw_score,
+            applicable_max=applicable_max,
+            profile_res=profile_res,
+            strategy=strategy,
+            strategy_ver=strategy_ver,
+            confidence=confidence,
+            validation_warnings=val_res.warnings,
+            factor_points=points,
+        )
+
     # Pass temp values for metadata building
     breakdown["_assessment_raw"] = raw_score
     breakdown["_assessment_applicable_max"] = applicable_max
@@ -773,6 +1055,172 @@ def assess(inp: EvidencePackage) -> AssessmentResult:
     )
 
 
+def _assess_instrumented(inp: EvidencePackage, explain: bool) -> AssessmentResult:
+    """assess() with every stage timed, reporting an AssessmentEvent to the registered hooks."""
+    clock = time.perf_counter_ns
+    t0 = clock()
+    val_res = EvidenceValidator.validate(inp)
+    t1 = clock()
+    if not val_res.is_valid:
+        emit_assessment_event(AssessmentEvent(
+            profile=None, strategy_version=None, explain=explain,
+            validation_warnings=len(val_res.warnings), failed=True, stage_ns={"validate": t1 - t0},
+        ))
+        raise ValueError(f"Evidence validation failed: {', '.join(val_res.errors)}")
+
+    profile_res = ProfileInferenceService.detect(inp)
+    t2 = clock()
+    strategy, strategy_ver = StrategyFactory.get_strategy(profile_res.profile)
+    t3 = clock()
+    if explain:
+        breakdown, raw_score, applicable_max = ScoreCalculator.calculate(inp, strategy, profile_res.unavailable_factors)
+        points = None
+    else:
+        breakdown = None
+        points = ScoreCalculator.points(inp, strategy, profile_res.unavailable_factors)
+        raw_score, applicable_max = ScoreCalculator.total(points, strategy)
+    t4 = clock()
+    confidence = ConfidenceCalculator.calculate(inp)
+    t5 = clock()
+    result = _finish(inp, val_res, profile_res, strategy, strategy_ver, raw_score, applicable_max,
+                     breakdown, points, confidence)
+    t6 = clock()
+
+    ticks = (t0, t1, t2, t3, t4, t5, t6)
+    emit_assessment_event(AssessmentEvent(
+        profile=profile_res.profile.value,
+        strategy_version=strategy_ver,
+        explain=explain,
+        validation_warnings=len(val_res.warnings),
+        stage_ns={stage: ticks[i + 1] - ticks[i] for i, stage in enumerate(ASSESSMENT_STAGES)},
+    ))
+    return result
+
+
+# ── Incremental re-assessment ─────────────────────────────────────────────────
+
+EVIDENCE_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(EvidencePackage))
+
+
+def changed_fields(old_pkg: EvidencePackage, new_pkg: EvidencePackage) -> set[str]:
+    """Names of the EvidencePackage fields whose values differ between the two packages."""
+    return {name for name in EVIDENCE_FIELDS if getattr(old_pkg, name) != getattr(new_pkg, name)}
+
+
+def reassess(previous: AssessmentResult, old_pkg: EvidencePackage, new_pkg: EvidencePackage) -> AssessmentResult:
+    """
+    Incremental assess() for a single write (an invoice paid, a verification approved, ...).
+
+    `previous` must be the result of assessing `old_pkg` with the current
+    engine versions. Only the factors that depend on a changed field
+    (ScoreCalculator.DEPENDENCIES) are recomputed; the others are carried
+    over from `previous`. Validation, profile inference and confidence are
+    always re-run, and a change of profile or engine version falls back to a
+    full assess(). The result equals assess(new_pkg) — a score-only
+    (lazy) `previous` yields a score-only result, an explained one an explained result.
+    Unchanged breakdown entries are shared with `previous` and must not be mutated.
+    """
+    if _assessment_hooks:
+        return _reassess_instrumented(previous, old_pkg, new_pkg)
+
+    explain = not isinstance(previous, LazyAssessmentResult)
+
+    val_res = EvidenceValidator.validate(new_pkg)
+    if not val_res.is_valid:
+        raise ValueError(f"Evidence validation failed: {', '.join(val_res.errors)}")
+
+    profile_res = ProfileInferenceService.detect(new_pkg)
+    strategy, strategy_ver = StrategyFactory.get_strategy(profile_res.profile)
+    if _needs_full_assessment(previous, profile_res, strategy, strategy_ver, explain):
+        return assess(new_pkg, explain=explain)
+
+    breakdown, points, raw_score, applicable_max = _recalculate(previous, old_pkg, new_pkg, profile_res, strategy)
+    return _finish(new_pkg, val_res, profile_res, strategy, strategy_ver, raw_score, applicable_max, breakdown, points)
+
+
+def _needs_full_assessment(previous, profile_res, strategy, strategy_ver: str, explain: bool) -> bool:
+    """True when `previous` cannot be carried over: the profile or an engine version changed."""
+    return (
+        profile_res.profile != previous.profile
+        or strategy.name != previous.strategy_name
+        or strategy_ver != previous.strategy_version
+        or profile_res.inference_version != previous.inference_version
+        or (not explain and previous.factor_points is None)
+    )
+
+
+def _recalculate(previous, old_pkg: EvidencePackage, new_pkg: EvidencePackage, profile_res, strategy):
+    """Step 4 of reassess(): (breakdown, points, raw_score, applicable_max) with only the affected factors recomputed."""
+    affected = ScoreCalculator.affected_factors(changed_fields(old_pkg, new_pkg))
+    unavailable = profile_res.unavailable_factors
+
+    if not isinstance(previous, LazyAssessmentResult):
+        breakdown = {name: previous.breakdown[name] for name in FACTOR_ORDER}
+        if affected:
+            breakdown.update(ScoreCalculator.calculate(new_pkg, strategy, unavailable, affected)[0])
+        raw_score, applicable_max = ScoreCalculator.total(
+            {name: entry["contribution"] for name, entry in breakdown.items() if entry["applicable"]}, strategy,
+        )
+        return breakdown, None, raw_score, applicable_max
+
+    points = dict(previous.factor_points)
+    if affected:
+        points.update(ScoreCalculator.points(new_pkg, strategy, unavailable, affected))
+    raw_score, applicable_max = ScoreCalculator.total(points, strategy)
+    return None, points, raw_score, applicable_max
+
+
+def _reassess_instrumented(
+    previous: AssessmentResult, old_pkg: EvidencePackage, new_pkg: EvidencePackage,
+) -> AssessmentResult:
+    """reassess() with every stage timed, reporting a reassessed AssessmentEvent to the registered hooks."""
+    explain = not isinstance(previous, LazyAssessmentResult)
+    clock = time.perf_counter_ns
+    t0 = clock()
+    val_res = EvidenceValidator.validate(new_pkg)
+    t1 = clock()
+    if not val_res.is_valid:
+        emit_assessment_event(AssessmentEvent(
+            profile=None, strategy_version=None, explain=explain, validation_warnings=len(val_res.warnings),
+            failed=True, reassessed=True, stage_ns={"validate": t1 - t0},
+        ))
+        raise ValueError(f"Evidence validation failed: {', '.join(val_res.errors)}")
+
+    profile_res = ProfileInferenceService.detect(new_pkg)
+    t2 = clock()
+    strategy, strategy_ver = StrategyFactory.get_strategy(profile_res.profile)
+    t3 = clock()
+    if _needs_full_assessment(previous, profile_res, strategy, strategy_ver, explain):
+        return assess(new_pkg, explain=explain)     # reported by assess() as a full assessment
+    breakdown, points, raw_score, applicable_max = _recalculate(previous, old_pkg, new_pkg, profile_res, strategy)
+    t4 = clock()
+    confidence = ConfidenceCalculator.calculate(new_pkg)
+    t5 = clock()
+    result = _finish(new_pkg, val_res, profile_res, strategy, strategy_ver, raw_score, applicable_max,
+                     breakdown, points, confidence)
+    t6 = clock()
+
+    ticks = (t0, t1, t2, t3, t4, t5, t6)
+    emit_assessment_event(AssessmentEvent(
+        profile=profile_res.profile.value,
+        strategy_version=strategy_ver,
+        explain=explain,
+        validation_warnings=len(val_res.warnings),
+        reassessed=True,
+        stage_ns={stage: ticks[i + 1] - ticks[i] for i, stage in enumerate(ASSESSMENT_STAGES)},
+    ))
+    return result
+
+
+def assess_batch(packages):
+    """
+    Vectorised entry point for scoring many packages at once.
+    Scores, profiles, decisions and confidence match assess() exactly; see core.batch_engine.
+    """
+    from core.batch_engine import assess_batch as _assess_batch
+    return _assess_batch(packages)
+
+
 # ── Backward Compatibility Wrappers ──────────────────────────────────────────
 
 def infer_profile(inp: EvidencePackage) -> tuple[BusinessProfile, list[str]]:
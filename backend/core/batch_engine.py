@@ -0,0 +1,567 @@
+"""
+core/batch_engine.py
+
+Vectorised Assessment Engine for whole-book rescoring.
+
+assess() walks one EvidencePackage at a time through the pipeline and builds
+a fully explained breakdown dict for every factor. For nightly rescoring we
+only need the numbers, so this module:
+  1. EvidenceColumns.from_packages(pkgs) — packs N packages into NumPy columns (one pass)
+  2. BatchAssessmentEngine.validate       — vectorised EvidenceValidator range / contradiction checks
+  3. BatchAssessmentEngine.detect         — vectorised ProfileInferenceService rules
+  4. BatchAssessmentEngine.calculate      — vectorised ScoreCalculator factor points
+  5. BatchAssessmentEngine.confidence     — vectorised ConfidenceCalculator
+  6. rescale + decision                   — identical formulas to assess()
+
+Results are bit-for-bit identical to assess(): tier points come from the same
+compiled ScoringPlans (stacked per profile in PlanTables, bisect replaced by
+np.searchsorted), every factor accumulates in the same order as ScoreCalculator,
+and rounding goes through _round1(), which reproduces Python's round(x, 1)
+exactly (see the note on that function).
+
+No labels, notes or f-strings are built here. Call assess() on a single
+package when the explanation is needed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import ClassVar, Iterable, Sequence
+
+import numpy as np
+
+from core.scoring import EvidencePackage, EvidenceValidator
+from core.factor_registry import (
+    COMPLIANCE_POINTS,
+    INTENT_BASE_POINTS,
+    FACTOR_ORDER,
+    FOUNDER_FLAG_POINTS,
+    OVERDRAFT_PENALTY_CAP,
+    QUALIFICATION_LEVELS,
+    REVENUE_CAP,
+    SURVIVAL_RANGE,
+    MARKET_RANGE,
+    CompiledTiers,
+)
+from core.assessment_engine import BusinessProfile, SCORING_PLANS, StrategyFactory, on_strategies_changed
+from core.compact_evidence import (
+    CompactEvidencePackage,
+    STATUS_APPROVED,
+    TRISTATE_TRUE,
+    intent_shift,
+    verification_shift,
+)
+from services.market_data_service import market_signals
+
+
+# Profile codes used in the profile column — index into PROFILE_ORDER
+PROFILE_ORDER: tuple[BusinessProfile, ...] = (
+    BusinessProfile.IDEA,
+    BusinessProfile.STARTUP,
+    BusinessProfile.GROWTH,
+    BusinessProfile.ESTABLISHED,
+)
+DECISIONS: tuple[str, ...] = ("Declined", "Review", "Approved")
+
+FACTOR_NAMES: tuple[str, ...] = FACTOR_ORDER
+
+# Qualifications that score — column code is an index into this tuple, -1 otherwise
+_SCORING_QUALIFICATIONS: tuple[str, ...] = tuple(q for q, pts in QUALIFICATION_LEVELS.items() if pts > 0)
+
+
+# ── Rounding ──────────────────────────────────────────────────────────────────
+
+def _round1(x: np.ndarray) -> np.ndarray:
+    """
+    Element-wise equivalent of Python's round(v, 1).
+
+    Python rounds the *exact* binary value half-to-even, whereas
+    np.round(x, 1) rounds the already-rounded product x * 10. The two only
+    disagree when x * 10 lands within an ulp of a .5 boundary (e.g. 0.35),
+    so those few elements are re-rounded with the builtin.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    scaled = x * 10.0
+    out = np.rint(scaled) / 10.0
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        idx = np.flatnonzero(near_half)
+        out[idx] = [round(float(v), 1) for v in x[idx]]
+    return out
+
+
+def _scale(value: np.ndarray, low_val: float, high_val: float, low_pts, high_pts) -> np.ndarray:
+    """Vectorised core.scoring._scale — same operation order, same result."""
+    mid = low_pts + (value - low_val) / (high_val - low_val) * (high_pts - low_pts)
+    return np.where(value <= low_val, low_pts, np.where(value >= high_val, high_pts, mid))
+
+
+# ── Column packing ────────────────────────────────────────────────────────────
+
+@dataclass
+class EvidenceColumns:
+    """
+    Column-oriented view of N EvidencePackages.
+    Optional fields carry a has_* mask; the value column is 0 where absent.
+    """
+    revenue:           np.ndarray
+    years_active:      np.ndarray
+    total_invoices:    np.ndarray
+    paid_on_time:      np.ndarray
+    unpaid_invoices:   np.ndarray
+
+    has_months:        np.ndarray
+    months_analysed:   np.ndarray
+    has_overdraft:     np.ndarray
+    overdraft_count:   np.ndarray
+    has_regularity:    np.ndarray
+    income_regularity: np.ndarray
+
+    industry_code:     np.ndarray   # index into industries
+    market_code:       np.ndarray   # index into markets; -1 when province is not set
+    industries:        list[str]
+    markets:           list[tuple[str, str]]   # (province, industry)
+
+    approved:          dict[str, np.ndarray]   # verifications[doc] == "approved"
+    intent_approved:   dict[str, np.ndarray]   # intent status resolved like ScoreCalculator
+    loi_known:         np.ndarray              # loi_counterparty_known is True
+
+    has_founder:       np.ndarray
+    has_experience:    np.ndarray
+    experience:        np.ndarray
+    qualification:     np.ndarray   # index into _SCORING_QUALIFICATIONS, -1 when it does not score
+    prior_owner:       np.ndarray
+    association:       np.ndarray
+    reference:         np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.revenue)
+
+    @classmethod
+    def from_packages(cls, packages: Sequence[EvidencePackage]) -> "EvidenceColumns":
+        n = len(packages)
+        f64 = lambda: np.zeros(n, dtype=np.float64)
+        flag = lambda: np.zeros(n, dtype=bool)
+
+        revenue, years, total, paid, unpaid = f64(), f64(), f64(), f64(), f64()
+        has_months, months = flag(), f64()
+        has_od, od = flag(), f64()
+        has_reg, reg = flag(), f64()
+        industry_code = np.zeros(n, dtype=np.int64)
+        market_code = np.full(n, -1, dtype=np.int64)
+        approved = {doc: flag() for doc in (*COMPLIANCE_POINTS, *INTENT_BASE_POINTS)}
+        intent_approved = {doc: flag() for doc in INTENT_BASE_POINTS}
+        loi_known = flag()
+        has_founder, has_exp, exp = flag(), flag(), f64()
+        qualification = np.full(n, -1, dtype=np.int64)
+        qual_codes = {q: i for i, q in enumerate(_SCORING_QUALIFICATIONS)}
+        prior, assoc, ref = flag(), flag(), flag()
+
+        industries: dict[str, int] = {}
+        markets: dict[tuple[str, str], int] = {}
+        approved_items = tuple(approved.items())
+        # CompactEvidencePackages without extras skip the dict walk; their bitmasks are decoded column-wise below
+        compact = flag()
+        verification_bits = np.zeros(n, dtype=np.int64)
+        intent_bits = np.zeros(n, dtype=np.int64)
+
+        for i, p in enumerate(packages):
+            revenue[i] = p.revenue
+            years[i]   = p.years_active
+            total[i]   = p.total_invoices
+            paid[i]    = p.paid_on_time
+            unpaid[i]  = p.unpaid_invoices
+
+            if p.months_analysed is not None:
+                has_months[i], months[i] = True, p.months_analysed
+            if p.overdraft_count is not None:
+                has_od[i], od[i] = True, p.overdraft_count
+            if p.income_regularity is not None:
+                has_reg[i], reg[i] = True, p.income_regularity
+
+            industry_code[i] = industries.setdefault(p.industry, len(industries))
+            if p.province:
+                market_code[i] = markets.setdefault((p.province, p.industry), len(markets))
+
+            if isinstance(p, CompactEvidencePackage) and not p.extras:
+                compact[i] = True
+                verification_bits[i] = p.verification_bits
+                intent_bits[i] = p.intent_bits
+            else:
+                cls._fill_verifications(i, p, approved_items, intent_approved, loi_known)
+
+            f = p.founder
+            if f is not None:
+                has_founder[i] = True
+                if f.years_industry_experience is not None:
+                    has_exp[i], exp[i] = True, f.years_industry_experience
+                qualification[i] = qual_codes.get((f.highest_qualification or "").lower().strip(), -1)
+                prior[i] = f.prior_business_owner is True
+                assoc[i] = f.trade_association_member is True
+                ref[i]   = f.reference_provided is True
+
+        if compact.any():
+            ver_codes = {
+                doc: np.where(compact, (verification_bits >> verification_shift(doc)) & 3, 0)
+                for doc in approved
+            }
+            for doc, col in approved.items():
+                col |= ver_codes[doc] == STATUS_APPROVED
+            for doc, col in intent_approved.items():
+                nibble = np.where(compact, (intent_bits >> intent_shift(doc)) & 0xF, 0)
+                status = np.where(nibble & 3, nibble & 3, ver_codes[doc])
+                col |= status == STATUS_APPROVED
+                if doc == "letter_of_intent":
+                    loi_known |= (status == STATUS_APPROVED) & ((nibble >> 2) == TRISTATE_TRUE)
+
+        return cls(
+            revenue=revenue, years_active=years, total_invoices=total,
+            paid_on_time=paid, unpaid_invoices=unpaid,
+            has_months=has_months, months_analysed=months,
+            has_overdraft=has_od, overdraft_count=od,
+            has_regularity=has_reg, income_regularity=reg,
+            industry_code=industry_code, market_code=market_code,
+            industries=list(industries), markets=list(markets),
+            approved=approved, intent_approved=intent_approved, loi_known=loi_known,
+            has_founder=has_founder, has_experience=has_exp, experience=exp,
+            qualification=qualification, prior_owner=prior, association=assoc, reference=ref,
+        )
+
+    @staticmethod
+    def _fill_verifications(i, p, approved_items, intent_approved, loi_known) -> None:
+        ver = p.verifications
+        for doc, col in approved_items:
+            if ver.get(doc) == "approved":
+                col[i] = True
+        details_map = p.intent_doc_details
+        for doc, col in intent_approved.items():
+            details = details_map.get(doc, {})
+            if (details.get("status") or ver.get(doc)) == "approved":
+                col[i] = True
+                if doc == "letter_of_intent" and details.get("loi_counterparty_known") is True:
+                    loi_known[i] = True
+
+
+# ── Output ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class BatchAssessmentResult:
+    """
+    Column-oriented output of assess_batch().
+    Row i corresponds to packages[i]. Rows that fail validation have
+    valid[i] == False, NaN numeric columns, and their messages in errors[i]
+    (the same messages assess() would raise as a ValueError).
+    """
+    score:             np.ndarray
+    raw_score:         np.ndarray
+    applicable_max:    np.ndarray
+    confidence_score:  np.ndarray
+    profile_code:      np.ndarray   # index into PROFILE_ORDER, -1 when invalid
+    decision_code:     np.ndarray   # index into DECISIONS, -1 when invalid
+    valid:             np.ndarray
+    factor_points:     dict[str, np.ndarray]
+    errors:            dict[int, list[str]] = field(default_factory=dict)
+    inference_version: str = "v1"
+    strategy_version:  str = "v1"
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    @property
+    def profiles(self) -> list[BusinessProfile | None]:
+        return [PROFILE_ORDER[c] if c >= 0 else None for c in self.profile_code.tolist()]
+
+    @property
+    def decisions(self) -> list[str | None]:
+        return [DECISIONS[c] if c >= 0 else None for c in self.decision_code.tolist()]
+
+
+# ── Plan tables ───────────────────────────────────────────────────────────────
+
+@dataclass
+class PlanTables:
+    """
+    The compiled ScoringPlans of one strategy version, stacked into arrays
+    indexed [profile code, ...] so every row gathers its own strategy's points.
+    Tier bounds come from the shared registry and are identical across profiles.
+    """
+    maxima:                dict[str, np.ndarray]
+    raw_max:               np.ndarray
+    tiers:                 dict[str, tuple[CompiledTiers, np.ndarray]]   # name -> (bounds/side, points[profile, idx])
+    no_invoice_timeliness: np.ndarray
+    no_invoice_unpaid:     np.ndarray
+    industry_band:         np.ndarray   # [low|high, profile]
+    market_band:           np.ndarray
+    market_neutral:        np.ndarray
+    compliance_points:     np.ndarray   # [profile, doc]
+    overdraft_unit:        np.ndarray
+    intent_points:         np.ndarray   # [profile, doc]
+    loi_bonus:             np.ndarray
+    qualification_points:  np.ndarray   # [profile, qualification]; last column (-1) scores 0
+    founder_flags:         np.ndarray   # [profile, flag]
+
+    _cache: ClassVar[dict[str, "PlanTables"]] = {}
+
+    @classmethod
+    def for_version(cls, version: str) -> "PlanTables":
+        if version not in cls._cache:
+            cls._cache[version] = cls.build([SCORING_PLANS[version][p] for p in PROFILE_ORDER])
+        return cls._cache[version]
+
+    @classmethod
+    def build(cls, plans: list) -> "PlanTables":
+        arr = lambda rows: np.array(rows, dtype=np.float64)
+        tiers = {
+            name: (getattr(plans[0], name), arr([getattr(p, name).points for p in plans]))
+            for name in ("timeliness", "age", "unpaid", "bank_history", "income_regularity", "founder_experience")
+        }
+        return cls(
+            maxima={name: arr([p.maxima[name] for p in plans]) for name in FACTOR_NAMES},
+            raw_max=arr([sum(p.maxima.values()) for p in plans]),
+            tiers=tiers,
+            no_invoice_timeliness=arr([p.no_invoice_timeliness for p in plans]),
+            no_invoice_unpaid=arr([p.no_invoice_unpaid for p in plans]),
+            industry_band=arr([p.industry_band for p in plans]).T,
+            market_band=arr([p.market_band for p in plans]).T,
+            market_neutral=arr([p.market_neutral for p in plans]),
+            compliance_points=arr([[p.compliance_points[d] for d in COMPLIANCE_POINTS] for p in plans]),
+            overdraft_unit=arr([p.overdraft_unit for p in plans]),
+            intent_points=arr([[p.intent_points[d] for d in INTENT_BASE_POINTS] for p in plans]),
+            loi_bonus=arr([p.loi_bonus for p in plans]),
+            qualification_points=arr([
+                [p.qualification_points[q] for q in _SCORING_QUALIFICATIONS] + [0.0] for p in plans
+            ]),
+            founder_flags=arr([[p.founder_flags[a][0] for a in FOUNDER_FLAG_POINTS] for p in plans]),
+        )
+
+    def tier_points(self, name: str, profile_code: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Vectorised CompiledTiers.lookup: bisect becomes np.searchsorted on the same bounds."""
+        compiled, points = self.tiers[name]
+        idx = np.searchsorted(np.asarray(compiled.bounds, dtype=np.float64), values, side=compiled.side)
+        return points[profile_code, idx]
+
+
+on_strategies_changed(PlanTables._cache.clear)
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+
+class BatchAssessmentEngine:
+
+    @staticmethod
+    def validate(cols: EvidenceColumns) -> np.ndarray:
+        """Returns a boolean mask of rows that EvidenceValidator would reject."""
+        invalid = (
+            (cols.revenue < 0) | (cols.years_active < 0) | (cols.total_invoices < 0) |
+            (cols.paid_on_time < 0) | (cols.unpaid_invoices < 0) |
+            (cols.has_months & (cols.months_analysed < 0)) |
+            (cols.has_overdraft & (cols.overdraft_count < 0)) |
+            (cols.has_regularity & ~((cols.income_regularity >= 0.0) & (cols.income_regularity <= 1.0)))
+        )
+        has_invoices = cols.total_invoices > 0
+        invalid |= has_invoices & (
+            (cols.paid_on_time > cols.total_invoices) |
+            (cols.unpaid_invoices > cols.total_invoices) |
+            (cols.paid_on_time + cols.unpaid_invoices > cols.total_invoices)
+        )
+        return invalid
+
+    @staticmethod
+    def detect(cols: EvidenceColumns) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorised ProfileInferenceService.detect (v1 rules, evaluated in the same order).
+        Returns (profile_code, idea_mask).
+        """
+        years, total, has_bs = cols.years_active, cols.total_invoices, cols.has_months
+        established = (years >= 3) | (total >= 20)
+        growth  = ~established & (years >= 1) & ((total > 0) | has_bs)
+        startup = ~established & ~growth & (cols.approved["cipc"] | (years >= 1) | has_bs)
+        idea    = ~(established | growth | startup)
+
+        code = np.select(
+            [established, growth, startup],
+            [PROFILE_ORDER.index(BusinessProfile.ESTABLISHED),
+             PROFILE_ORDER.index(BusinessProfile.GROWTH),
+             PROFILE_ORDER.index(BusinessProfile.STARTUP)],
+            default=PROFILE_ORDER.index(BusinessProfile.IDEA),
+        )
+        return code, idea
+
+    @staticmethod
+    def calculate(
+        cols: EvidenceColumns,
+        tables: "PlanTables",
+        profile_code: np.ndarray,
+        idea: np.ndarray,
+    ) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """
+        Vectorised ScoreCalculator.calculate over the compiled plans.
+        Returns (factor points, raw score sum, applicable raw max sum).
+        Only IDEA rows have unavailable factors (revenue, timeliness, unpaid ratio).
+        """
+        n = len(cols)
+        zero = np.zeros(n)
+        pc = profile_code
+        total = cols.total_invoices
+        no_invoices = total == 0
+        safe_total = np.where(no_invoices, 1.0, total)
+        maxima = {name: tables.maxima[name][pc] for name in FACTOR_NAMES}
+        pts: dict[str, np.ndarray] = {}
+
+        # 1. Revenue Tier — continuous up to REVENUE_CAP
+        rev_ratio = np.minimum(cols.revenue / REVENUE_CAP, 1.0)
+        pts["Revenue Tier"] = _round1(_scale(rev_ratio, 0.0, 1.0, 0, maxima["Revenue Tier"]))
+
+        # 2. Invoice Timeliness
+        ratio = cols.paid_on_time / safe_total
+        pts["Invoice Timeliness"] = np.where(
+            no_invoices, tables.no_invoice_timeliness[pc], tables.tier_points("timeliness", pc, ratio),
+        )
+
+        # 3. Business Age
+        pts["Business Age"] = tables.tier_points("age", pc, cols.years_active)
+
+        # 4. Unpaid Invoice Ratio
+        ratio = cols.unpaid_invoices / safe_total
+        pts["Unpaid Invoice Ratio"] = np.where(
+            no_invoices, tables.no_invoice_unpaid[pc], tables.tier_points("unpaid", pc, ratio),
+        )
+
+        # 5. Industry Risk — survival rate looked up once per distinct industry
+        survival = np.array(
+            [market_signals(ind, None).sector_survival_rate for ind in cols.industries] or [0.0],
+            dtype=np.float64,
+        )[cols.industry_code]
+        pts["Industry Risk"] = _round1(_scale(survival, *SURVIVAL_RANGE, *tables.industry_band[:, pc]))
+
+        # 6. Market Viability — market score looked up once per distinct (province, industry)
+        has_province = cols.market_code >= 0
+        mkt = np.array(
+            [market_signals(ind, prov).province_market_score for prov, ind in cols.markets] or [0.0],
+            dtype=np.float64,
+        )[np.where(has_province, cols.market_code, 0)]
+        pts["Market Viability"] = np.where(
+            has_province,
+            _round1(_scale(mkt, *MARKET_RANGE, *tables.market_band[:, pc])),
+            tables.market_neutral[pc],
+        )
+
+        # 7. Compliance Documents — same accumulation order as ScoreCalculator
+        comp = zero.copy()
+        for j, doc_type in enumerate(COMPLIANCE_POINTS):
+            comp = comp + np.where(cols.approved[doc_type], tables.compliance_points[pc, j], 0.0)
+
+        bonus = zero + tables.tier_points("bank_history", pc, cols.months_analysed)
+        bonus = bonus + np.where(
+            cols.has_regularity, tables.tier_points("income_regularity", pc, cols.income_regularity), 0.0,
+        )
+        bonus = bonus - np.where(
+            cols.has_overdraft & (cols.overdraft_count != 0),
+            np.minimum(cols.overdraft_count, OVERDRAFT_PENALTY_CAP) * tables.overdraft_unit[pc],
+            0.0,
+        )
+        bonus = np.where(cols.has_months, bonus, 0.0)
+        pts["Compliance Documents"] = _round1(np.minimum(comp + bonus, maxima["Compliance Documents"]))
+
+        # 8. Intent Documents
+        intent = zero.copy()
+        for j, doc_type in enumerate(INTENT_BASE_POINTS):
+            doc_pts = tables.intent_points[pc, j]
+            if doc_type == "letter_of_intent":
+                doc_pts = doc_pts + np.where(cols.loi_known, tables.loi_bonus[pc], 0.0)
+            intent = intent + np.where(cols.intent_approved[doc_type], doc_pts, 0.0)
+        pts["Intent Documents"] = _round1(np.minimum(intent, maxima["Intent Documents"]))
+
+        # 9. Founder Signal
+        founder = zero + np.where(
+            cols.has_experience, tables.tier_points("founder_experience", pc, cols.experience), 0.0,
+        )
+        founder = founder + tables.qualification_points[pc, cols.qualification]
+        for j, flag in enumerate((cols.prior_owner, cols.association, cols.reference)):
+            founder = founder + np.where(flag, tables.founder_flags[pc, j], 0.0)
+        pts["Founder Signal"] = np.where(
+            cols.has_founder, _round1(np.minimum(founder, maxima["Founder Signal"])), 0.0,
+        )
+
+        # Unavailable factors contribute nothing and are excluded from the applicable max
+        unavailable = {"Revenue Tier", "Invoice Timeliness", "Unpaid Invoice Ratio"}
+        raw = zero.copy()
+        applicable_max = zero.copy()
+        for name in FACTOR_NAMES:
+            if name in unavailable:
+                pts[name] = np.where(idea, 0.0, pts[name])
+                raw = raw + pts[name]
+                applicable_max = applicable_max + np.where(idea, 0.0, maxima[name])
+            else:
+                raw = raw + pts[name]
+                applicable_max = applicable_max + maxima[name]
+
+        return pts, raw, applicable_max
+
+    @staticmethod
+    def confidence(cols: EvidenceColumns) -> np.ndarray:
+        """Vectorised ConfidenceCalculator.calculate."""
+        approved = cols.approved
+        conf = np.full(len(cols), 10.0)
+        conf += np.where(approved["cipc"], 15.0, 0.0)
+        conf += np.where(approved["bank_statement"] | cols.has_months, 15.0, 0.0)
+        conf += np.where(approved["tax_clearance"], 10.0, 0.0)
+        conf += np.where(approved["registration_docs"], 5.0, 0.0)
+
+        months = cols.months_analysed
+        conf += np.where(cols.has_months, np.select([months >= 6, months >= 3], [25.0, 15.0], default=5.0), 0.0)
+        conf += np.where(cols.has_founder, 10.0, 0.0)
+
+        intent_count = sum(col.astype(np.int64) for col in cols.intent_approved.values())
+        conf += np.select([intent_count >= 2, intent_count == 1], [10.0, 5.0], default=0.0)
+        return _round1(np.minimum(np.maximum(conf, 10.0), 100.0))
+
+    @classmethod
+    def run(cls, cols: EvidenceColumns, strategy_version: str | None = None) -> BatchAssessmentResult:
+        invalid = cls.validate(cols)
+        profile_code, idea = cls.detect(cols)
+        if strategy_version is None:
+            _, strategy_version = StrategyFactory.get_strategy(PROFILE_ORDER[0])
+        tables = PlanTables.for_version(strategy_version)
+
+        factor_points, raw, applicable_max = cls.calculate(cols, tables, profile_code, idea)
+        confidence = cls.confidence(cols)
+
+        # Guard against division by zero (mirrors assess())
+        raw_max = tables.raw_max[profile_code]
+        applicable_max = np.where(applicable_max == 0, raw_max, applicable_max)
+
+        score = _round1(np.minimum(np.maximum((raw / applicable_max) * 100, 0), 100))
+        decision_code = np.select([score >= 75, score >= 50], [2, 1], default=0)
+
+        if invalid.any():
+            for arr in (score, raw, applicable_max, confidence):
+                arr[invalid] = np.nan
+            profile_code = np.where(invalid, -1, profile_code)
+            decision_code = np.where(invalid, -1, decision_code)
+
+        return BatchAssessmentResult(
+            score=score,
+            raw_score=raw,
+            applicable_max=applicable_max,
+            confidence_score=confidence,
+            profile_code=profile_code,
+            decision_code=decision_code,
+            valid=~invalid,
+            factor_points=factor_points,
+            strategy_version=strategy_version,
+        )
+
+
+def assess_batch(packages: Iterable[EvidencePackage]) -> BatchAssessmentResult:
+    """
+    Score many EvidencePackages in one vectorised pass.
+
+    Unlike assess(), invalid packages do not raise: they are flagged in
+    result.valid and their validation messages are collected in result.errors.
+    """
+    packages = packages if isinstance(packages, Sequence) else list(packages)
+    result = BatchAssessmentEngine.run(EvidenceColumns.from_packages(packages))
+    for i in np.flatnonzero(~result.valid).tolist():
+        result.errors[i] = EvidenceValidator.validate(packages[i]).errors
+    return result
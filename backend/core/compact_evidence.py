@@ -0,0 +1,411 @@
+"""
+core/compact_evidence.py
+
+Compact, immutable variants of EvidencePackage / FounderSignalInput for
+holding very large books in memory (batch rescoring, backtests) and shipping
+them to worker processes.
+
+  CompactFounderSignal      — frozen, slotted; tri-state flags packed into one int
+  CompactEvidencePackage    — frozen, slotted; interned industry/province codes,
+                              2-bit-per-document verification bitmask,
+                              precomputed content hash, to_bytes()/from_bytes()
+
+Both expose the same read attributes as the originals (verifications,
+intent_doc_details, industry, ...), so assess() accepts them directly.
+Decoding those dicts on every access is slower than a plain EvidencePackage —
+score them through assess_batch(), which reads the bitmasks column-wise, or
+call to_package() first when scoring one at a time.
+
+Industry / province codes come from tables seeded with the market data keys,
+so codes are identical across processes running the same code; any other
+string is interned at runtime and written inline by to_bytes().
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import sys
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from core.scoring import EvidencePackage, FounderSignalInput
+from core.factor_registry import COMPLIANCE_POINTS, INTENT_BASE_POINTS
+from services.market_data_service import SECTOR_SURVIVAL_RATES, PROVINCE_ECONOMIC_INDEX
+
+
+# ── Interning tables ──────────────────────────────────────────────────────────
+
+class CodeTable:
+    """Bidirectional string <-> small int table. The first `seeded` codes are process-independent."""
+
+    def __init__(self, seed: Iterable[str]):
+        self._names: list[str] = []
+        self._codes: dict[str, int] = {}
+        for name in seed:
+            self.code(name)
+        self.seeded = len(self._names)
+
+    def code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self._names)
+            name = sys.intern(name)
+            self._names.append(name)
+            self._codes[name] = code
+        return code
+
+    def name(self, code: int) -> str:
+        return self._names[code]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+INDUSTRY_CODES = CodeTable(SECTOR_SURVIVAL_RATES)
+PROVINCE_CODES = CodeTable(PROVINCE_ECONOMIC_INDEX)
+NO_PROVINCE = -1
+
+
+# ── Verification bitmask ──────────────────────────────────────────────────────
+# 2 bits per document: 0 = no record, else index into VERIFICATION_STATUSES
+
+VERIFICATION_DOCS: tuple[str, ...] = (*COMPLIANCE_POINTS, *INTENT_BASE_POINTS)
+VERIFICATION_STATUSES: tuple[str | None, ...] = (None, "approved", "pending", "rejected")
+_STATUS_CODES = {s: i for i, s in enumerate(VERIFICATION_STATUSES) if s is not None}
+STATUS_APPROVED = _STATUS_CODES["approved"]
+
+# Intent details: 4 bits per intent document — 2-bit status code + 2-bit loi_counterparty_known
+INTENT_DOCS: tuple[str, ...] = tuple(INTENT_BASE_POINTS)
+_TRISTATE = (None, True, False)
+_TRISTATE_CODES = {None: 0, True: 1, False: 2}
+TRISTATE_TRUE = _TRISTATE_CODES[True]
+_INTENT_DETAIL_KEYS = {"status", "loi_counterparty_known"}
+
+
+def _freeze(details: dict) -> tuple:
+    return tuple(sorted(((k, v) for k, v in details.items()), key=lambda kv: kv[0]))
+
+
+def _tristate_code(value) -> int | None:
+    if value is None or value is True or value is False:
+        return _TRISTATE_CODES[value]
+    return None
+
+
+def verification_shift(doc_type: str) -> int:
+    return 2 * VERIFICATION_DOCS.index(doc_type)
+
+
+def intent_shift(doc_type: str) -> int:
+    return 4 * INTENT_DOCS.index(doc_type)
+
+
+# ── Compact founder ───────────────────────────────────────────────────────────
+
+@dataclass(frozen=True, slots=True)
+class CompactFounderSignal:
+    """FounderSignalInput with its three tri-state flags packed into flag_bits (2 bits each)."""
+    years_industry_experience: int | None
+    highest_qualification:     str | None
+    flag_bits:                 int
+
+    FLAGS = ("prior_business_owner", "trade_association_member", "reference_provided")
+
+    @classmethod
+    def from_signal(cls, f: FounderSignalInput | CompactFounderSignal) -> CompactFounderSignal:
+        if isinstance(f, CompactFounderSignal):
+            return f
+        bits = 0
+        for i, attr in enumerate(cls.FLAGS):
+            code = _tristate_code(getattr(f, attr))
+            if code is None:
+                raise TypeError(f"{attr} must be True, False or None")
+            bits |= code << (2 * i)
+        qual = f.highest_qualification
+        return cls(f.years_industry_experience, sys.intern(qual) if qual is not None else None, bits)
+
+    def _flag(self, i: int) -> bool | None:
+        return _TRISTATE[(self.flag_bits >> (2 * i)) & 3]
+
+    @property
+    def prior_business_owner(self) -> bool | None:
+        return self._flag(0)
+
+    @property
+    def trade_association_member(self) -> bool | None:
+        return self._flag(1)
+
+    @property
+    def reference_provided(self) -> bool | None:
+        return self._flag(2)
+
+    def to_signal(self) -> FounderSignalInput:
+        return FounderSignalInput(
+            years_industry_experience=self.years_industry_experience,
+            highest_qualification=self.highest_qualification,
+            prior_business_owner=self.prior_business_owner,
+            trade_association_member=self.trade_association_member,
+            reference_provided=self.reference_provided,
+        )
+
+
+# ── Compact evidence package ──────────────────────────────────────────────────
+
+# version, presence flags, revenue, years, total, paid, unpaid,
+# verification bits, intent bits, overdraft, income regularity, months,
+# industry code, province code, founder experience, founder flag bits
+_HEADER = struct.Struct("<BBdqqqqIHqdqHHqB")
+_FORMAT_VERSION = 1
+_INLINE = 0xFFFF      # string follows the header
+_ABSENT = 0xFFFE      # None
+
+_HAS_OVERDRAFT, _HAS_REGULARITY, _HAS_MONTHS, _HAS_FOUNDER = 1, 2, 4, 8
+_HAS_EXPERIENCE, _HAS_QUALIFICATION, _HAS_EXTRAS, _REVENUE_IS_INT = 16, 32, 64, 128
+
+
+@dataclass(frozen=True, slots=True)
+class CompactEvidencePackage:
+    """
+    Immutable, slotted EvidencePackage.
+    Anything the bitmasks cannot represent (unknown document types or statuses,
+    extra intent-detail keys) is kept verbatim in `extras` so round trips are exact.
+    """
+    revenue:           float
+    years_active:      int
+    industry_code:     int
+    total_invoices:    int
+    paid_on_time:      int
+    unpaid_invoices:   int
+    verification_bits: int
+    intent_bits:       int
+    overdraft_count:   int | None
+    income_regularity: float | None
+    months_analysed:   int | None
+    province_code:     int
+    founder:           CompactFounderSignal | None
+    extras:            tuple = ()     # (("verifications" | "intent_doc_details", doc_type, value), ...)
+    content_hash:      bytes = field(default=b"", compare=False, repr=False)
+
+    def __post_init__(self):
+        if not self.content_hash:
+            digest = hashlib.blake2b(self.to_bytes(), digest_size=16).digest()
+            object.__setattr__(self, "content_hash", digest)
+
+    def __hash__(self) -> int:
+        return int.from_bytes(self.content_hash[:8], "little")
+
+    # ── Construction ──────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_package(cls, pkg: EvidencePackage | CompactEvidencePackage) -> CompactEvidencePackage:
+        if isinstance(pkg, CompactEvidencePackage):
+            return pkg
+        extras: list[tuple] = []
+
+        ver_bits = 0
+        for doc_type, status in pkg.verifications.items():
+            code = _STATUS_CODES.get(status)
+            if doc_type in VERIFICATION_DOCS and code is not None:
+                ver_bits |= code << verification_shift(doc_type)
+            else:
+                extras.append(("verifications", doc_type, status))
+
+        intent_bits = 0
+        for doc_type, details in pkg.intent_doc_details.items():
+            status_code = _STATUS_CODES.get(details.get("status"))
+            known_code = _tristate_code(details.get("loi_counterparty_known"))
+            if (doc_type in INTENT_DOCS and details.keys() == _INTENT_DETAIL_KEYS
+                    and status_code is not None and known_code is not None):
+                intent_bits |= (status_code | (known_code << 2)) << intent_shift(doc_type)
+            else:
+                extras.append(("intent_doc_details", doc_type, _freeze(details)))
+
+        return cls(
+            revenue=pkg.revenue,
+            years_active=pkg.years_active,
+            industry_code=INDUSTRY_CODES.code(pkg.industry),
+            total_invoices=pkg.total_invoices,
+            paid_on_time=pkg.paid_on_time,
+            unpaid_invoices=pkg.unpaid_invoices,
+            verification_bits=ver_bits,
+            intent_bits=intent_bits,
+            overdraft_count=pkg.overdraft_count,
+            income_regularity=pkg.income_regularity,
+            months_analysed=pkg.months_analysed,
+            province_code=PROVINCE_CODES.code(pkg.province) if pkg.province is not None else NO_PROVINCE,
+            founder=CompactFounderSignal.from_signal(pkg.founder) if pkg.founder is not None else None,
+            extras=tuple(sorted(extras, key=lambda e: (e[0], e[1]))),
+        )
+
+    def to_package(self) -> EvidencePackage:
+        return EvidencePackage(
+            revenue=self.revenue,
+            years_active=self.years_active,
+            industry=self.industry,
+            total_invoices=self.total_invoices,
+            paid_on_time=self.paid_on_time,
+            unpaid_invoices=self.unpaid_invoices,
+            verifications=self.verifications,
+            intent_doc_details=self.intent_doc_details,
+            overdraft_count=self.overdraft_count,
+            income_regularity=self.income_regularity,
+            months_analysed=self.months_analysed,
+            province=self.province,
+            founder=self.founder.to_signal() if self.founder is not None else None,
+        )
+
+    # ── EvidencePackage-compatible views ──────────────────────────────────────
+
+    @property
+    def industry(self) -> str:
+        return INDUSTRY_CODES.name(self.industry_code)
+
+    @property
+    def province(self) -> str | None:
+        return PROVINCE_CODES.name(self.province_code) if self.province_code != NO_PROVINCE else None
+
+    def verification_code(self, doc_type: str) -> int:
+        return (self.verification_bits >> verification_shift(doc_type)) & 3
+
+    def is_approved(self, doc_type: str) -> bool:
+        return self.verification_code(doc_type) == STATUS_APPROVED
+
+    @property
+    def verifications(self) -> dict[str, str]:
+        out = {}
+        for i, doc_type in enumerate(VERIFICATION_DOCS):
+            code = (self.verification_bits >> (2 * i)) & 3
+            if code:
+                out[doc_type] = VERIFICATION_STATUSES[code]
+        for kind, doc_type, value in self.extras:
+            if kind == "verifications":
+                out[doc_type] = value
+        return out
+
+    @property
+    def intent_doc_details(self) -> dict[str, dict]:
+        out = {}
+        for i, doc_type in enumerate(INTENT_DOCS):
+            nibble = (self.intent_bits >> (4 * i)) & 0xF
+            if nibble:
+                out[doc_type] = {
+                    "status":                 VERIFICATION_STATUSES[nibble & 3],
+                    "loi_counterparty_known": _TRISTATE[nibble >> 2],
+                }
+        for kind, doc_type, value in self.extras:
+            if kind == "intent_doc_details":
+                out[doc_type] = dict(value)
+        return out
+
+    # ── Serialisation ─────────────────────────────────────────────────────────
+
+    def to_bytes(self) -> bytes:
+        flags = 0
+        inline: list[bytes] = []
+
+        def pack_str(table: CodeTable, code: int, absent: bool = False) -> int:
+            if absent:
+                return _ABSENT
+            if code < table.seeded:
+                return code
+            inline.append(_encode_str(table.name(code)))
+            return _INLINE
+
+        if self.overdraft_count is not None:   flags |= _HAS_OVERDRAFT
+        if self.income_regularity is not None: flags |= _HAS_REGULARITY
+        if self.months_analysed is not None:   flags |= _HAS_MONTHS
+        if isinstance(self.revenue, int):      flags |= _REVENUE_IS_INT
+
+        industry = pack_str(INDUSTRY_CODES, self.industry_code)
+        province = pack_str(PROVINCE_CODES, self.province_code, absent=self.province_code == NO_PROVINCE)
+
+        f = self.founder
+        exp, founder_bits = 0, 0
+        if f is not None:
+            flags |= _HAS_FOUNDER
+            founder_bits = f.flag_bits
+            if f.years_industry_experience is not None:
+                flags |= _HAS_EXPERIENCE
+                exp = f.years_industry_experience
+            if f.highest_qualification is not None:
+                flags |= _HAS_QUALIFICATION
+                inline.append(_encode_str(f.highest_qualification))
+        if self.extras:
+            flags |= _HAS_EXTRAS
+            inline.append(_encode_str(json.dumps(self.extras, sort_keys=True, separators=(",", ":"))))
+
+        header = _HEADER.pack(
+            _FORMAT_VERSION, flags, float(self.revenue),
+            self.years_active, self.total_invoices, self.paid_on_time, self.unpaid_invoices,
+            self.verification_bits, self.intent_bits,
+            self.overdraft_count or 0,
+            float(self.income_regularity) if self.income_regularity is not None else 0.0,
+            self.months_analysed or 0,
+            industry, province, exp, founder_bits,
+        )
+        return header + b"".join(inline)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> CompactEvidencePackage:
+        (version, flags, revenue, years, total, paid, unpaid, ver_bits, intent_bits,
+         overdraft, regularity, months, industry, province, exp, founder_bits) = _HEADER.unpack_from(data)
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact evidence format version: {version}")
+        offset = _HEADER.size
+
+        def read_str() -> str:
+            nonlocal offset
+            (length,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            value = data[offset:offset + length].decode("utf-8")
+            offset += length
+            return value
+
+        industry_code = INDUSTRY_CODES.code(read_str()) if industry == _INLINE else industry
+        if province == _ABSENT:
+            province_code = NO_PROVINCE
+        else:
+            province_code = PROVINCE_CODES.code(read_str()) if province == _INLINE else province
+
+        founder = None
+        if flags & _HAS_FOUNDER:
+            founder = CompactFounderSignal(
+                exp if flags & _HAS_EXPERIENCE else None,
+                sys.intern(read_str()) if flags & _HAS_QUALIFICATION else None,
+                founder_bits,
+            )
+        extras = ()
+        if flags & _HAS_EXTRAS:
+            extras = tuple(
+                (kind, doc_type, value if kind == "verifications" else tuple(map(tuple, value)))
+                for kind, doc_type, value in json.loads(read_str())
+            )
+
+        return cls(
+            revenue=int(revenue) if flags & _REVENUE_IS_INT else revenue,
+            years_active=years,
+            industry_code=industry_code,
+            total_invoices=total,
+            paid_on_time=paid,
+            unpaid_invoices=unpaid,
+            verification_bits=ver_bits,
+            intent_bits=intent_bits,
+            overdraft_count=overdraft if flags & _HAS_OVERDRAFT else None,
+            income_regularity=regularity if flags & _HAS_REGULARITY else None,
+            months_analysed=months if flags & _HAS_MONTHS else None,
+            province_code=province_code,
+            founder=founder,
+            extras=extras,
+        )
+
+
+def _encode_str(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    return struct.pack("<I", len(raw)) + raw
+
+
+def compact_packages(packages: Iterable[EvidencePackage]) -> list[CompactEvidencePackage]:
+    """Converts many packages, returning a list of CompactEvidencePackage."""
+    return [CompactEvidencePackage.from_package(p) for p in packages]
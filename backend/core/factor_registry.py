@@ -0,0 +1,292 @@
+"""
+core/factor_registry.py
+
+Declarative factor / tier registry — the single source of truth for every
+threshold ladder used in scoring.
+
+Each ladder is declared as data (TierSpec) and compiled once into a
+bisect-searchable plan (ScoringPlan) for a given set of factor maxima:
+  - the Assessment Engine compiles one plan per WeightStrategy (per strategy version)
+  - the legacy calculate_score() compiles LEGACY_PLAN with whole-number points
+
+A new strategy version therefore ships as a new set of maxima (and, if needed,
+a new registry entry) rather than a new if/elif chain.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+
+# ── Evidence point tables ─────────────────────────────────────────────────────
+
+COMPLIANCE_POINTS: dict[str, int] = {
+    "cipc":               10,
+    "bank_statement":      8,
+    "tax_clearance":       5,
+    "registration_docs":   2,
+}
+MAX_COMPLIANCE_POINTS = 25
+
+INTENT_BASE_POINTS: dict[str, int] = {
+    "letter_of_intent": 8,
+    "supplier_quote":   4,
+    "lease_agreement":  3,
+}
+LOI_KNOWN_COUNTERPARTY_BONUS = 4
+MAX_INTENT_POINTS = 15
+
+MAX_FOUNDER_POINTS = 15
+
+# Qualification levels — ordered lowest to highest
+QUALIFICATION_LEVELS = {
+    "none":         0,
+    "matric":       1,
+    "certificate":  2,
+    "diploma":      2,
+    "degree":       4,
+    "postgraduate": 4,
+}
+
+# Founder yes/no signals: attribute -> (base points, detail label)
+FOUNDER_FLAG_POINTS: dict[str, tuple[int, str]] = {
+    "prior_business_owner":     (3, "prior business ownership"),
+    "trade_association_member": (2, "trade association member"),
+    "reference_provided":       (1, "business reference provided"),
+}
+
+OVERDRAFT_PENALTY_CAP = 2
+
+
+# ── Tier ladders ──────────────────────────────────────────────────────────────
+
+FACTOR_ORDER: tuple[str, ...] = (
+    "Revenue Tier",
+    "Invoice Timeliness",
+    "Business Age",
+    "Unpaid Invoice Ratio",
+    "Industry Risk",
+    "Market Viability",
+    "Compliance Documents",
+    "Intent Documents",
+    "Founder Signal",
+)
+
+
+@dataclass(frozen=True)
+class TierSpec:
+    """
+    A threshold ladder read top to bottom, exactly like an if/elif chain.
+      op=">=": first tier whose threshold <= value wins (thresholds descending)
+      op="<=": first tier whose threshold >= value wins (thresholds ascending)
+    The final tier has threshold None and is the fallback.
+    Labels may contain "{value}", formatted with the looked-up value.
+    """
+    op:    str
+    tiers: tuple[tuple[float | None, float, str | None], ...]   # (threshold, value, label)
+
+    def compile(self, points: tuple | None = None) -> "CompiledTiers":
+        values = points if points is not None else tuple(v for _, v, _ in self.tiers)
+        labels = tuple(label for _, _, label in self.tiers)
+        bounds = tuple(t for t, _, _ in self.tiers[:-1])
+        if self.op == ">=":
+            # Search ascending bounds; bisect_right counts thresholds <= value
+            return CompiledTiers(bounds[::-1], "right", values[::-1], labels[::-1])
+        return CompiledTiers(bounds, "left", values, labels)
+
+
+@dataclass(frozen=True)
+class CompiledTiers:
+    """
+    Ascending bounds plus points/labels in search order:
+    points[bisect(bounds, value)] is the tier a value falls into.
+    `side` is the matching np.searchsorted side for the vectorised path.
+    """
+    bounds: tuple[float, ...]
+    side:   str
+    points: tuple
+    labels: tuple[str | None, ...]
+
+    def index(self, value) -> int:
+        if self.side == "right":
+            return bisect_right(self.bounds, value)
+        return bisect_left(self.bounds, value)
+
+    def lookup(self, value):
+        return self.points[self.index(value)]
+
+    def label(self, value, idx: int | None = None) -> str | None:
+        label = self.labels[self.index(value) if idx is None else idx]
+        return label.format(value=value) if label else None
+
+
+# Fractions of the factor maximum
+REVENUE_TIERS = TierSpec(">=", (
+    (500_000, 1.00, "≥ R500k"),
+    (200_000, 0.72, "R200k–R500k"),
+    (100_000, 0.48, "R100k–R200k"),
+    ( 50_000, 0.28, "R50k–R100k"),
+    (None,    0.12, "< R50k"),
+))
+REVENUE_CAP = 500_000   # Engine: points scale continuously up to this revenue
+
+TIMELINESS_TIERS = TierSpec(">=", (
+    (0.90, 1.00, None),
+    (0.70, 0.65, None),
+    (0.50, 0.35, None),
+    (None, 0.15, None),
+))
+
+AGE_TIERS = TierSpec(">=", (
+    (5,    1.00, "{value} years"),
+    (2,    0.60, "{value} years"),
+    (1,    0.30, "{value} year"),
+    (None, 0.10, "< 1 year"),
+))
+
+UNPAID_TIERS = TierSpec("<=", (
+    (0.05, 1.00, None),
+    (0.15, 0.60, None),
+    (0.30, 0.30, None),
+    (None, 0.00, None),
+))
+
+NO_INVOICES_FRACTION = 0.5      # Timeliness / unpaid ratio when no invoices exist yet
+MARKET_NEUTRAL_FRACTION = 0.5   # Market viability when province is not specified
+RANGE_FLOOR_FRACTION = 0.3      # Industry / market points at the bottom of their range
+SURVIVAL_RANGE = (0.38, 0.72)
+MARKET_RANGE = (0.30, 1.00)
+
+# Base points (scaled by factor max / base max in the engine)
+BANK_HISTORY_TIERS = TierSpec(">=", (
+    (6,    2, "{value} months of history"),
+    (3,    1, "{value} months of history"),
+    (None, 0, None),
+))
+
+INCOME_REGULARITY_TIERS = TierSpec(">=", (
+    (0.80, 2, "consistent income pattern"),
+    (0.60, 1, "moderate income consistency"),
+    (None, 0, None),
+))
+
+FOUNDER_EXPERIENCE_TIERS = TierSpec(">=", (
+    (5,    5, "{value} years industry experience"),
+    (2,    3, "{value} years industry experience"),
+    (1,    1, "{value} year industry experience"),
+    (None, 0, None),
+))
+
+
+# ── Compiled plan ─────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    """
+    All per-call constants for one set of factor maxima, precomputed.
+    round_points=True  -> engine semantics (points scaled to the maxima, 1 dp)
+    round_points=False -> legacy semantics (whole base points, no rounding)
+    """
+    maxima:              dict[str, float]
+    round_points:        bool
+
+    revenue:             CompiledTiers
+    timeliness:          CompiledTiers
+    age:                 CompiledTiers
+    unpaid:              CompiledTiers
+    no_invoice_timeliness: float
+    no_invoice_unpaid:   float
+
+    industry_band:       tuple[float, float]   # (low pts, high pts)
+    market_band:         tuple[float, float]
+    market_neutral:      float
+
+    compliance_points:   dict[str, float]
+    bank_history:        CompiledTiers
+    income_regularity:   CompiledTiers
+    overdraft_unit:      float
+
+    intent_points:       dict[str, float]
+    loi_bonus:           float
+
+    founder_experience:  CompiledTiers
+    qualification_points: dict[str, float]
+    founder_flags:       dict[str, tuple[float, str]]
+
+    def finish(self, pts):
+        """Final per-factor rounding for capped accumulators (compliance, intent, founder)."""
+        return round(pts, 1) if self.round_points else pts
+
+
+def compile_plan(maxima: dict[str, float], round_points: bool = True) -> ScoringPlan:
+    """Compiles the registry for the given factor maxima (keyed by FACTOR_ORDER names)."""
+    if round_points:
+        share = lambda m, frac: round(m * frac, 1)
+    else:
+        share = lambda m, frac: int(round(m * frac))
+
+    def fractions(spec: TierSpec, m: float) -> CompiledTiers:
+        return spec.compile(tuple(share(m, v) for _, v, _ in spec.tiers))
+
+    def scaled(spec: TierSpec, scale: float) -> CompiledTiers:
+        return spec.compile(tuple(v * scale for _, v, _ in spec.tiers))
+
+    comp_max   = maxima["Compliance Documents"]
+    intent_max = maxima["Intent Documents"]
+    founder_max = maxima["Founder Signal"]
+    if round_points:
+        comp_scale    = comp_max / MAX_COMPLIANCE_POINTS
+        intent_scale  = intent_max / MAX_INTENT_POINTS
+        founder_scale = founder_max / MAX_FOUNDER_POINTS
+        compliance_points = {d: round(p * comp_scale, 1) for d, p in COMPLIANCE_POINTS.items()}
+    else:
+        comp_scale = intent_scale = founder_scale = 1
+        compliance_points = dict(COMPLIANCE_POINTS)
+
+    return ScoringPlan(
+        maxima=dict(maxima),
+        round_points=round_points,
+        revenue=fractions(REVENUE_TIERS, maxima["Revenue Tier"]),
+        timeliness=fractions(TIMELINESS_TIERS, maxima["Invoice Timeliness"]),
+        age=fractions(AGE_TIERS, maxima["Business Age"]),
+        unpaid=fractions(UNPAID_TIERS, maxima["Unpaid Invoice Ratio"]),
+        no_invoice_timeliness=share(maxima["Invoice Timeliness"], NO_INVOICES_FRACTION),
+        no_invoice_unpaid=share(maxima["Unpaid Invoice Ratio"], NO_INVOICES_FRACTION),
+        industry_band=(
+            maxima["Industry Risk"] * RANGE_FLOOR_FRACTION if round_points
+            else share(maxima["Industry Risk"], RANGE_FLOOR_FRACTION),
+            maxima["Industry Risk"],
+        ),
+        market_band=(
+            maxima["Market Viability"] * RANGE_FLOOR_FRACTION if round_points
+            else share(maxima["Market Viability"], RANGE_FLOOR_FRACTION),
+            maxima["Market Viability"],
+        ),
+        market_neutral=round(maxima["Market Viability"] * MARKET_NEUTRAL_FRACTION, 1),
+        compliance_points=compliance_points,
+        bank_history=scaled(BANK_HISTORY_TIERS, comp_scale),
+        income_regularity=scaled(INCOME_REGULARITY_TIERS, comp_scale),
+        overdraft_unit=comp_scale,
+        intent_points={d: p * intent_scale for d, p in INTENT_BASE_POINTS.items()},
+        loi_bonus=LOI_KNOWN_COUNTERPARTY_BONUS * intent_scale,
+        founder_experience=scaled(FOUNDER_EXPERIENCE_TIERS, founder_scale),
+        qualification_points={q: p * founder_scale for q, p in QUALIFICATION_LEVELS.items() if p > 0},
+        founder_flags={attr: (p * founder_scale, label) for attr, (p, label) in FOUNDER_FLAG_POINTS.items()},
+    )
+
+
+# Legacy calculate_score() maxima (RAW_MAX = 140)
+LEGACY_MAXIMA: dict[str, float] = {
+    "Revenue Tier":         25,
+    "Invoice Timeliness":   20,
+    "Business Age":         10,
+    "Unpaid Invoice Ratio": 10,
+    "Industry Risk":        10,
+    "Market Viability":     10,
+    "Compliance Documents": MAX_COMPLIANCE_POINTS,
+    "Intent Documents":     MAX_INTENT_POINTS,
+    "Founder Signal":       MAX_FOUNDER_POINTS,
+}
+
+LEGACY_PLAN = compile_plan(LEGACY_MAXIMA, round_points=False)
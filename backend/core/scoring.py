@@ -23,42 +23,24 @@ Factor weights (raw pts, rescaled to 100):
 from __future__ import annotations
 from dataclasses import dataclass, field
 
-from services.market_data_service import (
-    sector_survival_score,
-    province_market_score,
-    get_market_intelligence,
+from core.factor_registry import (
+    COMPLIANCE_POINTS,
+    MAX_COMPLIANCE_POINTS,
+    INTENT_BASE_POINTS,
+    LOI_KNOWN_COUNTERPARTY_BONUS,
+    MAX_INTENT_POINTS,
+    MAX_FOUNDER_POINTS,
+    QUALIFICATION_LEVELS,
+    OVERDRAFT_PENALTY_CAP,
+    LEGACY_PLAN,
+    SURVIVAL_RANGE,
+    MARKET_RANGE,
+    ScoringPlan,
 )
+from services.market_data_service import market_signals
 
 RAW_MAX = 140.0
 
-COMPLIANCE_POINTS: dict[str, int] = {
-    "cipc":               10,
-    "bank_statement":      8,
-    "tax_clearance":       5,
-    "registration_docs":   2,
-}
-MAX_COMPLIANCE_POINTS = 25
-
-INTENT_BASE_POINTS: dict[str, int] = {
-    "letter_of_intent": 8,
-    "supplier_quote":   4,
-    "lease_agreement":  3,
-}
-LOI_KNOWN_COUNTERPARTY_BONUS = 4
-MAX_INTENT_POINTS = 15
-
-MAX_FOUNDER_POINTS = 15
-
-# Qualification levels — ordered lowest to highest
-QUALIFICATION_LEVELS = {
-    "none":         0,
-    "matric":       1,
-    "certificate":  2,
-    "diploma":      2,
-    "degree":       4,
-    "postgraduate": 4,
-}
-
 
 # ── Founder signal input ──────────────────────────────────────────────────────
 @dataclass
@@ -163,16 +145,16 @@ class ScoringResult:
 
 # ── Engine ────────────────────────────────────────────────────────────────────
 def calculate_score(inp: ScoringInput) -> ScoringResult:
+    plan = LEGACY_PLAN
     breakdown: dict[str, dict] = {}
     raw = 0.0
+    signals = market_signals(inp.industry, inp.province)
 
     # 1. Revenue tier (25 pts) ─────────────────────────────────────────────────
     revenue_source = "parsed" if inp.months_analysed is not None else "self-reported"
-    if inp.revenue >= 500_000:   rev_pts, rev_label = 25, "≥ R500k"
-    elif inp.revenue >= 200_000: rev_pts, rev_label = 18, "R200k–R500k"
-    elif inp.revenue >= 100_000: rev_pts, rev_label = 12, "R100k–R200k"
-    elif inp.revenue >= 50_000:  rev_pts, rev_label =  7, "R50k–R100k"
-    else:                        rev_pts, rev_label =  3, "< R50k"
+    rev_idx   = plan.revenue.index(inp.revenue)
+    rev_pts   = plan.revenue.points[rev_idx]
+    rev_label = plan.revenue.label(inp.revenue, rev_idx)
 
     raw += rev_pts
     breakdown["Revenue Tier"] = {
@@ -182,13 +164,11 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
 
     # 2. Invoice timeliness (20 pts) ───────────────────────────────────────────
     if inp.total_invoices == 0:
-        time_pts, time_label, time_ratio = 10, "No invoices yet", None
+        time_pts, time_label, time_ratio = plan.no_invoice_timeliness, "No invoices yet", None
     else:
         time_ratio = inp.paid_on_time / inp.total_invoices
-        if time_ratio >= 0.90:   time_pts, time_label = 20, f"{time_ratio:.0%} on time"
-        elif time_ratio >= 0.70: time_pts, time_label = 13, f"{time_ratio:.0%} on time"
-        elif time_ratio >= 0.50: time_pts, time_label =  7, f"{time_ratio:.0%} on time"
-        else:                    time_pts, time_label =  3, f"{time_ratio:.0%} on time"
+        time_pts   = plan.timeliness.lookup(time_ratio)
+        time_label = f"{time_ratio:.0%} on time"
 
     raw += time_pts
     breakdown["Invoice Timeliness"] = {
@@ -197,10 +177,9 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
     }
 
     # 3. Business age (10 pts) ─────────────────────────────────────────────────
-    if inp.years_active >= 5:   age_pts, age_label = 10, f"{inp.years_active} years"
-    elif inp.years_active >= 2: age_pts, age_label =  6, f"{inp.years_active} years"
-    elif inp.years_active >= 1: age_pts, age_label =  3, f"{inp.years_active} year"
-    else:                       age_pts, age_label =  1, "< 1 year"
+    age_idx   = plan.age.index(inp.years_active)
+    age_pts   = plan.age.points[age_idx]
+    age_label = plan.age.label(inp.years_active, age_idx)
 
     raw += age_pts
     breakdown["Business Age"] = {
@@ -210,13 +189,10 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
 
     # 4. Unpaid invoice ratio (10 pts) ─────────────────────────────────────────
     if inp.total_invoices == 0:
-        unpaid_pts, unpaid_label, unpaid_ratio = 5, "No invoices", None
+        unpaid_pts, unpaid_label, unpaid_ratio = plan.no_invoice_unpaid, "No invoices", None
     else:
         unpaid_ratio = inp.unpaid_invoices / inp.total_invoices
-        if unpaid_ratio <= 0.05:   unpaid_pts = 10
-        elif unpaid_ratio <= 0.15: unpaid_pts = 6
-        elif unpaid_ratio <= 0.30: unpaid_pts = 3
-        else:                      unpaid_pts = 0
+        unpaid_pts   = plan.unpaid.lookup(unpaid_ratio)
         unpaid_label = f"{unpaid_ratio:.0%} unpaid"
 
     raw += unpaid_pts
@@ -226,14 +202,13 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
     }
 
     # 5. Industry Risk (10 pts) ────────────────────────────────────────────────
-    survival = sector_survival_score(inp.industry)
-    industry_pts = round(_scale(survival, 0.38, 0.72, 3, 10), 1)
-    intel = get_market_intelligence(inp.industry, inp.province)
+    survival = signals.sector_survival_rate
+    industry_pts = round(_scale(survival, *SURVIVAL_RANGE, *plan.industry_band), 1)
 
     raw += industry_pts
     breakdown["Industry Risk"] = {
         "value": survival,
-        "label": intel["survival_label"],
+        "label": signals.survival_label,
         "contribution": industry_pts,
         "max": 10,
         "sector_survival_rate": survival,
@@ -241,12 +216,12 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
 
     # 6. Market Viability (10 pts) ─────────────────────────────────────────────
     if inp.province:
-        mkt_score  = province_market_score(inp.province, inp.industry)
-        market_pts = round(_scale(mkt_score, 0.30, 1.00, 3, 10), 1)
-        market_label = intel["market_label"]
+        mkt_score  = signals.province_market_score
+        market_pts = round(_scale(mkt_score, *MARKET_RANGE, *plan.market_band), 1)
+        market_label = signals.market_label
         market_note  = None
     else:
-        mkt_score, market_pts = None, 5.0
+        mkt_score, market_pts = None, plan.market_neutral
         market_label = "Province not specified — neutral score applied"
         market_note  = "Add your province to improve this factor"
 
@@ -262,7 +237,7 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
     verified_compliance: list[str] = []
     missing_compliance:  list[str] = []
 
-    for doc_type, points in COMPLIANCE_POINTS.items():
+    for doc_type, points in plan.compliance_points.items():
         if inp.verifications.get(doc_type) == "approved":
             comp_pts += points
             verified_compliance.append(doc_type)
@@ -271,15 +246,7 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
 
     bs_bonus, bs_bonus_detail = 0, []
     if inp.months_analysed is not None:
-        if inp.months_analysed >= 6:   bs_bonus += 2; bs_bonus_detail.append(f"{inp.months_analysed} months of history")
-        elif inp.months_analysed >= 3: bs_bonus += 1; bs_bonus_detail.append(f"{inp.months_analysed} months of history")
-        if inp.income_regularity is not None:
-            if inp.income_regularity >= 0.80:   bs_bonus += 2; bs_bonus_detail.append("consistent income pattern")
-            elif inp.income_regularity >= 0.60: bs_bonus += 1; bs_bonus_detail.append("moderate income consistency")
-        if inp.overdraft_count:
-            penalty = min(inp.overdraft_count, 2)
-            bs_bonus -= penalty
-            bs_bonus_detail.append(f"{inp.overdraft_count} overdraft month(s) detected")
+        bs_bonus = _bank_statement_bonus(inp, plan, bs_bonus, bs_bonus_detail)
 
     comp_pts = min(comp_pts + bs_bonus, MAX_COMPLIANCE_POINTS)
     raw += comp_pts
@@ -298,7 +265,7 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
     missing_intent:  list[str] = []
     intent_notes:    list[str] = []
 
-    for doc_type, base_pts in INTENT_BASE_POINTS.items():
+    for doc_type, base_pts in plan.intent_points.items():
         details = inp.intent_doc_details.get(doc_type, {})
         status  = details.get("status") or inp.verifications.get(doc_type)
         if status == "approved":
@@ -307,8 +274,8 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
             if doc_type == "letter_of_intent":
                 known = details.get("loi_counterparty_known")
                 if known is True:
-                    pts += LOI_KNOWN_COUNTERPARTY_BONUS
-                    intent_notes.append(f"LOI from recognised counterparty (+{LOI_KNOWN_COUNTERPARTY_BONUS} pts)")
+                    pts += plan.loi_bonus
+                    intent_notes.append(f"LOI from recognised counterparty (+{plan.loi_bonus} pts)")
                 elif known is False:
                     intent_notes.append("LOI counterparty not verified — base points only")
                 else:
@@ -331,44 +298,15 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
     }
 
     # 9. Founder Signal (15 pts) — NEW ────────────────────────────────────────
-    founder_pts  = 0
     founder_detail: list[str] = []
 
     if inp.founder is None:
         # Profile not yet created — neutral 0 pts, but clearly labelled
+        founder_pts   = 0
         founder_label = "Founder profile not yet completed"
         founder_note  = "Complete your founder profile to earn up to 15 pts"
     else:
-        f = inp.founder
-
-        # Experience (max 5 pts)
-        exp = f.years_industry_experience
-        if exp is not None:
-            if exp >= 5:
-                founder_pts += 5; founder_detail.append(f"{exp} years industry experience")
-            elif exp >= 2:
-                founder_pts += 3; founder_detail.append(f"{exp} years industry experience")
-            elif exp >= 1:
-                founder_pts += 1; founder_detail.append(f"{exp} year industry experience")
-
-        # Qualification (max 4 pts)
-        qual = (f.highest_qualification or "").lower().strip()
-        qual_pts = QUALIFICATION_LEVELS.get(qual, 0)
-        if qual_pts > 0:
-            founder_pts += qual_pts
-            founder_detail.append(f"{f.highest_qualification} qualification")
-
-        # Prior business ownership (3 pts)
-        if f.prior_business_owner is True:
-            founder_pts += 3; founder_detail.append("prior business ownership")
-
-        # Network / reference (3 pts)
-        if f.trade_association_member is True:
-            founder_pts += 2; founder_detail.append("trade association member")
-        if f.reference_provided is True:
-            founder_pts += 1; founder_detail.append("business reference provided")
-
-        founder_pts  = min(founder_pts, MAX_FOUNDER_POINTS)
+        founder_pts  = min(_founder_points(inp.founder, plan, 0, founder_detail), MAX_FOUNDER_POINTS)
         founder_label = (
             f"Founder profile: {founder_pts}/{MAX_FOUNDER_POINTS} pts"
             if founder_detail else "Founder profile submitted — no scoreable signals yet"
@@ -390,6 +328,57 @@ def calculate_score(inp: ScoringInput) -> ScoringResult:
     return ScoringResult(score=score, decision=determine_decision(score), breakdown=breakdown)
 
 
+# ── Shared plan-driven helpers (also used by the Assessment Engine) ───────────
+def _bank_statement_bonus(inp: EvidencePackage, plan: ScoringPlan, bonus, detail: list[str] | None):
+    """
+    Bank statement quality bonus: history length, income regularity, overdraft penalty.
+    Pass detail=None on score-only paths to skip building the explanation strings.
+    """
+    idx = plan.bank_history.index(inp.months_analysed)
+    if plan.bank_history.labels[idx]:
+        bonus += plan.bank_history.points[idx]
+        if detail is not None:
+            detail.append(plan.bank_history.label(inp.months_analysed, idx))
+    if inp.income_regularity is not None:
+        idx = plan.income_regularity.index(inp.income_regularity)
+        if plan.income_regularity.labels[idx]:
+            bonus += plan.income_regularity.points[idx]
+            if detail is not None:
+                detail.append(plan.income_regularity.labels[idx])
+    if inp.overdraft_count:
+        bonus -= min(inp.overdraft_count, OVERDRAFT_PENALTY_CAP) * plan.overdraft_unit
+        if detail is not None:
+            detail.append(f"{inp.overdraft_count} overdraft month(s) detected")
+    return bonus
+
+
+def _founder_points(f: FounderSignalInput, plan: ScoringPlan, pts, detail: list[str] | None):
+    """
+    Uncapped founder signal points: experience, qualification, ownership and network.
+    Pass detail=None on score-only paths to skip building the explanation strings.
+    """
+    exp = f.years_industry_experience
+    if exp is not None:
+        idx = plan.founder_experience.index(exp)
+        if plan.founder_experience.labels[idx]:
+            pts += plan.founder_experience.points[idx]
+            if detail is not None:
+                detail.append(plan.founder_experience.label(exp, idx))
+
+    qual_pts = plan.qualification_points.get((f.highest_qualification or "").lower().strip())
+    if qual_pts is not None:
+        pts += qual_pts
+        if detail is not None:
+            detail.append(f"{f.highest_qualification} qualification")
+
+    for attr, (flag_pts, flag_label) in plan.founder_flags.items():
+        if getattr(f, attr) is True:
+            pts += flag_pts
+            if detail is not None:
+                detail.append(flag_label)
+    return pts
+
+
 def determine_decision(score: float) -> str:
     if score >= 75: return "Approved"
     if score >= 50: return "Review"
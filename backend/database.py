@@ -1,17 +1,87 @@
-from sqlalchemy import create_engine
+from fastapi import Depends
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from config import get_settings
+from services.query_stats_service import TimedAsyncAdaptedQueuePool, TimedQueuePool
+from services.read_routing_service import PRIMARY, ReadRoutingPolicy, register_policy
+from starlette.concurrency import run_in_threadpool
 
 settings = get_settings()
 
 DATABASE_URL = settings.database_url
 
-engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+
+def pool_options(url: str, poolclass) -> dict:
+    """Engine pool arguments from Settings. SQLite keeps SQLAlchemy's default pool for its URL."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass":     poolclass,
+        "pool_size":     settings.db_pool_size,
+        "max_overflow":  settings.db_max_overflow,
+        "pool_recycle":  settings.db_pool_recycle_seconds,
+        "pool_timeout":  settings.db_pool_timeout_seconds,
+    }
+
+
+engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True, **pool_options(DATABASE_URL, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+def to_async_url(url: str) -> str:
+    """The async-driver form of a sync database URL: asyncpg for Postgres, aiosqlite for SQLite."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+ASYNC_DATABASE_URL = settings.async_database_url or to_async_url(DATABASE_URL)
+
+# Read-heavy routers use the async stack so waiting on the database does not
+# hold one of Starlette's threadpool workers. expire_on_commit=False: async
+# sessions cannot lazy-load expired attributes.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, echo=False, pool_pre_ping=True,
+    **pool_options(ASYNC_DATABASE_URL, TimedAsyncAdaptedQueuePool),
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Optional read replica for read-only endpoints; see services/read_routing_service.py
+REPLICA_DATABASE_URL = settings.replica_database_url
+replica_engine = None
+async_replica_engine = None
+ReplicaSessionLocal = None
+AsyncReplicaSessionLocal = None
+if REPLICA_DATABASE_URL:
+    ASYNC_REPLICA_DATABASE_URL = settings.async_replica_database_url or to_async_url(REPLICA_DATABASE_URL)
+    replica_engine = create_engine(
+        REPLICA_DATABASE_URL, echo=False, pool_pre_ping=True,
+        **pool_options(REPLICA_DATABASE_URL, TimedQueuePool),
+    )
+    async_replica_engine = create_async_engine(
+        ASYNC_REPLICA_DATABASE_URL, echo=False, pool_pre_ping=True,
+        **pool_options(ASYNC_REPLICA_DATABASE_URL, TimedAsyncAdaptedQueuePool),
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False,
+    )
+
+read_routing = register_policy(ReadRoutingPolicy(
+    replica_engine,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    read_your_writes_seconds=settings.read_your_writes_seconds,
+    lag_check_seconds=settings.replica_lag_check_seconds,
+))
+
 # Dependency for DB session
 def get_db():
     db = SessionLocal()
@@ -19,3 +89,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency for async DB session (async def endpoints)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependency for read-only endpoints: a replica session when read_routing allows
+# it, otherwise the primary session (which opens no connection until used)
+def get_read_db(primary: Session = Depends(get_db)):
+    if read_routing.route_current() == PRIMARY:
+        yield primary
+        return
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(primary: AsyncSession = Depends(get_async_db)):
+    if read_routing.enabled and read_routing.lag_is_stale():
+        await run_in_threadpool(read_routing.refresh_lag)
+    if read_routing.route_current() == PRIMARY:
+        yield primary
+        return
+    async with AsyncReplicaSessionLocal() as db:
+        yield db
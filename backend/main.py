@@ -16,6 +16,9 @@ from routers import (
 )
 from fastapi.middleware.cors import CORSMiddleware
 from limiter import limiter
+from pagination import PAGE_HEADERS
+from services.query_stats_service import QueryStatsMiddleware
+from services.read_routing_service import ReadRoutingMiddleware
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
 
@@ -36,7 +39,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGE_HEADERS,   # keyset pagination metadata for list endpoints
 )
+# Per-request query counts / DB time, N+1 logging and @query_budget checks
+app.add_middleware(QueryStatsMiddleware)
+# Identifies the client for read-your-writes routing of get_read_db endpoints
+app.add_middleware(ReadRoutingMiddleware)
 
 # Include routers
 app.include_router(auth_router.router)
@@ -9,3 +9,7 @@ from models.lender import Lender
 from models.sme_outcome import SmeOutcome
 from models.api_key import APIKey
 
+from models.sme_signal_snapshot import SmeSignalSnapshot
+from models.rescore_run import RescoreRun
+from models.portfolio_counter import PortfolioCounter
+from models.lender_match import SmeMatchKey, LenderCriterion, LenderMatch, LenderMatchEvent, LenderMatchBuild
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index, event, or_, select, update
+from sqlalchemy.orm import relationship, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from database import Base
 from datetime import datetime
 
+from models.sme import SME
+
 class CreditScore(Base):
     __tablename__ = "credit_scores"
 
@@ -16,5 +20,57 @@ class CreditScore(Base):
 
     finance_requests = relationship("FinanceRequest", back_populates="credit_score")
 
+    # History lookups: WHERE sme_id = ? ORDER BY created_at DESC (migration 019)
+    __table_args__ = (Index("ix_credit_scores_sme_id_created_at", sme_id, created_at.desc()),)
+
     def __repr__(self):
         return f"<CreditScore(id={self.id}, sme_id={self.sme_id}, score={self.score})>"
+
+
+# ── smes.latest_score_* maintenance ───────────────────────────────────────────
+# Runs inside the flush on the same connection, so the denormalized columns on
+# smes change atomically with the credit_scores row that caused them.
+
+_smes = SME.__table__
+
+
+def _sync_identity_map(target: CreditScore, values: dict) -> None:
+    """Mirror the UPDATE onto the session's copy of the SME, if it has one loaded."""
+    session = object_session(target)
+    sme = session.identity_map.get(identity_key(SME, target.sme_id)) if session is not None else None
+    if sme is not None:
+        for key, value in values.items():
+            set_committed_value(sme, key, value)
+
+
+@event.listens_for(CreditScore, "after_insert")
+def _promote_latest_score(mapper, connection, target):
+    values = {"latest_score_id": target.id, "latest_score": target.score, "latest_score_at": target.created_at}
+    promoted = connection.execute(
+        update(_smes)
+        .where(
+            _smes.c.id == target.sme_id,
+            or_(_smes.c.latest_score_at.is_(None), _smes.c.latest_score_at <= target.created_at),
+        )
+        .values(**values)
+    ).rowcount
+    if promoted:
+        _sync_identity_map(target, values)
+
+
+@event.listens_for(CreditScore, "after_update")
+@event.listens_for(CreditScore, "after_delete")
+def _recompute_latest_score(mapper, connection, target):
+    latest = connection.execute(
+        select(CreditScore.id, CreditScore.score, CreditScore.created_at)
+        .where(CreditScore.sme_id == target.sme_id)
+        .order_by(CreditScore.created_at.desc(), CreditScore.id.desc())
+        .limit(1)
+    ).first()
+    values = {
+        "latest_score_id": latest.id if latest else None,
+        "latest_score":    latest.score if latest else None,
+        "latest_score_at": latest.created_at if latest else None,
+    }
+    connection.execute(update(_smes).where(_smes.c.id == target.sme_id).values(**values))
+    _sync_identity_map(target, values)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Numeric, ForeignKey, String, DateTime
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -44,4 +44,10 @@ class FinanceRequest(Base):
     credit_score = relationship("CreditScore", back_populates="finance_requests")
 
     lender = relationship("Lender", back_populates="approvals")
-    outcome = relationship("SmeOutcome", back_populates="finance_request", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
+    outcome = relationship("SmeOutcome", back_populates="finance_request", uselist=False, cascade="all, delete-orphan")
+
+    # Status filters and per-status counts grouped by SME; an SME's requests in a status (migration 021)
+    __table_args__ = (
+        Index("ix_finance_requests_status_sme_id", status, sme_id),
+        Index("ix_finance_requests_sme_id_status", sme_id, status),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, Index
 from datetime import datetime
 from database import Base
 from sqlalchemy.orm import relationship
@@ -11,7 +11,7 @@ class Invoice(Base):
     client_name = Column(String)
     description = Column(String)
     amount = Column(Numeric(18, 2))
-    status = Column(String, default="pending")
+    status = Column(String, default="pending", index=True)
     invoice_number = Column(String, nullable=True)
     issue_date = Column(DateTime, nullable=True)
     due_date = Column(DateTime, nullable=True)
@@ -26,3 +26,6 @@ class Invoice(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     sme = relationship("SME", back_populates="invoices")
     finance_requests = relationship("FinanceRequest", back_populates="invoice", cascade="all, delete-orphan")
+
+    # Per-SME invoice lists and paid / unpaid aggregation (migration 021)
+    __table_args__ = (Index("ix_invoices_sme_id_status", sme_id, status),)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -12,6 +12,8 @@ class Lender(Base):
     phone = Column(String, nullable=True)
     max_lending_amount = Column(Numeric(18, 2), default=1000000)
     min_credit_score = Column(Integer, default=40)
+    sectors = Column(JSON, nullable=True)     # SME industries the lender finances; empty or NULL = any
+    provinces = Column(JSON, nullable=True)   # SME provinces the lender finances; empty or NULL = any
 
     user = relationship("User", back_populates="lender_profile")
     approvals = relationship("FinanceRequest", back_populates="lender")
@@ -0,0 +1,98 @@
+"""
+models/lender_match.py
+
+Precomputed SME–lender eligibility, kept current by
+services/matching_service.py in the same transaction as the writes that
+change it.
+
+  sme_match_keys      the inverted index: one row per scored SME with its
+                      score band, sector and province (each indexed), plus the
+                      score, confidence and pending requested amount that the
+                      lender criteria are checked against
+  lender_criteria     the lender side: one row per sector / province a lender
+                      accepts ("*" when it accepts any), keyed for lookup by
+                      value, so an SME's eligible lenders are found in SQL
+  lender_matches      each lender's eligible set, ranked by score and confidence
+  lender_match_events one row each time an SME enters a lender's eligible set
+                      because the SME changed ("new eligible SME")
+  lender_match_builds one row per completed rebuild; until the first, reads
+                      compute matches from the source tables
+"""
+from sqlalchemy import Column, Integer, String, Float, Numeric, ForeignKey, DateTime, Index
+from datetime import datetime
+from database import Base
+
+
+class SmeMatchKey(Base):
+    __tablename__ = "sme_match_keys"
+
+    sme_id = Column(Integer, ForeignKey("smes.id", ondelete="CASCADE"), primary_key=True)
+
+    score_band = Column(Integer, nullable=False, index=True)   # floor(score / MATCH_BAND_WIDTH)
+    sector     = Column(String,  nullable=False, index=True)
+    province   = Column(String,  nullable=True,  index=True)
+
+    score            = Column(Float,          nullable=False)
+    confidence       = Column(Float,          nullable=False)
+    requested_amount = Column(Numeric(18, 2), nullable=False, default=0)   # sum of pending requests
+
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SmeMatchKey(sme_id={self.sme_id}, band={self.score_band}, sector='{self.sector}')>"
+
+
+class LenderCriterion(Base):
+    __tablename__ = "lender_criteria"
+
+    # Lookup: WHERE field = ? AND value IN (?, '*') — the primary key leads with (field, value)
+    field     = Column(String, primary_key=True)    # "sector" or "province"
+    value     = Column(String, primary_key=True)    # "*" when the lender accepts any
+    lender_id = Column(Integer, ForeignKey("lenders.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+    def __repr__(self):
+        return f"<LenderCriterion(lender_id={self.lender_id}, {self.field}='{self.value}')>"
+
+
+class LenderMatch(Base):
+    __tablename__ = "lender_matches"
+
+    lender_id = Column(Integer, ForeignKey("lenders.id", ondelete="CASCADE"), primary_key=True)
+    sme_id    = Column(Integer, ForeignKey("smes.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+    score      = Column(Float, nullable=False)
+    confidence = Column(Float, nullable=False)
+    matched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Top-k: WHERE lender_id = ? ORDER BY score DESC, confidence DESC, sme_id LIMIT k
+    __table_args__ = (Index("ix_lender_matches_ranking", lender_id, score.desc(), confidence.desc(), sme_id),)
+
+    def __repr__(self):
+        return f"<LenderMatch(lender_id={self.lender_id}, sme_id={self.sme_id}, score={self.score})>"
+
+
+class LenderMatchEvent(Base):
+    __tablename__ = "lender_match_events"
+
+    id         = Column(Integer, primary_key=True, index=True)
+    lender_id  = Column(Integer, ForeignKey("lenders.id", ondelete="CASCADE"), nullable=False)
+    sme_id     = Column(Integer, ForeignKey("smes.id", ondelete="CASCADE"), nullable=False)
+    score      = Column(Float, nullable=False)
+    confidence = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Polling: WHERE lender_id = ? AND id > ? ORDER BY id
+    __table_args__ = (Index("ix_lender_match_events_lender_id_id", lender_id, id),)
+
+    def __repr__(self):
+        return f"<LenderMatchEvent(id={self.id}, lender_id={self.lender_id}, sme_id={self.sme_id})>"
+
+
+class LenderMatchBuild(Base):
+    __tablename__ = "lender_match_builds"
+
+    id       = Column(Integer, primary_key=True)
+    built_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<LenderMatchBuild(id={self.id}, built_at={self.built_at})>"
@@ -0,0 +1,32 @@
+"""
+models/portfolio_counter.py
+
+Portfolio-wide aggregates kept current by services/portfolio_counter_service.py
+in the same transaction as the writes that change them, so
+/lenders/portfolio-analytics and /api/v1/platform/stats read a few dozen
+rows instead of scanning the portfolio.
+
+One row per (metric, bucket):
+  applications / <status>            count = finance requests
+  financials / approved_amount       total = approved amount of funded, paid and closed requests
+  financials / platform_fee          total = their platform fees
+  score_band / <band>                count = SMEs, total = sum of their latest scores
+  sector / <industry>                count = SMEs ("" for none)
+  province / <province>              count = SMEs ("" for none)
+  outcomes / <outcome_status>        count = outcomes
+  meta / rebuilt                     present once the counters were built by a rebuild
+"""
+from sqlalchemy import Column, String, BigInteger, Numeric
+from database import Base
+
+
+class PortfolioCounter(Base):
+    __tablename__ = "portfolio_counters"
+
+    metric = Column(String, primary_key=True)
+    bucket = Column(String, primary_key=True)
+    count  = Column(BigInteger, nullable=False, default=0)
+    total  = Column(Numeric(20, 4), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PortfolioCounter({self.metric}/{self.bucket}: count={self.count}, total={self.total})>"
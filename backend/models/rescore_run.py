@@ -0,0 +1,42 @@
+"""
+models/rescore_run.py
+
+One row per batch rescoring run (services/batch_rescoring_service.py).
+
+The run walks SMEs in id order; last_sme_id and the counters are updated in
+the same transaction as each chunk's CreditScore inserts, so a run that
+crashed resumes after its last committed chunk without scoring any SME twice.
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from datetime import datetime
+from database import Base
+
+
+class RescoreRun(Base):
+    __tablename__ = "rescore_runs"
+
+    id               = Column(Integer, primary_key=True, index=True)
+    status           = Column(String, nullable=False, default="running", index=True)  # running | completed | abandoned
+    strategy_version = Column(String, nullable=True)
+    chunk_size       = Column(Integer, nullable=False)
+    total_smes       = Column(Integer, nullable=False, default=0)   # SME count when the run started
+
+    last_sme_id = Column(Integer, nullable=False, default=0)        # checkpoint: every SME up to here is done
+    scored      = Column(Integer, nullable=False, default=0)
+    failed      = Column(Integer, nullable=False, default=0)        # packages that failed validation
+    elapsed_seconds = Column(Float, nullable=False, default=0.0)    # scoring time across all attempts
+
+    started_at  = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at  = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    @property
+    def smes_per_second(self) -> float:
+        processed = self.scored + self.failed
+        return processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def __repr__(self):
+        return (
+            f"<RescoreRun(id={self.id}, status='{self.status}', "
+            f"last_sme_id={self.last_sme_id}, scored={self.scored})>"
+        )
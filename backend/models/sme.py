@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Numeric, Float, ForeignKey, DateTime, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -11,7 +11,7 @@ class SME(Base):
     industry     = Column(String,  nullable=False)
     revenue      = Column(Numeric(18, 2), nullable=False)
     years_active = Column(Integer, nullable=False, default=0)
-    user_id      = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id      = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # ── Location (Track A — migration 010) ────────────────────────────────────
     province      = Column(String, nullable=True)
@@ -32,11 +32,25 @@ class SME(Base):
     # cipc_verified_at:         set when the live API confirms the company
     # cipc_company_name:        as returned by CIPC API (may differ slightly from sme.name)
     # cipc_status:              "In Business" | "Deregistered" | "Pending" | etc.
-    cipc_registration_number = Column(String,   nullable=True)
+    cipc_registration_number = Column(String,   nullable=True, index=True)
     cipc_verified_at         = Column(DateTime, nullable=True)
     cipc_company_name        = Column(String,   nullable=True)
     cipc_status              = Column(String,   nullable=True)
 
+    # ── Latest credit score (denormalized — migration 019) ────────────────────
+    # Copied from the newest credit_scores row by the CreditScore insert/update/
+    # delete events in models/credit_score.py, in the same transaction.
+    # latest_score_id has no FK constraint so smes <-> credit_scores stays acyclic.
+    latest_score_id = Column(Integer,  nullable=True)
+    latest_score    = Column(Float,    nullable=True)
+    latest_score_at = Column(DateTime, nullable=True)
+
+    # ── Data version (migration 025) ──────────────────────────────────────────
+    # Incremented by services/intelligence_service.py in the same transaction as
+    # every write to the SME or its child rows; part of the fingerprint that keys
+    # and validates the cached /lenders/sme-intelligence bundle.
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     # ── Relationships ─────────────────────────────────────────────────────────
     user             = relationship("User",          back_populates="sme_profile")
     invoices         = relationship("Invoice",        back_populates="sme", cascade="all, delete-orphan")
@@ -51,3 +65,12 @@ class SME(Base):
             f"<SME(id={self.id}, name='{self.name}', "
             f"province='{self.province}', cipc='{self.cipc_registration_number}')>"
         )
+
+
+# ── Keyset sort keys of /lenders/available-smes (migration 023) ──────────────
+# Unscored SMEs sort below every score. The -1 is a literal, not a bound
+# parameter, so queries match the expression index.
+SCORE_SORT_KEY = func.coalesce(SME.latest_score, literal_column("-1"))
+
+Index("ix_smes_score_sort", SCORE_SORT_KEY, SME.id)
+Index("ix_smes_revenue_id", SME.revenue, SME.id)
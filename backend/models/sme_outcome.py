@@ -33,7 +33,7 @@ class SmeOutcome(Base):
     score_at_funding = Column(Float, nullable=False)
     amount = Column(Numeric(18, 2), nullable=False)
     outstanding_recommendations = Column(JSON, nullable=False, default=list)
-    outcome_status = Column(String(50), nullable=False, default="pending", server_default="pending")
+    outcome_status = Column(String(50), nullable=False, default="pending", server_default="pending", index=True)
     check_in_90_due_at = Column(DateTime, nullable=True)
     check_in_180_due_at = Column(DateTime, nullable=True)
     check_in_365_due_at = Column(DateTime, nullable=True)
@@ -0,0 +1,45 @@
+"""
+models/sme_signal_snapshot.py
+
+One row per SME holding every EvidencePackage field, precomputed from
+invoices, verifications, founder_profiles and the smes.bs_* columns.
+
+Kept current inside the writing transaction by the session listener in
+services/signal_snapshot_service.py, so scoring reads a single row by
+primary key instead of re-deriving signals. evidence_hash is a content hash
+of the package; the reconcile job compares it against a fresh rebuild to
+find rows that drifted (e.g. after raw SQL writes).
+"""
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, JSON
+from datetime import datetime
+from database import Base
+
+
+class SmeSignalSnapshot(Base):
+    __tablename__ = "sme_signal_snapshots"
+
+    sme_id = Column(Integer, ForeignKey("smes.id", ondelete="CASCADE"), primary_key=True)
+
+    revenue      = Column(Float,   nullable=False)
+    years_active = Column(Integer, nullable=False)
+    industry     = Column(String,  nullable=False)
+
+    total_invoices  = Column(Integer, nullable=False)
+    paid_on_time    = Column(Integer, nullable=False)
+    unpaid_invoices = Column(Integer, nullable=False)
+
+    verifications      = Column(JSON, nullable=False)   # {doc_type: status} of the latest submissions
+    intent_doc_details = Column(JSON, nullable=False)   # {doc_type: {status, loi_counterparty_known}}
+
+    overdraft_count   = Column(Integer, nullable=True)
+    income_regularity = Column(Float,   nullable=True)
+    months_analysed   = Column(Integer, nullable=True)
+
+    province = Column(String, nullable=True)
+    founder  = Column(JSON,   nullable=True)            # FounderSignalInput fields; NULL = no founder profile
+
+    evidence_hash = Column(String(32), nullable=False)
+    updated_at    = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SmeSignalSnapshot(sme_id={self.sme_id}, evidence_hash='{self.evidence_hash}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -13,7 +13,7 @@ class Verification(Base):
     doc_type = Column(String, nullable=False)
     document_url = Column(String, nullable=True)
 
-    status = Column(String, default="pending")
+    status = Column(String, default="pending", index=True)
     submitted_at = Column(DateTime, default=datetime.utcnow)
     reviewed_at = Column(DateTime, nullable=True)
     reviewer_notes = Column(String, nullable=True)
@@ -30,3 +30,6 @@ class Verification(Base):
 
     sme = relationship('SME', back_populates='verifications')
     lender = relationship('Lender', back_populates='verifications')
+
+    # Latest verification per (SME, doc_type) (migration 021)
+    __table_args__ = (Index("ix_verifications_sme_id_doc_type_submitted_at", sme_id, doc_type, submitted_at),)
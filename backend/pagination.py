@@ -0,0 +1,175 @@
+"""
+pagination.py
+
+Keyset (cursor) pagination for list endpoints.
+
+A page is read with WHERE (sort keys) past the previous page's last row,
+ORDER BY the sort keys, LIMIT n + 1. Every page then costs one index range
+scan, however deep the client pages. OFFSET, by contrast, reads and
+discards all the earlier rows. Every sort ends in the primary key, so the
+order is total and pages neither skip nor repeat rows when rows are
+inserted between requests. Sort key columns must not be NULL.
+
+Response bodies stay plain JSON lists, but hold one page: a client that
+needs every row must follow X-Next-Cursor (sme-portal's getAllPages() in
+src/api/client.ts does). The paging metadata travels in headers (exposed to
+the browser via CORS):
+
+  Link: <...?cursor=...>; rel="next"   absent on the last page
+  X-Next-Cursor                        the cursor for the next page
+  X-Total-Count-Estimate               approximate matching rows; first page only
+
+Clients pass ?limit= (default DEFAULT_PAGE_SIZE; larger values are clamped
+to MAX_PAGE_SIZE) and ?cursor= from the previous response. Cursors are
+opaque and tied to the sort they came from.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Sequence
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.exc import CompileError
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+PAGE_HEADERS = ["Link", "X-Next-Cursor", "X-Total-Count-Estimate"]
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    cursor: str | None = None
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description=f"Page size (at most {MAX_PAGE_SIZE})"),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+) -> PageParams:
+    return PageParams(limit=min(limit, MAX_PAGE_SIZE), cursor=cursor)
+
+
+@dataclass
+class Page:
+    items: list
+    next_cursor: str | None = None
+    total_estimate: int | None = None
+
+
+# ── Sort keys and cursors ─────────────────────────────────────────────────────
+
+class Keyset:
+    """
+    An ordered list of (column, descending) sort keys ending in a unique
+    column. Applies cursor filters, ordering and limits to a select() or
+    Query, and turns the rows it returned into a Page.
+    """
+
+    def __init__(self, *keys):
+        self.keys = tuple(k if isinstance(k, tuple) else (k, False) for k in keys)
+        self.signature = ",".join(f"{'-' if desc else ''}{col.key}" for col, desc in self.keys)
+
+    # Cursor encoding
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, datetime):
+            return {"dt": value.isoformat()}
+        if isinstance(value, Decimal):
+            return {"dec": str(value)}
+        return value
+
+    @staticmethod
+    def _decode_value(value):
+        if isinstance(value, dict):
+            if "dt" in value:
+                return datetime.fromisoformat(value["dt"])
+            if "dec" in value:
+                return Decimal(value["dec"])
+        return value
+
+    def encode(self, values: Sequence[Any]) -> str:
+        payload = {"s": self.signature, "k": [self._encode_value(v) for v in values]}
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode(self, cursor: str) -> list:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            values = [self._decode_value(v) for v in payload["k"]]
+            valid = payload["s"] == self.signature and len(values) == len(self.keys)
+        except (ValueError, KeyError, TypeError, binascii.Error):
+            valid = False
+        if not valid or any(v is None for v in values):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        return values
+
+    # Query building
+
+    def _after(self, values: list):
+        """Rows strictly after `values` in this order."""
+        directions = {desc for _, desc in self.keys}
+        columns = [col for col, _ in self.keys]
+        if len(directions) == 1:
+            row, cursor = tuple_(*columns), tuple_(*values)
+            return row < cursor if directions.pop() else row > cursor
+        clauses = []
+        for i, (col, desc) in enumerate(self.keys):
+            equal = [c == v for c, v in zip(columns[:i], values[:i])]
+            clauses.append(and_(*equal, col < values[i] if desc else col > values[i]))
+        return or_(*clauses)
+
+    def apply(self, stmt, params: PageParams):
+        """stmt restricted to the page after params.cursor, in order, with one look-ahead row."""
+        if params.cursor:
+            stmt = stmt.where(self._after(self.decode(params.cursor)))
+        order = [col.desc() if desc else col.asc() for col, desc in self.keys]
+        return stmt.order_by(*order).limit(params.limit + 1)
+
+    def page(self, rows: Sequence, params: PageParams, total_estimate: int | None = None) -> Page:
+        """Page of the first params.limit rows; next_cursor is set when the look-ahead row exists."""
+        rows = list(rows)
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[:params.limit]
+            next_cursor = self.encode([getattr(rows[-1], col.key) for col, _ in self.keys])
+        return Page(items=rows, next_cursor=next_cursor, total_estimate=total_estimate)
+
+
+# ── Totals ────────────────────────────────────────────────────────────────────
+
+def estimate_count(db, stmt) -> int:
+    """
+    Approximate number of rows stmt returns. PostgreSQL: the planner's row
+    estimate, without executing it. Other databases: COUNT(*).
+    db is a sync Session (from an AsyncSession: await db.run_sync(estimate_count, stmt)).
+    """
+    stmt = getattr(stmt, "statement", stmt).order_by(None).limit(None)
+    if db.get_bind().dialect.name == "postgresql":
+        try:
+            sql = str(stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+        except CompileError:
+            sql = None
+        if sql is not None:
+            plan = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql).scalar()
+            return int(plan[0]["Plan"]["Plan Rows"])
+    return db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
+
+
+# ── Response ──────────────────────────────────────────────────────────────────
+
+def set_page_headers(request: Request, response: Response, page: Page) -> None:
+    if page.next_cursor is not None:
+        next_url = request.url.include_query_params(cursor=page.next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.total_estimate is not None:
+        response.headers["X-Total-Count-Estimate"] = str(page.total_estimate)
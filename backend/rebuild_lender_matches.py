@@ -0,0 +1,41 @@
+"""
+rebuild_lender_matches.py
+
+Recomputes sme_match_keys, lender_criteria and every lender's eligible SMEs
+(lender_matches): builds them after migration 024 and repairs drift after
+raw-SQL fixes or bulk imports that bypass the ORM listener. Safe to run at
+any time; emits no "new eligible SME" events and reports how many rows had
+drifted.
+
+Run from backend/:  python rebuild_lender_matches.py
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure backend package modules are importable when running from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from database import SessionLocal
+
+import models  # noqa: F401  (configures every mapper)
+from services.matching_service import rebuild_matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--chunk-size", type=int, default=500, help="SMEs refreshed per query batch")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = rebuild_matches(db, chunk_size=args.chunk_size)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Checked {stats['smes']} SMEs and {stats['lenders']} lenders; "
+          f"{stats['keys_drifted']} match keys and {stats['matches_drifted']} lender matches had drifted.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+rebuild_portfolio_counters.py
+
+Recomputes portfolio_counters from the source tables: builds them after
+migration 022 and repairs drift after raw-SQL fixes or bulk imports that
+bypass the ORM listener. Safe to run at any time; reports how many counters
+had drifted.
+
+Run from backend/:  python rebuild_portfolio_counters.py
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure backend package modules are importable when running from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from database import SessionLocal
+
+import models  # noqa: F401  (configures every mapper)
+from services.portfolio_counter_service import rebuild_counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = rebuild_counters(db)
+        db.commit()
+    finally:
+        db.close()
+    if stats["first_build"]:
+        print(f"Built {stats['counters']} portfolio counters.")
+    else:
+        print(f"Rebuilt {stats['counters']} portfolio counters; {stats['drifted']} had drifted.")
+
+
+if __name__ == "__main__":
+    main()
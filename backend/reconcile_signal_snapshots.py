@@ -0,0 +1,42 @@
+"""
+reconcile_signal_snapshots.py
+
+Rebuilds sme_signal_snapshots rows that are missing or have drifted from the
+source tables (e.g. after raw-SQL fixes or bulk imports that bypass the ORM
+listener), and removes snapshots of deleted SMEs. Safe to run at any time;
+also used to backfill the table after migration 018.
+
+Run from backend/:  python reconcile_signal_snapshots.py [--chunk-size 500]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure backend package modules are importable when running from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from database import SessionLocal
+
+import models  # noqa: F401  (configures every mapper)
+from services.signal_snapshot_service import reconcile_snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = reconcile_snapshots(db, chunk_size=args.chunk_size)
+        db.commit()
+    finally:
+        db.close()
+    print(
+        f"Checked {stats['checked']} SMEs: rebuilt {stats['missing']} missing and "
+        f"{stats['drifted']} drifted snapshots, removed {stats['removed']} orphaned."
+    )
+
+
+if __name__ == "__main__":
+    main()
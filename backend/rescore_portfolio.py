@@ -0,0 +1,54 @@
+"""
+rescore_portfolio.py
+
+Rescores every SME — e.g. after a scoring-strategy or market-data change —
+and writes a new CreditScore row for each. Runs are checkpointed per chunk
+in rescore_runs: rerunning the command resumes an interrupted run where it
+stopped; --restart starts over.
+
+Run from backend/:  python rescore_portfolio.py [--workers N] [--chunk-size 500] [--restart]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure backend package modules are importable when running from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from database import SessionLocal
+
+import models  # noqa: F401  (configures every mapper)
+from services.batch_rescoring_service import rescore_portfolio
+
+
+def _report(run):
+    done = run.scored + run.failed
+    print(
+        f"  run {run.id}: {done}/{run.total_smes} SMEs (through id {run.last_sme_id}), "
+        f"{run.smes_per_second:.0f} SMEs/s",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--workers", type=int, default=None, help="scoring processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="SMEs per chunk (new runs only)")
+    parser.add_argument("--restart", action="store_true", help="abandon any unfinished run and start over")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        run = rescore_portfolio(
+            db, workers=args.workers, chunk_size=args.chunk_size, resume=not args.restart, progress=_report,
+        )
+        print(
+            f"Run {run.id} completed: {run.scored} scored, {run.failed} failed validation, "
+            f"strategy {run.strategy_version}, {run.elapsed_seconds:.1f}s, {run.smes_per_second:.0f} SMEs/s"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,34 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db, engine, async_engine, replica_engine, read_routing
 from models.api_key import APIKey
 from services.auth_service import get_current_user
 from models.user import User
+from services.assessment_cache import assessment_cache
+from services.metrics_service import assessment_metrics, PROMETHEUS_CONTENT_TYPE
+from services.signal_snapshot_service import reconcile_snapshots
+from services.portfolio_counter_service import rebuild_counters
+from services.matching_service import rebuild_matches
+from services.query_stats_service import pool_stats
+from pagination import Keyset, PageParams, estimate_count, page_params, set_page_headers
 
 router = APIRouter(prefix="/admin", tags=["Admin API Keys"])
 
 @router.get("/api-keys")
 def list_api_keys(
+    request: Request,
+    response: Response,
+    is_active: bool | None = None,
+    consumer_type: str | None = None,
+    paging: PageParams = Depends(page_params),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get all generated API keys (Admin only).
+    Get generated API keys, newest first (Admin only).
     """
     if current_user.role != "admin":
         raise HTTPException(
@@ -22,7 +36,17 @@ def list_api_keys(
             detail="Only admins can view API keys"
         )
 
-    keys = db.query(APIKey).order_by(APIKey.created_at.desc()).all()
+    stmt = select(APIKey)
+    if is_active is not None:
+        stmt = stmt.where(APIKey.is_active == is_active)
+    if consumer_type:
+        stmt = stmt.where(APIKey.consumer_type == consumer_type)
+
+    keyset = Keyset((APIKey.created_at, True), (APIKey.id, True))
+    total = estimate_count(db, stmt) if paging.cursor is None else None
+    page = keyset.page(db.scalars(keyset.apply(stmt, paging)).all(), paging, total)
+    set_page_headers(request, response, page)
+    keys = page.items
     return [
         {
             "id": k.id,
@@ -60,3 +84,128 @@ def revoke_api_key(
     key_record.is_active = False
     db.commit()
     return {"message": "API key revoked successfully"}
+
+
+@router.get("/assessment-cache")
+def get_assessment_cache_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Hit/miss counters and occupancy of the assessment result cache (Admin only).
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view cache statistics"
+        )
+    return assessment_cache.stats()
+
+@router.delete("/assessment-cache")
+def invalidate_assessment_cache(
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Drop all cached assessment results (Admin only).
+    Use after changing market tables or scoring strategies out of band.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can invalidate the assessment cache"
+        )
+    assessment_cache.invalidate()
+    return {"message": "Assessment cache invalidated", "stats": assessment_cache.stats()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_assessment_metrics(
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Assessment Engine latency histograms and counters in Prometheus text format (Admin only).
+    Collection is enabled with ASSESSMENT_METRICS_ENABLED=true.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view engine metrics"
+        )
+    return PlainTextResponse(assessment_metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Size, overflow, checked-out connections and checkout wait of the sync, async and replica pools,
+    plus read-routing decisions and replica lag (Admin only).
+    Pool sizing comes from DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_RECYCLE_SECONDS.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view database pool statistics"
+        )
+    stats = {"sync": pool_stats(engine), "async": pool_stats(async_engine.sync_engine)}
+    if replica_engine is not None:
+        stats["replica"] = pool_stats(replica_engine)
+    stats["read_routing"] = read_routing.stats()
+    return stats
+
+
+@router.post("/signal-snapshots/reconcile")
+def reconcile_signal_snapshots(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Rebuild SME signal snapshots that are missing or drifted from the source tables (Admin only).
+    Use after raw-SQL fixes or bulk imports that bypass the ORM.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can reconcile signal snapshots"
+        )
+    stats = reconcile_snapshots(db)
+    db.commit()
+    return stats
+
+
+@router.post("/portfolio-counters/rebuild")
+def rebuild_portfolio_counters(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute the portfolio analytics counters from the source tables (Admin only).
+    Use after migration 022, raw-SQL fixes or bulk imports that bypass the ORM.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can rebuild portfolio counters"
+        )
+    stats = rebuild_counters(db)
+    db.commit()
+    return stats
+
+
+@router.post("/lender-matches/rebuild")
+def rebuild_lender_matches(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute the SME match keys and every lender's eligible SMEs (Admin only).
+    Use after migration 024, raw-SQL fixes or bulk imports that bypass the ORM.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can rebuild lender matches"
+        )
+    stats = rebuild_matches(db)
+    db.commit()
+    return stats
@@ -2,15 +2,17 @@ from datetime import datetime, timezone
 from typing import Literal, Optional, List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_async_db, get_read_db
 from models.sme import SME
-from models.credit_score import CreditScore
 from models.api_key import APIKey
 from services.scoring_service import score_sme
 from services.recommendations_service import generate_plan
 from services.market_data_service import get_market_intelligence
-from services.api_key_service import get_api_key_from_header, generate_api_key
+from services.portfolio_counter_service import platform_stats
+from services.api_key_service import get_api_key_from_header, get_api_key_from_header_async, generate_api_key
 from services.auth_service import get_current_user
 from models.user import User
 
@@ -22,15 +24,15 @@ class KeyGenerateRequest(BaseModel):
     consumer_type: Literal["lender", "government", "corporate", "developer"]
 
 @router.get("/sme/score")
-def get_sme_score(
+async def get_sme_score(
     registration_number: str,
-    api_key: APIKey = Depends(get_api_key_from_header),
-    db: Session = Depends(get_db)
+    api_key: APIKey = Depends(get_api_key_from_header_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submit a company registration number and get back the platform's intelligence on that SME.
     """
-    sme = db.query(SME).filter(SME.cipc_registration_number == registration_number).first()
+    sme = await db.scalar(select(SME).where(SME.cipc_registration_number == registration_number).limit(1))
     if not sme:
         raise HTTPException(
             status_code=404,
@@ -38,8 +40,8 @@ def get_sme_score(
         )
 
 
-    # Call scoring engine
-    result = score_sme(sme, db)
+    # Call scoring engine (sync service code, run on the async session's connection)
+    result = await db.run_sync(lambda session: score_sme(sme, session))
     # Generate recommendations coaching plan
     plan = generate_plan(result.breakdown, result.score)
 
@@ -126,41 +128,12 @@ def get_market_viability(
 @router.get("/platform/stats")
 def get_platform_stats(
     api_key: APIKey = Depends(get_api_key_from_header),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    High-level platform statistics for integration dashboards.
+    High-level platform statistics for integration dashboards (from portfolio_counters).
     """
-    smes_with_scores = db.query(SME).join(CreditScore).all()
-    total_smes_assessed = len(smes_with_scores)
-
-    scores = []
-    for sme in smes_with_scores:
-        if sme.credit_scores:
-            latest_score_obj = max(sme.credit_scores, key=lambda cs: cs.created_at or datetime.min)
-            scores.append(latest_score_obj.score)
-
-    avg_score = round(sum(scores) / len(scores), 1) if scores else 0.0
-
-    approved = sum(1 for s in scores if s >= 75)
-    review = sum(1 for s in scores if s >= 50 and s < 75)
-    declined = sum(1 for s in scores if s < 50)
-
-    distinct_industries = [r[0] for r in db.query(SME.industry).distinct().all() if r[0]]
-    distinct_provinces = [r[0] for r in db.query(SME.province).distinct().all() if r[0]]
-
-    return {
-        "total_smes_assessed": total_smes_assessed,
-        "score_distribution": {
-            "approved": approved,
-            "review": review,
-            "declined": declined
-        },
-        "avg_score": avg_score,
-        "sectors_covered": sorted(distinct_industries),
-        "provinces_covered": sorted(distinct_provinces),
-        "platform_version": "1.0.0"
-    }
+    return platform_stats(db)
 
 @router.post("/keys/generate")
 def generate_new_api_key(
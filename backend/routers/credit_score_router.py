@@ -3,20 +3,25 @@ routers/credit_score_router.py
 
 All endpoints unchanged from the frontend's perspective.
 Internally, every score now flows through core/scoring.py via scoring_service.
+Read endpoints are async def on the async session (database.get_async_db);
+calculate, which writes, stays on the sync session.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 from limiter import limiter
 
-from database import get_db
+from database import get_db, get_async_db, get_async_read_db
 from models.credit_score import CreditScore
 from models.sme import SME
 from models.user import User
-from services.auth_service import get_current_user
+from services.auth_service import get_current_user, get_current_user_async
 from services.scoring_service import score_sme
 from core.scoring import determine_decision
+from pagination import Keyset, PageParams, estimate_count, page_params, set_page_headers
 
 router = APIRouter(prefix="/credit-scores", tags=["Credit Scoring"])
 
@@ -35,6 +40,13 @@ def _get_sme_or_404(sme_id: int, db: Session) -> SME:
     return sme
 
 
+async def check_sme_access_async(current_user: User, sme_id: int, db: AsyncSession):
+    if current_user.role not in {"admin", "lender"}:
+        own_sme_id = await db.scalar(select(SME.id).where(SME.user_id == current_user.id).limit(1))
+        if own_sme_id is None or own_sme_id != sme_id:
+            raise HTTPException(status_code=403, detail="Unauthorized")
+
+
 # ---------- Calculate & persist a new credit score ----------
 @router.post("/calculate/{sme_id}")
 @limiter.limit("5/minute")
@@ -47,7 +59,7 @@ def generate_credit_score(
     check_sme_access(current_user, sme_id, db)
     sme = _get_sme_or_404(sme_id, db)
 
-    result = score_sme(sme, db)
+    result = score_sme(sme, db, explain=False)
 
     new_score = CreditScore(
         sme_id=sme.id,
@@ -68,29 +80,32 @@ def generate_credit_score(
 
 # ---------- Get credit score history ----------
 @router.get("/sme/{sme_id}")
-def get_credit_scores_by_sme(
+async def get_credit_scores_by_sme(
     sme_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    paging: PageParams = Depends(page_params),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    check_sme_access(current_user, sme_id, db)
-    scores = (
-        db.query(CreditScore)
-        .filter(CreditScore.sme_id == sme_id)
-        .order_by(CreditScore.created_at.desc())
-        .all()
-    )
-    return scores  # empty list is fine
+    await check_sme_access_async(current_user, sme_id, db)
+    stmt = select(CreditScore).where(CreditScore.sme_id == sme_id)
+    # Newest first; id breaks ties between scores written in the same instant
+    keyset = Keyset((CreditScore.created_at, True), (CreditScore.id, True))
+    total = await db.run_sync(estimate_count, stmt) if paging.cursor is None else None
+    page = keyset.page((await db.scalars(keyset.apply(stmt, paging))).all(), paging, total)
+    set_page_headers(request, response, page)
+    return page.items  # empty list is fine
 
 
 @router.get("/history/{sme_id}")
-def get_credit_history(
+async def get_credit_history(
     sme_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    check_sme_access(current_user, sme_id, db)
-    scores = db.query(CreditScore).filter(CreditScore.sme_id == sme_id).all()
+    await check_sme_access_async(current_user, sme_id, db)
+    scores = (await db.scalars(select(CreditScore).where(CreditScore.sme_id == sme_id))).all()
     if not scores:
         raise HTTPException(status_code=404, detail="No credit scores found for this SME")
     return scores
@@ -98,61 +113,53 @@ def get_credit_history(
 
 # ---------- Latest score ----------
 @router.get("/latest/{sme_id}")
-def get_latest_credit_score(
+async def get_latest_credit_score(
     sme_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    check_sme_access(current_user, sme_id, db)
-    score = (
-        db.query(CreditScore)
-        .filter(CreditScore.sme_id == sme_id)
-        .order_by(CreditScore.created_at.desc())
-        .first()
-    )
-    if not score:
+    await check_sme_access_async(current_user, sme_id, db)
+    latest = (await db.execute(select(SME.latest_score, SME.latest_score_at).where(SME.id == sme_id))).first()
+    if latest is None or latest.latest_score is None:
         raise HTTPException(status_code=404, detail="No credit score found for this SME")
-    return {"sme_id": sme_id, "latest_score": score.score, "created_at": score.created_at}
+    return {"sme_id": sme_id, "latest_score": latest.latest_score, "created_at": latest.latest_score_at}
 
 
 # ---------- Decision ----------
 @router.get("/decision/{sme_id}")
-def get_credit_decision(
+async def get_credit_decision(
     sme_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    check_sme_access(current_user, sme_id, db)
-    score = (
-        db.query(CreditScore)
-        .filter(CreditScore.sme_id == sme_id)
-        .order_by(CreditScore.created_at.desc())
-        .first()
-    )
-    if not score:
+    await check_sme_access_async(current_user, sme_id, db)
+    latest_score = await db.scalar(select(SME.latest_score).where(SME.id == sme_id))
+    if latest_score is None:
         raise HTTPException(status_code=404, detail="No credit score found for this SME")
     return {
         "sme_id": sme_id,
-        "latest_score": score.score,
-        "decision": determine_decision(score.score),
+        "latest_score": latest_score,
+        "decision": determine_decision(latest_score),
     }
 
 
 # ---------- Score details with full breakdown ----------
 @router.get("/details/{sme_id}")
-def get_credit_score_details(
+async def get_credit_score_details(
     sme_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Returns a live score recalculated from current data plus a full
     per-factor breakdown for explainability. Does NOT persist a new score.
     """
-    check_sme_access(current_user, sme_id, db)
-    sme = _get_sme_or_404(sme_id, db)
+    await check_sme_access_async(current_user, sme_id, db)
+    sme = await db.get(SME, sme_id)
+    if not sme:
+        raise HTTPException(status_code=404, detail="SME not found")
 
-    result = score_sme(sme, db)
+    result = await db.run_sync(lambda session: score_sme(sme, session))
 
     return {
         "sme_id": sme_id,
@@ -86,25 +86,20 @@ def get_pricing_parameters(
     Get the fee rate and advance rate based on the credit score.
     """
     from models.sme import SME
-    from models.credit_score import CreditScore
 
     if current_user.role == "sme":
         sme = db.query(SME).filter(SME.user_id == current_user.id).first()
         if not sme:
             raise HTTPException(status_code=404, detail="SME profile not found")
         target_sme_id = sme.id
+        latest_score = sme.latest_score
     else:
         if sme_id is None:
             raise HTTPException(status_code=400, detail="sme_id is required for non-SME users")
         target_sme_id = sme_id
+        latest_score = db.query(SME.latest_score).filter(SME.id == sme_id).scalar()
 
-    latest_score = (
-        db.query(CreditScore)
-        .filter(CreditScore.sme_id == target_sme_id)
-        .order_by(CreditScore.created_at.desc())
-        .first()
-    )
-    score_value = int(latest_score.score) if latest_score else None
+    score_value = int(latest_score) if latest_score is not None else None
 
     fee_rate = calculate_fee_rate(score_value)
     advance_rate = calculate_eligible_amount(1.0, score_value)
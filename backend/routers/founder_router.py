@@ -19,10 +19,9 @@ from sqlalchemy.orm import Session
 from database import get_db
 from models.user import User
 from models.sme import SME
-from models.credit_score import CreditScore
 from models.founder_profile import FounderProfile
 from services.auth_service import get_current_user
-from services.scoring_service import score_sme
+from services.scoring_service import score_sme, rescore_sme
 
 router = APIRouter(prefix="/founder", tags=["Founder Profile"])
 
@@ -90,9 +89,7 @@ def _apply_fields(fp: FounderProfile, data: FounderProfileIn) -> None:
 
 
 def _recalculate_score(sme: SME, db: Session) -> float:
-    result = score_sme(sme, db)
-    db.add(CreditScore(sme_id=sme.id, score=result.score, created_at=datetime.utcnow()))
-    return result.score
+    return rescore_sme(sme, db).score
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────────────
@@ -1,5 +1,6 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from decimal import Decimal
 
@@ -10,6 +11,8 @@ from models.sme import SME
 from models.user import User
 from services.auth_service import get_current_user
 from services.finance_service import mark_finance_request_paid
+from services.scoring_service import rescore_sme
+from pagination import Keyset, PageParams, estimate_count, page_params, set_page_headers
 
 router = APIRouter(prefix="/invoices", tags=["Invoices"])
 
@@ -89,6 +92,7 @@ def create_invoice(
         status="pending"
     )
     db.add(invoice)
+    rescore_sme(sme, db)
     db.commit()
     db.refresh(invoice)
     # Return the created invoice object so frontend receives full invoice details
@@ -97,19 +101,34 @@ def create_invoice(
 # ---------- Get All Invoices ----------
 @router.get("/")
 def get_all_invoices(
+    request: Request,
+    response: Response,
+    status: str | None = None,
+    sme_id: int | None = None,
+    paging: PageParams = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    stmt = select(Invoice)
     if current_user.role == "sme":
         sme = db.query(SME).filter(SME.user_id == current_user.id).first()
         if not sme:
             raise HTTPException(status_code=404, detail="SME profile not found")
-        return db.query(Invoice).filter(Invoice.sme_id == sme.id).all()
+        stmt = stmt.where(Invoice.sme_id == sme.id)
+    elif current_user.role in {"lender", "admin"}:
+        if sme_id is not None:
+            stmt = stmt.where(Invoice.sme_id == sme_id)
+    else:
+        raise HTTPException(status_code=403, detail="Unauthorized")
 
-    if current_user.role in {"lender", "admin"}:
-        return db.query(Invoice).all()
+    if status:
+        stmt = stmt.where(Invoice.status == status)
 
-    raise HTTPException(status_code=403, detail="Unauthorized")
+    keyset = Keyset(Invoice.id)
+    total = estimate_count(db, stmt) if paging.cursor is None else None
+    page = keyset.page(db.scalars(keyset.apply(stmt, paging)).all(), paging, total)
+    set_page_headers(request, response, page)
+    return page.items
 
 # ---------- Get Invoices by SME ----------
 @router.get("/sme/{sme_id}")
@@ -148,6 +167,7 @@ def update_invoice(
 
     for key, value in request.model_dump(exclude_unset=True).items():
         setattr(invoice, key, value)
+    rescore_sme(sme, db)
     db.commit()
     db.refresh(invoice)
 
@@ -172,6 +192,7 @@ def mark_invoice_paid(
         raise HTTPException(status_code=403, detail="You can only update your own invoices")
 
     invoice.status = "paid"
+    rescore_sme(sme, db)
     db.commit()
     db.refresh(invoice)
 
@@ -195,5 +216,6 @@ def delete_invoice(
         raise HTTPException(status_code=403, detail="You can only delete your own invoices")
 
     db.delete(invoice)
+    rescore_sme(sme, db)
     db.commit()
     return {"message": "Invoice deleted successfully"}
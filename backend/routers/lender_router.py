@@ -1,21 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from decimal import Decimal
 
 from pydantic import BaseModel, ConfigDict, Field
-from database import get_db
+from database import get_db, get_async_db, get_read_db
 from models.user import User
 from models.lender import Lender
-from models.sme import SME
-from models.credit_score import CreditScore
+from models.sme import SME, SCORE_SORT_KEY
 from models.finance_request import FinanceRequest
-from services.auth_service import get_current_user
-from typing import List
-from models.sme_outcome import SmeOutcome
-from models.founder_profile import FounderProfile
-from services.scoring_service import score_sme
-from services.recommendations_service import generate_plan
+from services.auth_service import get_current_user, get_current_user_async
+from typing import List, Literal
 from core.scoring import determine_decision
+from services.query_stats_service import query_budget
+from services.portfolio_counter_service import portfolio_analytics
+from services.matching_service import match_events, top_matches
+from services.intelligence_service import cached_intelligence_bundle, etag_matches, intelligence_fingerprint
+from pagination import Keyset, PageParams, estimate_count, page_params, set_page_headers
 
 router = APIRouter(prefix="/lenders", tags=["Lenders"])
 
@@ -27,6 +29,8 @@ class LenderCreate(BaseModel):
     phone: str | None = None
     max_lending_amount: Decimal = Field(default=Decimal("1000000.00"), ge=0)
     min_credit_score: int = 40
+    sectors: list[str] = []
+    provinces: list[str] = []
 
 class LenderUpdate(BaseModel):
     organization_name: str | None = None
@@ -34,6 +38,8 @@ class LenderUpdate(BaseModel):
     phone: str | None = None
     max_lending_amount: Decimal | None = Field(default=None, ge=0)
     min_credit_score: int | None = None
+    sectors: list[str] | None = None
+    provinces: list[str] | None = None
 
 class LenderResponse(BaseModel):
     id: int
@@ -43,6 +49,8 @@ class LenderResponse(BaseModel):
     phone: str | None
     max_lending_amount: Decimal
     min_credit_score: int
+    sectors: list[str] | None = None
+    provinces: list[str] | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -87,7 +95,9 @@ def register_lender(
         contact_email=request.contact_email,
         phone=request.phone,
         max_lending_amount=request.max_lending_amount,
-        min_credit_score=request.min_credit_score
+        min_credit_score=request.min_credit_score,
+        sectors=request.sectors,
+        provinces=request.provinces
     )
     db.add(new_lender)
     current_user.role = "lender"
@@ -124,239 +134,210 @@ def update_lender_profile(
     db.refresh(lender)
     return lender
 
+AVAILABLE_SME_SORTS = {
+    "id":       SME.id,
+    "score":    SCORE_SORT_KEY.label("score_key"),               # unscored SMEs last (ix_smes_score_sort)
+    "revenue":  SME.revenue,                                     # ix_smes_revenue_id
+    "industry": SME.industry,
+    "province": func.coalesce(SME.province, "").label("province_key"),
+}
+RISK_LEVEL_SCORES = {"High": (None, 40), "Medium": (40, 60), "Low": (60, None)}   # get_risk_level()
+
+
 @router.get("/available-smes")
-def get_available_smes(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+@query_budget(4)
+async def get_available_smes(
+    request: Request,
+    response: Response,
+    industry: str | None = None,
+    province: str | None = None,
+    risk_level: Literal["High", "Medium", "Low"] | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    min_revenue: Decimal | None = None,
+    max_revenue: Decimal | None = None,
+    sort: Literal["id", "score", "revenue", "industry", "province"] = "id",
+    order: Literal["asc", "desc"] | None = Query(None, description="Default: desc for score and revenue"),
+    apply_criteria: bool = Query(True, description="Apply the lender profile's min_credit_score and max_lending_amount"),
+    paging: PageParams = Depends(page_params),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get list of SMEs available for financing (with credit scores)."""
+    """
+    Get a page of SMEs available for financing (with credit scores).
+
+    One query per page: the score is the denormalised smes.latest_score and
+    the pending request counts come from a grouped subquery joined to the
+    page. With a lender profile, SMEs below its min_credit_score are left out
+    (unscored ones too) and only pending requests within its
+    max_lending_amount are counted.
+    """
     if current_user.role != "lender":
         raise HTTPException(status_code=403, detail="Only lenders can view SMEs")
-    
-    smes = db.query(SME).all()
-    result = []
-    
-    for sme in smes:
-        latest_score = (
-            db.query(CreditScore)
-            .filter(CreditScore.sme_id == sme.id)
-            .order_by(CreditScore.created_at.desc())
-            .first()
-        )
-        
-        pending_requests = (
-            db.query(FinanceRequest)
-            .filter(FinanceRequest.sme_id == sme.id, FinanceRequest.status == "pending")
-            .count()
-        )
-        
-        result.append({
-            "sme_id": sme.id,
-            "company_name": sme.name,
-            "industry": sme.industry,
-            "province": sme.province,
-            "revenue": sme.revenue,
-            "credit_score": latest_score.score if latest_score else None,
-            "risk_level": get_risk_level(latest_score.score if latest_score else None),
-            "pending_finance_requests": pending_requests
-        })
-    
-    return result
+
+    lender = None
+    if apply_criteria:
+        lender = await db.scalar(select(Lender).where(Lender.user_id == current_user.id))
+
+    filters = []
+    if industry:
+        filters.append(SME.industry == industry)
+    if province:
+        filters.append(SME.province == province)
+    if risk_level:
+        low, high = RISK_LEVEL_SCORES[risk_level]
+        if low is not None:
+            filters.append(SME.latest_score >= low)
+        if high is not None:
+            filters.append(SME.latest_score < high)
+    if min_score is not None:
+        filters.append(SME.latest_score >= min_score)
+    if max_score is not None:
+        filters.append(SME.latest_score <= max_score)
+    if min_revenue is not None:
+        filters.append(SME.revenue >= min_revenue)
+    if max_revenue is not None:
+        filters.append(SME.revenue <= max_revenue)
+    if lender is not None:
+        filters.append(SME.latest_score >= lender.min_credit_score)
+
+    pending = (
+        select(FinanceRequest.sme_id, func.count(FinanceRequest.id).label("requests"))
+        .where(FinanceRequest.status == "pending")
+    )
+    if lender is not None:
+        pending = pending.where(FinanceRequest.amount_requested <= lender.max_lending_amount)
+    pending = pending.group_by(FinanceRequest.sme_id).subquery()
+
+    sort_key = AVAILABLE_SME_SORTS[sort]
+    descending = (order or ("desc" if sort in ("score", "revenue") else "asc")) == "desc"
+    columns = [SME.id, SME.name, SME.industry, SME.province, SME.revenue, SME.latest_score,
+               func.coalesce(pending.c.requests, 0).label("pending_finance_requests")]
+    if sort == "id":
+        keyset = Keyset((SME.id, descending))
+    else:
+        keyset = Keyset((sort_key, descending), (SME.id, descending))
+        if sort in ("score", "province"):       # computed keys, selected so the cursor can read them
+            columns.append(sort_key)
+    stmt = select(*columns).outerjoin(pending, pending.c.sme_id == SME.id).where(*filters)
+
+    total = await db.run_sync(estimate_count, select(SME.id).where(*filters)) if paging.cursor is None else None
+    page = keyset.page((await db.execute(keyset.apply(stmt, paging))).all(), paging, total)
+    set_page_headers(request, response, page)
+
+    return [
+        {
+            "sme_id": row.id,
+            "company_name": row.name,
+            "industry": row.industry,
+            "province": row.province,
+            "revenue": row.revenue,
+            "credit_score": row.latest_score,
+            "risk_level": get_risk_level(row.latest_score),
+            "pending_finance_requests": row.pending_finance_requests
+        }
+        for row in page.items
+    ]
 
 
 @router.get("/portfolio-analytics")
+@query_budget(6)
 def get_portfolio_analytics(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Retrieve portfolio-wide intelligence analytics."""
+    """Retrieve portfolio-wide intelligence analytics (from portfolio_counters, see portfolio_counter_service)."""
     if current_user.role not in ["lender", "admin"]:
         raise HTTPException(status_code=403, detail="Unauthorized access")
-    
-    # 1. applications
-    total_apps = db.query(FinanceRequest).count()
-    approved_apps = db.query(FinanceRequest).filter(FinanceRequest.status == "approved").count()
-    funded_apps = db.query(FinanceRequest).filter(FinanceRequest.status == "funded").count()
-    pending_apps = db.query(FinanceRequest).filter(FinanceRequest.status == "pending").count()
-    rejected_apps = db.query(FinanceRequest).filter(FinanceRequest.status == "rejected").count()
-
-    # 2. financials
-    financials_query = db.query(FinanceRequest).filter(
-        FinanceRequest.status.in_(["funded", "paid", "closed"])
-    ).all()
-    total_financed = float(sum(r.approved_amount or 0 for r in financials_query))
-    total_fees = float(sum(r.platform_fee or 0 for r in financials_query))
-
-    # 3. scores
-    smes = db.query(SME).all()
-    scores = []
-    distribution = {
-        "Declined (<50)": 0,
-        "Review (50-74)": 0,
-        "Approved (75+)": 0,
-        "Unscored": 0
-    }
-    for s in smes:
-        latest_score = db.query(CreditScore).filter(
-            CreditScore.sme_id == s.id
-        ).order_by(CreditScore.created_at.desc()).first()
-        if latest_score is not None:
-            scores.append(latest_score.score)
-            if latest_score.score < 50:
-                distribution["Declined (<50)"] += 1
-            elif latest_score.score < 75:
-                distribution["Review (50-74)"] += 1
-            else:
-                distribution["Approved (75+)"] += 1
-        else:
-            distribution["Unscored"] += 1
-
-    avg_score = round(sum(scores) / len(scores), 1) if scores else 0.0
-
-    # 4. concentration
-    by_sector = {}
-    by_province = {}
-    for s in smes:
-        sector = s.industry or "Other"
-        by_sector[sector] = by_sector.get(sector, 0) + 1
-        
-        prov = s.province or "Unknown"
-        by_province[prov] = by_province.get(prov, 0) + 1
-
-    # 5. outcomes
-    all_outcomes = db.query(SmeOutcome).all()
-    pending_out = sum(1 for o in all_outcomes if o.outcome_status == "pending")
-    active_out = sum(1 for o in all_outcomes if o.outcome_status == "active")
-    repaid_out = sum(1 for o in all_outcomes if o.outcome_status == "repaid")
-    defaulted_out = sum(1 for o in all_outcomes if o.outcome_status == "defaulted")
-    
-    total_denom = repaid_out + defaulted_out + active_out
-    repayment_rate = round((repaid_out / total_denom) * 100, 1) if total_denom > 0 else None
-
-    return {
-        "applications": {
-            "total": total_apps,
-            "approved": approved_apps,
-            "funded": funded_apps,
-            "pending": pending_apps,
-            "rejected": rejected_apps
-        },
-        "financials": {
-            "total_financed": total_financed,
-            "total_fees": total_fees
-        },
-        "scores": {
-            "average": avg_score,
-            "distribution": distribution
-        },
-        "concentration": {
-            "by_sector": by_sector,
-            "by_province": by_province
-        },
-        "outcomes": {
-            "pending": pending_out,
-            "active": active_out,
-            "repaid": repaid_out,
-            "defaulted": defaulted_out,
-            "repayment_rate": repayment_rate
-        }
-    }
 
-@router.get("/sme-intelligence/{sme_id}")
-def get_sme_intelligence(
-    sme_id: int,
+    return portfolio_analytics(db)
+
+@router.get("/matches")
+@query_budget(5)
+def get_matches(
+    limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Retrieve in-depth credit intelligence for a specific SME."""
-    if current_user.role not in ["lender", "admin"]:
-        raise HTTPException(status_code=403, detail="Unauthorized access")
-
-    sme = db.query(SME).filter(SME.id == sme_id).first()
-    if not sme:
-        raise HTTPException(status_code=404, detail="SME not found")
+    """Top SMEs that fit the current lender's criteria, by score and then confidence (see matching_service)."""
+    if current_user.role != "lender":
+        raise HTTPException(status_code=403, detail="Only lenders can view matches")
+    lender = db.query(Lender).filter(Lender.user_id == current_user.id).first()
+    if not lender:
+        raise HTTPException(status_code=404, detail="Lender profile not found")
 
-    # Call score_sme for the live score and breakdown
-    result = score_sme(sme, db)
-    
-    # Call generate_plan for recommendations and take the first 3
-    plan = generate_plan(result.breakdown, result.score)
-    top_3 = [
+    return [
         {
-            "action": rec.action,
-            "impact_score": rec.impact_score,
-            "difficulty": rec.difficulty
+            "sme_id": row.sme_id,
+            "company_name": row.name,
+            "industry": row.industry,
+            "province": row.province,
+            "credit_score": row.score,
+            "confidence": row.confidence,
+            "risk_level": get_risk_level(row.score),
+            "matched_at": row.matched_at.isoformat() if row.matched_at else None
         }
-        for rec in plan.recommendations[:3]
+        for row in top_matches(db, lender, limit)
     ]
 
-    # Query FounderProfile by sme_id
-    fp = db.query(FounderProfile).filter(FounderProfile.sme_id == sme_id).first()
-    founder_data = None
-    if fp is not None:
-        founder_data = {
-            "years_experience": fp.years_industry_experience,
-            "highest_qualification": fp.highest_qualification,
-            "prior_business_owner": fp.prior_business_owner,
-            "trade_association": fp.trade_association_name,
-            "reference_provided": bool(fp.reference_name) if fp.reference_name else False
-        }
+@router.get("/matches/events")
+@query_budget(3)
+def get_match_events(
+    after_id: int = Query(0, ge=0, description="Id of the last event already seen"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """"New eligible SME" events of the current lender after event after_id, oldest first."""
+    if current_user.role != "lender":
+        raise HTTPException(status_code=403, detail="Only lenders can view matches")
+    lender = db.query(Lender).filter(Lender.user_id == current_user.id).first()
+    if not lender:
+        raise HTTPException(status_code=404, detail="Lender profile not found")
 
-    # Query CreditScore ordered by created_at desc, limit 10
-    history = (
-        db.query(CreditScore)
-        .filter(CreditScore.sme_id == sme_id)
-        .order_by(CreditScore.created_at.desc())
-        .limit(10)
-        .all()
-    )
-    score_history = [
+    return [
         {
-            "score": h.score,
-            "created_at": h.created_at.isoformat()
+            "id": row.id,
+            "sme_id": row.sme_id,
+            "company_name": row.name,
+            "credit_score": row.score,
+            "confidence": row.confidence,
+            "created_at": row.created_at.isoformat()
         }
-        for h in reversed(history)  # Chronological order for Line Chart
+        for row in match_events(db, lender.id, after_id, limit)
     ]
 
-    # Query SmeOutcome by sme_id
-    outcomes_query = db.query(SmeOutcome).filter(SmeOutcome.sme_id == sme_id).all()
-    outcomes_data = [
-        {
-            "id": o.id,
-            "finance_request_id": o.finance_request_id,
-            "outcome_status": o.outcome_status,
-            "score_at_funding": o.score_at_funding,
-            "amount": float(o.amount),
-            "created_at": o.created_at.isoformat()
-        }
-        for o in outcomes_query
-    ]
+@router.get("/sme-intelligence/{sme_id}")
+def get_sme_intelligence(
+    sme_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve in-depth credit intelligence for a specific SME.
+
+    Served from a bundle cached per SME and fingerprint (see
+    intelligence_service); the fingerprint is the strong ETag, and a matching
+    If-None-Match is answered 304 Not Modified without building the bundle.
+    """
+    if current_user.role not in ["lender", "admin"]:
+        raise HTTPException(status_code=403, detail="Unauthorized access")
+
+    fingerprint = intelligence_fingerprint(db, sme_id)
+    if fingerprint is None:
+        raise HTTPException(status_code=404, detail="SME not found")
+    etag = f'"{fingerprint}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
 
-    return {
-        "sme": {
-            "id": sme.id,
-            "name": sme.name,
-            "industry": sme.industry,
-            "province": sme.province,
-            "business_city": sme.business_city,
-            "revenue": float(sme.revenue),
-            "years_active": sme.years_active,
-            "cipc_verified": sme.cipc_verified_at is not None
-        },
-        "score": {
-            "current": result.score,
-            "decision": result.decision,
-            "breakdown": result.breakdown
-        },
-        "founder": founder_data,
-        "recommendations": {
-            "projected_score": plan.projected_score,
-            "projected_decision": plan.projected_decision,
-            "top_3_actions": top_3
-        },
-        "score_history": score_history,
-        "outcomes": outcomes_data
-    }
+    sme = db.query(SME).filter(SME.id == sme_id).first()
+    if not sme:
+        raise HTTPException(status_code=404, detail="SME not found")
+    response.headers.update(headers)
+    return cached_intelligence_bundle(db, sme, fingerprint)
 
 @router.get("/{lender_id}", response_model=LenderResponse)
 def get_lender(lender_id: int, db: Session = Depends(get_db)):
@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
 from pydantic import BaseModel, ConfigDict, Field
 from decimal import Decimal
 from datetime import datetime
 
-from database import get_db
+from database import get_db, get_read_db
 from models.user import User
 from models.sme import SME
 from models.sme_outcome import SmeOutcome
 from services.auth_service import get_current_user
 from services.outcome_service import update_checkin, compute_followed_recommendations
+from services.scoring_service import score_smes
+from services.query_stats_service import query_budget
+from pagination import Keyset, PageParams, estimate_count, page_params, set_page_headers
 
 router = APIRouter(prefix="/outcomes", tags=["Outcomes"])
 
@@ -95,9 +99,10 @@ class OutcomeAnalyticsResponse(BaseModel):
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @router.get("/analytics", response_model=OutcomeAnalyticsResponse)
+@query_budget(2)
 def get_outcome_analytics(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Retrieve platform-wide outcome analytics.
@@ -106,7 +111,8 @@ def get_outcome_analytics(
     if current_user.role not in {"lender", "admin"}:
         raise HTTPException(status_code=403, detail="Not authorized to view analytics")
 
-    outcomes = db.query(SmeOutcome).all()
+    # The sector / province breakdowns read o.sme for every outcome
+    outcomes = db.query(SmeOutcome).options(joinedload(SmeOutcome.sme)).all()
     total = len(outcomes)
 
     if total == 0:
@@ -213,28 +219,47 @@ def get_outcome_analytics(
 
 @router.get("/history", response_model=list[SmeOutcomeResponse])
 def get_outcome_history(
+    request: Request,
+    response: Response,
+    outcome_status: str | None = None,
+    sme_id: int | None = None,
+    paging: PageParams = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Retrieve outcome history.
+    Retrieve outcome history, oldest first, one page at a time.
     - SMEs see their own outcome history.
-    - Lenders and Admins see all outcome records in the system.
+    - Lenders and Admins see all outcome records in the system
+      (optionally for one sme_id).
     """
+    stmt = select(SmeOutcome)
     if current_user.role == "sme":
         sme = db.query(SME).filter(SME.user_id == current_user.id).first()
         if not sme:
             raise HTTPException(status_code=404, detail="SME profile not found")
-        outcomes = db.query(SmeOutcome).filter(SmeOutcome.sme_id == sme.id).all()
+        stmt = stmt.where(SmeOutcome.sme_id == sme.id)
     elif current_user.role in {"lender", "admin"}:
-        outcomes = db.query(SmeOutcome).all()
+        if sme_id is not None:
+            stmt = stmt.where(SmeOutcome.sme_id == sme_id)
     else:
         raise HTTPException(status_code=403, detail="Not authorized to view outcomes")
 
-    # Populate dynamic followed recommendations for each outcome
+    if outcome_status:
+        stmt = stmt.where(SmeOutcome.outcome_status == outcome_status)
+
+    keyset = Keyset(SmeOutcome.id)
+    total = estimate_count(db, stmt) if paging.cursor is None else None
+    page = keyset.page(db.scalars(keyset.apply(stmt, paging)).all(), paging, total)
+    set_page_headers(request, response, page)
+    outcomes = page.items
+
+    # Populate dynamic followed recommendations for each outcome on the page,
+    # scoring every SME involved in one batch
+    scores = dict(score_smes((o.sme_id for o in outcomes), db))
     response_list = []
     for o in outcomes:
-        followed = compute_followed_recommendations(db, o)
+        followed = compute_followed_recommendations(db, o, scores.get(o.sme_id))
         item = SmeOutcomeResponse.model_validate(o)
         item.followed_recommendations = [FollowedRecommendation(**r) for r in followed]
         response_list.append(item)
@@ -1,23 +1,27 @@
 """
 routers/recommendations_router.py
 
-Single endpoint: GET /recommendations/
-Returns a personalised, prioritised action plan for the logged-in SME.
+GET  /recommendations/          — personalised, prioritised action plan for the logged-in SME
+POST /recommendations/simulate  — exact what-if scores over a grid of evidence perturbations
 
 The plan is generated live from the current score breakdown —
 no separate table needed. Every time the SME's data changes and
 they recalculate their score, the recommendations update automatically.
 """
 from __future__ import annotations
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models.user import User
 from models.sme import SME
 from services.auth_service import get_current_user
-from services.scoring_service import score_sme
+from services.scoring_service import score_sme, build_evidence_package
 from services.recommendations_service import RecommendationEngine
+from services.whatif_service import Axis, SimulationCell, document_toggles, simulate, simulate_grid
 
 router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 
@@ -86,3 +90,73 @@ def get_recommendations(
             for rec in plan.recommendations
         ],
     }
+
+
+# ── What-if simulation ────────────────────────────────────────────────────────
+
+class WhatIfAxis(BaseModel):
+    name:   str              # e.g. "revenue_delta", "on_time_rate", "doc:tax_clearance"
+    values: list[Any] = Field(..., min_length=1)
+
+
+class SimulateRequest(BaseModel):
+    sme_id:           int | None = None   # required for lenders / admins; SMEs always simulate their own profile
+    axes:             list[WhatIfAxis] = Field(default_factory=list, max_length=3)
+    toggle_documents: bool = False
+
+
+def _cell_out(cell: SimulationCell) -> dict:
+    return {
+        "values":     cell.values,
+        "score":      cell.score,
+        "decision":   cell.decision,
+        "profile":    cell.profile,
+        "confidence": cell.confidence,
+        "delta":      cell.delta,
+        "errors":     cell.errors or None,
+    }
+
+
+@router.post("/simulate")
+def simulate_recommendations(
+    request: SimulateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Scores a grid of perturbations of the SME's real evidence in one batched pass.
+
+    Example: axes = [{"name": "revenue_delta", "values": [0, 100000, 200000]},
+                     {"name": "on_time_rate",  "values": [0.7, 0.8, 0.9]}]
+    returns 9 cells (last axis varies fastest) plus `grid`, the scores nested by axis.
+    toggle_documents=true adds one cell per scored document, flipping its approval.
+    Every score is an exact Assessment Engine score.
+    """
+    if current_user.role == "sme":
+        sme = db.query(SME).filter(SME.user_id == current_user.id).first()
+        if not sme:
+            raise HTTPException(status_code=404, detail="SME profile not found")
+    elif current_user.role in {"lender", "admin"}:
+        if request.sme_id is None:
+            raise HTTPException(status_code=422, detail="sme_id is required")
+        sme = db.query(SME).filter(SME.id == request.sme_id).first()
+        if not sme:
+            raise HTTPException(status_code=404, detail="SME not found")
+    else:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    pkg = build_evidence_package(sme, db)
+    try:
+        result = simulate_grid(pkg, [Axis(a.name, a.values) for a in request.axes])
+        toggles = simulate(pkg, document_toggles(pkg))[1] if request.toggle_documents else []
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return {
+        "sme_id":   sme.id,
+        "baseline": _cell_out(result.baseline),
+        "axes":     [{"name": a.name, "values": a.values} for a in result.axes],
+        "grid":     result.score_grid() if result.axes else [],
+        "cells":    [_cell_out(c) for c in result.cells],
+        "document_toggles": [_cell_out(c) for c in toggles],
+    }
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from database import get_db, get_async_db
 from decimal import Decimal
 from datetime import datetime
 
@@ -13,9 +15,11 @@ from models.invoice import Invoice
 
 from pydantic import BaseModel, ConfigDict, Field
 from typing import List
-from services.auth_service import get_current_user
+from services.auth_service import get_current_user, get_current_user_async
 from services.scoring_service import score_sme
 from services.finance_service import calculate_eligible_amount
+from services.query_stats_service import query_budget
+from pagination import Keyset, PageParams, estimate_count, page_params, set_page_headers
 
 
 router = APIRouter(
@@ -136,7 +140,7 @@ def create_sme(
     db.add(new_sme)
     db.flush()
 
-    initial_score = score_sme(new_sme, db).score
+    initial_score = score_sme(new_sme, db, explain=False).score
     db.add(
         CreditScore(
             sme_id=new_sme.id,
@@ -152,41 +156,34 @@ def create_sme(
 
 # ✅ Dashboad
 @router.get("/dashboard", response_model=DashboardResponse)
-def sme_dashboard(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+@query_budget(5)   # user, SME, invoices, finance requests, their invoices
+async def sme_dashboard(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    sme = db.query(SME).filter(SME.user_id == current_user.id).first()
+    sme = await db.scalar(select(SME).where(SME.user_id == current_user.id).limit(1))
 
     if not sme:
         raise HTTPException(status_code=404, detail="SME profile not found")
 
-    invoices = (
-        db.query(Invoice)
-        .filter(Invoice.sme_id == sme.id)
+    invoices = (await db.scalars(
+        select(Invoice)
+        .where(Invoice.sme_id == sme.id)
         .order_by(Invoice.created_at.desc())
-        .all()
-    )
-    finance_requests = (
-        db.query(FinanceRequest)
-        .filter(FinanceRequest.sme_id == sme.id)
+    )).all()
+    finance_requests = (await db.scalars(
+        select(FinanceRequest)
+        .where(FinanceRequest.sme_id == sme.id)
         .order_by(FinanceRequest.created_at.desc())
-        .all()
-    )
+        .options(selectinload(FinanceRequest.invoice))   # no lazy loads on an AsyncSession
+    )).all()
 
     outstanding_balance = sum(
         (i.amount for i in invoices if (i.status or "").lower() != "paid"),
         Decimal("0.00"),
     )
 
-    latest_score = (
-        db.query(CreditScore)
-        .filter(CreditScore.sme_id == sme.id)
-        .order_by(CreditScore.created_at.desc())
-        .first()
-    )
-
-    score_value = int(round(latest_score.score)) if latest_score else None
+    score_value = int(round(sme.latest_score)) if sme.latest_score is not None else None
     requested_amount = sum((request.amount_requested for request in finance_requests), Decimal("0.00"))
     approved_amount = sum(
         (request.approved_amount for request in finance_requests if request.approved_amount is not None),
@@ -282,12 +279,12 @@ def sme_dashboard(
             )
         )
 
-    if latest_score:
+    if sme.latest_score is not None:
         activity_items.append(
             DashboardActivityItem(
                 kind="credit_score",
                 text=f"Credit score updated to {score_value}",
-                created_at=latest_score.created_at,
+                created_at=sme.latest_score_at,
             )
         )
 
@@ -317,14 +314,28 @@ def sme_dashboard(
 # ✅ Get all SMEs
 @router.get("/", response_model=List[SMECreated])
 def get_all_smes(
+    request: Request,
+    response: Response,
+    industry: str | None = None,
+    province: str | None = None,
+    paging: PageParams = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in {"admin", "lender"}:
         raise HTTPException(status_code=403, detail="Unauthorized")
 
-    smes = db.query(SME).all()
-    return smes
+    stmt = select(SME)
+    if industry:
+        stmt = stmt.where(SME.industry == industry)
+    if province:
+        stmt = stmt.where(SME.province == province)
+
+    keyset = Keyset(SME.id)
+    total = estimate_count(db, stmt) if paging.cursor is None else None
+    page = keyset.page(db.scalars(keyset.apply(stmt, paging)).all(), paging, total)
+    set_page_headers(request, response, page)
+    return page.items
 
 
 # ✅ Get SME by ID
@@ -16,11 +16,13 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, Request
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, Request, Response
 from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from database import get_db
+from pagination import Keyset, PageParams, estimate_count, page_params, set_page_headers
 from models.lender import Lender
 from models.sme import SME
 from models.user import User
@@ -28,6 +30,7 @@ from models.verification import Verification
 from services.auth_service import get_current_user
 from services.bank_statement_parser import parse_bank_statement
 from services.storage_service import save_uploaded_file
+from services.scoring_service import rescore_sme
 from services import cipc_service
 from limiter import limiter
 
@@ -149,6 +152,15 @@ def _apply_cipc_verification(
     }
 
 
+def _rescore_owner(ver: Verification, db: Session) -> None:
+    """Live re-score of the SME that owns a reviewed verification (lender documents are not scored)."""
+    if ver.sme_id is None:
+        return
+    sme = db.query(SME).filter(SME.id == ver.sme_id).first()
+    if sme:
+        rescore_sme(sme, db)
+
+
 # ── Schemas ───────────────────────────────────────────────────────────────────
 
 class VerificationOut(BaseModel):
@@ -243,6 +255,8 @@ async def submit_verification(
     if ver.id is None:
         db.add(ver)
 
+    if ver.sme_id is not None:
+        rescore_sme(sme, db)
     db.commit()
     db.refresh(ver)
 
@@ -293,12 +307,28 @@ def list_my_verifications(
 
 @router.get("/pending", response_model=List[VerificationOut])
 def list_pending_verifications(
+    request: Request,
+    response: Response,
+    doc_type: Optional[str] = None,
+    sme_id: Optional[int] = None,
+    paging: PageParams = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view pending verifications")
-    return db.query(Verification).filter(Verification.status == "pending").all()
+
+    stmt = select(Verification).where(Verification.status == "pending")
+    if doc_type:
+        stmt = stmt.where(Verification.doc_type == doc_type)
+    if sme_id is not None:
+        stmt = stmt.where(Verification.sme_id == sme_id)
+
+    keyset = Keyset(Verification.id)
+    total = estimate_count(db, stmt) if paging.cursor is None else None
+    page = keyset.page(db.scalars(keyset.apply(stmt, paging)).all(), paging, total)
+    set_page_headers(request, response, page)
+    return page.items
 
 
 @router.put("/approve/{verification_id}", response_model=VerificationOut)
@@ -330,6 +360,7 @@ def approve_verification(
     if ver.doc_type == "letter_of_intent" and payload.loi_counterparty_known is not None:
         ver.loi_counterparty_known = payload.loi_counterparty_known
 
+    _rescore_owner(ver, db)
     db.commit()
     db.refresh(ver)
     return ver
@@ -352,6 +383,7 @@ def reject_verification(
     ver.status         = "rejected"
     ver.reviewed_at    = datetime.utcnow()
     ver.reviewer_notes = payload.reviewer_notes
+    _rescore_owner(ver, db)
     db.commit()
     db.refresh(ver)
     return ver
@@ -29,6 +29,9 @@ from models.verification import Verification
 from models.credit_score import CreditScore
 from models.finance_request import FinanceRequest
 from core.scoring import ScoringInput, calculate_score
+import services.signal_snapshot_service  # noqa: F401  (keeps sme_signal_snapshots current)
+import services.portfolio_counter_service  # noqa: F401  (keeps portfolio_counters current)
+import services.matching_service  # noqa: F401  (keeps lender matches current)
 
 
 db = SessionLocal()
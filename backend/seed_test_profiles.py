@@ -41,6 +41,7 @@ from models.credit_score import CreditScore
 from models.lender import Lender
 from models.finance_request import FinanceRequest
 from core.scoring import ScoringInput, calculate_score
+import services.signal_snapshot_service  # noqa: F401  (keeps sme_signal_snapshots current)
 
 db = SessionLocal()
 
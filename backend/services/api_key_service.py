@@ -1,8 +1,11 @@
 import secrets
 from datetime import datetime
 from fastapi import Header, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from database import get_db
+from starlette.concurrency import run_in_threadpool
+from database import get_db, get_async_db
 from models.api_key import APIKey
 from services.auth_service import pwd_context
 
@@ -39,6 +42,26 @@ def verify_api_key(raw_key: str, db: Session) -> APIKey | None:
             continue
     return None
 
+async def verify_api_key_async(raw_key: str, db: AsyncSession) -> APIKey | None:
+    """
+    verify_api_key() on an AsyncSession. bcrypt verification is CPU-bound,
+    so it runs in the threadpool rather than blocking the event loop.
+    """
+    prefix = raw_key[:12]
+    candidates = (await db.scalars(select(APIKey).where(
+        APIKey.is_active == True,
+        APIKey.key_prefix == prefix
+    ))).all()
+    for key_record in candidates:
+        try:
+            if await run_in_threadpool(pwd_context.verify, raw_key, key_record.key_hash):
+                key_record.last_used_at = datetime.utcnow()
+                await db.commit()
+                return key_record
+        except Exception:
+            continue
+    return None
+
 def get_api_key_from_header(
     api_key: str = Header(..., alias="X-API-Key"),
     db: Session = Depends(get_db)
@@ -54,3 +77,16 @@ def get_api_key_from_header(
             detail="Invalid or inactive API key"
         )
     return key_record
+
+async def get_api_key_from_header_async(
+    api_key: str = Header(..., alias="X-API-Key"),
+    db: AsyncSession = Depends(get_async_db)
+) -> APIKey:
+    """get_api_key_from_header() for async def endpoints."""
+    key_record = await verify_api_key_async(api_key, db)
+    if key_record is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or inactive API key"
+        )
+    return key_record
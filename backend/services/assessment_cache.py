@@ -0,0 +1,195 @@
+"""
+services/assessment_cache.py
+
+Content-addressed cache for Assessment Engine results.
+
+assess() is a pure function of its EvidencePackage and the active
+inference / strategy versions, so results are keyed by a stable hash of
+exactly those inputs. A changed invoice, verification or founder field
+produces a different key — there is nothing to invalidate on writes.
+
+Entries are dropped only by:
+  - size-bounded LRU eviction
+  - TTL expiry
+  - explicit invalidation when market tables or strategies change
+    (wired up via on_market_tables_changed / on_strategies_changed below)
+
+Cached AssessmentResults are shared between callers and must be treated as
+read-only. Hits are reported to the engine's instrumentation hooks as
+cache_hit AssessmentEvents.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Callable
+
+from config import get_settings
+from core.scoring import EvidencePackage
+from core.compact_evidence import CompactEvidencePackage
+from core.assessment_engine import (
+    AssessmentResult,
+    on_strategies_changed,
+)
+import core.assessment_engine as assessment_engine
+from services.market_data_service import on_market_tables_changed
+
+
+def evidence_fingerprint(
+    pkg: EvidencePackage,
+    inference_version: str | None = None,
+    strategy_version: str | None = None,
+) -> str:
+    """
+    Stable content hash of an EvidencePackage plus the engine versions that
+    would score it. Dict ordering does not affect the key.
+    A CompactEvidencePackage contributes its precomputed content hash instead
+    of being serialised again, so it keys differently from the equivalent
+    EvidencePackage.
+    """
+    if isinstance(pkg, CompactEvidencePackage):
+        evidence = pkg.content_hash.hex()
+    else:
+        evidence = asdict(pkg)
+    payload = {
+        "evidence":          evidence,
+        "inference_version": inference_version or assessment_engine.CURRENT_INFERENCE_VERSION,
+        "strategy_version":  strategy_version or assessment_engine.CURRENT_STRATEGY_VERSION,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class AssessmentCache:
+    """
+    Thread-safe LRU + TTL cache of AssessmentResults keyed by evidence_fingerprint().
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, AssessmentResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> AssessmentResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        if assessment_engine.assessment_hooks_active():
+            assessment_engine.emit_assessment_event(assessment_engine.AssessmentEvent(
+                profile=result.profile.value,
+                strategy_version=result.strategy_version,
+                explain=getattr(result, "is_explained", True),
+                validation_warnings=0,
+                cache_hit=True,
+            ))
+        return result
+
+    def put(self, key: str, result: AssessmentResult) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_assess(self, pkg: EvidencePackage, assess_fn: Callable[[EvidencePackage], AssessmentResult]) -> AssessmentResult:
+        """Returns the cached result for pkg, or runs assess_fn(pkg) and caches it."""
+        key = evidence_fingerprint(pkg)
+        result = self.get(key)
+        if result is None:
+            result = assess_fn(pkg)   # ValueError on invalid evidence propagates, nothing cached
+            self.put(key, result)
+        return result
+
+    def invalidate(self) -> None:
+        """Drops every entry (market tables or strategies changed)."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size":          len(self._entries),
+                "maxsize":       self.maxsize,
+                "ttl_seconds":   self.ttl_seconds,
+                "hits":          self.hits,
+                "misses":        self.misses,
+                "hit_rate":      round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions":     self.evictions,
+                "expirations":   self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class LatestEvidenceStore:
+    """
+    Thread-safe LRU of each SME's most recently scored (EvidencePackage, AssessmentResult) —
+    the baseline reassess() diffs against on the invoice / verification / founder write paths.
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, tuple[EvidencePackage, AssessmentResult]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sme_id: int) -> tuple[EvidencePackage, AssessmentResult] | None:
+        with self._lock:
+            entry = self._entries.get(sme_id)
+            if entry is not None:
+                self._entries.move_to_end(sme_id)
+            return entry
+
+    def put(self, sme_id: int, pkg: EvidencePackage, result: AssessmentResult) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[sme_id] = (pkg, result)
+            self._entries.move_to_end(sme_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_settings = get_settings()
+assessment_cache = AssessmentCache(
+    maxsize=_settings.assessment_cache_size,
+    ttl_seconds=_settings.assessment_cache_ttl_seconds,
+)
+
+latest_evidence = LatestEvidenceStore(maxsize=_settings.assessment_cache_size)
+
+for _cache in (assessment_cache, latest_evidence):
+    on_market_tables_changed(_cache.invalidate)
+    on_strategies_changed(_cache.invalidate)
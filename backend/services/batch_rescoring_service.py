@@ -0,0 +1,186 @@
+"""
+services/batch_rescoring_service.py
+
+Portfolio-wide rescoring, e.g. after a strategy or market-data change.
+
+rescore_portfolio() walks the SMEs in id order, chunk_size at a time:
+  1. evidence for a chunk comes from build_evidence_packages() (one snapshot
+     query per chunk),
+  2. packages are shipped as CompactEvidencePackage bytes and scored with
+     the vectorised assess_batch() in a process pool — score_chunk() is the
+     worker — with at most 2 × workers chunks in flight,
+  3. the chunk's CreditScore rows go in with one executemany INSERT, the
+     smes.latest_score_* columns are advanced to match and the run's
+     checkpoint (RescoreRun.last_sme_id) moves past the chunk, all in one
+     transaction.
+
+Because the checkpoint commits with the scores, a crashed run resumes after
+its last written chunk without scoring any SME twice.
+"""
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import bindparam, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from models.sme import SME
+from models.credit_score import CreditScore
+from models.rescore_run import RescoreRun
+from core.assessment_engine import assess_batch
+from core.compact_evidence import CompactEvidencePackage
+from services.scoring_service import EVIDENCE_CHUNK_SIZE, build_evidence_packages
+from services.portfolio_counter_service import counted_sme_changes
+from services.matching_service import refresh_sme_matches
+from services.intelligence_service import bump_data_versions
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+def score_chunk(packages: list[tuple[int, bytes]]) -> tuple[list[tuple[int, float]], list[int], str]:
+    """
+    Process-pool worker: scores one chunk of (sme_id, CompactEvidencePackage.to_bytes())
+    with assess_batch(). Returns ([(sme_id, score)], [sme_id of packages that
+    failed validation], strategy version).
+    """
+    result = assess_batch([CompactEvidencePackage.from_bytes(data) for _, data in packages])
+    scored, failed = [], []
+    for (sme_id, _), score, valid in zip(packages, result.score.tolist(), result.valid.tolist()):
+        if valid:
+            scored.append((sme_id, score))
+        else:
+            failed.append(sme_id)
+    return scored, failed, result.strategy_version
+
+
+# ── Runs and checkpoints ──────────────────────────────────────────────────────
+
+def start_run(db: Session, chunk_size: int = EVIDENCE_CHUNK_SIZE, resume: bool = True) -> RescoreRun:
+    """
+    The run to work on: the latest unfinished run when resume is set,
+    otherwise a new one (unfinished runs are then marked abandoned).
+    """
+    unfinished = db.query(RescoreRun).filter(RescoreRun.status == "running").order_by(RescoreRun.id.desc()).all()
+    if resume and unfinished:
+        return unfinished[0]
+    for run in unfinished:
+        run.status = "abandoned"
+    run = RescoreRun(
+        status="running",
+        chunk_size=chunk_size,
+        total_smes=db.query(func.count(SME.id)).scalar(),
+    )
+    db.add(run)
+    db.commit()
+    return run
+
+
+def _iter_chunks(db: Session, after_id: int, chunk_size: int):
+    """Keyset walk over SME ids greater than after_id, chunk_size ids per query."""
+    while True:
+        chunk = db.execute(
+            select(SME.id).where(SME.id > after_id).order_by(SME.id).limit(chunk_size)
+        ).scalars().all()
+        if not chunk:
+            return
+        yield chunk
+        after_id = chunk[-1]
+
+
+def _write_chunk(db: Session, run: RescoreRun, last_sme_id: int, outcome, elapsed: float) -> None:
+    """Bulk-inserts one chunk's CreditScores and advances the checkpoint, in one transaction."""
+    scored, failed, strategy_version = outcome
+    now = datetime.utcnow()
+    if scored:
+        # Core executemany: no per-row ORM flush, so the latest-score events and the
+        # portfolio counter / matching / data version listeners do not fire —
+        # smes.latest_score_* are advanced here with the same newest-wins rule, the
+        # band moves counted, the lender matches refreshed and the versions bumped
+        # explicitly.
+        inserted = db.execute(
+            insert(CreditScore.__table__).returning(CreditScore.id, CreditScore.sme_id, CreditScore.score),
+            [{"sme_id": sme_id, "score": score, "created_at": now} for sme_id, score in scored],
+        ).all()
+        smes = SME.__table__
+        with counted_sme_changes(db.connection(), [row.sme_id for row in inserted]):
+            db.execute(
+                update(smes)
+                .where(
+                    smes.c.id == bindparam("b_sme_id"),
+                    or_(smes.c.latest_score_at.is_(None), smes.c.latest_score_at <= bindparam("b_created_at")),
+                )
+                .values(
+                    latest_score_id=bindparam("b_score_id"),
+                    latest_score=bindparam("b_score"),
+                    latest_score_at=bindparam("b_created_at"),
+                ),
+                [
+                    {"b_sme_id": row.sme_id, "b_score_id": row.id, "b_score": row.score, "b_created_at": now}
+                    for row in inserted
+                ],
+            )
+        refresh_sme_matches(db.connection(), [row.sme_id for row in inserted])
+        bump_data_versions(db.connection(), [row.sme_id for row in inserted])
+    run.last_sme_id = last_sme_id
+    run.scored += len(scored)
+    run.failed += len(failed)
+    run.strategy_version = strategy_version
+    run.elapsed_seconds = elapsed
+    run.updated_at = now
+    db.commit()
+
+
+def rescore_portfolio(
+    db: Session,
+    workers: int | None = None,
+    chunk_size: int = EVIDENCE_CHUNK_SIZE,
+    resume: bool = True,
+    progress: Callable[[RescoreRun], None] | None = None,
+) -> RescoreRun:
+    """
+    Rescores every SME and returns the completed RescoreRun. progress, if
+    given, is called with the run after each committed chunk.
+    workers=1 scores in-process; the default is one worker per CPU.
+    """
+    workers = workers or os.cpu_count() or 1
+    run = start_run(db, chunk_size, resume)
+    chunk_size = run.chunk_size
+    started = time.perf_counter()
+    elapsed_before = run.elapsed_seconds
+
+    def commit(last_sme_id: int, outcome) -> None:
+        _write_chunk(db, run, last_sme_id, outcome, elapsed_before + time.perf_counter() - started)
+        if progress is not None:
+            progress(run)
+
+    def packages(chunk):
+        return [
+            (sme_id, CompactEvidencePackage.from_package(pkg).to_bytes())
+            for sme_id, pkg in build_evidence_packages(chunk, db, chunk_size)
+        ]
+
+    chunks = _iter_chunks(db, run.last_sme_id, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            commit(chunk[-1], score_chunk(packages(chunk)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append((chunk[-1], pool.submit(score_chunk, packages(chunk))))
+                if len(in_flight) >= 2 * workers:
+                    last_sme_id, future = in_flight.popleft()
+                    commit(last_sme_id, future.result())
+            while in_flight:
+                last_sme_id, future = in_flight.popleft()
+                commit(last_sme_id, future.result())
+
+    run.status = "completed"
+    run.finished_at = datetime.utcnow()
+    db.commit()
+    return run
@@ -5,7 +5,6 @@ from datetime import datetime
 from models.finance_request import FinanceRequest
 from models.sme import SME
 from models.invoice import Invoice
-from models.credit_score import CreditScore
 from models.lender import Lender
 from config import get_settings
 
@@ -83,13 +82,7 @@ def create_finance_request(
         raise ValueError("SME not found")
 
     # Latest credit score — required for both paths
-    latest_score = (
-        db.query(CreditScore)
-        .filter(CreditScore.sme_id == sme_id)
-        .order_by(CreditScore.created_at.desc())
-        .first()
-    )
-    score_value = int(latest_score.score) if latest_score else None
+    score_value = int(sme.latest_score) if sme.latest_score is not None else None
 
     # ── Invoice-backed path ──────────────────────────────────────────────────
     if invoice_id is not None:
@@ -122,7 +115,7 @@ def create_finance_request(
             preferred_payout_date=preferred_payout_date,
             additional_notes=additional_notes,
             status="pending",
-            credit_score_id=latest_score.id if latest_score else None,
+            credit_score_id=sme.latest_score_id,
         )
 
     # ── Pre-invoice path ─────────────────────────────────────────────────────
@@ -161,7 +154,7 @@ def create_finance_request(
             preferred_payout_date=preferred_payout_date,
             additional_notes=additional_notes,
             status="pending",
-            credit_score_id=latest_score.id if latest_score else None,
+            credit_score_id=sme.latest_score_id,
         )
 
     db.add(request)
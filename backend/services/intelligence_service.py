@@ -0,0 +1,257 @@
+"""
+services/intelligence_service.py
+
+The /lenders/sme-intelligence bundle: live score and breakdown, top
+recommendations, founder profile, score history and outcomes of one SME.
+
+Building it runs the assessment engine and four more queries, so finished
+bundles are cached per SME, keyed by a fingerprint of:
+  - smes.data_version, incremented by the after_flush listener below on
+    every write to the SME or its invoices, verifications, founder profile,
+    credit scores or outcomes, in the same transaction
+  - the SME's evidence hash (sme_signal_snapshots)
+  - the engine's inference / strategy versions and a generation counter that
+    moves when market tables or strategies change at runtime
+Reading the fingerprint is one primary-key query. A write therefore moves the
+SME to a new fingerprint in every process, and the stale bundle is never
+served again. The fingerprint doubles as the bundle's strong ETag, so a
+request with a matching If-None-Match is answered 304 without building or
+even looking up the bundle.
+
+The batch rescoring job writes through Core and calls bump_data_versions()
+itself.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from config import get_settings
+import core.assessment_engine as assessment_engine
+from core.assessment_engine import on_strategies_changed
+from models.credit_score import CreditScore
+from models.founder_profile import FounderProfile
+from models.invoice import Invoice
+from models.sme import SME
+from models.sme_outcome import SmeOutcome
+from models.sme_signal_snapshot import SmeSignalSnapshot
+from models.verification import Verification
+from services.market_data_service import on_market_tables_changed
+from services.recommendations_service import generate_plan
+from services.scoring_service import score_sme
+
+# Rows whose writes change an SME's bundle. Any column counts.
+_CHILD_TYPES = (CreditScore, FounderProfile, Invoice, SmeOutcome, Verification)
+
+_smes = SME.__table__
+
+
+# ── Versioning ────────────────────────────────────────────────────────────────
+
+def bump_data_versions(conn, sme_ids) -> None:
+    """Increments smes.data_version of sme_ids on conn (a Session or Connection)."""
+    ids = sorted({i for i in sme_ids if i is not None})
+    if ids:
+        conn.execute(update(_smes).where(_smes.c.id.in_(ids)).values(data_version=_smes.c.data_version + 1))
+
+
+def _written_sme_ids(session: Session) -> set[int]:
+    ids: set[int] = set()
+    changed = [*session.new, *session.deleted]
+    changed += [obj for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    for obj in changed:
+        if isinstance(obj, SME):
+            ids.add(obj.id)
+        elif isinstance(obj, _CHILD_TYPES):
+            # A child row moved between SMEs changes both
+            ids.update([obj.sme_id, *inspect(obj).attrs.sme_id.history.deleted])
+    return ids
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session: Session, flush_context) -> None:
+    ids = _written_sme_ids(session)
+    if ids:
+        bump_data_versions(session.connection(), ids)
+
+
+_engine_generation = 0
+
+
+def _engine_changed() -> None:
+    global _engine_generation
+    _engine_generation += 1
+    intelligence_cache.invalidate()
+
+
+def intelligence_fingerprint(db: Session, sme_id: int) -> str | None:
+    """The fingerprint / ETag value of the SME's current bundle, or None if the SME does not exist."""
+    row = db.execute(
+        select(_smes.c.data_version, SmeSignalSnapshot.evidence_hash)
+        .select_from(_smes)
+        .outerjoin(SmeSignalSnapshot, SmeSignalSnapshot.sme_id == _smes.c.id)
+        .where(_smes.c.id == sme_id)
+    ).first()
+    if row is None:
+        return None
+    parts = (
+        sme_id, row.data_version, row.evidence_hash,
+        assessment_engine.CURRENT_INFERENCE_VERSION, assessment_engine.CURRENT_STRATEGY_VERSION, _engine_generation,
+    )
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True when an If-None-Match header value lists etag (weak comparison, as RFC 9110 specifies) or is *."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag.removeprefix("W/") for tag in candidates]
+
+
+# ── Bundle ────────────────────────────────────────────────────────────────────
+
+def build_intelligence_bundle(sme: SME, db: Session) -> dict:
+    """The /lenders/sme-intelligence response for sme, computed from the source tables."""
+    # Call score_sme for the live score and breakdown
+    result = score_sme(sme, db)
+
+    # Call generate_plan for recommendations and take the first 3
+    plan = generate_plan(result.breakdown, result.score)
+    top_3 = [
+        {
+            "action": rec.action,
+            "impact_score": rec.impact_score,
+            "difficulty": rec.difficulty
+        }
+        for rec in plan.recommendations[:3]
+    ]
+
+    # Query FounderProfile by sme_id
+    fp = db.query(FounderProfile).filter(FounderProfile.sme_id == sme.id).first()
+    founder_data = None
+    if fp is not None:
+        founder_data = {
+            "years_experience": fp.years_industry_experience,
+            "highest_qualification": fp.highest_qualification,
+            "prior_business_owner": fp.prior_business_owner,
+            "trade_association": fp.trade_association_name,
+            "reference_provided": bool(fp.reference_name) if fp.reference_name else False
+        }
+
+    # Query CreditScore ordered by created_at desc, limit 10
+    history = (
+        db.query(CreditScore)
+        .filter(CreditScore.sme_id == sme.id)
+        .order_by(CreditScore.created_at.desc())
+        .limit(10)
+        .all()
+    )
+    score_history = [
+        {
+            "score": h.score,
+            "created_at": h.created_at.isoformat()
+        }
+        for h in reversed(history)  # Chronological order for Line Chart
+    ]
+
+    # Query SmeOutcome by sme_id
+    outcomes_query = db.query(SmeOutcome).filter(SmeOutcome.sme_id == sme.id).all()
+    outcomes_data = [
+        {
+            "id": o.id,
+            "finance_request_id": o.finance_request_id,
+            "outcome_status": o.outcome_status,
+            "score_at_funding": o.score_at_funding,
+            "amount": float(o.amount),
+            "created_at": o.created_at.isoformat()
+        }
+        for o in outcomes_query
+    ]
+
+    return {
+        "sme": {
+            "id": sme.id,
+            "name": sme.name,
+            "industry": sme.industry,
+            "province": sme.province,
+            "business_city": sme.business_city,
+            "revenue": float(sme.revenue),
+            "years_active": sme.years_active,
+            "cipc_verified": sme.cipc_verified_at is not None
+        },
+        "score": {
+            "current": result.score,
+            "decision": result.decision,
+            "breakdown": result.breakdown
+        },
+        "founder": founder_data,
+        "recommendations": {
+            "projected_score": plan.projected_score,
+            "projected_decision": plan.projected_decision,
+            "top_3_actions": top_3
+        },
+        "score_history": score_history,
+        "outcomes": outcomes_data
+    }
+
+
+class IntelligenceCache:
+    """
+    Thread-safe LRU of each SME's latest bundle and the fingerprint it was
+    built for. A lookup with any other fingerprint misses. Cached bundles are
+    shared and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, tuple[str, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sme_id: int, fingerprint: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(sme_id)
+            if entry is None or entry[0] != fingerprint:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(sme_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, sme_id: int, fingerprint: str, bundle: dict) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[sme_id] = (fingerprint, bundle)
+            self._entries.move_to_end(sme_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+intelligence_cache = IntelligenceCache(maxsize=get_settings().intelligence_cache_size)
+
+on_market_tables_changed(_engine_changed)
+on_strategies_changed(_engine_changed)
+
+
+def cached_intelligence_bundle(db: Session, sme: SME, fingerprint: str) -> dict:
+    """The bundle for fingerprint from the cache, or build_intelligence_bundle() cached under it."""
+    bundle = intelligence_cache.get(sme.id, fingerprint)
+    if bundle is None:
+        bundle = build_intelligence_bundle(sme, db)
+        intelligence_cache.put(sme.id, fingerprint, bundle)
+    return bundle
@@ -20,6 +20,9 @@ Two outputs:
 
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Callable, NamedTuple
+
 
 # ── Sector survival rates ─────────────────────────────────────────────────────
 # Based on: SEDA SME Quarterly Update 2023, World Bank IFC Doing Business 2024
@@ -129,20 +132,61 @@ def province_market_score(province: str, industry: str) -> float:
     return min(base * adjustment, 1.0)
 
 
-def get_market_intelligence(industry: str, province: str | None) -> dict:
+class MarketSignals(NamedTuple):
+    sector_survival_rate:  float
+    province_market_score: float | None
+    survival_label:        str
+    market_label:          str
+
+
+@lru_cache(maxsize=1024)
+def market_signals(industry: str, province: str | None) -> MarketSignals:
     """
-    Returns a combined dict of market signals for use in scoring and explainability.
+    Memoised survival / market lookup shared by both scoring paths.
+    The tables are static; call market_tables_changed() after editing them at runtime.
     """
     survival = sector_survival_score(industry)
     market = province_market_score(province or "", industry) if province else None
+    return MarketSignals(
+        sector_survival_rate=survival,
+        province_market_score=market,
+        survival_label=_survival_label(survival),
+        market_label=_market_label(market) if market is not None else "Province not specified",
+    )
+
+
+_table_listeners: list[Callable[[], None]] = []
+
+
+def on_market_tables_changed(listener: Callable[[], None]) -> None:
+    """Registers a callback fired by market_tables_changed() (e.g. to drop cached assessments)."""
+    _table_listeners.append(listener)
+
+
+def market_tables_changed() -> None:
+    """
+    Call after editing SECTOR_SURVIVAL_RATES / PROVINCE_ECONOMIC_INDEX /
+    INDUSTRY_PROVINCE_ADJUSTMENTS at runtime. Clears memoised lookups and
+    notifies listeners.
+    """
+    market_signals.cache_clear()
+    for listener in _table_listeners:
+        listener()
+
+
+def get_market_intelligence(industry: str, province: str | None) -> dict:
+    """
+    Returns a combined dict of market signals for use in scoring and explainability.
+    """
+    signals = market_signals(industry, province)
 
     return {
-        "sector_survival_rate":  survival,
-        "province_market_score": market,
+        "sector_survival_rate":  signals.sector_survival_rate,
+        "province_market_score": signals.province_market_score,
         "province":              province,
         "industry":              industry,
-        "survival_label":        _survival_label(survival),
-        "market_label":          _market_label(market) if market is not None else "Province not specified",
+        "survival_label":        signals.survival_label,
+        "market_label":          signals.market_label,
     }
 
 
@@ -0,0 +1,524 @@
+"""
+services/matching_service.py
+
+Precomputed SME–lender eligibility for /lenders/matches.
+
+An SME fits a lender when its latest score is at least the lender's
+min_credit_score, its pending finance requests together ask for no more
+than max_lending_amount, and its sector and province are among the lender's
+sectors / provinces (empty or NULL accepts any). Unscored SMEs fit no lender.
+
+The result lives in the tables of models/lender_match.py:
+  sme_match_keys   the inverted index — score band, sector and province of
+                   every scored SME, each with its own index, so a lender's
+                   eligible set is an index lookup instead of a pass over
+                   every SME
+  lender_criteria  the same for lenders: the sectors and provinces each one
+                   accepts, so an SME's eligible lenders are one join instead
+                   of a pass over every lender
+  lender_matches   each lender's eligible set, ranked by score and confidence
+
+Writes: an after_flush listener on every Session refreshes the keys of the
+SMEs the flush touched (latest score, sector, province, pending requests, or
+the verifications / founder profile behind the confidence) and looks up the
+lenders of only the SMEs whose keys changed. A lender that registers or
+changes its criteria has its criteria rows rewritten and its set recomputed
+from the index. Pairs that stay eligible keep their matched_at.
+Both run on the flush's connection, so matches commit or roll back with the
+write that caused them. When an SME change moves it into a lender's set, a
+"new eligible SME" row is added to lender_match_events; lenders poll
+/lenders/matches/events for them.
+
+The batch rescoring job writes through Core and calls refresh_sme_matches()
+itself. Writes that bypass both (raw SQL, bulk imports, data fixes) are
+repaired by rebuild_matches(). Until a first rebuild has run (migration 024
+creates the tables empty), /lenders/matches computes matches from the source
+tables instead.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, bindparam, delete, event, func, insert, inspect, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from core.assessment_engine import ConfidenceCalculator
+from models.credit_score import CreditScore
+from models.finance_request import FinanceRequest
+from models.founder_profile import FounderProfile
+from models.lender import Lender
+from models.lender_match import LenderCriterion, LenderMatch, LenderMatchBuild, LenderMatchEvent, SmeMatchKey
+from models.sme import SME
+from models.verification import Verification
+# Imported for its after_flush listener, which must run first: confidences are read from the
+# packages it rebuilt or the snapshots it wrote
+from services.signal_snapshot_service import flushed_packages, load_snapshots
+
+MATCH_BAND_WIDTH = 10
+ANY_VALUE = "*"     # lender_criteria value of a lender that accepts any sector / province
+
+# Columns whose changes can move an SME in or out of a lender's set. New and deleted rows always count.
+TRACKED_ATTRIBUTES: dict[type, frozenset[str]] = {
+    SME:            frozenset({"latest_score", "industry", "province", "bs_months_analysed"}),
+    CreditScore:    frozenset({"sme_id", "score", "created_at"}),     # via smes.latest_score
+    FinanceRequest: frozenset({"sme_id", "status", "amount_requested"}),
+    Verification:   frozenset({"sme_id", "doc_type", "status"}),      # confidence
+    FounderProfile: frozenset({"sme_id"}),                            # confidence
+}
+_TRACKED_TYPES = tuple(TRACKED_ATTRIBUTES)
+CRITERIA_ATTRIBUTES = frozenset({"min_credit_score", "max_lending_amount", "sectors", "provinces"})
+
+_keys = SmeMatchKey.__table__
+_criteria_rows = LenderCriterion.__table__
+_matches = LenderMatch.__table__
+_events = LenderMatchEvent.__table__
+_builds = LenderMatchBuild.__table__
+
+
+def score_band(score: float) -> int:
+    return int(score // MATCH_BAND_WIDTH)
+
+
+def _amount(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+
+@dataclass(frozen=True)
+class Criteria:
+    """A lender's eligibility criteria, as filters on sme_match_keys (where) and lender_criteria rows."""
+    lender_id: int
+    min_score: float
+    max_amount: Decimal | None
+    sectors: frozenset[str]
+    provinces: frozenset[str]
+
+    @classmethod
+    def of(cls, lender) -> Criteria:
+        return cls(
+            lender_id=lender.id,
+            min_score=float(lender.min_credit_score or 0),
+            max_amount=_amount(lender.max_lending_amount) if lender.max_lending_amount is not None else None,
+            sectors=frozenset(lender.sectors or ()),
+            provinces=frozenset(lender.provinces or ()),
+        )
+
+    def where(self) -> list:
+        """The criteria as filters on sme_match_keys; the band bound lets the index narrow the scores."""
+        clauses = [_keys.c.score_band >= score_band(self.min_score), _keys.c.score >= self.min_score]
+        if self.max_amount is not None:
+            clauses.append(_keys.c.requested_amount <= self.max_amount)
+        if self.sectors:
+            clauses.append(_keys.c.sector.in_(sorted(self.sectors)))
+        if self.provinces:
+            clauses.append(_keys.c.province.in_(sorted(self.provinces)))
+        return clauses
+
+    def criterion_rows(self) -> list[dict]:
+        return [
+            {"field": field, "value": value, "lender_id": self.lender_id}
+            for field, values in (("sector", self.sectors), ("province", self.provinces))
+            for value in (sorted(values) or [ANY_VALUE])
+        ]
+
+
+def _criteria(conn, lender_ids=None) -> list[Criteria]:
+    stmt = select(Lender.id, Lender.min_credit_score, Lender.max_lending_amount, Lender.sectors, Lender.provinces)
+    if lender_ids is not None:
+        stmt = stmt.where(Lender.id.in_(list(lender_ids)))
+    return [Criteria.of(row) for row in conn.execute(stmt)]
+
+
+# ── SME side ──────────────────────────────────────────────────────────────────
+
+def _packages(conn, sme_ids: list[int], packages=None) -> dict:
+    """{sme_id: EvidencePackage} of sme_ids: from packages where given, else the snapshots, else the source tables."""
+    found = {i: packages[i] for i in sme_ids if packages and i in packages}
+    unread = [i for i in sme_ids if i not in found]
+    if unread:
+        found.update(load_snapshots(unread, conn))
+    missing = [i for i in sme_ids if i not in found]
+    if missing:
+        from services.scoring_service import build_evidence_packages
+        found.update(build_evidence_packages(missing, conn, use_snapshots=False))
+    return found
+
+
+def _key_values(conn, sme_ids, packages=None) -> dict[int, dict]:
+    """
+    {sme_id: sme_match_keys row} computed from the source tables, for the
+    scored SMEs among sme_ids. packages ({sme_id: EvidencePackage}, e.g. those
+    the snapshot listener just rebuilt) spare those SMEs the snapshot read.
+    """
+    ids = list(sme_ids)
+    asked = (
+        select(FinanceRequest.sme_id, func.sum(FinanceRequest.amount_requested).label("asked"))
+        .where(FinanceRequest.status == "pending", FinanceRequest.sme_id.in_(ids))
+        .group_by(FinanceRequest.sme_id)
+        .subquery()
+    )
+    rows = conn.execute(
+        select(SME.id, SME.latest_score, SME.industry, SME.province, func.coalesce(asked.c.asked, 0).label("asked"))
+        .outerjoin(asked, asked.c.sme_id == SME.id)
+        .where(SME.id.in_(ids), SME.latest_score.is_not(None))
+    ).all()
+    if not rows:
+        return {}
+
+    packages = _packages(conn, [row.id for row in rows], packages)
+    now = datetime.utcnow()
+    return {
+        row.id: {
+            "sme_id":           row.id,
+            "score_band":       score_band(row.latest_score),
+            "sector":           row.industry or "",
+            "province":         row.province,
+            "score":            row.latest_score,
+            "confidence":       ConfidenceCalculator.calculate(packages[row.id]),
+            "requested_amount": _amount(row.asked),
+            "updated_at":       now,
+        }
+        for row in rows
+    }
+
+
+def _same_key(stored, computed: dict | None) -> bool:
+    if stored is None or computed is None:
+        return stored is None and computed is None
+    return (
+        (stored.score_band, stored.sector, stored.province, stored.score, stored.confidence)
+        == (computed["score_band"], computed["sector"], computed["province"], computed["score"],
+            computed["confidence"])
+        and _amount(stored.requested_amount) == computed["requested_amount"]
+    )
+
+
+def refresh_sme_matches(conn, sme_ids, removed_ids=(), emit_events: bool = True, packages=None) -> dict:
+    """
+    Brings the keys and lender matches of sme_ids up to date and drops those of
+    removed_ids. conn is a Session or Connection; the caller's transaction
+    commits the result. With emit_events, every (lender, SME) pair that became
+    eligible is recorded in lender_match_events. packages are current
+    EvidencePackages of some of the SMEs (see _key_values). Returns counts.
+    """
+    stats = {"keys_changed": 0, "matched": 0, "unmatched": 0, "events": 0}
+    removed = set(removed_ids)
+    if removed:
+        conn.execute(delete(_events).where(_events.c.sme_id.in_(removed)))
+        conn.execute(delete(_matches).where(_matches.c.sme_id.in_(removed)))
+        conn.execute(delete(_keys).where(_keys.c.sme_id.in_(removed)))
+    ids = set(sme_ids) - removed
+    if not ids:
+        return stats
+
+    computed = _key_values(conn, ids, packages)
+    stored = {row.sme_id: row for row in conn.execute(select(_keys).where(_keys.c.sme_id.in_(ids)))}
+    changed = sorted(i for i in ids if not _same_key(stored.get(i), computed.get(i)))
+    if not changed:
+        return stats
+    stats["keys_changed"] = len(changed)
+    conn.execute(delete(_keys).where(_keys.c.sme_id.in_(changed)))
+    rows = [computed[i] for i in changed if i in computed]
+    if rows:
+        conn.execute(insert(_keys), rows)
+
+    current = {
+        (row.lender_id, row.sme_id): (row.score, row.confidence)
+        for row in conn.execute(
+            select(_matches.c.lender_id, _matches.c.sme_id, _matches.c.score, _matches.c.confidence)
+            .where(_matches.c.sme_id.in_(changed))
+        )
+    }
+    eligible = _eligible_lenders(conn, [row["sme_id"] for row in rows]) if rows else set()
+    left = sorted(current.keys() - eligible)
+    if left:
+        conn.execute(delete(_matches).where(tuple_(_matches.c.lender_id, _matches.c.sme_id).in_(left)))
+    # Pairs that stay eligible keep their row and matched_at; only a new score / confidence is written
+    rescored = sorted({
+        sme_id for (lender_id, sme_id), ranking in current.items()
+        if (lender_id, sme_id) in eligible
+        and ranking != (computed[sme_id]["score"], computed[sme_id]["confidence"])
+    })
+    if rescored:
+        conn.execute(
+            update(_matches)
+            .where(_matches.c.sme_id == bindparam("b_sme_id"))
+            .values(score=bindparam("b_score"), confidence=bindparam("b_confidence")),
+            [{"b_sme_id": i, "b_score": computed[i]["score"], "b_confidence": computed[i]["confidence"]}
+             for i in rescored],
+        )
+    entered = sorted(eligible - current.keys())
+    now = datetime.utcnow()
+    if entered:
+        conn.execute(insert(_matches), [
+            {"lender_id": lender_id, "sme_id": sme_id, "score": computed[sme_id]["score"],
+             "confidence": computed[sme_id]["confidence"], "matched_at": now}
+            for lender_id, sme_id in entered
+        ])
+    stats["matched"], stats["unmatched"] = len(entered), len(left)
+    if emit_events and entered:
+        conn.execute(insert(_events), [
+            {"lender_id": lender_id, "sme_id": sme_id, "score": computed[sme_id]["score"],
+             "confidence": computed[sme_id]["confidence"], "created_at": now}
+            for lender_id, sme_id in entered
+        ])
+        stats["events"] = len(entered)
+    return stats
+
+
+def _eligible_lenders(conn, sme_ids) -> set[tuple[int, int]]:
+    """
+    (lender_id, sme_id) for every lender whose criteria the keyed SMEs among
+    sme_ids meet, in one query: lender_criteria narrows the lenders by sector
+    and province before their score and amount limits are checked.
+    """
+    sector = _criteria_rows.alias("sector_criteria")
+    province = _criteria_rows.alias("province_criteria")
+    return {
+        (row.lender_id, row.sme_id)
+        for row in conn.execute(
+            select(sector.c.lender_id, _keys.c.sme_id)
+            .select_from(_keys)
+            .join(sector, and_(sector.c.field == "sector", sector.c.value.in_([_keys.c.sector, ANY_VALUE])))
+            .join(province, and_(
+                province.c.field == "province", province.c.value.in_([_keys.c.province, ANY_VALUE]),
+                province.c.lender_id == sector.c.lender_id,
+            ))
+            .join(Lender, Lender.id == sector.c.lender_id)
+            .where(
+                _keys.c.sme_id.in_(list(sme_ids)),
+                func.coalesce(Lender.min_credit_score, 0) <= _keys.c.score,
+                or_(Lender.max_lending_amount.is_(None), _keys.c.requested_amount <= Lender.max_lending_amount),
+            )
+        )
+    }
+
+
+# ── Lender side ───────────────────────────────────────────────────────────────
+
+def write_lender_criteria(conn, lender_ids, removed_ids=()) -> list[Criteria]:
+    """Rewrites the lender_criteria rows of lender_ids and drops those of removed_ids; returns their Criteria."""
+    removed = set(removed_ids)
+    if removed:
+        conn.execute(delete(_criteria_rows).where(_criteria_rows.c.lender_id.in_(removed)))
+    lenders = _criteria(conn, set(lender_ids) - removed)
+    if lenders:
+        conn.execute(delete(_criteria_rows).where(_criteria_rows.c.lender_id.in_([c.lender_id for c in lenders])))
+        conn.execute(insert(_criteria_rows), [row for lender in lenders for row in lender.criterion_rows()])
+    return lenders
+
+
+def refresh_lender_matches(conn, lender_ids, removed_ids=(), lenders: list[Criteria] | None = None) -> int:
+    """
+    Recomputes the eligible sets of lender_ids from sme_match_keys and drops the
+    rows of removed_ids. Their lender_criteria rows are rewritten first, unless
+    lenders (the result of write_lender_criteria() for the same ids) says that
+    already happened. Returns the number of matches added, removed or re-ranked.
+    """
+    removed = set(removed_ids)
+    if removed:
+        conn.execute(delete(_events).where(_events.c.lender_id.in_(removed)))
+        conn.execute(delete(_matches).where(_matches.c.lender_id.in_(removed)))
+    if lenders is None:
+        lenders = write_lender_criteria(conn, lender_ids, removed)
+    changes = 0
+    for lender in lenders:
+        eligible = {
+            row.sme_id: (row.score, row.confidence)
+            for row in conn.execute(select(_keys.c.sme_id, _keys.c.score, _keys.c.confidence).where(*lender.where()))
+        }
+        current = {
+            row.sme_id: (row.score, row.confidence)
+            for row in conn.execute(
+                select(_matches.c.sme_id, _matches.c.score, _matches.c.confidence)
+                .where(_matches.c.lender_id == lender.lender_id)
+            )
+        }
+        left = sorted(current.keys() - eligible.keys())
+        entered = sorted(eligible.keys() - current.keys())
+        rescored = sorted(i for i in current.keys() & eligible.keys() if current[i] != eligible[i])
+        if left:
+            conn.execute(delete(_matches).where(_matches.c.lender_id == lender.lender_id, _matches.c.sme_id.in_(left)))
+        if rescored:
+            conn.execute(
+                update(_matches)
+                .where(_matches.c.lender_id == lender.lender_id, _matches.c.sme_id == bindparam("b_sme_id"))
+                .values(score=bindparam("b_score"), confidence=bindparam("b_confidence")),
+                [{"b_sme_id": i, "b_score": eligible[i][0], "b_confidence": eligible[i][1]} for i in rescored],
+            )
+        if entered:
+            now = datetime.utcnow()
+            conn.execute(insert(_matches), [
+                {"lender_id": lender.lender_id, "sme_id": i, "score": eligible[i][0], "confidence": eligible[i][1],
+                 "matched_at": now}
+                for i in entered
+            ])
+        changes += len(left) + len(entered) + len(rescored)
+    return changes
+
+
+# ── Session listener ──────────────────────────────────────────────────────────
+
+def _affected(session: Session) -> tuple[set[int], set[int], set[int], set[int]]:
+    """(SME ids to refresh, deleted SME ids, lender ids to recompute, deleted lender ids) of a flush."""
+    smes: set[int] = set()
+    removed_smes: set[int] = set()
+    lenders: set[int] = set()
+    removed_lenders: set[int] = set()
+
+    def owners(obj, state) -> list:
+        if isinstance(obj, SME):
+            return [obj.id]
+        return [obj.sme_id, *state.attrs.sme_id.history.deleted]
+
+    for obj in session.new:
+        if isinstance(obj, _TRACKED_TYPES):
+            smes.update(owners(obj, inspect(obj)))
+        elif isinstance(obj, Lender):
+            lenders.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, SME):
+            removed_smes.add(obj.id)
+        elif isinstance(obj, _TRACKED_TYPES):
+            smes.update(owners(obj, inspect(obj)))
+        elif isinstance(obj, Lender):
+            removed_lenders.add(obj.id)
+    for obj in session.dirty:
+        state = inspect(obj)
+        if isinstance(obj, _TRACKED_TYPES):
+            if any(state.attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES[type(obj)]):
+                smes.update(owners(obj, state))
+        elif isinstance(obj, Lender):
+            if any(state.attrs[name].history.has_changes() for name in CRITERIA_ATTRIBUTES):
+                lenders.add(obj.id)
+
+    smes.discard(None)
+    return smes - removed_smes, removed_smes, lenders - removed_lenders, removed_lenders
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_after_flush(session: Session, flush_context) -> None:
+    smes, removed_smes, lenders, removed_lenders = _affected(session)
+    criteria = None
+    if lenders or removed_lenders:
+        # Before the SME side, which looks lenders up through lender_criteria
+        criteria = write_lender_criteria(session.connection(), lenders, removed_lenders)
+    if smes or removed_smes:
+        refresh_sme_matches(session.connection(), smes, removed_smes, packages=flushed_packages(session))
+    if criteria is not None:
+        refresh_lender_matches(session.connection(), lenders, removed_lenders, criteria)
+
+
+# ── Reads ─────────────────────────────────────────────────────────────────────
+
+def matches_built(db: Session) -> bool:
+    """True once rebuild_matches() has run (or migration 024 found nothing to build)."""
+    return db.execute(select(_builds.c.id).limit(1)).first() is not None
+
+
+def top_matches(db: Session, lender, limit: int) -> list:
+    """
+    The lender's `limit` best matches, by score and then confidence, with their
+    SMEs' names and locations. Read from lender_matches, or computed from the
+    source tables (with matched_at None) before the first rebuild.
+    """
+    if not matches_built(db):
+        return _computed_matches(db, Criteria.of(lender), limit)
+    return db.execute(
+        select(_matches.c.sme_id, SME.name, SME.industry, SME.province, _matches.c.score, _matches.c.confidence,
+               _matches.c.matched_at)
+        .join(SME, SME.id == _matches.c.sme_id)
+        .where(_matches.c.lender_id == lender.id)
+        .order_by(_matches.c.score.desc(), _matches.c.confidence.desc(), _matches.c.sme_id)
+        .limit(limit)
+    ).all()
+
+
+@dataclass(frozen=True)
+class _ComputedMatch:
+    sme_id: int
+    name: str
+    industry: str | None
+    province: str | None
+    score: float
+    confidence: float
+    matched_at: datetime | None = None
+
+
+def _computed_matches(db: Session, lender: Criteria, limit: int) -> list[_ComputedMatch]:
+    """
+    top_matches() without the index: the SMEs meeting the criteria with the
+    `limit` highest scores (and every SME tied with the last of them) in one
+    query, ranked by the confidence of their snapshots.
+    """
+    asked = (
+        select(FinanceRequest.sme_id, func.sum(FinanceRequest.amount_requested).label("asked"))
+        .where(FinanceRequest.status == "pending")
+        .group_by(FinanceRequest.sme_id)
+        .subquery()
+    )
+    where = [SME.latest_score.is_not(None), SME.latest_score >= lender.min_score]
+    if lender.max_amount is not None:
+        where.append(func.coalesce(asked.c.asked, 0) <= lender.max_amount)
+    if lender.sectors:
+        where.append(func.coalesce(SME.industry, "").in_(sorted(lender.sectors)))
+    if lender.provinces:
+        where.append(SME.province.in_(sorted(lender.provinces)))
+
+    def eligible(*columns):
+        return select(*columns).outerjoin(asked, asked.c.sme_id == SME.id).where(*where)
+
+    cutoff = eligible(SME.latest_score).order_by(SME.latest_score.desc()).offset(limit - 1).limit(1)
+    rows = db.execute(
+        eligible(SME.id, SME.name, SME.industry, SME.province, SME.latest_score)
+        .where(SME.latest_score >= func.coalesce(cutoff.scalar_subquery(), lender.min_score))
+    ).all()
+    packages = _packages(db, [row.id for row in rows])
+    ranked = sorted(
+        (_ComputedMatch(row.id, row.name, row.industry, row.province, row.latest_score,
+                        ConfidenceCalculator.calculate(packages[row.id]))
+         for row in rows),
+        key=lambda m: (-m.score, -m.confidence, m.sme_id),
+    )
+    return ranked[:limit]
+
+
+def match_events(db: Session, lender_id: int, after_id: int, limit: int) -> list:
+    """The lender's "new eligible SME" events after event id after_id, oldest first."""
+    return db.execute(
+        select(_events.c.id, _events.c.sme_id, SME.name, _events.c.score, _events.c.confidence, _events.c.created_at)
+        .join(SME, SME.id == _events.c.sme_id)
+        .where(_events.c.lender_id == lender_id, _events.c.id > after_id)
+        .order_by(_events.c.id)
+        .limit(limit)
+    ).all()
+
+
+# ── Rebuild ───────────────────────────────────────────────────────────────────
+
+def rebuild_matches(db: Session, chunk_size: int = 500) -> dict:
+    """
+    Rewrites every lender's criteria rows, recomputes the keys of every SME and
+    the eligible set of every lender, rewriting only what drifted; drops rows
+    of SMEs and lenders that no longer exist, and records the build in
+    lender_match_builds. Emits no events. The caller commits. Returns counts.
+    """
+    stats = {"smes": 0, "lenders": 0, "keys_drifted": 0, "matches_drifted": 0}
+    db.execute(delete(_keys).where(_keys.c.sme_id.not_in(select(SME.id))))
+    db.execute(delete(_matches).where(_matches.c.sme_id.not_in(select(SME.id))))
+    lender_ids = db.execute(select(Lender.id)).scalars().all()
+    db.execute(delete(_criteria_rows).where(_criteria_rows.c.lender_id.not_in(lender_ids)))
+    criteria = write_lender_criteria(db, lender_ids)     # the SME side looks lenders up through these
+
+    sme_ids = db.execute(select(SME.id).order_by(SME.id)).scalars().all()
+    for start in range(0, len(sme_ids), chunk_size):
+        chunk = sme_ids[start:start + chunk_size]
+        stats["keys_drifted"] += refresh_sme_matches(db, chunk, emit_events=False)["keys_changed"]
+    stats["smes"] = len(sme_ids)
+
+    db.execute(delete(_matches).where(_matches.c.lender_id.not_in(lender_ids)))
+    stats["matches_drifted"] = refresh_lender_matches(db, lender_ids, lenders=criteria)
+    stats["lenders"] = len(lender_ids)
+    db.execute(insert(_builds).values(built_at=datetime.utcnow()))
+    return stats
@@ -5,6 +5,7 @@ from models.sme_outcome import SmeOutcome
 from models.finance_request import FinanceRequest
 from models.sme import SME
 from services.scoring_service import score_sme
+from core.assessment_engine import AssessmentResult
 from services.recommendations_service import generate_plan
 
 
@@ -137,17 +138,21 @@ def update_checkin(
     return outcome
 
 
-def compute_followed_recommendations(db: Session, outcome: SmeOutcome) -> list[dict]:
+def compute_followed_recommendations(
+    db: Session, outcome: SmeOutcome, score_res: AssessmentResult | None = None,
+) -> list[dict]:
     """
     Computes which of the snapshot outstanding recommendations have since been
     completed by checking the SME's current outstanding recommendations.
+    Pass score_res when the SME has already been scored (e.g. via score_smes()).
     """
     sme = outcome.sme
     if not sme:
         return []
 
     # Recalculate current score and plan dynamically
-    score_res = score_sme(sme, db)
+    if score_res is None:
+        score_res = score_sme(sme, db)
     current_plan = generate_plan(score_res.breakdown, score_res.score)
     current_recs = current_plan.recommendations
 
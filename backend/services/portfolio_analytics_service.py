@@ -0,0 +1,257 @@
+"""
+services/portfolio_analytics_service.py
+
+Portfolio-wide analytics for /lenders/portfolio-analytics.
+
+The figures come from four aggregate queries, so the response does not grow
+with the portfolio:
+  - finance requests grouped by status
+  - financed / fee totals of the funded, paid and closed requests
+  - SMEs grouped by (score band, sector, province), with the score sum per
+    group; the score band comes from the denormalised smes.latest_score
+    (migration 019), so no per-SME score lookup is needed
+  - outcomes grouped by status
+
+The result is shared by every caller for portfolio_analytics_ttl_seconds
+through a single-flight TTL cache: when the entry expires, one request
+recomputes it and concurrent requests wait for that result instead of running
+the same aggregates. Figures can therefore lag writes by up to the TTL.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from models.finance_request import FinanceRequest
+from models.sme import SME
+from models.sme_outcome import SmeOutcome
+
+SCORE_BANDS = ("Declined (<50)", "Review (50-74)", "Approved (75+)", "Unscored")
+FINANCED_STATUSES = ("funded", "paid", "closed")
+OUTCOME_STATUSES = ("pending", "active", "repaid", "defaulted")
+
+
+def score_band(score: float | None) -> str:
+    if score is None:
+        return "Unscored"
+    if score < 50:
+        return "Declined (<50)"
+    if score < 75:
+        return "Review (50-74)"
+    return "Approved (75+)"
+
+
+def _score_band():
+    """score_band() as a SQL expression over smes.latest_score."""
+    return case(
+        (SME.latest_score.is_(None), "Unscored"),
+        (SME.latest_score < 50, "Declined (<50)"),
+        (SME.latest_score < 75, "Review (50-74)"),
+        else_="Approved (75+)",
+    )
+
+
+@dataclass
+class PortfolioFigures:
+    """
+    The aggregates behind the analytics responses. Sectors and provinces are
+    keyed by the stored value, with NULL as "".
+    """
+    applications: dict[str, int] = field(default_factory=dict)       # status -> requests
+    total_financed: float = 0.0
+    total_fees: float = 0.0
+    bands: dict[str, tuple[int, float]] = field(default_factory=dict)  # band -> (SMEs, score sum)
+    sectors: dict[str, int] = field(default_factory=dict)
+    provinces: dict[str, int] = field(default_factory=dict)
+    outcomes: dict[str, int] = field(default_factory=dict)           # outcome_status -> outcomes
+
+
+def grouped_figures(db: Session) -> PortfolioFigures:
+    """PortfolioFigures from GROUP BY queries over the source tables."""
+    figures = PortfolioFigures()
+    # 1. applications
+    figures.applications = dict(db.execute(
+        select(FinanceRequest.status, func.count(FinanceRequest.id)).group_by(FinanceRequest.status)
+    ).all())
+
+    # 2. financials
+    total_financed, total_fees = db.execute(
+        select(
+            func.coalesce(func.sum(FinanceRequest.approved_amount), 0),
+            func.coalesce(func.sum(FinanceRequest.platform_fee), 0),
+        ).where(FinanceRequest.status.in_(FINANCED_STATUSES))
+    ).one()
+    figures.total_financed, figures.total_fees = float(total_financed), float(total_fees)
+
+    # 3. scores and 4. concentration, from one pass over the SMEs
+    band = _score_band().label("band")
+    sector = func.coalesce(SME.industry, "").label("sector")
+    province = func.coalesce(SME.province, "").label("province")
+    groups = db.execute(
+        select(band, sector, province, func.count(SME.id), func.coalesce(func.sum(SME.latest_score), 0))
+        .group_by(band, sector, province)
+    ).all()
+    for group_band, group_sector, group_province, count, score_sum in groups:
+        band_count, band_sum = figures.bands.get(group_band, (0, 0.0))
+        figures.bands[group_band] = (band_count + count, band_sum + float(score_sum))
+        figures.sectors[group_sector] = figures.sectors.get(group_sector, 0) + count
+        figures.provinces[group_province] = figures.provinces.get(group_province, 0) + count
+
+    # 5. outcomes
+    figures.outcomes = dict(db.execute(
+        select(SmeOutcome.outcome_status, func.count(SmeOutcome.id)).group_by(SmeOutcome.outcome_status)
+    ).all())
+    return figures
+
+
+def _average_score(figures: PortfolioFigures) -> tuple[int, float]:
+    """(scored SMEs, average latest score rounded to 1 decimal)."""
+    scored = [figures.bands.get(band, (0, 0.0)) for band in SCORE_BANDS if band != "Unscored"]
+    count = sum(c for c, _ in scored)
+    return count, (round(sum(total for _, total in scored) / count, 1) if count else 0.0)
+
+
+def _counts(values: dict[str, int], blank: str) -> dict[str, int]:
+    merged: dict[str, int] = {}
+    for key in sorted(values, key=lambda k: k or blank):
+        if values[key] > 0:
+            merged[key or blank] = merged.get(key or blank, 0) + values[key]
+    return merged
+
+
+def analytics_payload(figures: PortfolioFigures) -> dict:
+    """The /lenders/portfolio-analytics response for figures."""
+    apps = figures.applications
+    _, avg_score = _average_score(figures)
+    outcomes = {status: figures.outcomes.get(status, 0) for status in OUTCOME_STATUSES}
+    total_denom = outcomes["repaid"] + outcomes["defaulted"] + outcomes["active"]
+    repayment_rate = round((outcomes["repaid"] / total_denom) * 100, 1) if total_denom > 0 else None
+
+    return {
+        "applications": {
+            "total": sum(apps.values()),
+            "approved": apps.get("approved", 0),
+            "funded": apps.get("funded", 0),
+            "pending": apps.get("pending", 0),
+            "rejected": apps.get("rejected", 0)
+        },
+        "financials": {
+            "total_financed": float(figures.total_financed),
+            "total_fees": float(figures.total_fees)
+        },
+        "scores": {
+            "average": avg_score,
+            "distribution": {band: figures.bands.get(band, (0, 0.0))[0] for band in SCORE_BANDS}
+        },
+        "concentration": {
+            "by_sector": _counts(figures.sectors, "Other"),
+            "by_province": _counts(figures.provinces, "Unknown")
+        },
+        "outcomes": {
+            **outcomes,
+            "repayment_rate": repayment_rate
+        }
+    }
+
+
+def platform_stats_payload(figures: PortfolioFigures) -> dict:
+    """The /api/v1/platform/stats response for figures."""
+    scored, avg_score = _average_score(figures)
+    return {
+        "total_smes_assessed": scored,
+        "score_distribution": {
+            "approved": figures.bands.get("Approved (75+)", (0, 0.0))[0],
+            "review": figures.bands.get("Review (50-74)", (0, 0.0))[0],
+            "declined": figures.bands.get("Declined (<50)", (0, 0.0))[0]
+        },
+        "avg_score": avg_score,
+        "sectors_covered": sorted(k for k, count in figures.sectors.items() if k and count > 0),
+        "provinces_covered": sorted(k for k, count in figures.provinces.items() if k and count > 0),
+        "platform_version": "1.0.0"
+    }
+
+
+def compute_portfolio_analytics(db: Session) -> dict:
+    """The /lenders/portfolio-analytics payload, computed with GROUP BY queries."""
+    return analytics_payload(grouped_figures(db))
+
+
+class SingleFlightCache:
+    """
+    Thread-safe TTL cache where each key is computed by at most one caller at a
+    time. A caller that misses while another is computing the same key waits
+    for that result. Cached values are shared and must be treated as read-only.
+    """
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[str, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+        self._flights: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.computations = 0
+
+    def _fresh(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() < entry[0]:
+            return entry
+        return None
+
+    def get_or_compute(self, key: str, compute: Callable[[], object]):
+        """The cached value of key, or compute()'s result (cached unless it raises)."""
+        if self.ttl_seconds <= 0:
+            return compute()
+        with self._lock:
+            entry = self._fresh(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            flight = self._flights.setdefault(key, threading.Lock())
+
+        with flight:
+            with self._lock:
+                entry = self._fresh(key)
+                if entry is not None:       # computed by the caller we waited for
+                    self.coalesced += 1
+                    return entry[1]
+                self.computations += 1
+            value = compute()
+            with self._lock:
+                self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            return value
+
+    def invalidate(self, key: str | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ttl_seconds":  self.ttl_seconds,
+                "entries":      len(self._entries),
+                "hits":         self.hits,
+                "misses":       self.misses,
+                "coalesced":    self.coalesced,
+                "computations": self.computations,
+            }
+
+
+portfolio_analytics_cache = SingleFlightCache(ttl_seconds=get_settings().portfolio_analytics_ttl_seconds)
+
+
+def cached_portfolio_analytics(db: Session) -> dict:
+    """compute_portfolio_analytics(db), shared between callers for the cache TTL."""
+    return portfolio_analytics_cache.get_or_compute("portfolio", lambda: compute_portfolio_analytics(db))
@@ -0,0 +1,320 @@
+"""
+services/portfolio_counter_service.py
+
+Maintains portfolio_counters (models/portfolio_counter.py) and serves the
+portfolio analytics from them.
+
+Writes: a before_flush / after_flush listener pair on every Session. Before a
+flush that touches an SME, FinanceRequest, SmeOutcome or CreditScore, the
+counted columns of the affected rows are read. After the flush they are read
+again, and the difference is added to the counters on the same connection.
+The counters therefore commit or roll back with the write that caused them:
+approve / reject / fund / pay / close of finance requests, outcome check-ins,
+credit score inserts (through smes.latest_score), SME create and delete, and
+any other ORM write to the counted columns. The batch rescoring job writes
+through Core and reports its changes with counted_sme_changes().
+
+Deltas are applied with INSERT ... ON CONFLICT DO UPDATE in (metric, bucket)
+order, so concurrent writers queue on the counter rows they share instead
+of deadlocking.
+
+Writes that bypass both (raw SQL, bulk imports, data fixes) make the counters
+drift; rebuild_counters() recomputes them from the source tables. Until a
+first rebuild has run, reads fall back to the grouped queries of
+portfolio_analytics_service.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from decimal import Decimal
+from itertools import chain
+
+from sqlalchemy import delete, event, insert, inspect, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.credit_score import CreditScore
+from models.finance_request import FinanceRequest
+from models.portfolio_counter import PortfolioCounter
+from models.sme import SME
+from models.sme_outcome import SmeOutcome
+from services.portfolio_analytics_service import (
+    FINANCED_STATUSES,
+    PortfolioFigures,
+    analytics_payload,
+    cached_portfolio_analytics,
+    grouped_figures,
+    platform_stats_payload,
+    score_band,
+)
+
+_counters = PortfolioCounter.__table__
+REBUILT = ("meta", "rebuilt")
+
+# Columns whose changes can move a row between counters. New and deleted rows always count.
+TRACKED_ATTRIBUTES: dict[type, frozenset[str]] = {
+    SME:            frozenset({"industry", "province", "latest_score"}),
+    FinanceRequest: frozenset({"status", "approved_amount", "platform_fee"}),
+    SmeOutcome:     frozenset({"outcome_status"}),
+    CreditScore:    frozenset({"sme_id", "score", "created_at"}),   # via smes.latest_score
+}
+_TRACKED_TYPES = tuple(TRACKED_ATTRIBUTES)
+
+
+# ── Contributions ─────────────────────────────────────────────────────────────
+
+def _decimal(value) -> Decimal:
+    return Decimal(str(value)) if value is not None else Decimal(0)
+
+
+def _sme_contribution(row) -> list[tuple[str, str, int, Decimal]]:
+    return [
+        ("score_band", score_band(row.latest_score), 1, _decimal(row.latest_score)),
+        ("sector", row.industry or "", 1, Decimal(0)),
+        ("province", row.province or "", 1, Decimal(0)),
+    ]
+
+
+def _request_contribution(row) -> list[tuple[str, str, int, Decimal]]:
+    counted = [("applications", row.status or "", 1, Decimal(0))]
+    if row.status in FINANCED_STATUSES:
+        counted.append(("financials", "approved_amount", 0, _decimal(row.approved_amount)))
+        counted.append(("financials", "platform_fee", 0, _decimal(row.platform_fee)))
+    return counted
+
+
+def _outcome_contribution(row) -> list[tuple[str, str, int, Decimal]]:
+    return [("outcomes", row.outcome_status or "", 1, Decimal(0))]
+
+
+class _Affected:
+    """Ids of the rows a flush may move between counters."""
+
+    def __init__(self):
+        self.smes: set[int] = set()
+        self.requests: set[int] = set()
+        self.outcomes: set[int] = set()
+        self.deleted_smes: set[int] = set()     # their requests and outcomes go with them
+
+    def __bool__(self):
+        return bool(self.smes or self.requests or self.outcomes)
+
+    def update(self, other: "_Affected") -> None:
+        self.smes |= other.smes
+        self.requests |= other.requests
+        self.outcomes |= other.outcomes
+        self.deleted_smes |= other.deleted_smes
+
+
+def _snapshot(conn: Connection, affected: _Affected) -> list:
+    """Contributions of the affected rows as they currently are in the database."""
+    contributions = []
+    if affected.smes:
+        rows = conn.execute(
+            select(SME.id, SME.industry, SME.province, SME.latest_score).where(SME.id.in_(affected.smes))
+        ).all()
+        contributions += chain.from_iterable(_sme_contribution(row) for row in rows)
+    if affected.requests or affected.deleted_smes:
+        rows = conn.execute(
+            select(FinanceRequest.id, FinanceRequest.status, FinanceRequest.approved_amount,
+                   FinanceRequest.platform_fee)
+            .where(or_(FinanceRequest.id.in_(affected.requests), FinanceRequest.sme_id.in_(affected.deleted_smes)))
+        ).all()
+        contributions += chain.from_iterable(_request_contribution(row) for row in rows)
+    if affected.outcomes or affected.deleted_smes:
+        rows = conn.execute(
+            select(SmeOutcome.id, SmeOutcome.outcome_status)
+            .where(or_(SmeOutcome.id.in_(affected.outcomes), SmeOutcome.sme_id.in_(affected.deleted_smes)))
+        ).all()
+        contributions += chain.from_iterable(_outcome_contribution(row) for row in rows)
+    return contributions
+
+
+def _deltas(before: list, after: list) -> dict[tuple[str, str], tuple[int, Decimal]]:
+    deltas: dict[tuple[str, str], list] = {}
+    for sign, contributions in ((-1, before), (1, after)):
+        for metric, bucket, count, total in contributions:
+            delta = deltas.setdefault((metric, bucket), [0, Decimal(0)])
+            delta[0] += sign * count
+            delta[1] += sign * total
+    return {key: (count, total) for key, (count, total) in deltas.items() if count or total}
+
+
+def apply_deltas(conn: Connection, deltas: dict[tuple[str, str], tuple[int, Decimal]]) -> None:
+    """Adds deltas to the counters, creating missing rows."""
+    rows = [
+        {"metric": metric, "bucket": bucket, "count": count, "total": total}
+        for (metric, bucket), (count, total) in sorted(deltas.items())
+    ]
+    if not rows:
+        return
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(conn.dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(_counters)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[_counters.c.metric, _counters.c.bucket],
+                set_={"count": _counters.c.count + stmt.excluded.count,
+                      "total": _counters.c.total + stmt.excluded.total},
+            ),
+            rows,
+        )
+        return
+    for row in rows:
+        updated = conn.execute(
+            update(_counters)
+            .where(_counters.c.metric == row["metric"], _counters.c.bucket == row["bucket"])
+            .values(count=_counters.c.count + row["count"], total=_counters.c.total + row["total"])
+        ).rowcount
+        if not updated:
+            conn.execute(insert(_counters), row)
+
+
+@contextmanager
+def counted_sme_changes(conn: Connection, sme_ids):
+    """
+    For writes that bypass the ORM: counts the change of the given SMEs'
+    counted columns made inside the block, on conn.
+    """
+    affected = _Affected()
+    affected.smes = set(sme_ids)
+    before = _snapshot(conn, affected)
+    yield
+    apply_deltas(conn, _deltas(before, _snapshot(conn, affected)))
+
+
+# ── Session listener ──────────────────────────────────────────────────────────
+
+def _has_tracked_changes(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES[type(obj)])
+
+
+def _score_owner(score: CreditScore) -> int | None:
+    if score.sme_id is not None:
+        return score.sme_id
+    sme = score.__dict__.get("sme")             # assigned through the relationship, not yet flushed
+    return sme.id if sme is not None else None
+
+
+def _affected(session: Session, new: bool) -> _Affected:
+    """
+    Persistent rows the pending changes touch (new=False, before the flush),
+    or the rows the flush inserted (new=True, after it, once they have ids).
+    A new credit score touches its persistent SME, so it counts before the flush.
+    """
+    affected = _Affected()
+    if new:
+        objects = [obj for obj in session.new if isinstance(obj, (SME, FinanceRequest, SmeOutcome))]
+    else:
+        objects = [obj for obj in session.new if isinstance(obj, CreditScore)]
+        objects += [obj for obj in session.deleted if isinstance(obj, _TRACKED_TYPES)]
+        objects += [obj for obj in session.dirty if isinstance(obj, _TRACKED_TYPES) and _has_tracked_changes(obj)]
+        affected.deleted_smes = {obj.id for obj in session.deleted if isinstance(obj, SME)}
+    for obj in objects:
+        if isinstance(obj, SME):
+            affected.smes.add(obj.id)
+        elif isinstance(obj, FinanceRequest):
+            affected.requests.add(obj.id)
+        elif isinstance(obj, SmeOutcome):
+            affected.outcomes.add(obj.id)
+        else:
+            affected.smes.add(_score_owner(obj))
+            affected.smes.update(inspect(obj).attrs.sme_id.history.deleted)
+    for ids in (affected.smes, affected.requests, affected.outcomes):
+        ids.discard(None)
+    return affected
+
+
+@event.listens_for(Session, "before_flush")
+def _counters_before_flush(session: Session, flush_context, instances) -> None:
+    affected = _affected(session, new=False)
+    session.info["portfolio_counters"] = (affected, _snapshot(session.connection(), affected) if affected else [])
+
+
+@event.listens_for(Session, "after_flush")
+def _counters_after_flush(session: Session, flush_context) -> None:
+    affected, before = session.info.pop("portfolio_counters", (_Affected(), []))
+    affected.update(_affected(session, new=True))
+    if affected:
+        conn = session.connection()
+        apply_deltas(conn, _deltas(before, _snapshot(conn, affected)))
+
+
+# ── Rebuild ───────────────────────────────────────────────────────────────────
+
+def _figure_rows(figures: PortfolioFigures) -> dict[tuple[str, str], tuple[int, Decimal]]:
+    rows = {("applications", status): (count, Decimal(0)) for status, count in figures.applications.items()}
+    rows[("financials", "approved_amount")] = (0, _decimal(figures.total_financed))
+    rows[("financials", "platform_fee")] = (0, _decimal(figures.total_fees))
+    rows.update({("score_band", band): (count, _decimal(total)) for band, (count, total) in figures.bands.items()})
+    rows.update({("sector", sector): (count, Decimal(0)) for sector, count in figures.sectors.items()})
+    rows.update({("province", province): (count, Decimal(0)) for province, count in figures.provinces.items()})
+    rows.update({("outcomes", status or ""): (count, Decimal(0)) for status, count in figures.outcomes.items()})
+    rows[REBUILT] = (1, Decimal(0))
+    return rows
+
+
+def rebuild_counters(db: Session) -> dict:
+    """
+    Recomputes every counter from the source tables. On PostgreSQL the table
+    is locked first, so concurrent writers wait and apply their deltas on top
+    of the rebuilt values. The caller commits. Returns counts.
+    """
+    conn = db.connection()
+    if conn.dialect.name == "postgresql":
+        conn.exec_driver_sql("LOCK TABLE portfolio_counters IN EXCLUSIVE MODE")
+    stored = {
+        (row.metric, row.bucket): (row.count, _decimal(row.total))
+        for row in conn.execute(select(_counters))
+    }
+    rebuilt = _figure_rows(grouped_figures(db))
+    conn.execute(delete(_counters))
+    conn.execute(insert(_counters), [
+        {"metric": metric, "bucket": bucket, "count": count, "total": total}
+        for (metric, bucket), (count, total) in sorted(rebuilt.items())
+    ])
+    drifted = sum(
+        1 for key in set(stored) | set(rebuilt)
+        if key != REBUILT and stored.get(key, (0, Decimal(0))) != rebuilt.get(key, (0, Decimal(0)))
+    )
+    return {"counters": len(rebuilt), "drifted": drifted, "first_build": REBUILT not in stored}
+
+
+# ── Reads ─────────────────────────────────────────────────────────────────────
+
+def counter_figures(db: Session) -> PortfolioFigures | None:
+    """PortfolioFigures from the counters, or None when they have never been rebuilt."""
+    rows = db.execute(select(_counters)).all()
+    if not any((row.metric, row.bucket) == REBUILT for row in rows):
+        return None
+    figures = PortfolioFigures()
+    for row in rows:
+        if row.metric == "applications":
+            figures.applications[row.bucket] = row.count
+        elif (row.metric, row.bucket) == ("financials", "approved_amount"):
+            figures.total_financed = float(row.total)
+        elif (row.metric, row.bucket) == ("financials", "platform_fee"):
+            figures.total_fees = float(row.total)
+        elif row.metric == "score_band":
+            figures.bands[row.bucket] = (row.count, float(row.total))
+        elif row.metric == "sector":
+            figures.sectors[row.bucket] = row.count
+        elif row.metric == "province":
+            figures.provinces[row.bucket] = row.count
+        elif row.metric == "outcomes":
+            figures.outcomes[row.bucket] = row.count
+    return figures
+
+
+def portfolio_analytics(db: Session) -> dict:
+    """/lenders/portfolio-analytics: one read of the counters, or the cached grouped queries before a rebuild."""
+    figures = counter_figures(db)
+    return analytics_payload(figures) if figures is not None else cached_portfolio_analytics(db)
+
+
+def platform_stats(db: Session) -> dict:
+    """/api/v1/platform/stats: one read of the counters, or the grouped queries before a rebuild."""
+    figures = counter_figures(db)
+    return platform_stats_payload(figures if figures is not None else grouped_figures(db))
@@ -0,0 +1,274 @@
+"""
+services/query_stats_service.py
+
+Per-request database telemetry and query budgets.
+
+Every Engine (the sync engine, and the async engine's underlying sync engine)
+reports its cursor executions here. While a request is in flight,
+QueryStatsMiddleware keeps a RequestQueryStats in a context variable, so the
+statements a request runs — from the threadpool or the event loop — are
+counted against it:
+
+  - statement count and total DB time, returned as X-DB-Query-Count /
+    X-DB-Time-Ms response headers
+  - statements grouped by shape (SQL text with IN-lists collapsed); a shape
+    that runs more than QUERY_REPEAT_THRESHOLD times in one request is logged
+    as a probable N+1
+  - routes declare their expected statement count with @query_budget(n);
+    exceeding it logs a warning, or raises QueryBudgetExceeded while
+    query_budgets.enforce is on (QUERY_BUDGET_ENFORCE=true, and the API
+    tests), so an N+1 regression fails the suite instead of shipping
+
+TimedQueuePool / TimedAsyncAdaptedQueuePool record how long checkouts wait
+for a connection; pool_stats() combines that with the pool's size, overflow
+and checked-out counts for GET /admin/db-pool.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.datastructures import MutableHeaders
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# "(?, ?, ?)" / "(%(id_1_1)s, %(id_1_2)s)" / "($1, $2)" -> "(?)": IN-lists of any length are one shape
+_PARAM = r"(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _PARAM_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A route ran more statements than its declared @query_budget (raised only while enforcing)."""
+
+
+class QueryBudgets:
+    """Process-wide knobs: the repeated-shape threshold and whether budgets are enforced."""
+
+    def __init__(self, repeat_threshold: int = 5, enforce: bool = False):
+        self.repeat_threshold = repeat_threshold
+        self.enforce = enforce
+
+
+settings = get_settings()
+query_budgets = QueryBudgets(settings.query_repeat_threshold, settings.query_budget_enforce)
+
+
+def query_budget(max_queries: int):
+    """Declares the most statements one call of the decorated route may run (auth lookups included)."""
+    def decorate(endpoint):
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorate
+
+
+# ── Per-request statistics ────────────────────────────────────────────────────
+
+class RequestQueryStats:
+    __slots__ = ("count", "db_seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """(shape, count) of the shapes run more than threshold times, most frequent first."""
+        if self.count <= threshold:
+            return []
+        shapes: Counter[str] = Counter()
+        for statement, count in self.statements.items():
+            shapes[statement_shape(statement)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count > threshold]
+
+
+_current_stats: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> RequestQueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries():
+    """Collects the statements run inside the block, outside of HTTP requests (tests, jobs)."""
+    stats = RequestQueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    started = context.connection.info.get("query_started_at") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+# ── Middleware ────────────────────────────────────────────────────────────────
+
+def _check_budget(scope, stats: RequestQueryStats) -> None:
+    budget = getattr(scope.get("endpoint"), "__query_budget__", None)
+    if budget is None or stats.count <= budget:
+        return
+    message = (
+        f"{scope['method']} {scope['path']} ran {stats.count} queries, "
+        f"over its budget of {budget}"
+    )
+    if query_budgets.enforce:
+        repeated = stats.repeated_shapes(1)
+        detail = "; ".join(f"{count}x {shape}" for shape, count in repeated[:3])
+        raise QueryBudgetExceeded(f"{message}. Repeated: {detail}" if detail else message)
+    logger.warning(message)
+
+
+def _report(scope, stats: RequestQueryStats) -> None:
+    for shape, count in stats.repeated_shapes(query_budgets.repeat_threshold):
+        logger.warning(
+            "Possible N+1 in %s %s: statement ran %d times: %s",
+            scope["method"], scope["path"], count, shape[:300],
+        )
+    logger.debug(
+        "%s %s: %d queries, %.1f ms in the database",
+        scope["method"], scope["path"], stats.count, stats.db_seconds * 1000,
+    )
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware opening a RequestQueryStats scope around each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                _check_budget(scope, stats)
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(stats.count))
+                headers.append("X-DB-Time-Ms", f"{stats.db_seconds * 1000:.1f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+            _report(scope, stats)
+
+
+# ── Connection pool telemetry ─────────────────────────────────────────────────
+
+class _CheckoutTiming:
+    """Mixin for QueuePool subclasses: times each checkout, including waits for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = _CheckoutStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_stats.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.checkout_stats.observe(time.perf_counter() - started)
+        return connection
+
+
+class _CheckoutStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_seconds_total": round(self.wait_seconds_total, 6),
+                "checkout_wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "checkout_wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+class TimedQueuePool(_CheckoutTiming, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTiming, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Size, overflow and checkout-wait figures of engine's connection pool."""
+    pool = engine.pool
+    stats: dict = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "timeout_seconds": pool.timeout(),
+            "recycle_seconds": pool._recycle,
+        })
+    if isinstance(pool, _CheckoutTiming):
+        stats.update(pool.checkout_stats.as_dict())
+    return stats
@@ -0,0 +1,247 @@
+"""
+services/read_routing_service.py
+
+Routes read-only endpoints between the primary and a read replica.
+
+Endpoints that only read (analytics, stats, score history, admin lists) take
+database.get_read_db / get_async_read_db instead of get_db. Per request,
+ReadRoutingPolicy.route() picks the primary or the replica. The checks run
+in this order:
+
+  no_replica           REPLICA_DATABASE_URL is unset
+  forced_primary       the client sent X-Read-Consistency: strong
+  sticky               the same credentials committed a write within the
+                       read-your-writes window, so their own changes may not
+                       have replicated yet
+  replica_unavailable  the lag probe failed
+  replica_lagging      the measured lag exceeds REPLICA_MAX_LAG_SECONDS
+  replica              otherwise
+
+Writes are noticed on commit: any Session that flushed or executed DML marks
+the client of the current request (a hash of its Authorization / X-API-Key
+header, set by ReadRoutingMiddleware). The window is per process. Writes that
+bypass the ORM session (Core on engine.begin(), other services) do not start
+one.
+
+Replica lag is probed at most every REPLICA_LAG_CHECK_SECONDS:
+  PostgreSQL  seconds since the last replayed transaction, or 0 when the
+              standby has replayed everything it received
+  SQLite      0 — there is no replication. Point REPLICA_DATABASE_URL at a
+              second database file to exercise the routing locally, and pass
+              a lag_probe to simulate lag.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+_PG_REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def default_lag_probe(conn: Connection) -> float:
+    """Replica lag in seconds for the connection's dialect (0 when it is not replicating)."""
+    if conn.dialect.name == "postgresql":
+        lag = conn.execute(_PG_REPLICA_LAG).scalar()
+        return float(lag) if lag is not None else 0.0
+    return 0.0
+
+
+# ── Request identity ──────────────────────────────────────────────────────────
+
+_current_client: ContextVar[str | None] = ContextVar("read_routing_client", default=None)
+_strong_reads: ContextVar[bool] = ContextVar("read_routing_strong", default=False)
+
+
+def client_key(authorization: str | None, api_key: str | None) -> str | None:
+    """Stable, non-reversible key for the credentials of a request; None when anonymous."""
+    credential = authorization or api_key
+    if not credential:
+        return None
+    return hashlib.blake2b(credential.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def current_client() -> str | None:
+    return _current_client.get()
+
+
+class ReadRoutingMiddleware:
+    """ASGI middleware recording who is asking, and whether they asked for primary reads."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        client = client_key(
+            headers.get(b"authorization", b"").decode("latin-1"),
+            headers.get(b"x-api-key", b"").decode("latin-1"),
+        )
+        strong = headers.get(b"x-read-consistency", b"").lower() == b"strong"
+        client_token = _current_client.set(client)
+        strong_token = _strong_reads.set(strong)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_client.reset(client_token)
+            _strong_reads.reset(strong_token)
+
+
+# ── Policy ────────────────────────────────────────────────────────────────────
+
+class ReadRoutingPolicy:
+    """Chooses primary or replica per read; see the module docstring for the rules."""
+
+    MAX_TRACKED_CLIENTS = 50_000
+
+    def __init__(
+        self,
+        replica_engine: Engine | None = None,
+        max_lag_seconds: float = 5.0,
+        read_your_writes_seconds: float = 10.0,
+        lag_check_seconds: float = 1.0,
+        lag_probe: Callable[[Connection], float] = default_lag_probe,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.replica_engine = replica_engine
+        self.max_lag_seconds = max_lag_seconds
+        # A client's writes must have replicated before it reads from the replica again
+        self.sticky_seconds = max(read_your_writes_seconds, max_lag_seconds)
+        self.lag_check_seconds = lag_check_seconds
+        self.lag_probe = lag_probe
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._last_write: dict[str, float] = {}
+        self._lag: float | None = None          # None: probe failed
+        self._lag_checked_at: float | None = None
+        self._decisions: Counter[str] = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica_engine is not None
+
+    # Writes
+
+    def note_write(self, client: str | None) -> None:
+        if client is None or not self.enabled:
+            return
+        now = self.clock()
+        with self._lock:
+            if len(self._last_write) >= self.MAX_TRACKED_CLIENTS:
+                cutoff = now - self.sticky_seconds
+                self._last_write = {k: t for k, t in self._last_write.items() if t > cutoff}
+            self._last_write[client] = now
+
+    # Lag
+
+    def lag_is_stale(self) -> bool:
+        return self._lag_checked_at is None or self.clock() - self._lag_checked_at >= self.lag_check_seconds
+
+    def refresh_lag(self) -> float | None:
+        """Probes the replica (blocking); None when it could not be reached."""
+        self._lag_checked_at = self.clock()     # concurrent readers keep the old value meanwhile
+        try:
+            with self.replica_engine.connect() as conn:
+                lag = float(self.lag_probe(conn))
+        except Exception:
+            lag = None
+        self._lag, self._lag_checked_at = lag, self.clock()
+        return lag
+
+    # Routing
+
+    def decide(self, client: str | None = None, strong: bool = False) -> str:
+        """The reason for routing this read; the target is REPLICA only for "replica"."""
+        if not self.enabled:
+            return "no_replica"
+        if strong:
+            return "forced_primary"
+        if client is not None:
+            wrote_at = self._last_write.get(client)
+            if wrote_at is not None and self.clock() - wrote_at < self.sticky_seconds:
+                return "sticky"
+        if self.lag_is_stale():
+            self.refresh_lag()
+        if self._lag is None:
+            return "replica_unavailable"
+        if self._lag > self.max_lag_seconds:
+            return "replica_lagging"
+        return "replica"
+
+    def route(self, client: str | None = None, strong: bool = False) -> str:
+        """PRIMARY or REPLICA for one read, counted in stats()."""
+        reason = self.decide(client, strong)
+        with self._lock:
+            self._decisions[reason] += 1
+        return REPLICA if reason == "replica" else PRIMARY
+
+    def route_current(self) -> str:
+        """route() for the client of the request being served."""
+        return self.route(_current_client.get(), _strong_reads.get())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "replica_configured": self.enabled,
+                "replica_lag_seconds": self._lag,
+                "max_lag_seconds": self.max_lag_seconds,
+                "sticky_seconds": self.sticky_seconds,
+                "sticky_clients": len(self._last_write),
+                "decisions": dict(self._decisions),
+            }
+
+
+# ── Write tracking ────────────────────────────────────────────────────────────
+
+_policies: list[ReadRoutingPolicy] = []
+
+
+def register_policy(policy: ReadRoutingPolicy) -> ReadRoutingPolicy:
+    """Makes policy receive note_write() for committed writes; returns it."""
+    _policies.append(policy)
+    return policy
+
+
+def unregister_policy(policy: ReadRoutingPolicy) -> None:
+    if policy in _policies:
+        _policies.remove(policy)
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session: Session) -> None:
+    if session.info.pop("wrote", False):
+        client = _current_client.get()
+        for policy in _policies:
+            policy.note_write(client)
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session: Session) -> None:
+    session.info.pop("wrote", None)
@@ -6,47 +6,159 @@ The legacy calculate_score() path is preserved for backward compatibility
 but assess() is now the authoritative entry point.
 """
 from __future__ import annotations
-from datetime import datetime, timezone
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Iterator
+from sqlalchemy import and_, case, func, select
 from sqlalchemy.orm import Session
 
 from models.invoice import Invoice
 from models.verification import Verification
 from models.sme import SME
 from models.founder_profile import FounderProfile
+from models.credit_score import CreditScore
 from core.scoring import EvidencePackage, FounderSignalInput, INTENT_BASE_POINTS
-from core.assessment_engine import AssessmentResult, assess
+from core.assessment_engine import AssessmentResult, assess, reassess
+from services.assessment_cache import assessment_cache, evidence_fingerprint, latest_evidence
+from services.signal_snapshot_service import has_pending_evidence, load_snapshots
 
 
-def build_evidence_package(sme: SME, db: Session) -> EvidencePackage:
+EVIDENCE_CHUNK_SIZE = 500
+
+_FOUNDER_COLUMNS = (
+    FounderProfile.years_industry_experience,
+    FounderProfile.highest_qualification,
+    FounderProfile.prior_business_owner,
+    FounderProfile.trade_association_member,
+    FounderProfile.reference_name,
+)
+
+
+def _invoice_aggregates():
     """
-    Pull all signals for an SME from the database and return an EvidencePackage.
+    Conditional COUNT / SUM over invoices, so the invoice history never leaves
+    the database. A status of NULL counts as unpaid; an invoice is paid on
+    time when it is paid with a due date on or after its creation date.
     """
-    # ── Invoice signals ───────────────────────────────────────────────────────
-    invoices = db.query(Invoice).filter(Invoice.sme_id == sme.id).all()
-    total_invoices  = len(invoices)
-    unpaid_invoices = sum(1 for i in invoices if i.status != "paid")
-    paid_on_time    = sum(
-        1 for i in invoices
-        if i.status == "paid" and i.due_date is not None
-        and i.due_date.replace(tzinfo=timezone.utc)
-            >= i.created_at.replace(tzinfo=timezone.utc)
+    is_paid = Invoice.status == "paid"
+    on_time = and_(is_paid, Invoice.due_date.is_not(None), Invoice.due_date >= Invoice.created_at)
+    return (
+        func.count(Invoice.id).label("total_invoices"),
+        func.coalesce(func.sum(case((is_paid, 0), else_=1)), 0).label("unpaid_invoices"),
+        func.coalesce(func.sum(case((on_time, 1), else_=0)), 0).label("paid_on_time"),
     )
 
-    # ── Verification signals ──────────────────────────────────────────────────
-    verifications = db.query(Verification).filter(Verification.sme_id == sme.id).all()
-    ver_map: dict[str, str] = {}
-    for v in sorted(verifications, key=lambda x: x.submitted_at):
-        ver_map[v.doc_type] = v.status
 
-    # ── Intent document details ───────────────────────────────────────────────
+def _latest_verifications(*where):
+    """The most recently submitted verification per (sme_id, doc_type) (ties: highest id)."""
+    ranked = (
+        select(
+            Verification.sme_id,
+            Verification.doc_type,
+            Verification.status,
+            Verification.loi_counterparty_known,
+            Verification.submitted_at,
+            Verification.id,
+            func.row_number().over(
+                partition_by=(Verification.sme_id, Verification.doc_type),
+                order_by=(Verification.submitted_at.desc().nulls_last(), Verification.id.desc()),
+            ).label("rank"),
+        )
+        .where(*where)
+        .subquery()
+    )
+    return (
+        select(
+            ranked.c.sme_id, ranked.c.doc_type, ranked.c.status, ranked.c.loi_counterparty_known,
+            ranked.c.submitted_at, ranked.c.id,
+        )
+        .where(ranked.c.rank == 1)
+        .order_by(ranked.c.sme_id, ranked.c.doc_type)
+    )
+
+
+def _pending_rows(db: Session, model, sme_id: int) -> tuple[list[int], list]:
+    """
+    (ids of model rows with unflushed changes, the unflushed new / modified
+    rows of sme_id). The database copies of the former are stale and are left
+    out of queries; the latter are merged in from memory instead.
+    """
+    stale_ids, rows = [], []
+    for obj in (*db.new, *db.dirty, *db.deleted):
+        if not isinstance(obj, model):
+            continue
+        if obj.id is not None:
+            stale_ids.append(obj.id)
+        if obj.sme_id == sme_id and obj not in db.deleted:
+            rows.append(obj)
+    return stale_ids, rows
+
+
+def _as_datetime(value):
+    return datetime.combine(value, datetime.min.time()) if isinstance(value, date) and not isinstance(value, datetime) else value
+
+
+def _merge_invoices(totals, pending: list[Invoice]):
+    """The invoice aggregate row totals plus the unflushed invoices, counted as _invoice_aggregates() would."""
+    if not pending:
+        return totals
+    now = datetime.utcnow()
+    paid = [inv for inv in pending if inv.status == "paid"]
+    return SimpleNamespace(
+        total_invoices=int(totals.total_invoices) + len(pending),
+        unpaid_invoices=int(totals.unpaid_invoices) + len(pending) - len(paid),
+        paid_on_time=int(totals.paid_on_time) + sum(
+            1 for inv in paid
+            if inv.due_date is not None and _as_datetime(inv.due_date) >= _as_datetime(inv.created_at or now)
+        ),
+    )
+
+
+def _merge_verifications(latest, pending: list[Verification]) -> list:
+    """The latest verification per doc_type across the queried rows and the unflushed ones."""
+    if not pending:
+        return latest
+    now = datetime.utcnow()
+
+    def recency(v):
+        # Unflushed new rows get submitted_at = now and the highest id on insert
+        submitted = v.submitted_at if v.submitted_at is not None or v.id is not None else now
+        return submitted is not None, submitted or datetime.min, v.id if v.id is not None else float("inf")
+
+    by_type = {v.doc_type: v for v in latest}
+    for v in pending:
+        if v.doc_type not in by_type or recency(v) > recency(by_type[v.doc_type]):
+            by_type[v.doc_type] = v
+    return [by_type[doc_type] for doc_type in sorted(by_type)]
+
+
+def _founder_signal(row) -> FounderSignalInput | None:
+    if row is None:
+        return None
+    return FounderSignalInput(
+        years_industry_experience = row.years_industry_experience,
+        highest_qualification     = row.highest_qualification,
+        prior_business_owner      = row.prior_business_owner,
+        trade_association_member  = row.trade_association_member,
+        reference_provided        = True if row.reference_name else None,
+    )
+
+
+def _package(sme, invoices, verifications, founder) -> EvidencePackage:
+    """
+    Assembles an EvidencePackage from an SME (ORM object or row with the same
+    column names), its invoice aggregate row (None: no invoices), its latest
+    verification rows and its founder row (None: no founder profile).
+    """
+    # ── Verification signals + intent document details ────────────────────────
+    ver_map: dict[str, str] = {}
     intent_doc_details: dict[str, dict] = {}
-    for doc_type in INTENT_BASE_POINTS:
-        matching = [v for v in verifications if v.doc_type == doc_type]
-        if matching:
-            latest = sorted(matching, key=lambda x: x.submitted_at)[-1]
-            intent_doc_details[doc_type] = {
-                "status":                latest.status,
-                "loi_counterparty_known": latest.loi_counterparty_known,
+    for v in verifications:
+        ver_map[v.doc_type] = v.status
+        if v.doc_type in INTENT_BASE_POINTS:
+            intent_doc_details[v.doc_type] = {
+                "status":                 v.status,
+                "loi_counterparty_known": v.loi_counterparty_known,
             }
 
     # ── Revenue ───────────────────────────────────────────────────────────────
@@ -58,46 +170,205 @@ def build_evidence_package(sme: SME, db: Session) -> EvidencePackage:
     income_regularity = float(sme.bs_income_regularity) if sme.bs_income_regularity is not None else None
     months_analysed   = int(sme.bs_months_analysed)     if sme.bs_months_analysed   is not None else None
 
-    # ── Founder signals ───────────────────────────────────────────────────────
-    fp = db.query(FounderProfile).filter(FounderProfile.sme_id == sme.id).first()
-    founder = None
-    if fp is not None:
-        founder = FounderSignalInput(
-            years_industry_experience = fp.years_industry_experience,
-            highest_qualification     = fp.highest_qualification,
-            prior_business_owner      = fp.prior_business_owner,
-            trade_association_member  = fp.trade_association_member,
-            reference_provided        = bool(fp.reference_name) if fp.reference_name else None,
-        )
-
     return EvidencePackage(
         revenue=revenue,
         years_active=int(sme.years_active or 0),
         industry=sme.industry or "Other",
-        total_invoices=total_invoices,
-        paid_on_time=paid_on_time,
-        unpaid_invoices=unpaid_invoices,
+        total_invoices=int(invoices.total_invoices) if invoices is not None else 0,
+        paid_on_time=int(invoices.paid_on_time) if invoices is not None else 0,
+        unpaid_invoices=int(invoices.unpaid_invoices) if invoices is not None else 0,
         verifications=ver_map,
         intent_doc_details=intent_doc_details,
         overdraft_count=overdraft_count,
         income_regularity=income_regularity,
         months_analysed=months_analysed,
         province=sme.province or None,
-        founder=founder,
+        founder=_founder_signal(founder),
     )
 
 
+def build_evidence_package(sme: SME, db: Session) -> EvidencePackage:
+    """
+    Pull all signals for an SME from the database and return an EvidencePackage.
+
+    Reads the SME's row in sme_signal_snapshots (one primary-key lookup). When
+    there is no snapshot, or the session holds unflushed evidence changes, it
+    falls back to two queries, each transferring O(1) rows however long the
+    SME's history: invoice aggregates outer-joined to the founder profile, and
+    the latest verification per doc_type.
+
+    Unflushed changes are read from the session without flushing it: rows
+    with pending changes are left out of both queries and merged in from
+    memory, so the package reflects the session as the next flush will write it.
+    """
+    pending = has_pending_evidence(db)
+    if not pending:
+        snapshot = load_snapshots([sme.id], db).get(sme.id)
+        if snapshot is not None:
+            return snapshot
+
+    stale_invoices, pending_invoices = _pending_rows(db, Invoice, sme.id) if pending else ([], [])
+    stale_verifications, pending_verifications = _pending_rows(db, Verification, sme.id) if pending else ([], [])
+    stale_founders, pending_founders = _pending_rows(db, FounderProfile, sme.id) if pending else ([], [])
+
+    invoice_filter = [Invoice.sme_id == sme.id]
+    founder_join = [FounderProfile.sme_id == sme.id]
+    verification_filter = [Verification.sme_id == sme.id]
+    if stale_invoices:
+        invoice_filter.append(Invoice.id.not_in(stale_invoices))
+    if stale_founders:
+        founder_join.append(FounderProfile.id.not_in(stale_founders))
+    if stale_verifications:
+        verification_filter.append(Verification.id.not_in(stale_verifications))
+
+    invoices = select(*_invoice_aggregates()).where(*invoice_filter).subquery()
+    signals = db.execute(
+        select(invoices, FounderProfile.id.label("founder_id"), *_FOUNDER_COLUMNS)
+        .select_from(invoices)
+        .outerjoin(FounderProfile, and_(*founder_join))
+    ).one()
+    verifications = db.execute(_latest_verifications(*verification_filter)).all()
+
+    founder = signals if signals.founder_id is not None else None
+    if pending_founders:
+        founder = pending_founders[-1]
+    return _package(
+        sme,
+        _merge_invoices(signals, pending_invoices),
+        _merge_verifications(verifications, pending_verifications),
+        founder,
+    )
+
+
+def build_evidence_packages(
+    sme_ids, db: Session, chunk_size: int = EVIDENCE_CHUNK_SIZE, use_snapshots: bool = True,
+) -> Iterator[tuple[int, EvidencePackage]]:
+    """
+    Bulk build_evidence_package(): yields (sme_id, EvidencePackage) for each id,
+    in input order (ids with no SME are skipped; duplicates are built once).
+
+    Ids are processed chunk_size at a time with four grouped queries per chunk
+    (SME columns, invoice aggregates, latest verifications, founder profiles),
+    so the query count depends only on the number of chunks and memory on the
+    chunk size. Use dict(build_evidence_packages(...)) for a mapping.
+
+    With use_snapshots, each chunk is first read from sme_signal_snapshots and
+    only ids without a snapshot go through the grouped queries.
+    use_snapshots=False always aggregates the source tables (db may then be a
+    Connection, as in the snapshot listener).
+    """
+    ids = list(dict.fromkeys(sme_ids))
+    use_snapshots = use_snapshots and not has_pending_evidence(db)
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+
+        snapshots = load_snapshots(chunk, db) if use_snapshots else {}
+        missing = [sme_id for sme_id in chunk if sme_id not in snapshots]
+        if not missing:
+            for sme_id in chunk:
+                yield sme_id, snapshots[sme_id]
+            continue
+
+        smes = {
+            row.id: row for row in db.execute(
+                select(
+                    SME.id, SME.revenue, SME.bs_parsed_revenue, SME.years_active, SME.industry,
+                    SME.bs_overdraft_count, SME.bs_income_regularity, SME.bs_months_analysed, SME.province,
+                ).where(SME.id.in_(missing))
+            )
+        }
+        invoices = {
+            row.sme_id: row for row in db.execute(
+                select(Invoice.sme_id, *_invoice_aggregates())
+                .where(Invoice.sme_id.in_(missing))
+                .group_by(Invoice.sme_id)
+            )
+        }
+        verifications: dict[int, list] = {}
+        for row in db.execute(_latest_verifications(Verification.sme_id.in_(missing))):
+            verifications.setdefault(row.sme_id, []).append(row)
+        founders = {
+            row.sme_id: row for row in db.execute(
+                select(FounderProfile.sme_id, *_FOUNDER_COLUMNS).where(FounderProfile.sme_id.in_(missing))
+            )
+        }
+
+        for sme_id in chunk:
+            if sme_id in snapshots:
+                yield sme_id, snapshots[sme_id]
+                continue
+            sme = smes.get(sme_id)
+            if sme is None:
+                continue
+            yield sme_id, _package(sme, invoices.get(sme_id), verifications.get(sme_id, ()), founders.get(sme_id))
+
+
 # Backward compatibility alias
 build_scoring_input = build_evidence_package
 
 
-def score_sme(sme: SME, db: Session) -> AssessmentResult:
+def score_sme(sme: SME, db: Session, explain: bool = True, use_cache: bool = True) -> AssessmentResult:
     """
     Primary entry point. Returns a full AssessmentResult including
     business profile inference, context-appropriate weights, and confidence score.
 
     Return type is AssessmentResult which is a superset of ScoringResult —
     all existing code reading .score, .decision, .breakdown continues to work.
+    Pass explain=False when only .score / .decision / .profile are needed;
+    the breakdown is then built lazily on first access.
+
+    Results are served from the content-addressed assessment_cache: unchanged
+    evidence is not re-assessed. Cached results are shared — do not mutate them.
     """
     inp = build_evidence_package(sme, db)
-    return assess(inp)
+    if not use_cache:
+        return assess(inp, explain=explain)
+    result = assessment_cache.get_or_assess(inp, lambda pkg: assess(pkg, explain=explain))
+    latest_evidence.put(sme.id, inp, result)
+    return result
+
+
+def score_smes(
+    sme_ids, db: Session, explain: bool = True, use_cache: bool = True,
+    chunk_size: int = EVIDENCE_CHUNK_SIZE,
+) -> Iterator[tuple[int, AssessmentResult]]:
+    """
+    Batch score_sme(): yields (sme_id, AssessmentResult) in input order, with
+    evidence loaded by build_evidence_packages() — the standard input path
+    for anything that scores more than one SME.
+    """
+    for sme_id, inp in build_evidence_packages(sme_ids, db, chunk_size):
+        if not use_cache:
+            yield sme_id, assess(inp, explain=explain)
+            continue
+        result = assessment_cache.get_or_assess(inp, lambda pkg: assess(pkg, explain=explain))
+        latest_evidence.put(sme_id, inp, result)
+        yield sme_id, result
+
+
+def rescore_sme(sme: SME, db: Session) -> AssessmentResult:
+    """
+    Live re-score after a write to an SME's invoices, verifications or founder
+    profile. Scores the evidence as of the session's pending changes and adds
+    a CreditScore row without flushing — the caller's commit writes both in
+    one flush, so the after_flush listeners run once per write.
+
+    The SME's previously scored package is kept in latest_evidence, so only
+    the factors that depend on changed fields are recomputed (reassess()).
+    Returns a score-only result unless the baseline was explained.
+    """
+    new_pkg = build_evidence_package(sme, db)
+    key = evidence_fingerprint(new_pkg)
+    result = assessment_cache.get(key)
+    if result is None:
+        baseline = latest_evidence.get(sme.id)
+        if baseline is None:
+            result = assess(new_pkg, explain=False)
+        else:
+            old_pkg, previous = baseline
+            result = reassess(previous, old_pkg, new_pkg)
+        assessment_cache.put(key, result)
+    latest_evidence.put(sme.id, new_pkg, result)
+
+    db.add(CreditScore(sme_id=sme.id, score=result.score, created_at=datetime.utcnow()))
+    return result
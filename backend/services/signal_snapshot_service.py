@@ -0,0 +1,268 @@
+"""
+services/signal_snapshot_service.py
+
+Maintains sme_signal_snapshots — one precomputed EvidencePackage per SME.
+
+Writes: an after_flush listener on every Session collects the SMEs whose
+evidence a flush may have changed (new / deleted rows, or changes to the
+tracked columns of SME, Invoice, Verification and FounderProfile) and
+rebuilds their snapshot rows from the source tables on the same connection,
+so snapshots commit or roll back with the write that caused them. Rows are
+upserted and only rewritten when their evidence hash changed; the rebuilt
+packages stay available to later listeners of the same flush through
+flushed_packages().
+
+Reads: scoring_service.build_evidence_package(s) load the snapshot row and
+only fall back to aggregating the source tables when it is missing or the
+session holds unflushed evidence changes.
+
+Writes that bypass the ORM (raw SQL, bulk imports, data fixes) are not seen
+by the listener; reconcile_snapshots() rebuilds any rows that drifted.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict
+from datetime import datetime
+
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.sme import SME
+from models.invoice import Invoice
+from models.verification import Verification
+from models.founder_profile import FounderProfile
+from models.sme_signal_snapshot import SmeSignalSnapshot
+from core.scoring import EvidencePackage, FounderSignalInput
+
+# Columns whose changes can alter an SME's EvidencePackage. New and deleted rows always count.
+TRACKED_ATTRIBUTES: dict[type, frozenset[str]] = {
+    SME: frozenset({
+        "revenue", "bs_parsed_revenue", "years_active", "industry",
+        "bs_overdraft_count", "bs_income_regularity", "bs_months_analysed", "province",
+    }),
+    Invoice:        frozenset({"sme_id", "status", "due_date", "created_at"}),
+    Verification:   frozenset({"sme_id", "doc_type", "status", "submitted_at", "loi_counterparty_known"}),
+    FounderProfile: frozenset({
+        "sme_id", "years_industry_experience", "highest_qualification",
+        "prior_business_owner", "trade_association_member", "reference_name",
+    }),
+}
+_TRACKED_TYPES = tuple(TRACKED_ATTRIBUTES)
+
+_snapshots = SmeSignalSnapshot.__table__
+_FLUSHED_PACKAGES = "signal_snapshot_packages"
+
+
+# ── Conversion ────────────────────────────────────────────────────────────────
+
+def evidence_hash(pkg: EvidencePackage) -> str:
+    """Stable content hash of an EvidencePackage (dict ordering does not affect it)."""
+    encoded = json.dumps(asdict(pkg), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def snapshot_values(sme_id: int, pkg: EvidencePackage, digest: str | None = None) -> dict:
+    return {
+        "sme_id":             sme_id,
+        "revenue":            pkg.revenue,
+        "years_active":       pkg.years_active,
+        "industry":           pkg.industry,
+        "total_invoices":     pkg.total_invoices,
+        "paid_on_time":       pkg.paid_on_time,
+        "unpaid_invoices":    pkg.unpaid_invoices,
+        "verifications":      pkg.verifications,
+        "intent_doc_details": pkg.intent_doc_details,
+        "overdraft_count":    pkg.overdraft_count,
+        "income_regularity":  pkg.income_regularity,
+        "months_analysed":    pkg.months_analysed,
+        "province":           pkg.province,
+        "founder":            asdict(pkg.founder) if pkg.founder is not None else None,
+        "evidence_hash":      digest or evidence_hash(pkg),
+        "updated_at":         datetime.utcnow(),
+    }
+
+
+def package_from_snapshot(row) -> EvidencePackage:
+    return EvidencePackage(
+        revenue=row.revenue,
+        years_active=row.years_active,
+        industry=row.industry,
+        total_invoices=row.total_invoices,
+        paid_on_time=row.paid_on_time,
+        unpaid_invoices=row.unpaid_invoices,
+        verifications=dict(row.verifications),
+        intent_doc_details={k: dict(v) for k, v in row.intent_doc_details.items()},
+        overdraft_count=row.overdraft_count,
+        income_regularity=row.income_regularity,
+        months_analysed=row.months_analysed,
+        province=row.province,
+        founder=FounderSignalInput(**row.founder) if row.founder is not None else None,
+    )
+
+
+# ── Reads ─────────────────────────────────────────────────────────────────────
+
+def load_snapshots(sme_ids, db) -> dict[int, EvidencePackage]:
+    """{sme_id: EvidencePackage} for the ids that have a snapshot, in one primary-key query."""
+    rows = db.execute(select(SmeSignalSnapshot.__table__).where(SmeSignalSnapshot.sme_id.in_(list(sme_ids))))
+    return {row.sme_id: package_from_snapshot(row) for row in rows}
+
+
+def has_pending_evidence(db: Session) -> bool:
+    """True when the session holds unflushed changes that snapshots do not reflect yet."""
+    return any(isinstance(obj, _TRACKED_TYPES) for obj in (*db.new, *db.dirty, *db.deleted))
+
+
+# ── Writes ────────────────────────────────────────────────────────────────────
+
+def _upsert_snapshots(db, rows: list[dict], force: bool = False) -> None:
+    """
+    Inserts rows, or overwrites the stored snapshot of the same SME when its
+    evidence hash differs (always, with force). Unchanged snapshots are not
+    rewritten.
+    """
+    if not rows:
+        return
+    dialect = (db.get_bind() if isinstance(db, Session) else db).dialect.name
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect)
+    if dialect_insert is not None:
+        stmt = dialect_insert(_snapshots)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[_snapshots.c.sme_id],
+                set_={name: stmt.excluded[name] for name in rows[0] if name != "sme_id"},
+                where=None if force else _snapshots.c.evidence_hash != stmt.excluded.evidence_hash,
+            ),
+            rows,
+        )
+        return
+    stored = dict(db.execute(
+        select(_snapshots.c.sme_id, _snapshots.c.evidence_hash)
+        .where(_snapshots.c.sme_id.in_([row["sme_id"] for row in rows]))
+    ).all())
+    changed = [row for row in rows if force or stored.get(row["sme_id"]) != row["evidence_hash"]]
+    if changed:
+        db.execute(delete(_snapshots).where(_snapshots.c.sme_id.in_([row["sme_id"] for row in changed])))
+        db.execute(insert(_snapshots), changed)
+
+
+def write_snapshots(db, sme_ids, removed_ids=()) -> dict[int, EvidencePackage]:
+    """
+    Rebuilds the snapshots of sme_ids from the source tables and drops those
+    of removed_ids (and of ids with no SME). db is a Session or Connection;
+    the caller's transaction commits the result. Returns the rebuilt
+    packages, {sme_id: EvidencePackage}.
+    """
+    from services.scoring_service import build_evidence_packages
+
+    packages = dict(build_evidence_packages(sme_ids, db, use_snapshots=False))
+    gone = {*removed_ids, *(set(sme_ids) - packages.keys())}
+    if gone:
+        db.execute(delete(_snapshots).where(_snapshots.c.sme_id.in_(gone)))
+    _upsert_snapshots(db, [snapshot_values(sme_id, pkg) for sme_id, pkg in packages.items()])
+    return packages
+
+
+def flushed_packages(session: Session) -> dict[int, EvidencePackage]:
+    """
+    The packages the snapshot listener rebuilt in the flush being processed,
+    for later after_flush listeners that need the same evidence. Empty outside
+    after_flush.
+    """
+    return session.info.get(_FLUSHED_PACKAGES, {})
+
+
+def affected_sme_ids(session: Session) -> tuple[set[int], set[int]]:
+    """
+    (SME ids whose snapshot must be rebuilt, SME ids that were deleted) for the
+    session's pending changes. Called in after_flush, when new / dirty / deleted
+    and attribute history still describe the flush.
+    """
+    refresh: set[int] = set()
+    removed: set[int] = set()
+
+    def owners(obj, state) -> list:
+        if isinstance(obj, SME):
+            return [obj.id]
+        # An invoice / verification / founder moved between SMEs affects both
+        return [obj.sme_id, *state.attrs.sme_id.history.deleted]
+
+    for obj in session.new:
+        if isinstance(obj, _TRACKED_TYPES):
+            refresh.update(owners(obj, inspect(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, SME):
+            removed.add(obj.id)
+        elif isinstance(obj, _TRACKED_TYPES):
+            refresh.update(owners(obj, inspect(obj)))
+    for obj in session.dirty:
+        if not isinstance(obj, _TRACKED_TYPES):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES[type(obj)]):
+            refresh.update(owners(obj, state))
+
+    refresh.discard(None)
+    return refresh - removed, removed
+
+
+def _load_previous_owner(target, value, oldvalue, initiator) -> None:
+    pass
+
+
+# Moving a child row to another SME must refresh the old owner too; active_history
+# makes the ORM load the previous sme_id on assignment even when it was expired.
+for _model in (Invoice, Verification, FounderProfile):
+    event.listen(_model.sme_id, "set", _load_previous_owner, active_history=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_after_flush(session: Session, flush_context) -> None:
+    refresh, removed = affected_sme_ids(session)
+    if refresh or removed:
+        session.info[_FLUSHED_PACKAGES] = write_snapshots(session.connection(), refresh, removed)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _forget_flushed_packages(session: Session, flush_context) -> None:
+    session.info.pop(_FLUSHED_PACKAGES, None)
+
+
+# ── Reconcile job ─────────────────────────────────────────────────────────────
+
+def reconcile_snapshots(db: Session, chunk_size: int = 500) -> dict:
+    """
+    Rebuilds every SME's package from the source tables and rewrites the
+    snapshot rows that are missing or differ from it; drops snapshots of SMEs
+    that no longer exist. The caller commits. Returns counts.
+    """
+    from services.scoring_service import build_evidence_packages
+
+    stats = {"checked": 0, "missing": 0, "drifted": 0, "removed": 0}
+    sme_ids = db.execute(select(SME.id).order_by(SME.id)).scalars().all()
+    for start in range(0, len(sme_ids), chunk_size):
+        chunk = sme_ids[start:start + chunk_size]
+        stored = db.execute(
+            select(SmeSignalSnapshot.__table__).where(SmeSignalSnapshot.sme_id.in_(chunk))
+        ).all()
+        stored_hashes = {
+            row.sme_id: (row.evidence_hash, evidence_hash(package_from_snapshot(row))) for row in stored
+        }
+
+        rows = []
+        for sme_id, pkg in build_evidence_packages(chunk, db, chunk_size=chunk_size, use_snapshots=False):
+            stats["checked"] += 1
+            digest = evidence_hash(pkg)
+            if stored_hashes.get(sme_id) == (digest, digest):
+                continue
+            stats["missing" if sme_id not in stored_hashes else "drifted"] += 1
+            rows.append(snapshot_values(sme_id, pkg, digest))
+        _upsert_snapshots(db, rows, force=True)   # a drifted row may still carry the right hash
+
+    stats["removed"] = db.execute(
+        delete(SmeSignalSnapshot).where(SmeSignalSnapshot.sme_id.not_in(select(SME.id)))
+    ).rowcount
+    return stats
@@ -0,0 +1,218 @@
+"""
+services/whatif_service.py
+
+Counterfactual "what-if" engine.
+
+Takes an SME's real EvidencePackage and a set of perturbation axes, e.g.
+
+    revenue_delta = [0, 100_000, 200_000]   ×   on_time_rate = [0.7, 0.8, 0.9]
+
+builds one perturbed package per grid cell and scores the whole grid in a
+single assess_batch() pass. Scores are exact engine scores (assess_batch is
+bit-for-bit identical to assess()), not point approximations against a fixed
+RAW_MAX, and a few hundred cells score in a few milliseconds — fast enough to
+drive interactive sliders.
+
+Like recommendations_service, this module never calls the database.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from core.scoring import EvidencePackage, FounderSignalInput, COMPLIANCE_POINTS, INTENT_BASE_POINTS
+from core.assessment_engine import assess_batch
+
+MAX_GRID_CELLS = 2500
+DOCUMENT_TYPES: tuple[str, ...] = (*COMPLIANCE_POINTS, *INTENT_BASE_POINTS)
+
+
+# ── Perturbations ─────────────────────────────────────────────────────────────
+# Each perturbation maps (package, value) -> package. Values arrive from JSON,
+# so every perturbation validates / coerces its own value. Perturbations apply
+# in axis order: on_time_rate / unpaid_rate are fractions of the invoice count
+# at that point, so put total_invoices first for SMEs without invoices.
+
+def _with_rate(pkg: EvidencePackage, rate: float, attr: str, other: str) -> EvidencePackage:
+    """Sets paid_on_time / unpaid_invoices to a fraction of total invoices, keeping the pair consistent."""
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError(f"{attr} rate must be between 0.0 and 1.0: {rate}")
+    total = pkg.total_invoices
+    count = round(rate * total)
+    return dataclasses.replace(pkg, **{attr: count, other: min(getattr(pkg, other), total - count)})
+
+
+def _text(value: Any, nullable: bool = True) -> str | None:
+    """value if it is a string (or None, when nullable); anything else is rejected."""
+    if value is None and nullable:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"expected a string{' or null' if nullable else ''}, got {type(value).__name__}")
+    return value
+
+
+def _founder(pkg: EvidencePackage) -> FounderSignalInput:
+    return pkg.founder if pkg.founder is not None else FounderSignalInput()
+
+
+def _with_document(doc_type: str) -> Callable[[EvidencePackage, Any], EvidencePackage]:
+    def apply(pkg: EvidencePackage, status: str | None) -> EvidencePackage:
+        status = _text(status)
+        verifications = dict(pkg.verifications)
+        intent_details = dict(pkg.intent_doc_details)
+        if status is None:
+            verifications.pop(doc_type, None)
+            intent_details.pop(doc_type, None)
+        else:
+            verifications[doc_type] = status
+            if doc_type in intent_details:
+                intent_details[doc_type] = {**intent_details[doc_type], "status": status}
+        return dataclasses.replace(pkg, verifications=verifications, intent_doc_details=intent_details)
+    return apply
+
+
+PERTURBATIONS: dict[str, Callable[[EvidencePackage, Any], EvidencePackage]] = {
+    "revenue":            lambda p, v: dataclasses.replace(p, revenue=float(v)),
+    "revenue_delta":      lambda p, v: dataclasses.replace(p, revenue=max(p.revenue + float(v), 0.0)),
+    "years_active":       lambda p, v: dataclasses.replace(p, years_active=int(v)),
+    "total_invoices":     lambda p, v: dataclasses.replace(
+        p, total_invoices=int(v),
+        paid_on_time=min(p.paid_on_time, int(v)),
+        unpaid_invoices=min(p.unpaid_invoices, int(v) - min(p.paid_on_time, int(v))),
+    ),
+    "on_time_rate":       lambda p, v: _with_rate(p, float(v), "paid_on_time", "unpaid_invoices"),
+    "unpaid_rate":        lambda p, v: _with_rate(p, float(v), "unpaid_invoices", "paid_on_time"),
+    "months_analysed":    lambda p, v: dataclasses.replace(p, months_analysed=None if v is None else int(v)),
+    "income_regularity":  lambda p, v: dataclasses.replace(p, income_regularity=None if v is None else float(v)),
+    "overdraft_count":    lambda p, v: dataclasses.replace(p, overdraft_count=None if v is None else int(v)),
+    "province":           lambda p, v: dataclasses.replace(p, province=_text(v) or None),
+    "industry":           lambda p, v: dataclasses.replace(p, industry=_text(v, nullable=False)),
+    "founder_experience": lambda p, v: dataclasses.replace(
+        p, founder=dataclasses.replace(_founder(p), years_industry_experience=None if v is None else int(v)),
+    ),
+    "qualification":      lambda p, v: dataclasses.replace(
+        p, founder=dataclasses.replace(_founder(p), highest_qualification=_text(v)),
+    ),
+    **{f"doc:{doc_type}": _with_document(doc_type) for doc_type in DOCUMENT_TYPES},
+}
+
+
+# ── Output ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class Axis:
+    name:   str
+    values: list
+
+
+@dataclass
+class SimulationCell:
+    values:     dict[str, Any]      # axis name -> value for this cell
+    score:      float | None        # None when the perturbed evidence is invalid
+    decision:   str | None
+    profile:    str | None
+    confidence: float | None
+    delta:      float | None        # score - baseline score
+    errors:     list[str] = field(default_factory=list)
+
+
+@dataclass
+class SimulationResult:
+    baseline: SimulationCell
+    axes:     list[Axis]
+    cells:    list[SimulationCell]  # row-major over axes (last axis varies fastest)
+
+    def score_grid(self) -> list:
+        """Scores nested by axis, e.g. grid[i][j] for two axes."""
+        scores: list = [c.score for c in self.cells]
+        for axis in reversed(self.axes[1:]):
+            n = len(axis.values)
+            scores = [scores[i:i + n] for i in range(0, len(scores), n)]
+        return scores
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+
+def _validate_axes(axes: list[Axis]) -> None:
+    names = [a.name for a in axes]
+    unknown = [n for n in names if n not in PERTURBATIONS]
+    if unknown:
+        raise ValueError(f"Unknown what-if axes {unknown}. Valid axes: {sorted(PERTURBATIONS)}")
+    if len(set(names)) != len(names):
+        raise ValueError("Each what-if axis may appear only once")
+    if any(not a.values for a in axes):
+        raise ValueError("Every what-if axis needs at least one value")
+    cells = 1
+    for a in axes:
+        cells *= len(a.values)
+    if cells > MAX_GRID_CELLS:
+        raise ValueError(f"What-if grid has {cells} cells; the maximum is {MAX_GRID_CELLS}")
+
+
+def perturb(pkg: EvidencePackage, values: dict[str, Any]) -> EvidencePackage:
+    """Applies {axis name: value} perturbations to a copy of pkg, in the given order."""
+    for name, value in values.items():
+        pkg = PERTURBATIONS[name](pkg, value)
+    return pkg
+
+
+def simulate(pkg: EvidencePackage, scenarios: list[dict[str, Any]]) -> tuple[SimulationCell, list[SimulationCell]]:
+    """
+    Scores the baseline package plus one perturbed package per scenario
+    ({axis name: value}) in a single batched pass.
+    Returns (baseline cell, scenario cells). Raises ValueError for unknown
+    axes or values a perturbation cannot apply.
+    """
+    unknown = {name for s in scenarios for name in s} - set(PERTURBATIONS)
+    if unknown:
+        raise ValueError(f"Unknown what-if axes {sorted(unknown)}. Valid axes: {sorted(PERTURBATIONS)}")
+
+    packages = [pkg]
+    for values in scenarios:
+        try:
+            packages.append(perturb(pkg, values))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Cannot apply what-if {values}: {e}") from e
+
+    batch = assess_batch(packages)
+    scores = batch.score.tolist()
+    confidence = batch.confidence_score.tolist()
+    profiles, decisions = batch.profiles, batch.decisions
+    baseline_score = scores[0] if batch.valid[0] else None
+
+    cells = []
+    for i, values in enumerate([{}, *scenarios]):
+        if not batch.valid[i]:
+            cells.append(SimulationCell(values, None, None, None, None, None, batch.errors.get(i, [])))
+            continue
+        cells.append(SimulationCell(
+            values=values,
+            score=scores[i],
+            decision=decisions[i],
+            profile=profiles[i].value,
+            confidence=confidence[i],
+            delta=round(scores[i] - baseline_score, 1) if baseline_score is not None else None,
+        ))
+    return cells[0], cells[1:]
+
+
+def simulate_grid(pkg: EvidencePackage, axes: list[Axis]) -> SimulationResult:
+    """Scores every combination of the axis values (cartesian product) against pkg."""
+    _validate_axes(axes)
+    scenarios = [
+        dict(zip((a.name for a in axes), combo))
+        for combo in itertools.product(*(a.values for a in axes))
+    ] if axes else []
+    baseline, cells = simulate(pkg, scenarios)
+    return SimulationResult(baseline=baseline, axes=axes, cells=cells)
+
+
+def document_toggles(pkg: EvidencePackage) -> list[dict[str, Any]]:
+    """One scenario per scored document, flipping it: approved -> removed, anything else -> approved."""
+    return [
+        {f"doc:{doc_type}": None if pkg.verifications.get(doc_type) == "approved" else "approved"}
+        for doc_type in DOCUMENT_TYPES
+    ]
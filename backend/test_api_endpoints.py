@@ -1,10 +1,13 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from database import Base, get_db
+from sqlalchemy.pool import NullPool
+from database import Base, get_db, get_async_db
 from main import app
 from limiter import limiter
+from services.query_stats_service import query_budgets
 from models.user import User
 from models.sme import SME
 from models.invoice import Invoice
@@ -25,6 +28,15 @@ TEST_DB_URL = f"sqlite:///./{TEST_DB_FILE}"
 engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async endpoints read the same file through aiosqlite. NullPool: TestClient
+# runs each request on its own event loop, so connections cannot be reused.
+async_engine = create_async_engine(f"sqlite+aiosqlite:///./{TEST_DB_FILE}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 @pytest.fixture(scope="module", autouse=True)
 def setup_db():
     # Remove existing DB file if any
@@ -35,7 +47,11 @@ def setup_db():
             pass
     Base.metadata.create_all(bind=engine)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Routes that declare a @query_budget fail these tests when they exceed it
+    query_budgets.enforce = True
     yield
+    query_budgets.enforce = False
     app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
     if os.path.exists(TEST_DB_FILE):
@@ -156,3 +172,198 @@ def test_auth_and_sme_flow():
     assert upload_response.status_code == 200
     assert upload_response.json()["status"] == "pending"
     assert upload_response.json()["doc_type"] == "cipc"
+
+
+def test_invoice_writes_rescore_sme_live():
+    unique_suffix = uuid.uuid4().hex[:6]
+    client.post("/auth/register", json={
+        "username": f"rescore_{unique_suffix}",
+        "email": f"rescore_{unique_suffix}@test.com",
+        "password": "Password123",
+        "role": "sme"
+    })
+    token = client.post("/auth/login", json={
+        "username": f"rescore_{unique_suffix}",
+        "password": "Password123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    sme_id = client.post("/smes/", json={
+        "name": "Rescore Co",
+        "industry": "Retail",
+        "revenue": 250000.0,
+        "years_active": 4
+    }, headers=headers).json()["id"]
+
+    def history():
+        db = TestingSessionLocal()
+        try:
+            return [s.score for s in db.query(CreditScore).filter(CreditScore.sme_id == sme_id).order_by(CreditScore.id)]
+        finally:
+            db.close()
+
+    before = len(history())
+    invoice_id = client.post("/invoices/", json={
+        "client_name": "Client Y",
+        "amount": 1000.0,
+        "due_date": "2999-01-01T00:00:00"
+    }, headers=headers).json()["invoice"]["id"]
+    assert len(history()) == before + 1
+
+    paid = client.put(f"/invoices/{invoice_id}/paid", headers=headers)
+    assert paid.status_code == 200
+    scores = history()
+    assert len(scores) == before + 2
+    # One invoice, now paid on time: timeliness and unpaid ratio both improve
+    assert scores[-1] > scores[-2]
+
+    full = client.post(f"/credit-scores/calculate/{sme_id}", headers=headers).json()["score"]
+    assert full == scores[-1]
+
+
+def test_recommendations_simulate_grid():
+    unique_suffix = uuid.uuid4().hex[:6]
+    client.post("/auth/register", json={
+        "username": f"whatif_{unique_suffix}",
+        "email": f"whatif_{unique_suffix}@test.com",
+        "password": "Password123",
+        "role": "sme"
+    })
+    token = client.post("/auth/login", json={
+        "username": f"whatif_{unique_suffix}",
+        "password": "Password123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/smes/", json={
+        "name": "What If Co", "industry": "Technology", "revenue": 120000.0, "years_active": 2
+    }, headers=headers)
+
+    response = client.post("/recommendations/simulate", json={
+        "axes": [
+            {"name": "revenue_delta", "values": [0, 200000]},
+            {"name": "years_active", "values": [2, 5, 8]},
+        ],
+        "toggle_documents": True,
+    }, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["cells"]) == 6
+    assert len(data["grid"]) == 2 and len(data["grid"][0]) == 3
+    assert data["cells"][0]["score"] == data["baseline"]["score"]
+    assert data["grid"][1][2] >= data["grid"][0][0]
+    assert len(data["document_toggles"]) == 7
+
+    bad = client.post("/recommendations/simulate", json={"axes": [{"name": "nope", "values": [1]}]}, headers=headers)
+    assert bad.status_code == 422
+    for axis in [{"name": "qualification", "values": [5]}, {"name": "province", "values": [["x"]]}]:
+        wrong_type = client.post("/recommendations/simulate", json={"axes": [axis]}, headers=headers)
+        assert wrong_type.status_code == 422
+
+
+def test_admin_metrics_reports_engine_latency():
+    from services.auth_service import hash_password
+    from services.metrics_service import assessment_metrics
+
+    unique_suffix = uuid.uuid4().hex[:6]
+    db = TestingSessionLocal()
+    db.add(User(username=f"metrics_admin_{unique_suffix}", email=f"metrics_admin_{unique_suffix}@test.com",
+                hashed_password=hash_password("AdminPass123"), role="admin"))
+    db.commit()
+    db.close()
+    admin_token = client.post("/auth/login", json={
+        "username": f"metrics_admin_{unique_suffix}", "password": "AdminPass123"
+    }).json()["access_token"]
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+
+    client.post("/auth/register", json={
+        "username": f"metrics_{unique_suffix}",
+        "email": f"metrics_{unique_suffix}@test.com",
+        "password": "Password123",
+        "role": "sme"
+    })
+    token = client.post("/auth/login", json={
+        "username": f"metrics_{unique_suffix}",
+        "password": "Password123"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/admin/metrics", headers=headers).status_code == 403
+
+    assessment_metrics.reset()
+    assessment_metrics.enable()
+    try:
+        sme_id = client.post("/smes/", json={
+            "name": "Metrics Co", "industry": "Retail", "revenue": 90000.0, "years_active": 1
+        }, headers=headers).json()["id"]
+        client.post(f"/credit-scores/calculate/{sme_id}", headers=headers)
+        client.post(f"/credit-scores/calculate/{sme_id}", headers=headers)
+        response = client.get("/admin/metrics", headers=admin_headers)
+    finally:
+        assessment_metrics.disable()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'sme_assessment_stage_duration_seconds_count{stage="calculate"' in body
+    assert 'outcome="scored"}' in body
+    assert 'outcome="cache_hit"}' in body
+
+
+def test_async_read_endpoints():
+    def register(prefix, role):
+        suffix = uuid.uuid4().hex[:6]
+        client.post("/auth/register", json={
+            "username": f"{prefix}_{suffix}",
+            "email": f"{prefix}_{suffix}@test.com",
+            "password": "Password123",
+            "role": role
+        })
+        token = client.post("/auth/login", json={
+            "username": f"{prefix}_{suffix}",
+            "password": "Password123"
+        }).json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    headers = register("asyncsme", "sme")
+    sme_id = client.post("/smes/", json={
+        "name": "Async Co",
+        "industry": "Retail",
+        "revenue": 320000.0,
+        "years_active": 3
+    }, headers=headers).json()["id"]
+    invoice_id = client.post("/invoices/", json={
+        "client_name": "Client A",
+        "amount": 20000.0,
+        "description": "Goods"
+    }, headers=headers).json()["invoice"]["id"]
+    client.post("/finance/apply", json={
+        "invoice_id": invoice_id,
+        "amount": 5000.0,
+        "purpose_of_funding": "Stock"
+    }, headers=headers)
+
+    latest = client.get(f"/credit-scores/latest/{sme_id}", headers=headers)
+    assert latest.status_code == 200
+    score = latest.json()["latest_score"]
+
+    dashboard = client.get("/smes/dashboard", headers=headers)
+    assert dashboard.status_code == 200
+    data = dashboard.json()
+    assert (data["sme_id"], data["credit_score"], data["invoice_count"]) == (sme_id, int(round(score)), 1)
+    assert data["recent_finance_requests"][0]["invoice_client_name"] == "Client A"
+
+    assert client.get(f"/credit-scores/decision/{sme_id}", headers=headers).json()["latest_score"] == score
+    details = client.get(f"/credit-scores/details/{sme_id}", headers=headers).json()
+    assert details["score"] == score and details["breakdown"]
+    history = client.get(f"/credit-scores/sme/{sme_id}", headers=headers).json()
+    assert history[0]["score"] == score
+    assert len(client.get(f"/credit-scores/history/{sme_id}", headers=headers).json()) == len(history)
+
+    other = register("asyncother", "sme")
+    assert client.get(f"/credit-scores/latest/{sme_id}", headers=other).status_code == 403
+    assert client.get("/credit-scores/latest/999999", headers=register("asynclender", "lender")).status_code == 404
+
+    lender = register("asynclender", "lender")
+    listed = client.get("/lenders/available-smes", headers=lender).json()
+    row = next(r for r in listed if r["sme_id"] == sme_id)
+    assert (row["credit_score"], row["pending_finance_requests"]) == (score, 1)
+    assert client.get("/lenders/available-smes", headers=headers).status_code == 403
@@ -1,14 +1,16 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 import sys
 from pathlib import Path
 
 # Add backend directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from database import Base, get_db
+from database import Base, get_db, get_async_db
 from main import app
 from models.user import User
 from models.sme import SME
@@ -20,6 +22,15 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test_api_v1.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async endpoints read the same file through aiosqlite. NullPool: TestClient
+# runs each request on its own event loop, so connections cannot be reused.
+async_engine = create_async_engine("sqlite+aiosqlite:///./test_api_v1.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 def override_get_db():
     db = TestingSessionLocal()
     try:
@@ -31,6 +42,7 @@ def override_get_db():
 def setup_db():
     Base.metadata.create_all(bind=engine)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     db = TestingSessionLocal()
     
     # Create test users
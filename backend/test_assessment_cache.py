@@ -0,0 +1,111 @@
+"""
+test_assessment_cache.py
+
+Tests for the content-addressed assessment cache: stable fingerprints,
+LRU / TTL eviction, hit/miss counters and explicit invalidation.
+
+Run from backend/:  pytest test_assessment_cache.py -v
+"""
+from dataclasses import replace
+
+from core.scoring import EvidencePackage, FounderSignalInput
+from core.assessment_engine import (
+    assess, STRATEGIES, STRATEGY_VERSIONS, SCORING_PLANS, register_strategy_version,
+)
+from services.market_data_service import market_tables_changed
+from services.assessment_cache import AssessmentCache, evidence_fingerprint, assessment_cache
+
+
+def _pkg(**overrides) -> EvidencePackage:
+    fields = dict(
+        revenue=120_000, years_active=2, industry="Retail",
+        total_invoices=10, paid_on_time=8, unpaid_invoices=1,
+        verifications={"cipc": "approved", "tax_clearance": "approved"},
+        province="Gauteng",
+        founder=FounderSignalInput(years_industry_experience=3),
+    )
+    fields.update(overrides)
+    return EvidencePackage(**fields)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fingerprint_is_stable_and_order_independent():
+    a = _pkg(verifications={"cipc": "approved", "tax_clearance": "approved"})
+    b = _pkg(verifications={"tax_clearance": "approved", "cipc": "approved"})
+    assert evidence_fingerprint(a) == evidence_fingerprint(b)
+
+
+def test_fingerprint_changes_with_evidence_and_versions():
+    base = evidence_fingerprint(_pkg())
+    assert evidence_fingerprint(_pkg(paid_on_time=9)) != base
+    assert evidence_fingerprint(_pkg(founder=None)) != base
+    assert evidence_fingerprint(_pkg(), strategy_version="v2") != base
+    assert evidence_fingerprint(_pkg(), inference_version="v2") != base
+
+
+def test_get_or_assess_counts_hits_and_misses():
+    cache = AssessmentCache(maxsize=10, ttl_seconds=60)
+    calls = []
+
+    def scorer(pkg):
+        calls.append(pkg)
+        return assess(pkg)
+
+    first = cache.get_or_assess(_pkg(), scorer)
+    second = cache.get_or_assess(_pkg(), scorer)
+    assert first is second
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_lru_eviction_is_size_bounded():
+    cache = AssessmentCache(maxsize=2, ttl_seconds=60)
+    result = assess(_pkg())
+    cache.put("a", result)
+    cache.put("b", result)
+    cache.get("a")              # a becomes most recently used
+    cache.put("c", result)      # evicts b
+    assert cache.get("b") is None
+    assert cache.get("a") is result and cache.get("c") is result
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = AssessmentCache(maxsize=10, ttl_seconds=30, clock=clock)
+    cache.put("k", assess(_pkg()))
+    clock.now = 29.9
+    assert cache.get("k") is not None
+    clock.now = 30.0
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalid_evidence_is_not_cached():
+    import pytest
+    cache = AssessmentCache(maxsize=10, ttl_seconds=60)
+    with pytest.raises(ValueError):
+        cache.get_or_assess(_pkg(revenue=-1), assess)
+    assert cache.stats()["size"] == 0
+
+
+def test_market_table_and_strategy_changes_invalidate_shared_cache():
+    assessment_cache.put("probe", assess(_pkg()))
+    market_tables_changed()
+    assert assessment_cache.get("probe") is None
+
+    assessment_cache.put("probe", assess(_pkg()))
+    try:
+        register_strategy_version("test-only", {p: replace(s) for p, s in STRATEGIES.items()})
+        assert assessment_cache.get("probe") is None
+    finally:
+        STRATEGY_VERSIONS.pop("test-only", None)
+        SCORING_PLANS.pop("test-only", None)
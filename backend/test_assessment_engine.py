@@ -460,3 +460,134 @@ class TestAssessmentEngine:
 
 
 
+
+
+# ── Score-only fast path ──────────────────────────────────────────────────────
+
+class TestScoreOnlyPath:
+
+    def _packages(self):
+        return [
+            EvidencePackage(
+                revenue=0, years_active=0, industry="Retail",
+                total_invoices=0, paid_on_time=0, unpaid_invoices=0,
+                verifications={}, province=None,
+            ),
+            EvidencePackage(
+                revenue=180_000, years_active=1, industry="Technology",
+                total_invoices=8, paid_on_time=6, unpaid_invoices=1,
+                verifications={"cipc": "approved", "letter_of_intent": "approved"},
+                intent_doc_details={"letter_of_intent": {"status": "approved", "loi_counterparty_known": True}},
+                months_analysed=4, income_regularity=0.7, overdraft_count=1, province="Gauteng",
+                founder=FounderSignalInput(years_industry_experience=6, highest_qualification="Degree",
+                                           prior_business_owner=True),
+            ),
+            EvidencePackage(
+                revenue=750_000, years_active=6, industry="Construction",
+                total_invoices=40, paid_on_time=30, unpaid_invoices=5,
+                verifications={"cipc": "approved", "tax_clearance": "approved"}, province="Limpopo",
+            ),
+        ]
+
+    def test_score_only_matches_explained(self):
+        for inp in self._packages():
+            full = assess(inp)
+            fast = assess(inp, explain=False)
+            assert (fast.score, fast.decision, fast.profile, fast.confidence_score) == \
+                   (full.score, full.decision, full.profile, full.confidence_score)
+            assert fast == full
+
+    def test_breakdown_is_lazy_and_identical(self):
+        for inp in self._packages():
+            fast = assess(inp, explain=False)
+            assert not fast.is_explained
+            assert fast.breakdown == assess(inp).breakdown
+            assert fast.is_explained
+            assert fast.breakdown is fast.breakdown   # materialised once
+
+    def test_score_only_still_validates(self):
+        import pytest
+        inp = EvidencePackage(
+            revenue=-1, years_active=0, industry="Retail",
+            total_invoices=0, paid_on_time=0, unpaid_invoices=0, verifications={},
+        )
+        with pytest.raises(ValueError):
+            assess(inp, explain=False)
+
+
+# ── Incremental re-assessment ─────────────────────────────────────────────────
+
+class TestReassess:
+
+    def _base(self):
+        return EvidencePackage(
+            revenue=180_000, years_active=4, industry="Technology",
+            total_invoices=25, paid_on_time=18, unpaid_invoices=4,
+            verifications={"cipc": "approved", "letter_of_intent": "pending"},
+            intent_doc_details={"letter_of_intent": {"status": "pending", "loi_counterparty_known": None}},
+            months_analysed=6, income_regularity=0.7, overdraft_count=1, province="Gauteng",
+            founder=FounderSignalInput(years_industry_experience=3, highest_qualification="diploma"),
+        )
+
+    def _writes(self, base):
+        import dataclasses
+        return [
+            # invoice marked paid
+            dataclasses.replace(base, paid_on_time=19, unpaid_invoices=3),
+            # verification approved, counterparty confirmed
+            dataclasses.replace(
+                base,
+                verifications={**base.verifications, "letter_of_intent": "approved", "tax_clearance": "approved"},
+                intent_doc_details={"letter_of_intent": {"status": "approved", "loi_counterparty_known": True}},
+            ),
+            # founder profile updated
+            dataclasses.replace(base, founder=FounderSignalInput(years_industry_experience=7, prior_business_owner=True)),
+            # profile change (ESTABLISHED -> GROWTH) falls back to a full assessment
+            dataclasses.replace(base, years_active=1, total_invoices=5, paid_on_time=4, unpaid_invoices=1),
+            # nothing changed
+            base,
+        ]
+
+    def test_dependency_map_covers_every_factor_and_field(self):
+        import dataclasses
+        from core.assessment_engine import ScoreCalculator
+        from core.factor_registry import FACTOR_ORDER
+        assert set(ScoreCalculator.DEPENDENCIES) == set(FACTOR_ORDER)
+        deps = set().union(*ScoreCalculator.DEPENDENCIES.values())
+        assert deps == {f.name for f in dataclasses.fields(EvidencePackage)}
+        assert ScoreCalculator.affected_factors({"paid_on_time"}) == {"Invoice Timeliness"}
+        assert ScoreCalculator.affected_factors({"founder"}) == {"Founder Signal"}
+
+    def test_matches_full_assessment(self):
+        from core.assessment_engine import reassess
+        base = self._base()
+        for explain in (True, False):
+            previous = assess(base, explain=explain)
+            for new in self._writes(base):
+                expected = assess(new, explain=explain)
+                result = reassess(previous, base, new)
+                assert type(result) is type(expected)
+                assert result == expected
+                assert result.breakdown == expected.breakdown
+
+    def test_only_affected_factors_recomputed(self, monkeypatch):
+        import dataclasses
+        from core.assessment_engine import ScoreCalculator, reassess
+        base = self._base()
+        previous = assess(base)
+        seen = []
+        original = ScoreCalculator.calculate
+        monkeypatch.setattr(ScoreCalculator, "calculate", staticmethod(
+            lambda inp, strategy, unavailable, factors=None:
+                seen.append(factors) or original(inp, strategy, unavailable, factors)
+        ))
+        reassess(previous, base, dataclasses.replace(base, paid_on_time=19, unpaid_invoices=3))
+        assert seen == [{"Invoice Timeliness", "Unpaid Invoice Ratio"}]
+
+    def test_invalid_new_evidence_raises(self):
+        import dataclasses
+        import pytest
+        from core.assessment_engine import reassess
+        base = self._base()
+        with pytest.raises(ValueError):
+            reassess(assess(base), base, dataclasses.replace(base, paid_on_time=40))
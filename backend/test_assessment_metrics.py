@@ -0,0 +1,140 @@
+"""
+test_assessment_metrics.py
+
+Tests for the assess() / reassess() instrumentation hooks and the Prometheus
+metrics collector: instrumented results must equal uninstrumented ones,
+events must carry every stage timing, write-path reassessments must be
+reported as such, and the text exposition must be well formed.
+
+Run from backend/:  pytest test_assessment_metrics.py -v
+"""
+import dataclasses
+
+import pytest
+
+from core.scoring import EvidencePackage
+from core.assessment_engine import (
+    ASSESSMENT_STAGES,
+    AssessmentEvent,
+    add_assessment_hook,
+    assess,
+    assessment_hooks_active,
+    reassess,
+    remove_assessment_hook,
+)
+from services.metrics_service import AssessmentMetrics
+
+
+def _pkg(**overrides) -> EvidencePackage:
+    fields = dict(
+        revenue=180_000, years_active=3, industry="Retail",
+        total_invoices=12, paid_on_time=9, unpaid_invoices=2,
+        verifications={"cipc": "approved"}, province="Gauteng",
+    )
+    fields.update(overrides)
+    return EvidencePackage(**fields)
+
+
+@pytest.fixture
+def events():
+    received = []
+    add_assessment_hook(received.append)
+    yield received
+    remove_assessment_hook(received.append)
+
+
+def test_no_hooks_registered_by_default():
+    assert not assessment_hooks_active()
+
+
+def test_hook_receives_stage_timings(events):
+    pkg = _pkg()
+    result = assess(pkg)
+    fast = assess(pkg, explain=False)
+
+    assert len(events) == 2
+    event = events[0]
+    assert tuple(event.stage_ns) == ASSESSMENT_STAGES
+    assert all(ns >= 0 for ns in event.stage_ns.values())
+    assert event.total_ns == sum(event.stage_ns.values())
+    assert (event.profile, event.strategy_version) == (result.profile.value, result.strategy_version)
+    assert event.explain and not events[1].explain
+    assert not event.cache_hit and not event.failed
+
+    remove_assessment_hook(events.append)
+    assert assess(pkg) == result
+    assert (assess(pkg, explain=False).score, fast.breakdown) == (fast.score, result.breakdown)
+
+
+def test_hook_reports_reassessments(events):
+    pkg = _pkg()
+    paid = dataclasses.replace(pkg, paid_on_time=10, unpaid_invoices=1)
+    for explain in (True, False):
+        previous = assess(pkg, explain=explain)
+        events.clear()
+        result = reassess(previous, pkg, paid)
+
+        assert len(events) == 1
+        event = events[0]
+        assert event.reassessed and not event.failed and not event.cache_hit
+        assert tuple(event.stage_ns) == ASSESSMENT_STAGES
+        assert (event.profile, event.explain) == (result.profile.value, explain)
+        assert result.score == assess(paid).score
+
+    # A profile change falls back to a full assess(), reported as one
+    previous = assess(pkg)
+    events.clear()
+    result = reassess(previous, pkg, dataclasses.replace(pkg, years_active=0, total_invoices=0, paid_on_time=0,
+                                                         unpaid_invoices=0))
+    assert result.profile != previous.profile
+    assert len(events) == 1 and not events[0].reassessed
+
+    events.clear()
+    with pytest.raises(ValueError):
+        reassess(previous, pkg, dataclasses.replace(pkg, years_active=-1))
+    assert len(events) == 1 and events[0].failed and events[0].reassessed
+
+
+def test_hook_reports_failed_validation(events):
+    with pytest.raises(ValueError):
+        assess(_pkg(years_active=-1))
+    assert events[0].failed and events[0].profile is None
+    assert tuple(events[0].stage_ns) == ("validate",)
+
+
+def test_failing_hook_does_not_break_scoring():
+    def broken(event):
+        raise RuntimeError("boom")
+
+    add_assessment_hook(broken)
+    try:
+        assert assess(_pkg()).score > 0
+    finally:
+        remove_assessment_hook(broken)
+
+
+def test_collector_renders_prometheus_text():
+    metrics = AssessmentMetrics(buckets=(0.0001, 0.001))
+    stages = {stage: 10_000 for stage in ASSESSMENT_STAGES}      # 10 µs each, 60 µs total
+    metrics.record(AssessmentEvent("growth", "v1", True, 2, stage_ns=stages))
+    metrics.record(AssessmentEvent("growth", "v1", True, 0, stage_ns={**stages, "calculate": 2_000_000}))
+    metrics.record(AssessmentEvent("growth", "v1", False, 0, cache_hit=True))
+    metrics.record(AssessmentEvent(None, None, True, 1, failed=True, stage_ns={"validate": 1_000}))
+    metrics.record(AssessmentEvent("growth", "v2", False, 0, reassessed=True, stage_ns=stages))
+    text = metrics.render()
+
+    assert text.endswith("\n")
+    assert "# TYPE sme_assessment_duration_seconds histogram" in text
+    assert 'sme_assessment_duration_seconds_bucket{profile="growth",strategy_version="v1",le="0.0001"} 1' in text
+    assert 'sme_assessment_duration_seconds_bucket{profile="growth",strategy_version="v1",le="+Inf"} 2' in text
+    assert 'sme_assessment_duration_seconds_count{profile="growth",strategy_version="v1"} 2' in text
+    assert 'sme_assessment_stage_duration_seconds_bucket{stage="calculate",profile="growth",strategy_version="v1",le="0.001"} 1' in text
+    assert 'sme_assessments_total{profile="growth",strategy_version="v1",outcome="cache_hit"} 1' in text
+    assert 'sme_assessments_total{profile="growth",strategy_version="v1",outcome="scored"} 2' in text
+    assert 'sme_assessments_total{profile="none",strategy_version="none",outcome="invalid"} 1' in text
+    assert 'sme_assessments_total{profile="growth",strategy_version="v2",outcome="reassessed"} 1' in text
+    assert 'sme_assessment_duration_seconds_count{profile="growth",strategy_version="v2"} 1' in text
+    assert 'sme_assessment_validation_warnings_total{profile="growth"} 2' in text
+
+    metrics.reset()
+    assert "sme_assessments_total{" not in metrics.render()
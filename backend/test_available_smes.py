@@ -0,0 +1,177 @@
+"""
+test_available_smes.py
+
+Tests for /lenders/available-smes: the filters and sorts agree with the same
+selection done in Python, walking any sort with cursors visits every match
+once, a lender profile's min_credit_score and max_lending_amount are applied,
+and every page is read with one query.
+
+Run from backend/:  pytest test_available_smes.py -v
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from database import Base, get_db, get_async_db
+from main import app
+from limiter import limiter
+from models import User, SME, Lender, Invoice, FinanceRequest
+from services.auth_service import create_access_token
+
+limiter.enabled = False
+
+BROWSER = {"Authorization": f"Bearer {create_access_token({'sub': 'as_browser'})}"}    # no lender profile
+PROFILED = {"Authorization": f"Bearer {create_access_token({'sub': 'as_lender'})}"}    # min 50, max 20,000
+
+SCORES = [None, 35.0, 42.5, 50.0, 59.9, 60.0, 74.0, 88.0, 50.0]
+INDUSTRIES = ["Retail", "Mining", "Agriculture"]
+PROVINCES = ["Gauteng", None, "Limpopo", "Western Cape"]
+
+
+def _sme(i: int) -> dict:
+    return {
+        "id": i, "name": f"AS {i}", "industry": INDUSTRIES[i % 3], "province": PROVINCES[i % 4],
+        "revenue": 100000 + (i * 7919) % 50000, "latest_score": SCORES[i % len(SCORES)],
+    }
+
+
+SMES = [_sme(i) for i in range(1, 31)]
+
+
+@pytest.fixture(autouse=True)
+def client(tmp_path):
+    path = tmp_path / "available.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    created = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": 1, "username": "as_owner", "email": "as_owner@example.com", "hashed_password": "x", "role": "sme"},
+            {"id": 2, "username": "as_browser", "email": "as_browser@example.com", "hashed_password": "x",
+             "role": "lender"},
+            {"id": 3, "username": "as_lender", "email": "as_lender@example.com", "hashed_password": "x",
+             "role": "lender"},
+        ])
+        conn.execute(insert(Lender.__table__), {
+            "id": 1, "user_id": 3, "organization_name": "AS Capital", "contact_email": "as@example.com",
+            "min_credit_score": 50, "max_lending_amount": 20000,
+        })
+        conn.execute(insert(SME.__table__), [
+            {**sme, "years_active": 3, "user_id": 1, "latest_score_at": created} for sme in SMES
+        ])
+        conn.execute(insert(Invoice.__table__), [
+            {"id": i, "sme_id": i, "client_name": "C", "amount": 50000, "status": "pending", "created_at": created}
+            for i in range(1, 31)
+        ])
+        # SMEs 1-10: one pending request within the profile's limit and one above it; 11-20: one funded
+        conn.execute(insert(FinanceRequest.__table__), [
+            {"sme_id": i, "invoice_id": i, "amount_requested": amount, "status": status, "created_at": created}
+            for i in range(1, 21)
+            for amount, status in ([(5000, "pending"), (45000, "pending")] if i <= 10 else [(5000, "funded")])
+        ])
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def _walk(client, headers, **params) -> tuple[list, list]:
+    """Every row reachable by following X-Next-Cursor, and the responses."""
+    responses = [client.get("/lenders/available-smes", headers=headers, params={"limit": 4, **params})]
+    while "X-Next-Cursor" in responses[-1].headers:
+        assert responses[-1].status_code == 200
+        responses.append(client.get("/lenders/available-smes", headers=headers,
+                                    params={"limit": 4, **params, "cursor": responses[-1].headers["X-Next-Cursor"]}))
+    assert responses[-1].status_code == 200
+    return [row for r in responses for row in r.json()], responses
+
+
+@pytest.mark.parametrize("params, key, reverse", [
+    ({"sort": "score"}, lambda s: (s["latest_score"] if s["latest_score"] is not None else -1, s["id"]), True),
+    ({"sort": "score", "order": "asc"},
+     lambda s: (s["latest_score"] if s["latest_score"] is not None else -1, s["id"]), False),
+    ({"sort": "revenue"}, lambda s: (s["revenue"], s["id"]), True),
+    ({"sort": "industry", "province": "Gauteng"}, lambda s: (s["industry"], s["id"]), False),
+    ({"sort": "province", "order": "desc"}, lambda s: (s["province"] or "", s["id"]), True),
+    ({"risk_level": "Medium"}, lambda s: s["id"], False),
+    ({"min_revenue": 110000, "max_revenue": 130000, "min_score": 40, "max_score": 75}, lambda s: s["id"], False),
+])
+def test_filters_and_sorts_match_python(client, params, key, reverse):
+    def selected(sme):
+        score = sme["latest_score"]
+        if params.get("province") and sme["province"] != params["province"]:
+            return False
+        if params.get("risk_level") == "Medium" and not (score is not None and 40 <= score < 60):
+            return False
+        if "min_score" in params and not (score is not None and params["min_score"] <= score <= params["max_score"]):
+            return False
+        if "min_revenue" in params and not params["min_revenue"] <= sme["revenue"] <= params["max_revenue"]:
+            return False
+        return True
+
+    expected = [s["id"] for s in sorted(filter(selected, SMES), key=key, reverse=reverse)]
+    rows, responses = _walk(client, BROWSER, **params)
+    assert [row["sme_id"] for row in rows] == expected
+    assert responses[0].headers["X-Total-Count-Estimate"] == str(len(expected))
+    assert len(responses) > 1
+
+
+def test_rows_carry_scores_risk_levels_and_pending_counts(client):
+    rows = {row["sme_id"]: row for row in _walk(client, BROWSER)[0]}
+    assert len(rows) == 30
+    assert rows[10] == {
+        "sme_id": 10, "company_name": "AS 10", "industry": "Mining", "province": "Limpopo",
+        "revenue": 129190.0, "credit_score": 35.0, "risk_level": "High", "pending_finance_requests": 2,
+    }
+    assert rows[9]["credit_score"] is None and rows[9]["risk_level"] is None
+    assert rows[15]["pending_finance_requests"] == 0
+
+
+def test_lender_profile_criteria_are_applied(client):
+    rows, _ = _walk(client, PROFILED, sort="score")
+    assert [row["sme_id"] for row in rows] == [
+        s["id"] for s in sorted(SMES, key=lambda s: (s["latest_score"] or -1, s["id"]), reverse=True)
+        if s["latest_score"] is not None and s["latest_score"] >= 50
+    ]
+    # Only the pending request within max_lending_amount counts
+    assert {row["pending_finance_requests"] for row in rows if row["sme_id"] <= 10} == {1}
+
+    everything, _ = _walk(client, PROFILED, apply_criteria="false")
+    assert len(everything) == 30
+    assert {row["pending_finance_requests"] for row in everything if row["sme_id"] <= 10} == {2}
+
+
+def test_each_page_is_one_query(client):
+    first = client.get("/lenders/available-smes", headers=PROFILED, params={"sort": "revenue", "limit": 5})
+    assert int(first.headers["X-DB-Query-Count"]) == 4     # user, lender profile, estimate, page
+    following = client.get("/lenders/available-smes", headers=PROFILED,
+                           params={"sort": "revenue", "limit": 5, "cursor": first.headers["X-Next-Cursor"]})
+    assert int(following.headers["X-DB-Query-Count"]) == 3
+
+    # A cursor belongs to the sort it came from
+    other_sort = client.get("/lenders/available-smes", headers=PROFILED,
+                            params={"sort": "score", "cursor": first.headers["X-Next-Cursor"]})
+    assert other_sort.status_code == 400
+    assert client.get("/lenders/available-smes", headers=PROFILED,
+                      params={"sort": "name"}).status_code == 422
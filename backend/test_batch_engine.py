@@ -0,0 +1,130 @@
+"""
+test_batch_engine.py
+
+Parity tests for the vectorised batch engine: assess_batch() must reproduce
+assess() exactly — score, raw score, applicable max, profile, decision,
+confidence and per-factor points — across the gold dataset and random packages.
+
+Run from backend/:  pytest test_batch_engine.py -v
+"""
+import json, math, os, random
+
+from core.scoring import EvidencePackage, FounderSignalInput, EvidenceValidator
+from core.assessment_engine import assess, assess_batch, BusinessProfile
+from core.batch_engine import FACTOR_NAMES, _round1
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+GOLD_PATH = os.path.join(BASE, "testing", "gold_dataset.json")
+
+
+def _package(ev: dict) -> EvidencePackage:
+    fd = ev.get("founder")
+    return EvidencePackage(
+        revenue=ev.get("revenue", 0.0),
+        years_active=ev.get("years_active", 0),
+        industry=ev.get("industry", "Other"),
+        total_invoices=ev.get("total_invoices", 0),
+        paid_on_time=ev.get("paid_on_time", 0),
+        unpaid_invoices=ev.get("unpaid_invoices", 0),
+        verifications=ev.get("verifications", {}),
+        intent_doc_details=ev.get("intent_doc_details", {}),
+        overdraft_count=ev.get("overdraft_count"),
+        income_regularity=ev.get("income_regularity"),
+        months_analysed=ev.get("months_analysed"),
+        province=ev.get("province"),
+        founder=FounderSignalInput(**fd) if fd else None,
+    )
+
+
+def _random_package(rng: random.Random) -> EvidencePackage:
+    statuses = ["approved", "pending", "rejected", None]
+    docs = ["cipc", "bank_statement", "tax_clearance", "registration_docs",
+            "letter_of_intent", "supplier_quote", "lease_agreement"]
+    total = rng.choice([0, 0, rng.randint(1, 40)])
+    paid = rng.randint(0, total)
+    unpaid = rng.randint(0, total - paid)
+    has_bs = rng.random() < 0.5
+    founder = None
+    if rng.random() < 0.6:
+        founder = FounderSignalInput(
+            years_industry_experience=rng.choice([None, 0, 1, 3, 7]),
+            highest_qualification=rng.choice([None, "none", "Matric", " degree ", "diploma", "phd"]),
+            prior_business_owner=rng.choice([None, True, False]),
+            trade_association_member=rng.choice([None, True, False]),
+            reference_provided=rng.choice([None, True, False]),
+        )
+    return EvidencePackage(
+        revenue=rng.choice([0.0, rng.uniform(0, 900_000), 500_000.0]),
+        years_active=rng.choice([0, 1, 2, 3, 5, 8]),
+        industry=rng.choice(["Retail", "Technology", "Agriculture", "Construction", "Unknown Sector"]),
+        total_invoices=total, paid_on_time=paid, unpaid_invoices=unpaid,
+        verifications={d: s for d in docs if (s := rng.choice(statuses))},
+        intent_doc_details=(
+            {"letter_of_intent": {"status": "approved", "loi_counterparty_known": rng.choice([True, False, None])}}
+            if rng.random() < 0.3 else {}
+        ),
+        overdraft_count=rng.choice([None, 0, 1, 3]) if has_bs else None,
+        income_regularity=round(rng.random(), 2) if has_bs else None,
+        months_analysed=rng.choice([1, 3, 6, 12]) if has_bs else None,
+        province=rng.choice([None, "", "Gauteng", "Limpopo", "Western Cape", "Atlantis"]),
+        founder=founder,
+    )
+
+
+def _assert_parity(packages: list[EvidencePackage]):
+    batch = assess_batch(packages)
+    assert len(batch) == len(packages)
+    profiles, decisions = batch.profiles, batch.decisions
+
+    for i, pkg in enumerate(packages):
+        if not EvidenceValidator.validate(pkg).is_valid:
+            assert not batch.valid[i]
+            assert batch.errors[i] == EvidenceValidator.validate(pkg).errors
+            assert math.isnan(batch.score[i])
+            continue
+
+        res = assess(pkg)
+        meta = res.breakdown["_assessment"]
+        assert batch.valid[i]
+        assert batch.score[i] == res.score, (i, batch.score[i], res.score)
+        assert batch.raw_score[i] == meta["raw_score"]
+        assert batch.applicable_max[i] == meta["raw_max"]
+        assert batch.confidence_score[i] == res.confidence_score
+        assert profiles[i] == res.profile
+        assert decisions[i] == res.decision
+        for name in FACTOR_NAMES:
+            assert batch.factor_points[name][i] == res.breakdown[name]["contribution"], (i, name)
+
+
+class TestRounding:
+
+    def test_round1_matches_builtin_on_half_boundaries(self):
+        values = [0.35, 0.45, 2.675, 1.05, 7.25, 0.15 * 3, 12 * 0.35, 16.5 * 0.65]
+        values += [i / 100 for i in range(0, 2000)]
+        assert _round1(values).tolist() == [round(v, 1) for v in values]
+
+
+class TestBatchParity:
+
+    def test_gold_dataset(self):
+        with open(GOLD_PATH) as f:
+            scenarios = json.load(f)
+        _assert_parity([_package(sc["evidence"]) for sc in scenarios])
+
+    def test_random_packages(self):
+        rng = random.Random(20240601)
+        _assert_parity([_random_package(rng) for _ in range(3000)])
+
+    def test_invalid_rows_do_not_raise(self):
+        good = _package({"revenue": 120_000, "years_active": 4, "industry": "Retail"})
+        bad = _package({"revenue": -5, "total_invoices": 2, "paid_on_time": 3})
+        batch = assess_batch([good, bad, good])
+        assert batch.valid.tolist() == [True, False, True]
+        assert set(batch.errors) == {1}
+        assert batch.profiles[1] is None and batch.decisions[1] is None
+        assert batch.profiles[0] == BusinessProfile.ESTABLISHED
+
+    def test_empty_batch(self):
+        batch = assess_batch([])
+        assert len(batch) == 0
+        assert batch.errors == {}
@@ -0,0 +1,105 @@
+"""
+test_batch_rescoring.py
+
+Tests for the batch rescoring job: every SME gets exactly one new
+CreditScore equal to score_sme(), smes.latest_score_* follow the bulk
+inserts, and a run interrupted mid-way resumes from its checkpoint without
+scoring any SME twice — in-process and through the process pool.
+
+Run from backend/:  pytest test_batch_rescoring.py -v
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, SME, Invoice, Verification, CreditScore, RescoreRun
+from services.scoring_service import score_sme
+from services.batch_rescoring_service import rescore_portfolio
+
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _seed(db, count: int, invalid: int = 0) -> list[SME]:
+    rng = random.Random(count)
+    smes = []
+    for i in range(count):
+        user = User(username=f"r{i}", email=f"r{i}@test.com", hashed_password="x", role="sme")
+        db.add(user)
+        db.flush()
+        sme = SME(name=f"Rescore {i}", industry=rng.choice(["Retail", "Manufacturing", "Other"]),
+                  revenue=rng.randint(0, 900_000), years_active=-1 if i < invalid else rng.randint(0, 12),
+                  user_id=user.id, province=rng.choice(["Gauteng", None]))
+        db.add(sme)
+        db.flush()
+        base = datetime(2024, 1, 1)
+        for _ in range(rng.randint(0, 6)):
+            db.add(Invoice(sme_id=sme.id, client_name="C", amount=100, status=rng.choice(["paid", "pending"]),
+                           created_at=base, due_date=base + timedelta(days=rng.randint(-5, 30))))
+        if rng.random() < 0.5:
+            db.add(Verification(sme_id=sme.id, doc_type="cipc", status="approved", submitted_at=base))
+        db.add(CreditScore(sme_id=sme.id, score=1.0, created_at=base))
+        smes.append(sme)
+    db.commit()
+    return smes
+
+
+def _new_scores(db) -> dict[int, list[float]]:
+    scores = {}
+    for row in db.query(CreditScore).filter(CreditScore.score != 1.0).order_by(CreditScore.id):
+        scores.setdefault(row.sme_id, []).append(row.score)
+    return scores
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_rescores_every_sme_once(db, workers):
+    smes = _seed(db, 23, invalid=2)
+    run = rescore_portfolio(db, workers=workers, chunk_size=5)
+
+    assert (run.status, run.scored, run.failed, run.total_smes) == ("completed", 21, 2, 23)
+    assert run.last_sme_id == smes[-1].id and run.finished_at is not None
+    scores = _new_scores(db)
+    assert set(scores) == {s.id for s in smes[2:]}
+    for sme in smes[2:]:
+        db.refresh(sme)
+        assert scores[sme.id] == [score_sme(sme, db, use_cache=False).score]
+        assert sme.latest_score == scores[sme.id][0]
+        assert sme.latest_score_id == db.query(func.max(CreditScore.id)).filter(CreditScore.sme_id == sme.id).scalar()
+
+
+def test_interrupted_run_resumes_from_checkpoint(db):
+    smes = _seed(db, 17)
+    chunks_done = []
+
+    def crash_after_two_chunks(run):
+        chunks_done.append(run.last_sme_id)
+        if len(chunks_done) == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        rescore_portfolio(db, workers=1, chunk_size=4, progress=crash_after_two_chunks)
+    interrupted = db.query(RescoreRun).one()
+    assert (interrupted.status, interrupted.scored, interrupted.last_sme_id) == ("running", 8, smes[7].id)
+
+    run = rescore_portfolio(db, workers=1)
+    assert run.id == interrupted.id and run.chunk_size == 4
+    assert (run.status, run.scored) == ("completed", 17)
+    assert all(len(s) == 1 for s in _new_scores(db).values()) and len(_new_scores(db)) == 17
+
+    restarted = rescore_portfolio(db, workers=1, resume=False)
+    assert restarted.id != run.id and restarted.scored == 17
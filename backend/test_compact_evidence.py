@@ -0,0 +1,137 @@
+"""
+test_compact_evidence.py
+
+Tests for the compact, slotted evidence variants: exact round trips through
+to_package() and to_bytes()/from_bytes(), content-hash equality, and scoring
+parity with the plain EvidencePackage through assess() and assess_batch().
+
+Run from backend/:  pytest test_compact_evidence.py -v
+"""
+import json, os, pickle, random
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from core.scoring import EvidencePackage, FounderSignalInput
+from core.assessment_engine import assess, assess_batch
+from core.compact_evidence import (
+    CompactEvidencePackage,
+    CompactFounderSignal,
+    INDUSTRY_CODES,
+    compact_packages,
+)
+from services.assessment_cache import evidence_fingerprint
+from test_batch_engine import _package, _random_package
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+GOLD_PATH = os.path.join(BASE, "testing", "gold_dataset.json")
+
+
+def _gold_packages() -> list[EvidencePackage]:
+    with open(GOLD_PATH) as f:
+        return [_package(sc["evidence"]) for sc in json.load(f)]
+
+
+def _fields(obj) -> dict:
+    # Compared by value: test_assessment_engine reloads core.scoring, so class identity can differ
+    return asdict(obj)
+
+
+def _outcome(pkg):
+    try:
+        return repr(assess(pkg))
+    except ValueError as e:
+        return str(e)
+
+
+class TestRoundTrip:
+
+    def test_gold_dataset_round_trips_exactly(self):
+        for pkg in _gold_packages():
+            compact = CompactEvidencePackage.from_package(pkg)
+            assert _fields(compact.to_package()) == _fields(pkg)
+            restored = CompactEvidencePackage.from_bytes(compact.to_bytes())
+            assert restored == compact
+            assert restored.content_hash == compact.content_hash
+            assert _fields(restored.to_package()) == _fields(pkg)
+
+    def test_unrepresentable_values_kept_in_extras(self):
+        pkg = _package({
+            "revenue": 80_000, "years_active": 2, "industry": "Space Tourism", "province": "Atlantis",
+            "verifications": {"cipc": "approved", "vat_certificate": "approved", "tax_clearance": "expired"},
+            "intent_doc_details": {
+                "letter_of_intent": {"status": None, "loi_counterparty_known": True},
+                "supplier_quote":   {"status": "pending"},
+            },
+        })
+        compact = CompactEvidencePackage.from_package(pkg)
+        assert {doc for _, doc, _ in compact.extras} == {
+            "vat_certificate", "tax_clearance", "letter_of_intent", "supplier_quote",
+        }
+        assert compact.industry_code >= INDUSTRY_CODES.seeded
+        assert _fields(compact.to_package()) == _fields(pkg)
+        assert _fields(CompactEvidencePackage.from_bytes(compact.to_bytes()).to_package()) == _fields(pkg)
+
+    def test_integer_revenue_type_preserved(self):
+        pkg = _package({"revenue": 120_000, "years_active": 3, "industry": "Retail"})
+        restored = CompactEvidencePackage.from_bytes(CompactEvidencePackage.from_package(pkg).to_bytes())
+        assert type(restored.revenue) is int
+
+    def test_founder_flags(self):
+        signal = FounderSignalInput(4, "degree", True, False, None)
+        compact = CompactFounderSignal.from_signal(signal)
+        assert (compact.prior_business_owner, compact.trade_association_member,
+                compact.reference_provided) == (True, False, None)
+        assert _fields(compact.to_signal()) == _fields(signal)
+
+    def test_unknown_format_version_rejected(self):
+        data = bytearray(CompactEvidencePackage.from_package(_gold_packages()[0]).to_bytes())
+        data[0] = 99
+        with pytest.raises(ValueError):
+            CompactEvidencePackage.from_bytes(bytes(data))
+
+    def test_pickles(self):
+        compact = CompactEvidencePackage.from_package(_gold_packages()[0])
+        assert pickle.loads(pickle.dumps(compact)) == compact
+
+
+class TestImmutabilityAndHashing:
+
+    def test_frozen_and_slotted(self):
+        compact = CompactEvidencePackage.from_package(_gold_packages()[0])
+        with pytest.raises(AttributeError):
+            compact.revenue = 1.0
+        assert not hasattr(compact, "__dict__")
+        assert not hasattr(compact.founder or CompactFounderSignal(None, None, 0), "__dict__")
+
+    def test_equal_content_equal_hash(self):
+        a = _package({"revenue": 1.0, "industry": "Retail", "verifications": {"cipc": "approved", "bank_statement": "pending"}})
+        b = _package({"revenue": 1.0, "industry": "Retail", "verifications": {"bank_statement": "pending", "cipc": "approved"}})
+        ca, cb = CompactEvidencePackage.from_package(a), CompactEvidencePackage.from_package(b)
+        assert ca == cb and hash(ca) == hash(cb)
+        assert len({ca, cb}) == 1
+        assert evidence_fingerprint(ca) == evidence_fingerprint(cb)
+
+    def test_changed_field_changes_hash(self):
+        pkg = _package({"revenue": 1.0, "industry": "Retail", "verifications": {"cipc": "pending"}})
+        changed = _package({"revenue": 1.0, "industry": "Retail", "verifications": {"cipc": "approved"}})
+        assert (CompactEvidencePackage.from_package(pkg).content_hash
+                != CompactEvidencePackage.from_package(changed).content_hash)
+
+
+class TestScoringParity:
+
+    def test_assess_accepts_compact_packages(self):
+        for pkg in _gold_packages():
+            assert _outcome(CompactEvidencePackage.from_package(pkg)) == _outcome(pkg)
+
+    def test_assess_batch_parity(self):
+        rng = random.Random(20240715)
+        packages = _gold_packages() + [_random_package(rng) for _ in range(2000)]
+        plain, compact = assess_batch(packages), assess_batch(compact_packages(packages))
+        for name in ("score", "raw_score", "applicable_max", "confidence_score"):
+            assert np.array_equal(getattr(plain, name), getattr(compact, name), equal_nan=True), name
+        assert plain.profile_code.tolist() == compact.profile_code.tolist()
+        assert plain.decision_code.tolist() == compact.decision_code.tolist()
+        assert plain.errors == compact.errors
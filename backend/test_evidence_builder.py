@@ -0,0 +1,203 @@
+"""
+test_evidence_builder.py
+
+Tests for the aggregate-SQL evidence builders: build_evidence_package() and
+the bulk build_evidence_packages() must produce exactly the package the
+original row-by-row Python implementation built, in a fixed number of
+queries regardless of invoice history size or (per chunk) SME count, both
+from sme_signal_snapshots and when aggregating the source tables.
+
+Run from backend/:  pytest test_evidence_builder.py -v
+"""
+import random
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, delete, event
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, SME, Invoice, Verification, FounderProfile, SmeSignalSnapshot
+from core.scoring import EvidencePackage, FounderSignalInput, INTENT_BASE_POINTS
+from services.scoring_service import build_evidence_package, build_evidence_packages, score_smes, score_sme
+
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+DOC_TYPES = ["cipc", "tax_clearance", "bank_statement", "letter_of_intent", "purchase_order"]
+STATUSES = ["paid", "pending", "overdue", None]
+
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def reference_package(sme: SME, db) -> EvidencePackage:
+    """The original row-by-row build_evidence_package(), kept as the behavioural reference."""
+    invoices = db.query(Invoice).filter(Invoice.sme_id == sme.id).all()
+    paid_on_time = sum(
+        1 for i in invoices
+        if i.status == "paid" and i.due_date is not None
+        and i.due_date.replace(tzinfo=timezone.utc) >= i.created_at.replace(tzinfo=timezone.utc)
+    )
+    verifications = db.query(Verification).filter(Verification.sme_id == sme.id).order_by(Verification.id).all()
+    ver_map = {}
+    for v in sorted(verifications, key=lambda x: x.submitted_at):
+        ver_map[v.doc_type] = v.status
+    intent_doc_details = {}
+    for doc_type in INTENT_BASE_POINTS:
+        matching = [v for v in verifications if v.doc_type == doc_type]
+        if matching:
+            latest = sorted(matching, key=lambda x: x.submitted_at)[-1]
+            intent_doc_details[doc_type] = {
+                "status": latest.status, "loi_counterparty_known": latest.loi_counterparty_known,
+            }
+    fp = db.query(FounderProfile).filter(FounderProfile.sme_id == sme.id).first()
+    founder = None
+    if fp is not None:
+        founder = FounderSignalInput(
+            years_industry_experience=fp.years_industry_experience,
+            highest_qualification=fp.highest_qualification,
+            prior_business_owner=fp.prior_business_owner,
+            trade_association_member=fp.trade_association_member,
+            reference_provided=bool(fp.reference_name) if fp.reference_name else None,
+        )
+    return EvidencePackage(
+        revenue=float(sme.revenue or 0), years_active=int(sme.years_active or 0),
+        industry=sme.industry or "Other",
+        total_invoices=len(invoices), paid_on_time=paid_on_time,
+        unpaid_invoices=sum(1 for i in invoices if i.status != "paid"),
+        verifications=ver_map, intent_doc_details=intent_doc_details,
+        province=sme.province or None, founder=founder,
+    )
+
+
+def _seed(db, rng: random.Random, invoices: int, verifications: int, founder: bool) -> SME:
+    user = User(username=f"u{rng.random()}", email=f"{rng.random()}@test.com", hashed_password="x", role="sme")
+    db.add(user)
+    db.flush()
+    sme = SME(name="Builder Co", industry="Retail", revenue=150000, years_active=3, user_id=user.id, province="Gauteng")
+    db.add(sme)
+    db.flush()
+    base = datetime(2024, 1, 1)
+    for _ in range(invoices):
+        created = base + timedelta(days=rng.randint(0, 300))
+        due = None if rng.random() < 0.1 else created + timedelta(days=rng.randint(-10, 30))
+        db.add(Invoice(sme_id=sme.id, client_name="C", amount=100, status=rng.choice(STATUSES),
+                       due_date=due, created_at=created))
+    for _ in range(verifications):
+        # Few distinct timestamps so ties between submissions are common
+        db.add(Verification(sme_id=sme.id, doc_type=rng.choice(DOC_TYPES),
+                            status=rng.choice(["approved", "pending", "rejected"]),
+                            submitted_at=base + timedelta(days=rng.randint(0, 3)),
+                            loi_counterparty_known=rng.choice([True, False, None])))
+    if founder:
+        db.add(FounderProfile(sme_id=sme.id, years_industry_experience=rng.randint(0, 20),
+                              highest_qualification=rng.choice(["matric", "degree", None]),
+                              prior_business_owner=rng.choice([True, None]),
+                              reference_name=rng.choice(["Jane", "", None])))
+    db.commit()
+    return sme
+
+
+def test_matches_row_by_row_reference(db):
+    rng = random.Random(11)
+    for case in range(25):
+        sme = _seed(db, rng, invoices=rng.randint(0, 60), verifications=rng.randint(0, 15), founder=case % 3 != 0)
+        # asdict: other test modules reload core.scoring, so compare by value, not class
+        assert asdict(build_evidence_package(sme, db)) == asdict(reference_package(sme, db))
+
+
+def test_empty_history(db):
+    sme = _seed(db, random.Random(1), invoices=0, verifications=0, founder=False)
+    pkg = build_evidence_package(sme, db)
+    assert (pkg.total_invoices, pkg.paid_on_time, pkg.unpaid_invoices) == (0, 0, 0)
+    assert pkg.verifications == {} and pkg.founder is None
+
+
+def _count_statements(fn):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, len(statements)
+
+
+def _drop_snapshots(db, *smes):
+    db.execute(delete(SmeSignalSnapshot))
+    db.commit()
+    for sme in smes:
+        db.refresh(sme)
+
+
+def test_query_count_does_not_grow_with_history(db):
+    small = _seed(db, random.Random(2), invoices=2, verifications=1, founder=True)
+    large = _seed(db, random.Random(3), invoices=2000, verifications=200, founder=True)
+    db.refresh(small)
+    db.refresh(large)
+
+    _, small_queries = _count_statements(lambda: build_evidence_package(small, db))
+    pkg, large_queries = _count_statements(lambda: build_evidence_package(large, db))
+    assert large_queries == small_queries == 1      # snapshot row
+    assert pkg.total_invoices == 2000
+
+    _drop_snapshots(db, small, large)
+    _, small_queries = _count_statements(lambda: build_evidence_package(small, db))
+    pkg, large_queries = _count_statements(lambda: build_evidence_package(large, db))
+    assert large_queries == small_queries == 3      # snapshot miss, aggregates, verifications
+    assert pkg.total_invoices == 2000
+
+
+def test_bulk_matches_single_builder(db):
+    rng = random.Random(5)
+    smes = [
+        _seed(db, rng, invoices=rng.randint(0, 40), verifications=rng.randint(0, 10), founder=case % 2 == 0)
+        for case in range(12)
+    ]
+    ids = [s.id for s in reversed(smes)] + [9999, smes[0].id]   # unknown id skipped, duplicate built once
+
+    built = list(build_evidence_packages(ids, db, chunk_size=5))
+    assert [sme_id for sme_id, _ in built] == [s.id for s in reversed(smes)]
+    for sme_id, pkg in built:
+        sme = next(s for s in smes if s.id == sme_id)
+        assert asdict(pkg) == asdict(reference_package(sme, db))
+
+    # Without snapshots for some ids the chunk mixes both paths
+    db.execute(delete(SmeSignalSnapshot).where(SmeSignalSnapshot.sme_id.in_([s.id for s in smes[::3]])))
+    db.commit()
+    assert [(i, asdict(p)) for i, p in build_evidence_packages(ids, db, chunk_size=5)] == \
+        [(i, asdict(p)) for i, p in built]
+
+
+def test_bulk_query_count_is_per_chunk(db):
+    rng = random.Random(6)
+    ids = [_seed(db, rng, invoices=rng.randint(0, 30), verifications=3, founder=True).id for _ in range(20)]
+
+    built, queries = _count_statements(lambda: list(build_evidence_packages(ids, db, chunk_size=8)))
+    assert len(built) == 20
+    assert queries == 3       # three chunks, one snapshot query each
+
+    built, queries = _count_statements(
+        lambda: list(build_evidence_packages(ids, db, chunk_size=8, use_snapshots=False))
+    )
+    assert len(built) == 20
+    assert queries == 3 * 4   # three chunks, four grouped queries each
+
+
+def test_score_smes_matches_score_sme(db):
+    rng = random.Random(7)
+    smes = [_seed(db, rng, invoices=rng.randint(0, 20), verifications=4, founder=True) for _ in range(6)]
+    scores = dict(score_smes([s.id for s in smes], db, use_cache=False))
+    for sme in smes:
+        assert scores[sme.id].score == score_sme(sme, db, use_cache=False).score
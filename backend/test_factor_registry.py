@@ -0,0 +1,62 @@
+"""
+test_factor_registry.py
+
+Tests for the declarative tier registry: compiled bisect lookups must read
+exactly like the if/elif ladders they replace, for both the engine plans and
+the legacy whole-point plan.
+
+Run from backend/:  pytest test_factor_registry.py -v
+"""
+from core.factor_registry import (
+    TierSpec, LEGACY_PLAN, TIMELINESS_TIERS, UNPAID_TIERS, AGE_TIERS, compile_plan,
+)
+from core.assessment_engine import STRATEGIES, SCORING_PLANS, BusinessProfile
+
+
+def _ladder(spec: TierSpec, value):
+    """Reference if/elif reading of a TierSpec."""
+    for threshold, frac, _ in spec.tiers:
+        if threshold is None:
+            return frac
+        if spec.op == ">=" and value >= threshold:
+            return frac
+        if spec.op == "<=" and value <= threshold:
+            return frac
+
+
+def test_compiled_tiers_match_ladder_at_boundaries():
+    for spec in (TIMELINESS_TIERS, UNPAID_TIERS, AGE_TIERS):
+        compiled = spec.compile()
+        bounds = [t for t, _, _ in spec.tiers if t is not None]
+        probes = [-1, 0, 100] + [b + d for b in bounds for d in (-1e-9, 0, 1e-9)]
+        for v in probes:
+            assert compiled.lookup(v) == _ladder(spec, v), (spec.op, v)
+
+
+def test_legacy_plan_whole_points():
+    assert LEGACY_PLAN.revenue.lookup(500_000) == 25
+    assert LEGACY_PLAN.revenue.lookup(199_999) == 12
+    assert LEGACY_PLAN.revenue.lookup(0) == 3
+    assert LEGACY_PLAN.timeliness.lookup(0.7) == 13
+    assert LEGACY_PLAN.unpaid.lookup(0.31) == 0
+    assert LEGACY_PLAN.no_invoice_timeliness == 10
+    assert LEGACY_PLAN.industry_band == (3, 10)
+    assert LEGACY_PLAN.market_neutral == 5.0
+    assert LEGACY_PLAN.founder_experience.lookup(5) == 5
+
+
+def test_engine_plan_scaled_to_strategy():
+    strategy = STRATEGIES[BusinessProfile.GROWTH]
+    plan = SCORING_PLANS["v1"][BusinessProfile.GROWTH]
+    assert plan is strategy.plan
+    assert plan.timeliness.lookup(0.95) == strategy.timeliness_max
+    assert plan.age.lookup(3) == round(strategy.age_max * 0.6, 1)
+    assert plan.no_invoice_unpaid == round(strategy.unpaid_max * 0.5, 1)
+    assert plan.age.label(1) == "1 year"
+
+
+def test_new_strategy_version_is_data_only():
+    maxima = dict(STRATEGIES[BusinessProfile.ESTABLISHED].maxima, **{"Business Age": 20})
+    plan = compile_plan(maxima)
+    assert plan.age.lookup(10) == 20
+    assert plan.age.lookup(0) == 2.0
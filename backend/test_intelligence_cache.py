@@ -0,0 +1,146 @@
+"""
+test_intelligence_cache.py
+
+Tests for the cached /lenders/sme-intelligence bundle: repeats are served
+from the cache without running the engine, a matching If-None-Match is
+answered 304 after a single fingerprint query, every kind of write to the
+SME (and nothing else) moves its ETag, and rolled-back writes do not.
+
+Run from backend/:  pytest test_intelligence_cache.py -v
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, get_db
+from main import app
+from limiter import limiter
+from models import User, SME, CreditScore, FounderProfile, Invoice, Verification
+import services.intelligence_service as intelligence_service
+from services.auth_service import create_access_token
+from services.intelligence_service import build_intelligence_bundle, etag_matches, intelligence_cache
+
+limiter.enabled = False
+
+LENDER = {"Authorization": f"Bearer {create_access_token({'sub': 'ic_lender'})}"}
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'intelligence.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add_all([
+            User(id=1, username="ic_sme", email="ic_sme@example.com", hashed_password="x", role="sme"),
+            User(id=2, username="ic_lender", email="ic_lender@example.com", hashed_password="x", role="lender"),
+        ])
+        db.add_all([
+            SME(id=1, name="Intel One", industry="Retail", revenue=400000, years_active=5, user_id=1,
+                province="Gauteng"),
+            SME(id=2, name="Intel Two", industry="Mining", revenue=900000, years_active=8, user_id=1),
+        ])
+        db.add(CreditScore(sme_id=1, score=64.0, created_at=datetime(2025, 1, 1)))
+        db.commit()
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    intelligence_cache.invalidate()
+    yield factory
+    intelligence_cache.invalidate()
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def _get(client, sme_id=1, etag=None):
+    headers = {**LENDER, **({"If-None-Match": etag} if etag else {})}
+    return client.get(f"/lenders/sme-intelligence/{sme_id}", headers=headers)
+
+
+def _no_engine(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("the bundle was rebuilt")
+    monkeypatch.setattr(intelligence_service, "score_sme", fail)
+
+
+def test_repeats_are_cached_and_revalidated(sessions, monkeypatch):
+    client = TestClient(app)
+    first = _get(client)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and first.headers["Cache-Control"] == "private, no-cache"
+    with sessions() as db:
+        assert first.json() == build_intelligence_bundle(db.get(SME, 1), db)
+
+    _no_engine(monkeypatch)
+    cached = _get(client)
+    assert (cached.status_code, cached.headers["ETag"], cached.json()) == (200, etag, first.json())
+
+    not_modified = _get(client, etag=f'W/"stale", {etag}')
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    assert int(not_modified.headers["X-DB-Query-Count"]) == 2      # the user and the fingerprint
+    assert intelligence_cache.stats()["hits"] == 1
+
+    assert _get(client, etag='"stale"').status_code == 200
+    assert _get(client, sme_id=99).status_code == 404
+
+
+@pytest.mark.parametrize("write", [
+    lambda db: db.add(CreditScore(sme_id=1, score=71.0, created_at=datetime(2025, 2, 1))),
+    lambda db: db.add(FounderProfile(sme_id=1, years_industry_experience=12, highest_qualification="degree")),
+    lambda db: db.add(Verification(sme_id=1, doc_type="cipc", status="approved")),
+    lambda db: db.add(Invoice(sme_id=1, client_name="Client", amount=1000, status="paid")),
+    lambda db: setattr(db.get(SME, 1), "business_city", "Pretoria"),
+], ids=["credit_score", "founder", "verification", "invoice", "sme"])
+def test_writes_to_the_sme_change_its_etag(sessions, write):
+    client = TestClient(app)
+    before = _get(client)
+    other = _get(client, sme_id=2).headers["ETag"]
+
+    with sessions() as db:
+        write(db)
+        db.commit()
+
+    after = _get(client, etag=before.headers["ETag"])
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    with sessions() as db:
+        assert after.json() == build_intelligence_bundle(db.get(SME, 1), db)
+    assert _get(client, sme_id=2, etag=other).status_code == 304    # other SMEs keep theirs
+
+
+def test_rollbacks_and_engine_changes(sessions):
+    client = TestClient(app)
+    etag = _get(client).headers["ETag"]
+
+    with sessions() as db:
+        db.get(SME, 1).name = "Renamed"
+        db.flush()
+        assert db.scalar(select(SME.data_version).where(SME.id == 1)) > 0
+        db.rollback()
+    assert _get(client, etag=etag).status_code == 304
+
+    # test_assessment_engine re-executes market_data_service; fire the copy this service registered with
+    intelligence_service.on_market_tables_changed.__globals__["market_tables_changed"]()
+    refreshed = _get(client, etag=etag)
+    assert refreshed.status_code == 200 and refreshed.headers["ETag"] != etag
+
+
+def test_if_none_match_parsing():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"b", "a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('"ab"', '"a"')
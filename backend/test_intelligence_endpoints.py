@@ -1,8 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from database import Base, get_db
+from sqlalchemy.pool import NullPool
+from database import Base, get_db, get_async_db
 from main import app
 from limiter import limiter
 from models.user import User
@@ -23,6 +25,15 @@ TEST_DB_URL = f"sqlite:///./{TEST_DB_FILE}"
 engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async endpoints read the same file through aiosqlite. NullPool: TestClient
+# runs each request on its own event loop, so connections cannot be reused.
+async_engine = create_async_engine(f"sqlite+aiosqlite:///./{TEST_DB_FILE}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 def override_get_db():
     db = TestingSessionLocal()
     try:
@@ -39,6 +50,7 @@ def setup_db():
             pass
     Base.metadata.create_all(bind=engine)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     yield
     app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,114 @@
+"""
+test_latest_score.py
+
+Tests for the denormalized smes.latest_score_* columns: every CreditScore
+insert, update and delete through the ORM keeps them equal to the newest
+credit_scores row, in the same transaction.
+
+Run from backend/:  pytest test_latest_score.py -v
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, SME, CreditScore
+
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def sme(db):
+    user = User(username="latest", email="latest@test.com", hashed_password="x", role="sme")
+    db.add(user)
+    db.flush()
+    sme = SME(name="Latest Co", industry="Retail", revenue=100000, years_active=2, user_id=user.id)
+    db.add(sme)
+    db.commit()
+    return sme
+
+
+def _newest(db, sme_id):
+    return (
+        db.query(CreditScore)
+        .filter(CreditScore.sme_id == sme_id)
+        .order_by(CreditScore.created_at.desc(), CreditScore.id.desc())
+        .first()
+    )
+
+
+def _assert_latest(db, sme):
+    db.expire_all()
+    newest = _newest(db, sme.id)
+    if newest is None:
+        assert (sme.latest_score_id, sme.latest_score, sme.latest_score_at) == (None, None, None)
+    else:
+        assert (sme.latest_score_id, sme.latest_score, sme.latest_score_at) == \
+            (newest.id, newest.score, newest.created_at)
+
+
+def test_insert_promotes_newest_score(db, sme):
+    assert sme.latest_score is None
+    now = datetime(2025, 6, 1)
+    db.add(CreditScore(sme_id=sme.id, score=61.0, created_at=now))
+    db.flush()
+    assert sme.latest_score == 61.0          # session copy updated before commit
+    db.commit()
+    _assert_latest(db, sme)
+
+    db.add(CreditScore(sme_id=sme.id, score=40.0, created_at=now - timedelta(days=30)))   # backdated
+    db.commit()
+    assert sme.latest_score == 61.0
+    _assert_latest(db, sme)
+
+    db.add(CreditScore(sme_id=sme.id, score=77.5, created_at=now + timedelta(days=1)))
+    db.commit()
+    assert sme.latest_score == 77.5
+    _assert_latest(db, sme)
+
+
+def test_delete_and_update_recompute(db, sme):
+    base = datetime(2025, 1, 1)
+    scores = [CreditScore(sme_id=sme.id, score=50.0 + i, created_at=base + timedelta(days=i)) for i in range(3)]
+    db.add_all(scores)
+    db.commit()
+    assert sme.latest_score == 52.0
+
+    db.delete(scores[2])
+    db.commit()
+    _assert_latest(db, sme)
+    assert sme.latest_score == 51.0
+
+    scores[0].created_at = base + timedelta(days=10)
+    db.commit()
+    _assert_latest(db, sme)
+    assert sme.latest_score == 50.0
+
+    db.delete(scores[0])
+    db.delete(scores[1])
+    db.commit()
+    _assert_latest(db, sme)
+
+
+def test_rollback_restores_previous_latest(db, sme):
+    db.add(CreditScore(sme_id=sme.id, score=70.0, created_at=datetime(2025, 1, 1)))
+    db.commit()
+    db.add(CreditScore(sme_id=sme.id, score=20.0, created_at=datetime(2025, 2, 1)))
+    db.flush()
+    db.rollback()
+    _assert_latest(db, sme)
+    assert sme.latest_score == 70.0
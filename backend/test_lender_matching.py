@@ -0,0 +1,273 @@
+"""
+test_lender_matching.py
+
+Tests for the precomputed SME–lender eligibility: after every kind of write
+(credit scores, sector / province moves, pending requests, verifications,
+lender criteria, SME deletes) lender_matches equals a from-scratch evaluation
+of every lender against every SME; SMEs crossing into a lender's criteria
+emit exactly one "new eligible SME" event; pairs that stay eligible keep
+their matched_at; an SME's lenders are looked up in SQL rather than by
+loading every lender; rolled-back writes change nothing;
+rebuild_matches() repairs drift; and /lenders/matches and
+/lenders/matches/events serve the results, /lenders/matches computing them
+from the source tables until a first rebuild.
+
+Run from backend/:  pytest test_lender_matching.py -v
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, get_db
+from main import app
+from limiter import limiter
+from core.assessment_engine import ConfidenceCalculator
+from models import User, SME, Lender, CreditScore, Verification, LenderMatch, LenderMatchEvent
+from services.auth_service import create_access_token
+from services.finance_service import approve_finance_request, create_finance_request
+from services.matching_service import rebuild_matches, refresh_sme_matches
+from services.query_stats_service import statement_shape, track_queries
+from services.scoring_service import build_evidence_package
+
+limiter.enabled = False
+
+LENDER = {"Authorization": f"Bearer {create_access_token({'sub': 'lm_lender'})}"}
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'matching.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add_all([
+            User(id=1, username="lm_sme", email="lm_sme@example.com", hashed_password="x", role="sme"),
+            User(id=2, username="lm_lender", email="lm_lender@example.com", hashed_password="x", role="lender"),
+            User(id=3, username="lm_broad", email="lm_broad@example.com", hashed_password="x", role="lender"),
+        ])
+        db.add_all([
+            # Retail in Gauteng, scores of 60+, asks of at most 20,000
+            Lender(id=1, user_id=2, organization_name="LM Retail", contact_email="r@example.com",
+                   min_credit_score=60, max_lending_amount=20000, sectors=["Retail"], provinces=["Gauteng"]),
+            Lender(id=2, user_id=3, organization_name="LM Broad", contact_email="b@example.com",
+                   min_credit_score=40, max_lending_amount=1000000),
+        ])
+        db.add_all([
+            SME(id=i, name=f"Match {i}", industry=industry, province=province, revenue=100000, years_active=3,
+                user_id=1)
+            for i, industry, province in [(1, "Retail", "Gauteng"), (2, "Retail", "Limpopo"),
+                                          (3, "Mining", "Gauteng"), (4, "Retail", None)]
+        ])
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def _score(db, sme_id: int, score: float, day: int = 1) -> None:
+    db.add(CreditScore(sme_id=sme_id, score=score, created_at=datetime(2025, 1, day)))
+    db.commit()
+
+
+def _expected(db) -> dict[tuple[int, int], tuple[float, float]]:
+    """{(lender_id, sme_id): (score, confidence)} evaluated from the source tables, without the index."""
+    eligible = {}
+    for lender in db.query(Lender).all():
+        for sme in db.query(SME).all():
+            asked = sum((r.amount_requested for r in sme.finance_requests if r.status == "pending"), Decimal(0))
+            if (sme.latest_score is not None and sme.latest_score >= lender.min_credit_score
+                    and asked <= lender.max_lending_amount
+                    and (not lender.sectors or sme.industry in lender.sectors)
+                    and (not lender.provinces or sme.province in lender.provinces)):
+                confidence = ConfidenceCalculator.calculate(build_evidence_package(sme, db))
+                eligible[lender.id, sme.id] = (sme.latest_score, confidence)
+    return eligible
+
+
+def _matches(db) -> dict[tuple[int, int], tuple[float, float]]:
+    return {(m.lender_id, m.sme_id): (m.score, m.confidence) for m in db.query(LenderMatch).all()}
+
+
+def _assert_matches(db) -> dict:
+    db.expire_all()
+    expected = _expected(db)
+    assert _matches(db) == expected
+    return expected
+
+
+def _events(db) -> list[tuple[int, int]]:
+    return [(e.lender_id, e.sme_id) for e in db.query(LenderMatchEvent).order_by(LenderMatchEvent.id)]
+
+
+def test_matches_follow_every_write(sessions):
+    with sessions() as db:
+        assert _assert_matches(db) == {}                              # unscored SMEs fit no lender
+
+        for sme_id, score in [(1, 72.0), (2, 65.0), (3, 55.0), (4, 38.0)]:
+            _score(db, sme_id, score)
+        assert set(_assert_matches(db)) == {(1, 1), (2, 1), (2, 2), (2, 3)}
+
+        # A pending ask above lender 1's maximum takes SME 1 out; approving it brings it back
+        request = create_finance_request(db, sme_id=1, amount=50000)
+        assert request.amount_requested > 20000
+        assert (1, 1) not in _assert_matches(db)
+        approve_finance_request(db, request.id, lender_id=2, approved_amount=20000)
+        assert (1, 1) in _assert_matches(db)
+
+        # Sector and province moves, a new score and a lower score
+        db.get(SME, 3).industry = "Retail"
+        db.commit()
+        assert (1, 3) not in _assert_matches(db)                      # 55 is below lender 1's 60
+        _score(db, 3, 61.0, day=2)
+        db.get(SME, 2).province = "Gauteng"
+        db.commit()
+        assert {(1, 2), (1, 3)} <= set(_assert_matches(db))
+        _score(db, 1, 59.5, day=3)
+        assert (1, 1) not in _assert_matches(db)
+
+        # Confidence follows the evidence behind it
+        before = _matches(db)[2, 2][1]
+        db.add(Verification(sme_id=2, doc_type="cipc", status="approved"))
+        db.commit()
+        assert _assert_matches(db)[2, 2][1] == before + 15.0
+
+        # Lender criteria changes recompute that lender's set
+        lender = db.get(Lender, 1)
+        lender.sectors, lender.provinces, lender.min_credit_score = [], ["Gauteng", "Limpopo"], 50
+        db.commit()
+        _assert_matches(db)
+        db.add(Lender(id=3, user_id=1, organization_name="LM New", contact_email="n@example.com",
+                      min_credit_score=0, max_lending_amount=0))
+        db.commit()
+        assert {sme for lender_id, sme in _assert_matches(db) if lender_id == 3} == {1, 2, 3, 4}
+
+        db.delete(db.get(SME, 2))
+        db.commit()
+        assert all(sme != 2 for _, sme in _assert_matches(db))
+
+
+def test_sme_crossing_into_criteria_emits_one_event(sessions):
+    with sessions() as db:
+        _score(db, 1, 50.0)
+        assert _events(db) == [(2, 1)]                                # lender 1 needs 60
+
+        _score(db, 1, 70.0, day=2)
+        _score(db, 1, 71.0, day=3)                                    # already eligible: no new event
+        assert _events(db) == [(2, 1), (1, 1)]
+
+        _score(db, 1, 30.0, day=4)
+        _score(db, 1, 80.0, day=5)                                    # left and came back
+        assert _events(db) == [(2, 1), (1, 1), (1, 1), (2, 1)]
+
+        # Widening a lender's criteria is the lender's doing: matches, but no events
+        db.get(Lender, 1).provinces = []
+        _score(db, 2, 90.0)
+        assert _events(db)[-2:] == [(1, 2), (2, 2)]
+        db.get(SME, 4).industry = "Mining"
+        _score(db, 4, 90.0)
+        db.get(Lender, 1).sectors = []
+        db.commit()
+        assert (1, 4) in _assert_matches(db)
+        assert _events(db)[-1] == (2, 4)
+
+        # Rolled back writes leave matches and events untouched
+        matches, events = _matches(db), _events(db)
+        db.add(CreditScore(sme_id=3, score=95.0, created_at=datetime(2025, 2, 1)))
+        db.flush()
+        assert len(_events(db)) > len(events)
+        db.rollback()
+        assert (_matches(db), _events(db)) == (matches, events)
+
+
+def test_pairs_that_stay_eligible_keep_matched_at(sessions):
+    def matched_at(db):
+        db.expire_all()
+        return {(m.lender_id, m.sme_id): m.matched_at for m in db.query(LenderMatch).all()}
+
+    with sessions() as db:
+        _score(db, 1, 72.0)
+        first = matched_at(db)
+        assert set(first) == {(1, 1), (2, 1)}
+
+        _score(db, 1, 78.0, day=2)                                     # rescored
+        db.add(Verification(sme_id=1, doc_type="cipc", status="approved"))   # new confidence
+        db.commit()
+        db.get(Lender, 2).min_credit_score = 30                        # the lender side recomputes
+        db.commit()
+        assert matched_at(db) == first
+        assert _assert_matches(db)[1, 1][0] == 78.0
+
+        with track_queries() as stats:
+            _score(db, 1, 80.0, day=3)
+        assert not any(shape.startswith("SELECT lenders.") for shape in map(statement_shape, stats.statements))
+
+
+def test_core_writes_and_rebuild(sessions):
+    with sessions() as db:
+        db.execute(text("UPDATE smes SET latest_score = 75.0 WHERE id IN (1, 3)"))   # bypasses the listener
+        db.commit()
+        assert _matches(db) == {}
+
+        stats = refresh_sme_matches(db, [1, 3])
+        db.commit()
+        assert stats == {"keys_changed": 2, "matched": 3, "unmatched": 0, "events": 3}
+        _assert_matches(db)
+
+        db.execute(text("UPDATE smes SET province = 'Limpopo' WHERE id = 1"))
+        db.execute(text("DELETE FROM lender_matches WHERE lender_id = 2"))
+        db.commit()
+        events = _events(db)
+        stats = rebuild_matches(db)
+        db.commit()
+        # SME 1's key is rewritten along with its matches; lender 2 then gets SME 3 back
+        assert stats == {"smes": 4, "lenders": 2, "keys_drifted": 1, "matches_drifted": 1}
+        _assert_matches(db)
+        assert _events(db) == events                                   # rebuilds emit no events
+        assert rebuild_matches(db)["keys_drifted"] + rebuild_matches(db)["matches_drifted"] == 0
+
+
+def test_match_endpoints(sessions):
+    with sessions() as db:
+        for sme_id, score in [(1, 72.0), (2, 72.0), (3, 95.0), (4, 61.0)]:
+            _score(db, sme_id, score)
+        db.add(Verification(sme_id=2, doc_type="cipc", status="approved"))
+        db.get(Lender, 1).provinces = []
+        db.commit()
+
+    def override_get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        computed = [client.get("/lenders/matches", headers=LENDER, params={"limit": k}).json() for k in (1, 2, 5)]
+        with sessions() as db:
+            rebuild_matches(db)
+            db.commit()
+        top = client.get("/lenders/matches", headers=LENDER, params={"limit": 2})
+        indexed = [client.get("/lenders/matches", headers=LENDER, params={"limit": k}).json() for k in (1, 2, 5)]
+        events = client.get("/lenders/matches/events", headers=LENDER)
+        later = client.get("/lenders/matches/events", headers=LENDER, params={"after_id": events.json()[0]["id"]})
+        no_profile = client.get("/lenders/matches", headers={
+            "Authorization": f"Bearer {create_access_token({'sub': 'lm_sme'})}"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert top.status_code == 200
+    assert int(top.headers["X-DB-Query-Count"]) == 4                  # user, lender profile, build marker, top-k
+    # Before the first rebuild the same ranking is computed from the source tables
+    assert [[{**m, "matched_at": None} for m in page] for page in indexed] == computed
+    # Retail SMEs 1, 2 and 4 fit lender 1; 1 and 2 tie on score, 2 has the higher confidence
+    assert [(m["sme_id"], m["risk_level"]) for m in top.json()] == [(2, "Low"), (1, "Low")]
+    assert top.json()[0]["confidence"] > top.json()[1]["confidence"]
+
+    assert [e["sme_id"] for e in events.json()] == [1, 2]            # 4 only matched once provinces widened
+    assert [e["sme_id"] for e in later.json()] == [2]
+    assert no_profile.status_code == 403
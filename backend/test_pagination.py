@@ -0,0 +1,163 @@
+"""
+test_pagination.py
+
+Tests for keyset pagination of the list endpoints: following Link/X-Next-Cursor
+visits every row exactly once (also when rows are added between pages), the
+total estimate comes with the first page only, page sizes are clamped,
+filters narrow the listing, cursors are validated, and sorts on a
+non-unique column break ties by id.
+
+Run from backend/:  pytest test_pagination.py -v
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from database import Base, get_db, get_async_db
+from main import app
+from limiter import limiter
+from models import User, SME, CreditScore
+from pagination import MAX_PAGE_SIZE, Keyset, PageParams
+from services.auth_service import create_access_token
+
+limiter.enabled = False
+
+LENDER = {"Authorization": f"Bearer {create_access_token({'sub': 'pg_lender'})}"}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    path = tmp_path / "pagination.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), {
+            "id": 1, "username": "pg_lender", "email": "pg_lender@example.com", "hashed_password": "x",
+            "role": "lender",
+        })
+    sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield engine
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def _add_smes(engine, ids) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(SME.__table__), [
+            {"id": i, "name": f"Page {i}", "industry": ["Retail", "Mining"][i % 2], "revenue": 100000,
+             "years_active": 2, "user_id": 1, "province": "Gauteng"}
+            for i in ids
+        ])
+
+
+def _walk(client, url, **params) -> tuple[list, list]:
+    """Every item reachable from url by following rel="next", and the responses."""
+    responses = [client.get(url, headers=LENDER, params=params)]
+    while "Link" in responses[-1].headers:
+        assert responses[-1].status_code == 200
+        next_url = responses[-1].headers["Link"].split(">;")[0].lstrip("<")
+        responses.append(client.get(next_url, headers=LENDER))
+    assert responses[-1].status_code == 200
+    return [item for r in responses for item in r.json()], responses
+
+
+def test_following_next_links_visits_every_row_once(engine):
+    _add_smes(engine, range(1, 26))
+    client = TestClient(app)
+
+    first = client.get("/smes/", headers=LENDER, params={"limit": 10})
+    assert [s["id"] for s in first.json()] == list(range(1, 11))
+    assert first.headers["X-Total-Count-Estimate"] == "25"
+
+    # Rows added while a client pages are picked up once, never repeated
+    _add_smes(engine, [26, 27])
+    second = client.get("/smes/", headers=LENDER, params={"limit": 10, "cursor": first.headers["X-Next-Cursor"]})
+    assert [s["id"] for s in second.json()] == list(range(11, 21))
+    assert "X-Total-Count-Estimate" not in second.headers
+
+    items, responses = _walk(client, "/smes/", limit=10)
+    assert [s["id"] for s in items] == list(range(1, 28))
+    assert len(responses) == 3
+    assert "X-Next-Cursor" not in responses[-1].headers
+
+    listed, _ = _walk(client, "/lenders/available-smes", limit=4)
+    assert [s["sme_id"] for s in listed] == list(range(1, 28))
+
+
+def test_limit_is_clamped_and_filters_narrow_the_listing(engine):
+    _add_smes(engine, range(1, MAX_PAGE_SIZE + 11))
+    client = TestClient(app)
+
+    oversized = client.get("/smes/", headers=LENDER, params={"limit": 100000})
+    assert oversized.status_code == 200
+    assert len(oversized.json()) == MAX_PAGE_SIZE
+    assert "X-Next-Cursor" in oversized.headers
+    assert client.get("/smes/", headers=LENDER, params={"limit": 0}).status_code == 422
+
+    mining, _ = _walk(client, "/smes/", industry="Mining", limit=100)
+    assert [s["id"] for s in mining] == list(range(1, MAX_PAGE_SIZE + 11, 2))
+    assert client.get("/smes/", headers=LENDER, params={"province": "Limpopo"}).json() == []
+
+
+def test_invalid_cursors_are_rejected(engine):
+    _add_smes(engine, range(1, 6))
+    client = TestClient(app)
+
+    assert client.get("/smes/", headers=LENDER, params={"cursor": "not-a-cursor"}).status_code == 400
+    # A cursor only fits the sort it came from
+    cursor = client.get("/smes/", headers=LENDER, params={"limit": 2}).headers["X-Next-Cursor"]
+    scores = client.get("/credit-scores/sme/1", headers=LENDER, params={"cursor": cursor})
+    assert scores.status_code == 400
+    assert scores.json()["detail"] == "Invalid pagination cursor"
+
+
+def test_credit_scores_page_newest_first_and_break_ties_by_id(engine):
+    _add_smes(engine, [1])
+    same_instant = datetime(2025, 3, 1)
+    created = [datetime(2025, 1, 1), same_instant, same_instant, same_instant, datetime(2025, 5, 1)]
+    with engine.begin() as conn:
+        conn.execute(insert(CreditScore.__table__), [
+            {"id": i, "sme_id": 1, "score": 50.0 + i, "created_at": at} for i, at in enumerate(created, start=1)
+        ])
+    client = TestClient(app)
+
+    scores, responses = _walk(client, "/credit-scores/sme/1", limit=2)
+    assert [s["id"] for s in scores] == [5, 4, 3, 2, 1]
+    assert len(responses) == 3
+    assert responses[0].headers["X-Total-Count-Estimate"] == "5"
+
+
+def test_mixed_sort_directions_resume_after_the_cursor(engine):
+    _add_smes(engine, range(1, 11))
+    keyset = Keyset(SME.industry, (SME.id, True))
+    seen = []
+    params = PageParams(limit=3)
+    with engine.connect() as conn:
+        while True:
+            page = keyset.page(conn.execute(keyset.apply(select(SME.id, SME.industry), params)).all(), params)
+            seen += [row.id for row in page.items]
+            if page.next_cursor is None:
+                break
+            params = PageParams(limit=3, cursor=page.next_cursor)
+    assert seen == [9, 7, 5, 3, 1, 10, 8, 6, 4, 2]     # Mining before Retail, ids descending
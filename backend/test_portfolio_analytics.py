@@ -0,0 +1,182 @@
+"""
+test_portfolio_analytics.py
+
+Tests for /lenders/portfolio-analytics before its counters are built: the
+GROUP BY implementation returns what the former row-by-row implementation
+computed, within its query budget, and the single-flight TTL cache serves
+repeats and runs concurrent misses once.
+
+Run from backend/:  pytest test_portfolio_analytics.py -v
+"""
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, get_db
+from main import app
+from limiter import limiter
+from models import User, SME, Invoice, FinanceRequest, SmeOutcome
+from services.auth_service import create_access_token
+from services.portfolio_analytics_service import (
+    SingleFlightCache,
+    compute_portfolio_analytics,
+    portfolio_analytics_cache,
+)
+
+limiter.enabled = False
+
+LENDER = {"Authorization": f"Bearer {create_access_token({'sub': 'pa_lender'})}"}
+REQUEST_STATUSES = ["pending", "approved", "rejected", "funded", "paid", "closed"]
+OUTCOME_STATUSES = ["pending", "active", "repaid", "defaulted", "repaid"]
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'analytics.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    created = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": i, "username": f"pa{i}", "email": f"pa{i}@example.com", "hashed_password": "x", "role": "sme"}
+            for i in range(1, 41)
+        ] + [{"id": 100, "username": "pa_lender", "email": "pa_lender@example.com", "hashed_password": "x",
+              "role": "lender"}])
+        conn.execute(insert(SME.__table__), [
+            {"id": i, "name": f"PA {i}", "industry": ["Retail", "Mining", "", "Retail"][i % 4], "revenue": 100000,
+             "years_active": 2, "user_id": i, "province": ["Gauteng", None, "Limpopo"][i % 3],
+             "latest_score": [None, 42.5, 49.95, 50.0, 74.9, 75.0, 91.3][i % 7],
+             "latest_score_at": created}
+            for i in range(1, 41)
+        ])
+        conn.execute(insert(Invoice.__table__), [
+            {"id": i, "sme_id": i, "client_name": "C", "amount": 1000, "status": "pending", "created_at": created}
+            for i in range(1, 41)
+        ])
+        conn.execute(insert(FinanceRequest.__table__), [
+            {"id": i, "sme_id": i, "invoice_id": i, "amount_requested": 1000,
+             "status": REQUEST_STATUSES[i % len(REQUEST_STATUSES)], "approved_amount": 900 + i,
+             "platform_fee": 18.5 + i, "created_at": created}
+            for i in range(1, 41)
+        ])
+        conn.execute(insert(SmeOutcome.__table__), [
+            {"finance_request_id": i, "sme_id": i, "score_at_funding": 60.0, "amount": 900,
+             "outstanding_recommendations": [], "outcome_status": OUTCOME_STATUSES[i % len(OUTCOME_STATUSES)]}
+            for i in range(1, 41) if i % 2
+        ])
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    portfolio_analytics_cache.invalidate()
+    yield factory
+    portfolio_analytics_cache.invalidate()
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def _row_by_row(db) -> dict:
+    """The figures as the endpoint used to compute them, one ORM row at a time."""
+    requests = db.query(FinanceRequest).all()
+    financed = [r for r in requests if r.status in {"funded", "paid", "closed"}]
+    smes = db.query(SME).all()
+    scores = [s.latest_score for s in smes if s.latest_score is not None]
+    distribution = {"Declined (<50)": 0, "Review (50-74)": 0, "Approved (75+)": 0, "Unscored": 0}
+    by_sector, by_province = {}, {}
+    for s in smes:
+        if s.latest_score is None:
+            distribution["Unscored"] += 1
+        elif s.latest_score < 50:
+            distribution["Declined (<50)"] += 1
+        elif s.latest_score < 75:
+            distribution["Review (50-74)"] += 1
+        else:
+            distribution["Approved (75+)"] += 1
+        by_sector[s.industry or "Other"] = by_sector.get(s.industry or "Other", 0) + 1
+        by_province[s.province or "Unknown"] = by_province.get(s.province or "Unknown", 0) + 1
+    outcomes = [o.outcome_status for o in db.query(SmeOutcome).all()]
+    counts = {status: outcomes.count(status) for status in ("pending", "active", "repaid", "defaulted")}
+    denom = counts["repaid"] + counts["defaulted"] + counts["active"]
+    return {
+        "applications": {
+            "total": len(requests),
+            **{status: sum(r.status == status for r in requests)
+               for status in ("approved", "funded", "pending", "rejected")},
+        },
+        "financials": {
+            "total_financed": float(sum(r.approved_amount or 0 for r in financed)),
+            "total_fees": float(sum(r.platform_fee or 0 for r in financed)),
+        },
+        "scores": {"average": round(sum(scores) / len(scores), 1), "distribution": distribution},
+        "concentration": {"by_sector": by_sector, "by_province": by_province},
+        "outcomes": {**counts, "repayment_rate": round(counts["repaid"] / denom * 100, 1)},
+    }
+
+
+def test_grouped_queries_match_row_by_row_figures(sessions):
+    with sessions() as db:
+        expected = _row_by_row(db)
+        assert compute_portfolio_analytics(db) == expected
+    assert set(expected["concentration"]["by_sector"]) == {"Retail", "Mining", "Other"}
+    assert expected["scores"]["distribution"] == {
+        "Declined (<50)": 12, "Review (50-74)": 12, "Approved (75+)": 11, "Unscored": 5,
+    }
+
+    response = TestClient(app).get("/lenders/portfolio-analytics", headers=LENDER)
+    assert response.status_code == 200
+    assert response.json() == expected
+    assert int(response.headers["X-DB-Query-Count"]) <= 6    # before a counter rebuild: grouped queries
+
+
+def test_analytics_are_cached_until_the_ttl_passes(sessions, monkeypatch):
+    client = TestClient(app)
+    first = client.get("/lenders/portfolio-analytics", headers=LENDER)
+    with sessions() as db:
+        db.query(FinanceRequest).filter(FinanceRequest.id == 2).update({"status": "approved"})
+        db.commit()
+
+    cached = client.get("/lenders/portfolio-analytics", headers=LENDER)
+    assert cached.json() == first.json()
+    assert int(cached.headers["X-DB-Query-Count"]) == 2        # the user lookup and the (unbuilt) counters
+
+    monkeypatch.setattr(portfolio_analytics_cache, "_clock",
+                        lambda: time.monotonic() + portfolio_analytics_cache.ttl_seconds)
+    refreshed = client.get("/lenders/portfolio-analytics", headers=LENDER).json()
+    assert refreshed["applications"]["approved"] == first.json()["applications"]["approved"] + 1
+
+
+def test_concurrent_misses_compute_once():
+    cache = SingleFlightCache(ttl_seconds=60.0)
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"value": len(calls)}
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 8
+    stats = cache.stats()
+    assert stats["computations"] == 1 and stats["hits"] + stats["coalesced"] == 7
+
+    failing = SingleFlightCache(ttl_seconds=60.0)
+    with pytest.raises(RuntimeError):
+        failing.get_or_compute("k", lambda: (_ for _ in ()).throw(RuntimeError("db down")))
+    assert failing.get_or_compute("k", lambda: 42) == 42      # errors are not cached
@@ -0,0 +1,170 @@
+"""
+test_portfolio_counters.py
+
+Tests for the incrementally maintained portfolio_counters: after every state
+transition (finance request lifecycle, outcome check-ins, credit scores, SME
+create / delete) the counters agree with the GROUP BY figures; rolled-back
+writes leave them untouched; Core writes report through counted_sme_changes();
+rebuild_counters() repairs drift; and the analytics endpoint reads them in one
+query once they are built.
+
+Run from backend/:  pytest test_portfolio_counters.py -v
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text, update
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, get_db
+from main import app
+from limiter import limiter
+from models import User, SME, Lender, CreditScore, SmeOutcome
+from services.auth_service import create_access_token
+from services.finance_service import (
+    approve_finance_request,
+    create_finance_request,
+    mark_finance_request_closed,
+    mark_finance_request_funded,
+    mark_finance_request_paid,
+    reject_finance_request,
+)
+from services.outcome_service import update_checkin
+from services.portfolio_analytics_service import (
+    analytics_payload,
+    compute_portfolio_analytics,
+    grouped_figures,
+    platform_stats_payload,
+    portfolio_analytics_cache,
+)
+from services.portfolio_counter_service import counted_sme_changes, counter_figures, rebuild_counters
+
+limiter.enabled = False
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'counters.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add_all([
+            User(id=1, username="pc_sme1", email="pc_sme1@example.com", hashed_password="x", role="sme"),
+            User(id=2, username="pc_sme2", email="pc_sme2@example.com", hashed_password="x", role="sme"),
+            User(id=3, username="pc_lender", email="pc_lender@example.com", hashed_password="x", role="lender"),
+        ])
+        db.add(Lender(id=1, user_id=3, organization_name="PC Capital", contact_email="pc@example.com"))
+        db.add_all([
+            SME(id=1, name="Counter One", industry="Retail", revenue=500000, years_active=4, user_id=1,
+                province="Gauteng"),
+            SME(id=2, name="Counter Two", industry="Mining", revenue=250000, years_active=2, user_id=2),
+        ])
+        db.commit()
+        assert rebuild_counters(db)["first_build"] is True
+        db.commit()
+    yield factory
+    portfolio_analytics_cache.invalidate()
+    engine.dispose()
+
+
+def _assert_counters_match(db) -> dict:
+    figures = counter_figures(db)
+    expected = compute_portfolio_analytics(db)
+    assert analytics_payload(figures) == expected
+    assert platform_stats_payload(figures) == platform_stats_payload(grouped_figures(db))
+    return expected
+
+
+def test_counters_follow_every_state_transition(sessions):
+    with sessions() as db:
+        assert _assert_counters_match(db)["scores"]["distribution"]["Unscored"] == 2
+
+        db.add_all([CreditScore(sme_id=1, score=68.0, created_at=datetime(2025, 1, 1)),
+                    CreditScore(sme_id=2, score=55.5, created_at=datetime(2025, 1, 1))])
+        db.commit()
+        db.add(CreditScore(sme_id=1, score=81.25, created_at=datetime(2025, 2, 1)))
+        db.commit()
+        assert _assert_counters_match(db)["scores"]["distribution"]["Approved (75+)"] == 1
+
+        funded = create_finance_request(db, sme_id=1, amount=10000)
+        rejected = create_finance_request(db, sme_id=2, amount=5000)
+        assert _assert_counters_match(db)["applications"]["pending"] == 2
+
+        approve_finance_request(db, funded.id, lender_id=1, approved_amount=8000)
+        reject_finance_request(db, rejected.id, lender_id=1)
+        _assert_counters_match(db)
+
+        mark_finance_request_funded(db, funded.id)
+        analytics = _assert_counters_match(db)
+        assert analytics["financials"]["total_financed"] == 8000.0
+        assert analytics["outcomes"]["active"] + analytics["outcomes"]["pending"] == 1
+
+        outcome = db.query(SmeOutcome).one()
+        update_checkin(db, outcome.id, interval=90, still_operating=True, revenue=120000, loan_repaid=True)
+        assert _assert_counters_match(db)["outcomes"]["repaid"] == 1
+
+        mark_finance_request_paid(db, funded.id)
+        mark_finance_request_closed(db, funded.id)
+        _assert_counters_match(db)
+
+        db.add(SME(id=3, name="Counter Three", industry="", revenue=1000, years_active=0, user_id=2,
+                   province="Limpopo"))
+        db.commit()
+        assert "Other" in _assert_counters_match(db)["concentration"]["by_sector"]
+
+        db.delete(db.get(SME, 1))
+        db.commit()
+        analytics = _assert_counters_match(db)
+        assert analytics["applications"] == {"total": 1, "approved": 0, "funded": 0, "pending": 0, "rejected": 1}
+        assert analytics["financials"]["total_financed"] == 0.0
+
+
+def test_rolled_back_writes_leave_counters_untouched(sessions):
+    with sessions() as db:
+        before = _assert_counters_match(db)
+        db.add(CreditScore(sme_id=1, score=90.0, created_at=datetime(2025, 3, 1)))
+        db.get(SME, 2).industry = "Agriculture"
+        db.flush()
+        db.rollback()
+        assert analytics_payload(counter_figures(db)) == before
+
+
+def test_core_writes_and_drift_repair(sessions):
+    with sessions() as db:
+        with counted_sme_changes(db.connection(), [1, 2]):
+            db.execute(update(SME).where(SME.id.in_([1, 2])).values(latest_score=77.0))
+        db.commit()
+        assert _assert_counters_match(db)["scores"]["distribution"]["Approved (75+)"] == 2
+
+        db.execute(text("UPDATE smes SET province = 'Western Cape' WHERE id = 2"))   # bypasses the listener
+        db.commit()
+        assert analytics_payload(counter_figures(db)) != compute_portfolio_analytics(db)
+
+        stats = rebuild_counters(db)
+        db.commit()
+        assert stats["drifted"] == 2 and stats["first_build"] is False      # Unknown -1, Western Cape +1
+        _assert_counters_match(db)
+
+
+def test_endpoint_reads_counters_in_one_query(sessions):
+    def override_get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        portfolio_analytics_cache.invalidate()
+        response = TestClient(app).get(
+            "/lenders/portfolio-analytics",
+            headers={"Authorization": f"Bearer {create_access_token({'sub': 'pc_lender'})}"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) == 2     # the user lookup and the counters
+    with sessions() as db:
+        assert response.json() == compute_portfolio_analytics(db)
@@ -0,0 +1,283 @@
+"""
+test_query_budget.py
+
+Tests for per-request query telemetry: statement counting and X-DB-* headers,
+repeated-shape (N+1) logging, @query_budget enforcement, pool checkout stats,
+the budgets of the routes that used to issue one query per row, and the
+single flush of the rescoring write routes.
+
+Run from backend/:  pytest test_query_budget.py -v
+"""
+import logging
+import os
+import threading
+from datetime import datetime
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from database import Base, get_db, get_async_db
+from main import app
+from limiter import limiter
+from core.assessment_engine import assess
+from models import User, SME, FinanceRequest, Invoice, Lender, SmeOutcome, Verification
+from services.auth_service import create_access_token
+from services.scoring_service import build_evidence_package, build_evidence_packages, rescore_sme
+from services.query_stats_service import (
+    QueryBudgetExceeded,
+    QueryStatsMiddleware,
+    TimedQueuePool,
+    pool_stats,
+    query_budget,
+    query_budgets,
+    statement_shape,
+    track_queries,
+)
+
+limiter.enabled = False
+
+TEST_DB_FILE = "test_query_budget_tmp.db"
+engine = create_engine(f"sqlite:///./{TEST_DB_FILE}", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(f"sqlite+aiosqlite:///./{TEST_DB_FILE}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_db():
+    if os.path.exists(TEST_DB_FILE):
+        os.remove(TEST_DB_FILE)
+    Base.metadata.create_all(bind=engine)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield
+    app.dependency_overrides.clear()
+    engine.dispose()
+    if os.path.exists(TEST_DB_FILE):
+        os.remove(TEST_DB_FILE)
+
+
+@pytest.fixture
+def enforce_budgets():
+    previous = query_budgets.enforce
+    query_budgets.enforce = True
+    yield
+    query_budgets.enforce = previous
+
+
+# ── Middleware on a bare app ──────────────────────────────────────────────────
+
+def _probe_app() -> FastAPI:
+    probe = FastAPI()
+    probe.add_middleware(QueryStatsMiddleware)
+
+    @probe.get("/loop/{n}")
+    @query_budget(3)
+    def loop(n: int, db: Session = Depends(override_get_db)):
+        for i in range(n):
+            db.execute(text("SELECT :i"), {"i": i})
+        return {"n": n}
+
+    return probe
+
+
+def test_counts_queries_and_sets_headers():
+    response = TestClient(_probe_app()).get("/loop/2")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Query-Count"] == "2"
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0.0
+
+
+def test_logs_repeated_statement_shapes(caplog):
+    with caplog.at_level(logging.WARNING, logger="services.query_stats_service"):
+        TestClient(_probe_app()).get("/loop/8")
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("Possible N+1 in GET /loop/8: statement ran 8 times" in m for m in messages)
+    assert any("over its budget of 3" in m for m in messages)
+
+
+def test_enforced_budget_fails_the_request(enforce_budgets):
+    client = TestClient(_probe_app())
+    assert client.get("/loop/3").status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match=r"ran 4 queries, over its budget of 3.*4x SELECT \?"):
+        client.get("/loop/4")
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT * FROM t\n WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?)"
+    assert statement_shape("WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == "WHERE id IN (?)"
+    assert statement_shape("WHERE id IN ($1, $2, $3) AND x = $4") == "WHERE id IN (?) AND x = $4"
+
+
+def test_track_queries_outside_requests():
+    with track_queries() as stats:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    assert stats.count == 2
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))
+    assert stats.count == 2
+
+
+# ── Pool telemetry ────────────────────────────────────────────────────────────
+
+def test_pool_stats_report_size_overflow_and_checkout_waits(tmp_path):
+    pooled = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool,
+        pool_size=1, max_overflow=1, pool_timeout=0.05, connect_args={"check_same_thread": False},
+    )
+    first, second = pooled.connect(), pooled.connect()
+    stats = pool_stats(pooled)
+    assert (stats["size"], stats["max_overflow"], stats["checked_out"], stats["overflow"]) == (1, 1, 2, 1)
+    assert stats["checkouts"] == 2
+
+    with pytest.raises(PoolTimeoutError):
+        pooled.connect()
+    assert pool_stats(pooled)["checkout_timeouts"] == 1
+
+    # A checkout that waits for a connection to be returned shows up in the wait figures
+    threading.Timer(0.02, first.close).start()
+    pooled.pool._timeout = 1.0
+    third = pooled.connect()
+    stats = pool_stats(pooled)
+    assert stats["checkouts"] == 3 and stats["checkout_wait_seconds_max"] >= 0.015
+    third.close()
+    second.close()
+    pooled.dispose()
+
+
+# ── Route budgets on the real app ─────────────────────────────────────────────
+
+def _seed(smes: int) -> dict:
+    """SME users with a finance request and a funded outcome each, plus a lender; returns auth headers."""
+    created = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": i, "username": f"qb{i}", "email": f"qb{i}@example.com", "hashed_password": "x", "role": "sme"}
+            for i in range(1, smes + 1)
+        ] + [{"id": 1000, "username": "qb_lender", "email": "qb_lender@example.com",
+              "hashed_password": "x", "role": "lender"}])
+        conn.execute(insert(SME.__table__), [
+            {"id": i, "name": f"QB {i}", "industry": ["Retail", "Agriculture"][i % 2], "revenue": 100000,
+             "years_active": 2, "user_id": i, "province": "Gauteng", "latest_score": 60.0 + i,
+             "latest_score_at": created, "created_at": created}
+            for i in range(1, smes + 1)
+        ])
+        conn.execute(insert(Invoice.__table__), [
+            {"id": i, "sme_id": i, "client_name": "C", "amount": 1000, "status": "pending", "created_at": created}
+            for i in range(1, smes + 1)
+        ])
+        conn.execute(insert(FinanceRequest.__table__), [
+            {"id": i, "sme_id": i, "invoice_id": i, "amount_requested": 500,
+             "status": "pending" if i % 2 else "funded", "created_at": created}
+            for i in range(1, smes + 1)
+        ])
+        conn.execute(insert(SmeOutcome.__table__), [
+            {"finance_request_id": i, "sme_id": i, "score_at_funding": 60.0, "amount": 500,
+             "outstanding_recommendations": [], "outcome_status": "repaid" if i % 3 else "active"}
+            for i in range(1, smes + 1)
+        ])
+    return {
+        "lender": {"Authorization": f"Bearer {create_access_token({'sub': 'qb_lender'})}"},
+        "sme": {"Authorization": f"Bearer {create_access_token({'sub': 'qb1'})}"},
+    }
+
+
+def test_list_routes_stay_within_budget(enforce_budgets):
+    headers = _seed(12)
+    client = TestClient(app)
+
+    analytics = client.get("/outcomes/analytics", headers=headers["lender"])
+    assert analytics.status_code == 200
+    assert analytics.json()["total_deals"] == 12
+    assert set(analytics.json()["breakdown_by_sector"]) == {"Retail", "Agriculture"}
+
+    listed = client.get("/lenders/available-smes", headers=headers["lender"])
+    assert listed.status_code == 200
+    assert int(listed.headers["X-DB-Query-Count"]) <= 4     # first page also estimates the total
+    assert [row["pending_finance_requests"] for row in listed.json()[:4]] == [1, 0, 1, 0]
+    first = client.get("/lenders/available-smes", headers=headers["lender"], params={"limit": 4})
+    following = client.get("/lenders/available-smes", headers=headers["lender"],
+                           params={"limit": 4, "cursor": first.headers["X-Next-Cursor"]})
+    assert int(following.headers["X-DB-Query-Count"]) <= 3
+    assert [row["sme_id"] for row in following.json()] == [5, 6, 7, 8]
+
+    dashboard = client.get("/smes/dashboard", headers=headers["sme"])
+    assert dashboard.status_code == 200
+    assert int(dashboard.headers["X-DB-Query-Count"]) <= 5
+
+
+@pytest.fixture
+def count_flushes():
+    flushes = []
+
+    def record(session, flush_context):
+        flushes.append(session)
+
+    event.listen(Session, "after_flush", record)
+    yield flushes
+    event.remove(Session, "after_flush", record)
+
+
+def test_rescoring_writes_flush_once(count_flushes):
+    """PUT /invoices/{id}/paid and /verifications/approve/{id} rescore the SME in the write's only flush."""
+    with TestingSessionLocal() as db:
+        db.add_all([
+            User(id=2001, username="qb_writer", email="qb_writer@example.com", hashed_password="x", role="sme"),
+            User(id=2002, username="qb_admin", email="qb_admin@example.com", hashed_password="x", role="admin"),
+            *[User(id=2002 + i, username=f"qb_l{i}", email=f"qb_l{i}@example.com", hashed_password="x",
+                   role="lender") for i in range(1, 4)],
+        ])
+        db.add(SME(id=2001, name="QB Writer", industry="Retail", province="Gauteng", revenue=300000,
+                   years_active=4, user_id=2001))
+        db.add_all([
+            Lender(id=2000 + i, user_id=2002 + i, organization_name=f"QB L{i}", contact_email="l@example.com",
+                   min_credit_score=20 * i, max_lending_amount=100000)
+            for i in range(1, 4)
+        ])
+        db.add(Invoice(id=2001, sme_id=2001, client_name="C", amount=1000, status="pending",
+                       due_date=datetime(2999, 1, 1)))
+        db.add(Verification(id=2001, sme_id=2001, doc_type="tax_clearance", status="pending"))
+        db.commit()
+        rescore_sme(db.get(SME, 2001), db)
+        db.commit()
+
+    client = TestClient(app)
+    sme = {"Authorization": f"Bearer {create_access_token({'sub': 'qb_writer'})}"}
+    admin = {"Authorization": f"Bearer {create_access_token({'sub': 'qb_admin'})}"}
+    for url, headers, statements in [
+        ("/invoices/2001/paid", sme, 28),
+        ("/verifications/approve/2001", admin, 25),
+    ]:
+        count_flushes.clear()
+        response = client.put(url, headers=headers, json={})
+        assert response.status_code == 200
+        assert len(count_flushes) == 1
+        assert int(response.headers["X-DB-Query-Count"]) == statements
+
+        # The score was assessed from the pending state: it matches a fresh read of the source tables
+        with TestingSessionLocal() as db:
+            latest = db.get(SME, 2001)
+            _, pkg = next(build_evidence_packages([2001], db, use_snapshots=False))
+            assert latest.latest_score == assess(pkg, explain=False).score
+            assert build_evidence_package(latest, db) == pkg
@@ -0,0 +1,29 @@
+"""
+test_query_plans.py
+
+Runs verify_query_plans.py's EXPLAIN checks on a small seeded SQLite
+database: every hot query must search its table through the expected index,
+and dropping one of those indexes must fail the check.
+
+Run from backend/:  pytest test_query_plans.py -v
+"""
+from sqlalchemy import create_engine
+
+from verify_query_plans import HOT_QUERIES, seed, verify
+
+
+def test_hot_queries_use_their_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    seed(engine, smes=400)
+
+    results = verify(engine)
+    assert len(results) == len(HOT_QUERIES)
+    assert [(query.name, plan) for query, ok, plan in results if not ok] == []
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_smes_user_id")
+    engine.dispose()    # sqlite3 caches prepared EXPLAIN statements per connection
+    failed = {query.name: plan for query, ok, plan in verify(engine) if not ok}
+    assert list(failed) == ["sme_by_user"]
+    assert "SCAN smes" in failed["sme_by_user"]
+    engine.dispose()
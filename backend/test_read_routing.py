@@ -0,0 +1,187 @@
+"""
+test_read_routing.py
+
+Tests for read-replica routing with two SQLite files: the replica is a copy
+of the primary taken before later writes, so which file served a read is
+visible in the response. Covers replica reads, X-Read-Consistency: strong,
+read-your-writes stickiness after a client's own commit (and its expiry),
+and fallback to the primary when the replica lags or cannot be reached.
+
+Run from backend/:  pytest test_read_routing.py -v
+"""
+import shutil
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import database
+from database import Base, get_db, get_async_db
+from main import app
+from limiter import limiter
+from models import User, SME, Invoice, FinanceRequest, SmeOutcome
+from services.auth_service import create_access_token
+from services.read_routing_service import (
+    PRIMARY,
+    ReadRoutingPolicy,
+    register_policy,
+    unregister_policy,
+)
+
+limiter.enabled = False
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _headers(username: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+
+def _outcome_rows(n: int) -> dict:
+    created = datetime(2025, 1, 1)
+    return {
+        "invoice": {"id": n, "sme_id": 1, "client_name": "C", "amount": 1000, "status": "pending",
+                    "created_at": created},
+        "request": {"id": n, "sme_id": 1, "invoice_id": n, "amount_requested": 500, "status": "funded",
+                    "created_at": created},
+        "outcome": {"finance_request_id": n, "sme_id": 1, "score_at_funding": 70.0, "amount": 500,
+                    "outstanding_recommendations": [], "outcome_status": "repaid"},
+    }
+
+
+def _add_outcome(conn, n: int) -> None:
+    rows = _outcome_rows(n)
+    conn.execute(insert(Invoice.__table__), rows["invoice"])
+    conn.execute(insert(FinanceRequest.__table__), rows["request"])
+    conn.execute(insert(SmeOutcome.__table__), rows["outcome"])
+
+
+@pytest.fixture
+def routing(tmp_path, monkeypatch):
+    primary_path, replica_path = tmp_path / "primary.db", tmp_path / "replica.db"
+    primary = create_engine(f"sqlite:///{primary_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=primary)
+    with primary.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": 1, "username": "rr_sme", "email": "rr_sme@example.com", "hashed_password": "x", "role": "sme"},
+            {"id": 2, "username": "rr_lender", "email": "rr_lender@example.com", "hashed_password": "x",
+             "role": "lender"},
+        ])
+        conn.execute(insert(SME.__table__), {
+            "id": 1, "name": "Replica Co", "industry": "Retail", "revenue": 250000, "years_active": 3,
+            "user_id": 1, "province": "Gauteng", "created_at": datetime(2025, 1, 1),
+        })
+        _add_outcome(conn, 1)
+    primary.dispose()
+    shutil.copy(primary_path, replica_path)           # the replica stops here
+    with primary.begin() as conn:
+        _add_outcome(conn, 2)
+
+    replica = create_engine(f"sqlite:///{replica_path}", connect_args={"check_same_thread": False})
+    async_primary = create_async_engine(f"sqlite+aiosqlite:///{primary_path}", poolclass=NullPool)
+    async_replica = create_async_engine(f"sqlite+aiosqlite:///{replica_path}", poolclass=NullPool)
+    primary_sessions = sessionmaker(autocommit=False, autoflush=False, bind=primary)
+    async_primary_sessions = async_sessionmaker(async_primary, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = primary_sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_primary_sessions() as db:
+            yield db
+
+    clock = FakeClock()
+    policy = register_policy(ReadRoutingPolicy(
+        replica, max_lag_seconds=5.0, read_your_writes_seconds=10.0, lag_check_seconds=1.0, clock=clock,
+    ))
+    monkeypatch.setattr(database, "read_routing", policy)
+    monkeypatch.setattr(database, "ReplicaSessionLocal", sessionmaker(autoflush=False, bind=replica))
+    monkeypatch.setattr(database, "AsyncReplicaSessionLocal",
+                        async_sessionmaker(async_replica, autoflush=False, expire_on_commit=False))
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield policy, clock
+    app.dependency_overrides.clear()
+    unregister_policy(policy)
+    primary.dispose()
+    replica.dispose()
+
+
+def _total_deals(client, headers) -> int:
+    response = client.get("/outcomes/analytics", headers=headers)
+    assert response.status_code == 200
+    return response.json()["total_deals"]
+
+
+def test_reads_go_to_replica_unless_strong_consistency_is_requested(routing):
+    policy, _ = routing
+    client = TestClient(app)
+    lender = _headers("rr_lender")
+
+    assert _total_deals(client, lender) == 1
+    assert _total_deals(client, {**lender, "X-Read-Consistency": "strong"}) == 2
+    assert policy.stats()["decisions"] == {"replica": 1, "forced_primary": 1}
+
+
+def test_own_writes_are_read_from_primary_until_window_passes(routing):
+    policy, clock = routing
+    client = TestClient(app)
+    sme, lender = _headers("rr_sme"), _headers("rr_lender")
+
+    assert client.get("/credit-scores/history/1", headers=sme).status_code == 404    # replica: no scores
+    assert client.post("/credit-scores/calculate/1", headers=sme).status_code == 200
+
+    history = client.get("/credit-scores/history/1", headers=sme)
+    assert history.status_code == 200 and len(history.json()) == 1
+    # Other clients keep reading the replica
+    assert client.get("/credit-scores/history/1", headers=lender).status_code == 404
+
+    clock.now += policy.sticky_seconds + 1
+    assert client.get("/credit-scores/history/1", headers=sme).status_code == 404
+    assert policy.stats()["decisions"]["sticky"] == 1
+
+
+def test_falls_back_to_primary_when_replica_lags_or_is_down(routing):
+    policy, clock = routing
+    client = TestClient(app)
+    lender = _headers("rr_lender")
+    assert _total_deals(client, lender) == 1
+
+    policy.lag_probe = lambda conn: 30.0
+    clock.now += policy.lag_check_seconds
+    assert _total_deals(client, lender) == 2
+    assert policy.stats()["replica_lag_seconds"] == 30.0
+
+    def unreachable(conn):
+        raise ConnectionError("replica down")
+
+    policy.lag_probe = unreachable
+    clock.now += policy.lag_check_seconds
+    assert _total_deals(client, lender) == 2
+
+    policy.lag_probe = lambda conn: 0.5
+    clock.now += policy.lag_check_seconds
+    assert _total_deals(client, lender) == 1
+    assert policy.stats()["decisions"] == {"replica": 2, "replica_lagging": 1, "replica_unavailable": 1}
+
+
+def test_policy_without_replica_always_uses_primary():
+    policy = ReadRoutingPolicy(None)
+    policy.note_write("client")
+    assert policy.route("client") == PRIMARY
+    assert policy.route(None) == PRIMARY
+    assert policy.stats()["decisions"] == {"no_replica": 2}
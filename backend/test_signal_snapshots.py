@@ -0,0 +1,166 @@
+"""
+test_signal_snapshots.py
+
+Tests for sme_signal_snapshots: ORM writes to SMEs, invoices, verifications
+and founder profiles keep the snapshot equal to the package aggregated from
+the source tables, in the same transaction, rewriting rows only when the
+evidence changed; reconcile_snapshots() repairs
+rows that drifted through writes the listener cannot see.
+
+Run from backend/:  pytest test_signal_snapshots.py -v
+"""
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, SME, Invoice, Verification, FounderProfile, SmeSignalSnapshot
+from services.scoring_service import build_evidence_packages
+from services.signal_snapshot_service import evidence_hash, load_snapshots, reconcile_snapshots
+
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _sme(db, name="Snapshot Co") -> SME:
+    user = User(username=name, email=f"{name.replace(' ', '')}@test.com", hashed_password="x", role="sme")
+    db.add(user)
+    db.flush()
+    sme = SME(name=name, industry="Retail", revenue=120000, years_active=2, user_id=user.id, province="Gauteng")
+    db.add(sme)
+    db.commit()
+    return sme
+
+
+def _snapshot(db, sme_id):
+    return asdict(load_snapshots([sme_id], db)[sme_id])
+
+
+def _fresh(db, sme_id):
+    return asdict(dict(build_evidence_packages([sme_id], db, use_snapshots=False))[sme_id])
+
+
+def test_snapshot_follows_every_write_path(db):
+    sme = _sme(db)
+    assert _snapshot(db, sme.id) == _fresh(db, sme.id)
+
+    base = datetime(2024, 3, 1)
+    invoice = Invoice(sme_id=sme.id, client_name="C", amount=500, status="pending",
+                      created_at=base, due_date=base + timedelta(days=30))
+    db.add(invoice)
+    db.commit()
+    assert _snapshot(db, sme.id)["unpaid_invoices"] == 1
+
+    invoice.status = "paid"
+    db.commit()
+    assert (_snapshot(db, sme.id)["paid_on_time"], _snapshot(db, sme.id)["unpaid_invoices"]) == (1, 0)
+
+    db.add(Verification(sme_id=sme.id, doc_type="cipc", status="approved", submitted_at=base))
+    db.add(FounderProfile(sme_id=sme.id, years_industry_experience=8, reference_name="Jane"))
+    db.commit()
+    snap = _snapshot(db, sme.id)
+    assert snap["verifications"] == {"cipc": "approved"}
+    assert snap["founder"]["years_industry_experience"] == 8 and snap["founder"]["reference_provided"]
+
+    sme.revenue = 250000
+    sme.province = "Western Cape"
+    db.commit()
+    assert (_snapshot(db, sme.id)["revenue"], _snapshot(db, sme.id)["province"]) == (250000.0, "Western Cape")
+
+    db.delete(invoice)
+    db.commit()
+    assert _snapshot(db, sme.id) == _fresh(db, sme.id)
+    assert _snapshot(db, sme.id)["total_invoices"] == 0
+
+
+def test_moving_a_row_refreshes_both_smes(db):
+    first, second = _sme(db, "First Co"), _sme(db, "Second Co")
+    invoice = Invoice(sme_id=first.id, client_name="C", amount=100, status="paid", created_at=datetime(2024, 1, 1))
+    db.add(invoice)
+    db.commit()
+
+    invoice.sme_id = second.id
+    db.commit()
+    assert _snapshot(db, first.id)["total_invoices"] == 0
+    assert _snapshot(db, second.id)["total_invoices"] == 1
+
+
+def test_unrelated_changes_do_not_rewrite_snapshot(db):
+    sme = _sme(db)
+    before = db.get(SmeSignalSnapshot, sme.id).updated_at
+    sme.name = "Renamed Co"
+    db.commit()
+    db.expire_all()
+    assert db.get(SmeSignalSnapshot, sme.id).updated_at == before
+
+
+def test_tracked_changes_with_the_same_evidence_keep_the_row(db):
+    sme = _sme(db)
+    invoice = Invoice(sme_id=sme.id, client_name="C", amount=100, status="pending", created_at=datetime(2024, 1, 1))
+    db.add(invoice)
+    db.commit()
+    before = db.get(SmeSignalSnapshot, sme.id).updated_at
+
+    invoice.created_at = datetime(2024, 2, 1)     # tracked, but an unpaid invoice's dates do not count
+    db.commit()
+    db.expire_all()
+    assert db.get(SmeSignalSnapshot, sme.id).updated_at == before
+
+    invoice.status = "paid"
+    db.commit()
+    db.expire_all()
+    assert db.get(SmeSignalSnapshot, sme.id).updated_at > before
+    assert _snapshot(db, sme.id) == _fresh(db, sme.id)
+
+
+def test_rollback_discards_snapshot_changes(db):
+    sme = _sme(db)
+    db.add(Invoice(sme_id=sme.id, client_name="C", amount=100, status="pending", created_at=datetime(2024, 1, 1)))
+    db.flush()
+    assert _snapshot(db, sme.id)["total_invoices"] == 1
+    db.rollback()
+    assert _snapshot(db, sme.id)["total_invoices"] == 0
+
+
+def test_deleting_sme_removes_snapshot(db):
+    sme = _sme(db)
+    sme_id = sme.id
+    db.delete(sme)
+    db.commit()
+    assert load_snapshots([sme_id], db) == {}
+
+
+def test_reconcile_repairs_drift(db):
+    smes = [_sme(db, f"Co {i}") for i in range(4)]
+    ids = [s.id for s in smes]
+    with engine.begin() as conn:      # writes the listener cannot see
+        conn.execute(text("INSERT INTO invoices (sme_id, client_name, amount, status, created_at) "
+                          "VALUES (:id, 'C', 10, 'paid', '2024-01-01')"), {"id": ids[0]})
+        conn.execute(text("UPDATE sme_signal_snapshots SET revenue = 1 WHERE sme_id = :id"), {"id": ids[1]})
+        conn.execute(text("DELETE FROM sme_signal_snapshots WHERE sme_id = :id"), {"id": ids[2]})
+        conn.execute(text("INSERT INTO sme_signal_snapshots (sme_id, revenue, years_active, industry, total_invoices, "
+                          "paid_on_time, unpaid_invoices, verifications, intent_doc_details, evidence_hash, updated_at) "
+                          "VALUES (9999, 0, 0, 'Other', 0, 0, 0, '{}', '{}', 'x', '2024-01-01')"))
+
+    stats = reconcile_snapshots(db, chunk_size=3)
+    db.commit()
+    assert stats == {"checked": 4, "missing": 1, "drifted": 2, "removed": 1}
+    for sme_id in ids:
+        assert _snapshot(db, sme_id) == _fresh(db, sme_id)
+        assert db.get(SmeSignalSnapshot, sme_id).evidence_hash == evidence_hash(load_snapshots([sme_id], db)[sme_id])
+
+    assert reconcile_snapshots(db) == {"checked": 4, "missing": 0, "drifted": 0, "removed": 0}
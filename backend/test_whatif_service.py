@@ -0,0 +1,94 @@
+"""
+test_whatif_service.py
+
+Tests for the what-if engine: every grid cell must carry the exact assess()
+score of its perturbed package, and perturbations must keep invoice counts
+consistent.
+
+Run from backend/:  pytest test_whatif_service.py -v
+"""
+import pytest
+
+from core.scoring import EvidencePackage, FounderSignalInput
+from core.assessment_engine import assess
+from services.whatif_service import (
+    Axis,
+    DOCUMENT_TYPES,
+    MAX_GRID_CELLS,
+    document_toggles,
+    perturb,
+    simulate,
+    simulate_grid,
+)
+
+
+def _package() -> EvidencePackage:
+    return EvidencePackage(
+        revenue=150_000, years_active=2, industry="Retail",
+        total_invoices=20, paid_on_time=12, unpaid_invoices=5,
+        verifications={"cipc": "approved", "letter_of_intent": "pending"},
+        intent_doc_details={"letter_of_intent": {"status": "pending", "loi_counterparty_known": True}},
+        months_analysed=6, income_regularity=0.75, overdraft_count=1, province="Gauteng",
+        founder=FounderSignalInput(years_industry_experience=3, highest_qualification="diploma"),
+    )
+
+
+def test_grid_scores_match_assess():
+    pkg = _package()
+    result = simulate_grid(pkg, [
+        Axis("revenue_delta", [0, 100_000, 200_000, 400_000]),
+        Axis("on_time_rate", [0.5, 0.7, 0.9, 1.0]),
+    ])
+    assert len(result.cells) == 16
+    assert result.baseline.score == assess(pkg).score
+    for cell in result.cells:
+        expected = assess(perturb(pkg, cell.values))
+        assert (cell.score, cell.decision, cell.profile) == (expected.score, expected.decision, expected.profile.value)
+        assert cell.delta == round(expected.score - result.baseline.score, 1)
+
+    grid = result.score_grid()
+    assert len(grid) == 4 and all(len(row) == 4 for row in grid)
+    assert grid[1][2] == result.cells[1 * 4 + 2].score
+
+
+def test_rate_perturbation_keeps_invoices_consistent():
+    pkg = perturb(_package(), {"on_time_rate": 0.9})
+    assert pkg.paid_on_time == 18
+    assert pkg.paid_on_time + pkg.unpaid_invoices <= pkg.total_invoices
+    assert _package().paid_on_time == 12   # original untouched
+
+
+def test_document_toggles_flip_each_document():
+    pkg = _package()
+    scenarios = document_toggles(pkg)
+    assert len(scenarios) == len(DOCUMENT_TYPES)
+    assert {"doc:cipc": None} in scenarios
+    assert {"doc:letter_of_intent": "approved"} in scenarios
+
+    _, cells = simulate(pkg, scenarios)
+    loi = next(c for c in cells if "doc:letter_of_intent" in c.values)
+    toggled = perturb(pkg, loi.values)
+    assert toggled.intent_doc_details["letter_of_intent"]["status"] == "approved"
+    assert loi.score == assess(toggled).score and loi.delta > 0
+
+
+def test_invalid_cells_are_reported_not_raised():
+    result = simulate_grid(_package(), [Axis("years_active", [3, -1])])
+    assert result.cells[0].score is not None
+    assert result.cells[1].score is None and result.cells[1].errors
+
+
+def test_rejects_unknown_axes_and_oversized_grids():
+    with pytest.raises(ValueError):
+        simulate_grid(_package(), [Axis("shoe_size", [42])])
+    with pytest.raises(ValueError):
+        simulate_grid(_package(), [Axis("on_time_rate", [1.5])])
+    for name, value in [("qualification", 5), ("province", ["x"]), ("industry", None),
+                        ("years_active", ["x"]), ("doc:cipc", {"status": "approved"})]:
+        with pytest.raises(ValueError):
+            simulate_grid(_package(), [Axis(name, [value])])
+    with pytest.raises(ValueError):
+        simulate_grid(_package(), [
+            Axis("revenue", list(range(100))),
+            Axis("years_active", list(range(MAX_GRID_CELLS // 100 + 1))),
+        ])
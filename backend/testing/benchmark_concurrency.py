@@ -0,0 +1,253 @@
+"""
+testing/benchmark_concurrency.py
+
+Concurrency ceiling of the sync vs the async database stack.
+
+Each request does the dashboard's database work — token user lookup, SME,
+invoices, finance requests with their invoices — through one of:
+
+  sync         def endpoint, Session from a sync engine. Starlette runs it in
+               its threadpool (40 workers), and a worker is held for the whole
+               time the request waits on the database.
+  async        async def endpoint, AsyncSession (aiosqlite). Waiting on the
+               database yields the event loop.
+  dashboard    the real async GET /smes/dashboard.
+
+Every SQL statement sleeps --latency-ms inside the DB driver to stand in for
+the network round trip to Postgres (for aiosqlite the sleep runs in the
+driver's own thread, as an asyncpg socket wait would). Both engines get a
+connection pool larger than the highest concurrency, so the threadpool — not
+the pool — is what the sync stack runs into.
+
+For each concurrency level the benchmark reports throughput and p50/p95
+latency. The sync stack's throughput flattens at roughly
+40 / request latency once concurrency passes the threadpool size; the async
+stack keeps scaling until the process saturates its CPU (on a single core at
+~5 ms of Python per request — hence the high default latency, which keeps the
+threadpool the binding limit rather than the CPU).
+
+Usage (from backend/):
+    python testing/benchmark_concurrency.py [--latency-ms 50] [--levels 1,10,40,160,320] [--requests 3]
+"""
+import sys
+import os
+import time
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+import statistics
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+TESTING_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TESTING_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+
+from database import Base, get_db, get_async_db
+from main import app
+from limiter import limiter
+from models import User, SME, Invoice, FinanceRequest
+from services.auth_service import create_access_token, get_current_user, get_current_user_async
+
+SMES = 200
+INVOICES_PER_SME = 12
+LATENCY_SECONDS = 0.050   # set from --latency-ms before the engines connect
+
+
+class _SlowCursor(sqlite3.Cursor):
+    def execute(self, *args, **kwargs):
+        time.sleep(LATENCY_SECONDS)
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        time.sleep(LATENCY_SECONDS)
+        return super().executemany(*args, **kwargs)
+
+
+class SlowConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements each wait LATENCY_SECONDS first."""
+
+    def cursor(self, factory=_SlowCursor):
+        return super().cursor(factory)
+
+
+# ── Fixture database ──────────────────────────────────────────────────────────
+
+def seed(path: str) -> list[str]:
+    """Creates SMES SME users with invoices and finance requests; returns their bearer tokens."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    created = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": i, "username": f"bench{i}", "email": f"bench{i}@example.com",
+             "hashed_password": "x", "role": "sme"}
+            for i in range(1, SMES + 1)
+        ])
+        conn.execute(insert(SME.__table__), [
+            {"id": i, "name": f"Bench {i}", "industry": "Retail", "revenue": Decimal("250000"),
+             "years_active": 3, "user_id": i, "latest_score": 62.0, "latest_score_at": created}
+            for i in range(1, SMES + 1)
+        ])
+        conn.execute(insert(Invoice.__table__), [
+            {"id": (i - 1) * INVOICES_PER_SME + n + 1, "sme_id": i, "client_name": f"Client {n}",
+             "amount": Decimal("1000"), "status": "paid" if n % 3 else "pending",
+             "created_at": created + timedelta(days=n)}
+            for i in range(1, SMES + 1) for n in range(INVOICES_PER_SME)
+        ])
+        conn.execute(insert(FinanceRequest.__table__), [
+            {"sme_id": i, "invoice_id": (i - 1) * INVOICES_PER_SME + n + 1, "amount_requested": Decimal("500"),
+             "status": "pending", "created_at": created + timedelta(days=n)}
+            for i in range(1, SMES + 1) for n in range(3)
+        ])
+    engine.dispose()
+    return [create_access_token({"sub": f"bench{i}"}) for i in range(1, SMES + 1)]
+
+
+# ── Equivalent sync / async handlers ──────────────────────────────────────────
+
+def sync_dashboard(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    sme = db.query(SME).filter(SME.user_id == current_user.id).first()
+    invoices = db.query(Invoice).filter(Invoice.sme_id == sme.id).order_by(Invoice.created_at.desc()).all()
+    requests = (
+        db.query(FinanceRequest).filter(FinanceRequest.sme_id == sme.id)
+        .order_by(FinanceRequest.created_at.desc()).options(selectinload(FinanceRequest.invoice)).all()
+    )
+    return {"sme_id": sme.id, "invoices": len(invoices), "finance_requests": len(requests)}
+
+
+async def async_dashboard(
+    current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db),
+):
+    sme = await db.scalar(select(SME).where(SME.user_id == current_user.id).limit(1))
+    invoices = (await db.scalars(
+        select(Invoice).where(Invoice.sme_id == sme.id).order_by(Invoice.created_at.desc())
+    )).all()
+    requests = (await db.scalars(
+        select(FinanceRequest).where(FinanceRequest.sme_id == sme.id)
+        .order_by(FinanceRequest.created_at.desc()).options(selectinload(FinanceRequest.invoice))
+    )).all()
+    return {"sme_id": sme.id, "invoices": len(invoices), "finance_requests": len(requests)}
+
+
+ROUTES = {
+    "sync":      "/benchmark/sync-dashboard",
+    "async":     "/benchmark/async-dashboard",
+    "dashboard": "/smes/dashboard",
+}
+
+
+def install(path: str, pool_size: int) -> None:
+    """Points the app's sync and async session dependencies at the slow fixture database."""
+    sync_engine = create_engine(
+        f"sqlite:///{path}", pool_size=pool_size, max_overflow=0,
+        connect_args={"factory": SlowConnection, "check_same_thread": False},
+    )
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", pool_size=pool_size, max_overflow=0,
+        connect_args={"factory": SlowConnection},
+    )
+    sync_sessions = sessionmaker(bind=sync_engine, autoflush=False)
+    async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def bench_get_db():
+        db = sync_sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def bench_get_async_db():
+        async with async_sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = bench_get_db
+    app.dependency_overrides[get_async_db] = bench_get_async_db
+    app.add_api_route(ROUTES["sync"], sync_dashboard, methods=["GET"])
+    app.add_api_route(ROUTES["async"], async_dashboard, methods=["GET"])
+    limiter.enabled = False
+
+
+# ── Load generation ───────────────────────────────────────────────────────────
+
+async def run_level(client: httpx.AsyncClient, route: str, tokens: list[str], concurrency: int, total: int) -> dict:
+    latencies = []
+    issued = 0
+
+    async def worker():
+        nonlocal issued
+        while issued < total:
+            token = tokens[issued % len(tokens)]
+            issued += 1
+            start = time.perf_counter()
+            response = await client.get(route, headers={"Authorization": f"Bearer {token}"})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+    }
+
+
+async def run(tokens: list[str], levels: list[int], per_worker: int) -> dict:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, route in ROUTES.items():
+            await run_level(client, route, tokens, 4, 20)   # warm-up: connections, caches
+            for concurrency in levels:
+                total = max(concurrency * per_worker, 40)
+                results[(name, concurrency)] = await run_level(client, route, tokens, concurrency, total)
+    return results
+
+
+def print_results(results: dict, levels: list[int], latency_ms: float) -> None:
+    print(f"\nDashboard-shaped reads, {latency_ms:g} ms simulated DB latency per statement")
+    print(f"{'concurrency':>11} | " + " | ".join(f"{name:>26}" for name in ROUTES))
+    print(f"{'':>11} | " + " | ".join(f"{'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}" for _ in ROUTES))
+    for concurrency in levels:
+        cells = []
+        for name in ROUTES:
+            r = results[(name, concurrency)]
+            cells.append(f"{r['requests_per_sec']:>8.0f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}")
+        print(f"{concurrency:>11} | " + " | ".join(cells))
+    top = levels[-1]
+    ratio = results[("async", top)]["requests_per_sec"] / results[("sync", top)]["requests_per_sec"]
+    print(f"\nasync / sync throughput at concurrency {top}: {ratio:.1f}x")
+
+
+def main():
+    global LATENCY_SECONDS
+    parser = argparse.ArgumentParser(description="Sync vs async database stack concurrency benchmark")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated DB latency per SQL statement")
+    parser.add_argument("--levels", default="1,10,40,160,320", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=3, help="Requests per concurrent client at each level")
+    args = parser.parse_args()
+
+    LATENCY_SECONDS = args.latency_ms / 1000
+    levels = [int(level) for level in args.levels.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "benchmark.db")
+        tokens = seed(path)
+        install(path, pool_size=max(levels) + 10)
+        results = asyncio.run(run(tokens, levels, args.requests))
+    print_results(results, levels, args.latency_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+testing/benchmark_pipeline.py
+
+Per-stage latency benchmark for the Assessment Engine pipeline.
+Times every stage of assess() separately, plus recommendation generation:
+
+  validate    EvidenceValidator.validate
+  detect      ProfileInferenceService.detect
+  strategy    StrategyFactory.get_strategy
+  calculate   ScoreCalculator.calculate
+  confidence  ConfidenceCalculator.calculate
+  build       rescale, decision and AssessmentBuilder.build
+  recommend   RecommendationEngine.generate
+
+over the gold dataset (valid scenarios only) and the 1000-record synthetic
+dataset, and reports p50/p95/p99 (µs per call) and throughput per profile
+category.
+
+Baselines live in benchmark_baseline.json, next to expected_results.jsonl.
+Each (dataset, profile, stage) keeps the median of every timed pass; a run
+fails (exit code 1) when a stage is both statistically slower than its
+baseline (one-sided Mann-Whitney U over the pass medians, p < --alpha) and
+slower by more than --min-slowdown. Baselines are machine-specific —
+regenerate them with --update-baseline on the machine that runs the gate.
+
+Usage (from backend/):
+    python testing/benchmark_pipeline.py [--repeat 7] [--dataset gold|synthetic|all]
+    python testing/benchmark_pipeline.py --update-baseline
+"""
+import sys
+import os
+import math
+import time
+import json
+import argparse
+import platform
+import statistics
+from datetime import datetime
+
+TESTING_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TESTING_DIR)
+if TESTING_DIR not in sys.path:
+    sys.path.insert(0, TESTING_DIR)
+
+from regression_runner import deserialize_evidence
+from core.scoring import EvidencePackage, EvidenceValidator, FounderSignalInput, determine_decision
+from core.assessment_engine import (
+    AssessmentBuilder,
+    ConfidenceCalculator,
+    ProfileInferenceService,
+    ScoreCalculator,
+    StrategyFactory,
+    assess,
+)
+from services.recommendations_service import RecommendationEngine
+
+BASELINE_PATH = os.path.join(TESTING_DIR, "benchmark_baseline.json")
+STAGES = ("validate", "detect", "strategy", "calculate", "confidence", "build", "recommend")
+ALL_PROFILES = "all"
+
+
+# ── Datasets ──────────────────────────────────────────────────────────────────
+
+def deserialize_synthetic(record: dict) -> EvidencePackage:
+    """
+    Rebuilds an EvidencePackage from a flat synthetic_dataset.json record.
+    -1 marks a missing bank statement signal or founder profile; only approved
+    verifications are recorded in the dataset.
+    """
+    def optional(value):
+        return None if value == -1 else value
+
+    founder = None
+    if record["founder_experience"] != -1:
+        founder = FounderSignalInput(
+            years_industry_experience=record["founder_experience"],
+            highest_qualification=record["founder_qualification"],
+            prior_business_owner=record["founder_prior_owner"],
+        )
+    verifications = {
+        doc: "approved"
+        for doc, flag in (("cipc", "cipc_verified"), ("bank_statement", "bank_statement_verified"),
+                          ("tax_clearance", "tax_verified"))
+        if record[flag]
+    }
+    return EvidencePackage(
+        revenue=record["revenue"],
+        years_active=record["years_active"],
+        industry=record["industry"],
+        total_invoices=record["total_invoices"],
+        paid_on_time=record["paid_on_time"],
+        unpaid_invoices=record["unpaid_invoices"],
+        verifications=verifications,
+        overdraft_count=optional(record["overdraft_count"]),
+        income_regularity=optional(record["income_regularity"]),
+        months_analysed=optional(record["months_analysed"]),
+        province=None if record["province"] == "None" else record["province"],
+        founder=founder,
+    )
+
+
+def load_datasets(which: str = "all") -> dict[str, list[EvidencePackage]]:
+    datasets = {}
+    if which in ("gold", "all"):
+        with open(os.path.join(TESTING_DIR, "gold_dataset.json"), "r") as f:
+            packages = [deserialize_evidence(sc["evidence"]) for sc in json.load(f)]
+        datasets["gold"] = [p for p in packages if EvidenceValidator.validate(p).is_valid]
+    if which in ("synthetic", "all"):
+        with open(os.path.join(TESTING_DIR, "synthetic_dataset.json"), "r") as f:
+            packages = [deserialize_synthetic(r) for r in json.load(f)]
+        datasets["synthetic"] = [p for p in packages if EvidenceValidator.validate(p).is_valid]
+    return datasets
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+
+def time_stages(pkg: EvidencePackage):
+    """
+    Runs one package through the assess() pipeline stage by stage.
+    Returns (profile value, {stage: ns}, result, plan).
+    """
+    clock = time.perf_counter_ns
+    t0 = clock()
+    val_res = EvidenceValidator.validate(pkg)
+    t1 = clock()
+    profile_res = ProfileInferenceService.detect(pkg)
+    t2 = clock()
+    strategy, strategy_ver = StrategyFactory.get_strategy(profile_res.profile)
+    t3 = clock()
+    breakdown, raw_score, applicable_max = ScoreCalculator.calculate(pkg, strategy, profile_res.unavailable_factors)
+    t4 = clock()
+    confidence = ConfidenceCalculator.calculate(pkg)
+    t5 = clock()
+    if applicable_max == 0:
+        applicable_max = strategy.raw_max
+    score = round(min(max((raw_score / applicable_max) * 100, 0), 100), 1)
+    breakdown["_assessment_raw"] = raw_score
+    breakdown["_assessment_applicable_max"] = applicable_max
+    result = AssessmentBuilder.build(
+        score=score,
+        decision=determine_decision(score),
+        breakdown=breakdown,
+        profile_res=profile_res,
+        strategy=strategy,
+        strategy_ver=strategy_ver,
+        confidence=confidence,
+        validation_warnings=val_res.warnings,
+    )
+    t6 = clock()
+    plan = RecommendationEngine.generate(result)
+    t7 = clock()
+    ticks = (t0, t1, t2, t3, t4, t5, t6, t7)
+    return profile_res.profile.value, {s: ticks[i + 1] - ticks[i] for i, s in enumerate(STAGES)}, result, plan
+
+
+def run_dataset(packages: list[EvidencePackage], repeat: int) -> dict[str, dict[str, list]]:
+    """
+    Times every package `repeat` times (after one untimed warm-up pass).
+    Returns {profile: {"calls": {stage: [µs, ...]}, "passes": {stage: [median µs per pass]}}},
+    including an "all" profile over the whole dataset.
+    """
+    for pkg in packages:
+        time_stages(pkg)
+
+    timings: dict[str, dict[str, dict[str, list]]] = {}
+    for _ in range(repeat):
+        this_pass: dict[str, dict[str, list[float]]] = {}
+        for pkg in packages:
+            profile, stage_ns, _, _ = time_stages(pkg)
+            for key in (profile, ALL_PROFILES):
+                calls = this_pass.setdefault(key, {s: [] for s in (*STAGES, "total")})
+                for stage, ns in stage_ns.items():
+                    calls[stage].append(ns / 1000)
+                calls["total"].append(sum(stage_ns.values()) / 1000)
+        for profile, calls in this_pass.items():
+            entry = timings.setdefault(profile, {"calls": {}, "passes": {}})
+            for stage, samples in calls.items():
+                entry["calls"].setdefault(stage, []).extend(samples)
+                entry["passes"].setdefault(stage, []).append(statistics.median(samples))
+    return timings
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+def summarise(timings: dict[str, dict[str, dict[str, list]]]) -> dict[str, dict]:
+    """Per profile: package count, packages/sec through the pipeline, and p50/p95/p99 + ops/sec per stage."""
+    summary = {}
+    for profile, entry in sorted(timings.items()):
+        stages = {}
+        for stage, calls in entry["calls"].items():
+            mean = statistics.fmean(calls)
+            stages[stage] = {
+                **{k: round(v, 2) for k, v in percentiles(calls).items()},
+                "ops_per_sec": round(1e6 / mean) if mean else None,
+                "pass_medians": [round(v, 3) for v in entry["passes"][stage]],
+            }
+        summary[profile] = {
+            "packages": len(entry["calls"]["total"]) // len(entry["passes"]["total"]),
+            "throughput_per_sec": stages["total"]["ops_per_sec"],
+            "stages": stages,
+        }
+    return summary
+
+
+# ── Regression gate ───────────────────────────────────────────────────────────
+
+def mann_whitney_greater(current: list[float], baseline: list[float]) -> float:
+    """
+    One-sided Mann-Whitney U test that `current` tends to be larger than
+    `baseline`. Returns the p-value (normal approximation with tie correction
+    and continuity correction).
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    pooled = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+
+    rank_sum = sum(r for r, (_, group) in zip(ranks, pooled) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def find_regressions(summary: dict, baseline: dict, alpha: float, min_slowdown: float) -> list[dict]:
+    """
+    Compares a run against a baseline ({dataset: {profile: summary}}).
+    A stage regresses when its pass medians are significantly larger than the
+    baseline's (p < alpha) and its median is more than min_slowdown slower.
+    """
+    regressions = []
+    for dataset, profiles in summary.items():
+        for profile, entry in profiles.items():
+            base_entry = baseline.get(dataset, {}).get(profile)
+            if base_entry is None:
+                continue
+            for stage, stats in entry["stages"].items():
+                base_stats = base_entry["stages"].get(stage)
+                if base_stats is None:
+                    continue
+                current, previous = stats["pass_medians"], base_stats["pass_medians"]
+                ratio = statistics.median(current) / statistics.median(previous) if statistics.median(previous) else 1.0
+                if ratio - 1 <= min_slowdown:
+                    continue
+                p_value = mann_whitney_greater(current, previous)
+                if p_value < alpha:
+                    regressions.append({
+                        "dataset": dataset, "profile": profile, "stage": stage,
+                        "ratio": round(ratio, 3), "p_value": p_value,
+                    })
+    return regressions
+
+
+# ── Reporting ─────────────────────────────────────────────────────────────────
+
+def print_summary(dataset: str, summary: dict, repeat: int) -> None:
+    total = summary[ALL_PROFILES]["packages"]
+    print(f"\n{dataset} — {total} packages × {repeat} passes")
+    for profile, entry in summary.items():
+        print(f"  {profile} ({entry['packages']} packages, {entry['throughput_per_sec']} packages/sec)")
+        print(f"    {'Stage':<12}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}{'ops/sec':>12}")
+        for stage, stats in entry["stages"].items():
+            print(f"    {stage:<12}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['ops_per_sec']:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage assessment pipeline benchmark")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed passes over each dataset")
+    parser.add_argument("--dataset", choices=("gold", "synthetic", "all"), default="all")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite benchmark_baseline.json with this run")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level of the slowdown test")
+    parser.add_argument("--min-slowdown", type=float, default=0.15,
+                        help="Relative median slowdown a stage must exceed to fail (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    datasets = load_datasets(args.dataset)
+
+    # Sanity check — the staged pipeline must reproduce assess()
+    for packages in datasets.values():
+        for pkg in packages:
+            _, _, result, _ = time_stages(pkg)
+            expected = assess(pkg)
+            assert (result.score, result.decision, result.profile) == (expected.score, expected.decision, expected.profile)
+
+    summary = {}
+    for dataset, packages in datasets.items():
+        summary[dataset] = summarise(run_dataset(packages, args.repeat))
+        print_summary(dataset, summary[dataset], args.repeat)
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({
+                "generated_at": datetime.now().isoformat(timespec="seconds"),
+                "machine": platform.platform(),
+                "python": platform.python_version(),
+                "repeat": args.repeat,
+                "datasets": summary,
+            }, f, indent=2)
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        print("\nNo baseline found — run with --update-baseline to create one.")
+        return
+
+    with open(BASELINE_PATH, "r") as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != platform.platform():
+        print(f"\nWarning: baseline was recorded on {baseline.get('machine')}; timings may not be comparable.")
+
+    regressions = find_regressions(summary, baseline["datasets"], args.alpha, args.min_slowdown)
+    if not regressions:
+        print(f"\nNo significant slowdowns against the baseline from {baseline.get('generated_at')}.")
+        return
+
+    print(f"\n{len(regressions)} significant slowdown(s):")
+    for r in regressions:
+        print(f"  {r['dataset']}/{r['profile']}/{r['stage']}: {r['ratio']:.2f}x baseline (p={r['p_value']:.4f})")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
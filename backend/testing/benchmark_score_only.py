@@ -0,0 +1,86 @@
+"""
+testing/benchmark_score_only.py
+
+Micro-benchmark for the score-only fast path of the Assessment Engine.
+Runs every valid gold_dataset.json scenario through:
+  - assess(pkg)                        — full explained result (breakdown built eagerly)
+  - assess(pkg, explain=False)         — score / decision / profile / confidence only
+  - assess(pkg, explain=False).breakdown — lazy result whose explanation is then accessed
+
+and reports the per-call cost of each mode and the saving of the fast path.
+
+Usage (from backend/):
+    python testing/benchmark_score_only.py [--repeat 5]
+"""
+import sys
+import os
+import time
+import json
+import argparse
+import statistics
+
+TESTING_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TESTING_DIR)
+if TESTING_DIR not in sys.path:
+    sys.path.insert(0, TESTING_DIR)
+
+from regression_runner import deserialize_evidence
+from core.scoring import EvidenceValidator
+from core.assessment_engine import assess
+
+
+def load_packages():
+    with open(os.path.join(TESTING_DIR, "gold_dataset.json"), "r") as f:
+        scenarios = json.load(f)
+    packages = [deserialize_evidence(sc["evidence"]) for sc in scenarios]
+    return [p for p in packages if EvidenceValidator.validate(p).is_valid]
+
+
+def time_mode(packages, fn, repeat: int) -> list[float]:
+    """Returns the per-call time (µs) of each repeat."""
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for p in packages:
+            fn(p)
+        per_call.append((time.perf_counter() - start) * 1e6 / len(packages))
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score-only fast path benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the dataset per mode")
+    args = parser.parse_args()
+
+    packages = load_packages()
+
+    # Sanity check — the fast path must agree with the explained path
+    for p in packages:
+        full, fast = assess(p), assess(p, explain=False)
+        assert (fast.score, fast.decision, fast.profile) == (full.score, full.decision, full.profile)
+
+    modes = {
+        "assess (explained)":        lambda p: assess(p),
+        "assess (score-only)":       lambda p: assess(p, explain=False),
+        "score-only + .breakdown":   lambda p: assess(p, explain=False).breakdown,
+    }
+
+    # Warm-up pass so memoised market lookups and plan compilation are excluded
+    for fn in modes.values():
+        time_mode(packages, fn, 1)
+
+    print(f"Score-only benchmark — {len(packages)} packages × {args.repeat} passes")
+    print(f"{'Mode':<28}{'median µs/call':>16}{'best µs/call':>14}")
+    medians = {}
+    for name, fn in modes.items():
+        samples = time_mode(packages, fn, args.repeat)
+        medians[name] = statistics.median(samples)
+        print(f"{name:<28}{medians[name]:>16.1f}{min(samples):>14.1f}")
+
+    full = medians["assess (explained)"]
+    fast = medians["assess (score-only)"]
+    print(f"\nSaving per call: {full - fast:.1f} µs ({(1 - fast / full) * 100:.0f}% faster, {full / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,24 @@
 testing/regression_runner.py
 
 Test runner for the Assessment Engine Validation Framework.
-Loads gold_dataset.json, executes assess() and generate_plan() for each scenario,
-validates results against expected definitions, measures execution times,
-and performs regression comparison against expected_results.json.
+Streams scenarios (gold_dataset.json, the testing/scenarios/ tree, synthetic
+generators or any JSON / JSONL file), executes assess() and generate_plan()
+for each one in a process pool, validates results against expected
+definitions, measures execution times, and performs regression comparison
+against expected_results.jsonl.
+
+Results come back in input order and are written incrementally as JSONL;
+the regression diff and accuracy metrics are aggregated on the fly, so
+memory use does not grow with the number of scenarios.
+
+Usage (from backend/):
+    python testing/regression_runner.py [--source gold|tree|synthetic:100000|path] [--workers N]
+    python testing/regression_runner.py --update-expected
 """
 import sys
 import os
 import json
+import itertools
 import time
 import argparse
 from types import ModuleType
@@ -189,135 +200,352 @@ def run_scenario(sc):
         
     return res_details
 
+# ── Scenario sources ──────────────────────────────────────────────────────────
+# Every source is a generator, so a run never holds more than the in-flight
+# chunks in memory regardless of dataset size.
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """Streams the elements of a top-level JSON array file without loading it whole."""
+    decoder = json.JSONDecoder()
+    with open(path, "r") as f:
+        buf = f.read(chunk_size).lstrip()
+        if not buf.startswith("["):
+            raise ValueError(f"{path} is not a JSON array")
+        buf = buf[1:]
+        eof = False
+        while True:
+            buf = buf.lstrip().lstrip(",").lstrip()
+            if buf.startswith("]"):
+                return
+            try:
+                item, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buf += more
+                continue
+            yield item
+            buf = buf[end:]
+            if len(buf) < chunk_size and not eof:
+                more = f.read(chunk_size)
+                eof = not more
+                buf += more
+
+
+def iter_jsonl(path):
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_scenario_tree(root):
+    """One scenario per JSON file under root (e.g. testing/scenarios/<category>/), in sorted path order."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".json"):
+                with open(os.path.join(dirpath, filename), "r") as f:
+                    yield json.load(f)
+
+
+def iter_synthetic(count, seed=42):
+    """Scenarios from synthetic_scenario_generator (no expectations, so they only fail on errors)."""
+    import random
+    from dataclasses import asdict
+    from synthetic_scenario_generator import generate_random_sme
+
+    random.seed(seed)
+    stages = ["idea", "startup", "growth", "established"]
+    for i in range(count):
+        stage = stages[i % len(stages)]
+        yield {
+            "id": f"SYN_{i + 1:06d}",
+            "name": f"Synthetic {stage} SME {i + 1}",
+            "category": stage,
+            "is_valid_evidence": True,
+            "evidence": asdict(generate_random_sme(stage)),
+        }
+
+
+def iter_source(source, synthetic_seed=42):
+    """
+    Resolves --source: "gold" (gold_dataset.json), "tree" (testing/scenarios/),
+    "synthetic:<count>", or a path to a .json array / .jsonl file / scenario directory.
+    """
+    if source == "gold":
+        return iter_json_array(os.path.join(TESTING_DIR, "gold_dataset.json"))
+    if source == "tree":
+        return iter_scenario_tree(os.path.join(TESTING_DIR, "scenarios"))
+    if source.startswith("synthetic:"):
+        return iter_synthetic(int(source.split(":", 1)[1]), synthetic_seed)
+    if os.path.isdir(source):
+        return iter_scenario_tree(source)
+    if source.endswith(".jsonl"):
+        return iter_jsonl(source)
+    return iter_json_array(source)
+
+
+# ── Parallel execution ────────────────────────────────────────────────────────
+
+def run_record(sc):
+    """run_scenario() plus the expectation fields the aggregate metrics need, as one JSON-able record."""
+    res = run_scenario(sc)
+    expected = sc.get("expected", {})
+    exp_recs = expected.get("recommendations_contain")
+    recs_matched = None
+    if exp_recs:
+        recs_matched = all(
+            any(r.lower() in ar.lower() for ar in res["recommendations"]) for r in exp_recs
+        )
+    return {
+        "id": sc["id"],
+        "name": sc.get("name", sc["id"]),
+        "score": res["score"],
+        "decision": res["decision"],
+        "profile": res["profile"],
+        "confidence": res["confidence"],
+        "passed": res["passed"],
+        "error": res["error"],
+        "warnings": res.get("warnings", []),
+        "recommendations": res["recommendations"],
+        "duration_ms": res["duration_ms"],
+        "expected_profile": expected.get("profile"),
+        "recommendations_matched": recs_matched,
+    }
+
+
+def run_chunk(chunk):
+    return [run_record(sc) for sc in chunk]
+
+
+def iter_chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_parallel(scenarios, workers=None, chunk_size=256):
+    """
+    Yields run_record() results in input order. Scenarios are fed to a
+    process pool in chunks, with at most 2 × workers chunks in flight, so
+    memory stays bounded however long the scenario stream is.
+    workers=1 runs in-process.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_chunks(scenarios, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from run_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(run_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+# ── Streaming regression diff ─────────────────────────────────────────────────
+
+BASELINE_FIELDS = ("score", "decision", "profile", "confidence", "passed", "error", "warnings", "recommendations")
+
+
+class BaselineReader:
+    """
+    Looks up baseline entries while results stream past in run order.
+    expected_results.jsonl is written in run order, so lookups advance a
+    cursor through the file; entries skipped over (scenarios removed or
+    reordered since the baseline) wait in a window of at most `window`
+    entries. A single lookup reads at most `window` entries ahead before
+    giving up, so an id missing from the baseline (a new scenario) cannot
+    drain the file and leave every later lookup empty. A legacy
+    expected_results.json dict is loaded whole.
+    """
+
+    def __init__(self, path, window=10_000):
+        self.window = window
+        self._pending = {}
+        if path.endswith(".jsonl"):
+            self._entries = iter_jsonl(path)
+        else:
+            with open(path, "r") as f:
+                self._pending = json.load(f)
+            self._entries = iter(())
+
+    def get(self, s_id):
+        if s_id in self._pending:
+            return self._pending.pop(s_id)
+        for entry in itertools.islice(self._entries, self.window):
+            if entry["id"] == s_id:
+                return entry
+            self._pending[entry["id"]] = entry
+            if len(self._pending) > self.window:
+                self._pending.pop(next(iter(self._pending)))
+        return None
+
+
+class RunStats:
+    """Constant-memory aggregate of a run: counters, stage accuracy and the first failures / changes."""
+
+    STAGES = ("idea", "startup", "growth", "established")
+
+    def __init__(self, keep=100):
+        self.keep = keep
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.total_ms = 0.0
+        self.stage_correct = dict.fromkeys(self.STAGES, 0)
+        self.stage_totals = dict.fromkeys(self.STAGES, 0)
+        self.recs_matched = 0
+        self.recs_total_cases = 0
+        self.regression_change_count = 0
+        self.regression_changes = []
+        self.missing_baseline_count = 0
+        self.missing_baseline = []
+        self.failed_scenarios = []
+
+    def add(self, rec, base=None, baselined=False):
+        """
+        Accumulates one record; returns its regression change (or None) against
+        the baseline entry. With baselined=True a missing base is counted as a
+        scenario the baseline does not cover rather than as unchanged.
+        """
+        self.total += 1
+        self.total_ms += rec["duration_ms"]
+        if rec["passed"]:
+            self.passed += 1
+        else:
+            self.failed += 1
+            if len(self.failed_scenarios) < self.keep:
+                self.failed_scenarios.append({"id": rec["id"], "name": rec["name"], "error": rec["error"]})
+
+        expected_profile = rec["expected_profile"]
+        if expected_profile:
+            self.stage_totals[expected_profile] = self.stage_totals.get(expected_profile, 0) + 1
+            if rec["profile"] == expected_profile:
+                self.stage_correct[expected_profile] = self.stage_correct.get(expected_profile, 0) + 1
+
+        if rec["recommendations_matched"] is not None:
+            self.recs_total_cases += 1
+            self.recs_matched += rec["recommendations_matched"]
+
+        if base is None:
+            if baselined:
+                self.missing_baseline_count += 1
+                if len(self.missing_baseline) < self.keep:
+                    self.missing_baseline.append({"id": rec["id"], "name": rec["name"]})
+            return None
+        if rec["score"] is None:
+            return None
+        if (base.get("score"), base.get("decision"), base.get("profile")) == (rec["score"], rec["decision"], rec["profile"]):
+            return None
+        change = {
+            "id": rec["id"],
+            "name": rec["name"],
+            "old_score": base.get("score"),
+            "new_score": rec["score"],
+            "old_decision": base.get("decision"),
+            "new_decision": rec["decision"],
+            "old_profile": base.get("profile"),
+            "new_profile": rec["profile"],
+        }
+        self.regression_change_count += 1
+        if len(self.regression_changes) < self.keep:
+            self.regression_changes.append(change)
+        return change
+
+    def report_data(self):
+        return {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "total_scenarios": self.total,
+            "passed": self.passed,
+            "failed": self.failed,
+            "avg_duration_ms": round(self.total_ms / self.total, 2) if self.total else 0.0,
+            "total_duration_ms": round(self.total_ms, 2),
+            "stage_accuracy": {
+                k: (self.stage_correct.get(k, 0) / n * 100.0) if n > 0 else 100.0
+                for k, n in self.stage_totals.items()
+            },
+            "recommendation_accuracy": (self.recs_matched / self.recs_total_cases * 100.0) if self.recs_total_cases > 0 else 100.0,
+            "regression_change_count": self.regression_change_count,
+            "regression_changes": self.regression_changes,
+            "missing_baseline_count": self.missing_baseline_count,
+            "missing_baseline": self.missing_baseline,
+            "failed_scenarios": self.failed_scenarios,
+        }
+
+
 def main():
     parser = argparse.ArgumentParser(description="Assessment Engine Regression Runner")
-    parser.path = os.path.join(TESTING_DIR, "gold_dataset.json")
-    parser.add_argument("--update-expected", action="store_true", help="Overwrite expected_results.json with current results as baseline")
+    parser.add_argument("--update-expected", action="store_true", help="Overwrite expected_results.jsonl with current results as baseline")
+    parser.add_argument("--source", default="gold",
+                        help='"gold", "tree" (testing/scenarios/), "synthetic:<count>", or a .json / .jsonl / directory path')
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Scenarios per worker task")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for synthetic:<count> sources")
+    parser.add_argument("--output", default=os.path.join(TESTING_DIR, "regression_results.jsonl"),
+                        help="Per-scenario results, written incrementally as JSONL")
+    parser.add_argument("--baseline", default=None,
+                        help="Baseline to diff against (default: expected_results.jsonl, else legacy expected_results.json)")
     args = parser.parse_args()
 
-    # Load dataset
-    gold_path = os.path.join(TESTING_DIR, "gold_dataset.json")
-    if not os.path.exists(gold_path):
-        print(f"Error: {gold_path} does not exist. Please run generate_gold_dataset.py first.")
+    if args.source == "gold" and not os.path.exists(os.path.join(TESTING_DIR, "gold_dataset.json")):
+        print("Error: gold_dataset.json does not exist. Please run generate_gold_dataset.py first.")
         sys.exit(1)
-        
-    with open(gold_path, "r") as f:
-        scenarios = json.load(f)
-
-    # Load baseline if exists
-    expected_results_path = os.path.join(TESTING_DIR, "expected_results.json")
-    baseline = {}
-    if os.path.exists(expected_results_path) and not args.update_expected:
-        with open(expected_results_path, "r") as f:
-            baseline = json.load(f)
-
-    results = {}
-    passed_count = 0
-    failed_count = 0
-    total_ms = 0.0
-    regression_changes = []
-    
-    stage_correct = {"idea": 0, "startup": 0, "growth": 0, "established": 0}
-    stage_totals = {"idea": 0, "startup": 0, "growth": 0, "established": 0}
-    
-    recs_matched = 0
-    recs_total_cases = 0
 
-    print(f"Running {len(scenarios)} scenarios...")
-    
-    for sc in scenarios:
-        s_id = sc["id"]
-        res = run_scenario(sc)
-        results[s_id] = {
-            "score": res["score"],
-            "decision": res["decision"],
-            "profile": res["profile"],
-            "confidence": res["confidence"],
-            "passed": res["passed"],
-            "error": res["error"],
-            "warnings": res.get("warnings", []),
-            "recommendations": res["recommendations"]
-        }
-        
-        total_ms += res["duration_ms"]
-        
-        # Accumulate metrics
-        if res["passed"]:
-            passed_count += 1
-        else:
-            failed_count += 1
-            
-        actual_profile = res["profile"]
-        expected_profile = sc.get("expected", {}).get("profile")
-        if expected_profile:
-            stage_totals[expected_profile] += 1
-            if actual_profile == expected_profile:
-                stage_correct[expected_profile] += 1
+    # Locate the baseline
+    expected_results_path = os.path.join(TESTING_DIR, "expected_results.jsonl")
+    baseline_path = args.baseline
+    if baseline_path is None:
+        legacy_path = os.path.join(TESTING_DIR, "expected_results.json")
+        baseline_path = expected_results_path if os.path.exists(expected_results_path) else legacy_path
+    baseline = None
+    if os.path.exists(baseline_path) and not args.update_expected:
+        baseline = BaselineReader(baseline_path)
+    write_baseline = args.update_expected or baseline is None
+
+    diff_path = os.path.join(os.path.dirname(os.path.abspath(args.output)), "regression_diff.jsonl")
+    stats = RunStats()
+    print(f"Running scenarios from {args.source}...")
+
+    expected_tmp = expected_results_path + ".tmp"
+    with open(args.output, "w") as out, open(diff_path, "w") as diff_out, \
+            (open(expected_tmp, "w") if write_baseline else open(os.devnull, "w")) as expected_out:
+        for rec in run_parallel(iter_source(args.source, args.seed), args.workers, args.chunk_size):
+            out.write(json.dumps(rec) + "\n")
+            change = stats.add(rec, baseline.get(rec["id"]) if baseline else None, baselined=baseline is not None)
+            if change:
+                diff_out.write(json.dumps(change) + "\n")
+            if write_baseline:
+                expected_out.write(json.dumps({"id": rec["id"], **{k: rec[k] for k in BASELINE_FIELDS}}) + "\n")
 
-        exp_recs = sc.get("expected", {}).get("recommendations_contain")
-        if exp_recs:
-            recs_total_cases += 1
-            # Check if all expected recs are in the recommendations
-            matched = True
-            for r in exp_recs:
-                if not any(r.lower() in ar.lower() for ar in res["recommendations"]):
-                    matched = False
-                    break
-            if matched:
-                recs_matched += 1
-
-        # Check regression against baseline
-        if s_id in baseline and res["score"] is not None:
-            base_score = baseline[s_id].get("score")
-            base_decision = baseline[s_id].get("decision")
-            base_profile = baseline[s_id].get("profile")
-            
-            if base_score != res["score"] or base_decision != res["decision"] or base_profile != res["profile"]:
-                regression_changes.append({
-                    "id": s_id,
-                    "name": sc["name"],
-                    "old_score": base_score,
-                    "new_score": res["score"],
-                    "old_decision": base_decision,
-                    "new_decision": res["decision"],
-                    "old_profile": base_profile,
-                    "new_profile": res["profile"]
-                })
-
-    avg_ms = total_ms / len(scenarios) if scenarios else 0.0
-    
     # Save current results as baseline if requested or if none exists
-    if args.update_expected or not baseline:
-        with open(expected_results_path, "w") as f:
-            json.dump(results, f, indent=2)
+    if write_baseline:
+        os.replace(expected_tmp, expected_results_path)
         print(f"Baseline saved/updated in {expected_results_path}")
 
-    # Build report data for report_generator
-    report_data = {
-        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-        "total_scenarios": len(scenarios),
-        "passed": passed_count,
-        "failed": failed_count,
-        "avg_duration_ms": round(avg_ms, 2),
-        "total_duration_ms": round(total_ms, 2),
-        "stage_accuracy": {
-            k: (stage_correct[k] / stage_totals[k] * 100.0) if stage_totals[k] > 0 else 100.0
-            for k in stage_totals
-        },
-        "recommendation_accuracy": (recs_matched / recs_total_cases * 100.0) if recs_total_cases > 0 else 100.0,
-        "regression_changes": regression_changes,
-        "failed_scenarios": [
-            {"id": s_id, "name": s_name, "error": results[s_id]["error"]}
-            for s_id, s_name in [(s["id"], s["name"]) for s in scenarios]
-            if not results[s_id]["passed"]
-        ]
-    }
+    report_data = stats.report_data()
 
     # Save validation report data to a temp file for the report generator
     report_json_path = os.path.join(TESTING_DIR, "validation_report_data.json")
     with open(report_json_path, "w") as f:
         json.dump(report_data, f, indent=2)
-        
+
     # Call report generator
     try:
         from testing.report_generator import generate_report
@@ -325,11 +553,14 @@ def main():
     except ImportError:
         # Fallback if report_generator.py isn't written yet
         print("\n=== Validation Runner Completed ===")
-        print(f"Passed: {passed_count} / {len(scenarios)}")
-        print(f"Failed: {failed_count}")
-        print(f"Avg Time: {avg_ms:.2f} ms")
-        if regression_changes:
-            print(f"Regression changes detected in {len(regression_changes)} scenarios!")
+        print(f"Passed: {stats.passed} / {stats.total}")
+        print(f"Failed: {stats.failed}")
+        print(f"Avg Time: {report_data['avg_duration_ms']:.2f} ms")
+        if stats.regression_change_count:
+            print(f"Regression changes detected in {stats.regression_change_count} scenarios!")
+        if stats.missing_baseline_count:
+            print(f"No baseline entry for {stats.missing_baseline_count} scenarios")
+    print(f"Results: {args.output}  Regression diff: {diff_path}")
 
 if __name__ == "__main__":
     main()
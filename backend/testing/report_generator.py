@@ -30,25 +30,33 @@ def generate_report(report_data):
     
     # Regression changes
     reg_changes = report_data["regression_changes"]
+    reg_count = report_data.get("regression_change_count", len(reg_changes))
     if reg_changes:
-        console.append(f"WARNING: {len(reg_changes)} regression changes detected!")
+        console.append(f"WARNING: {reg_count} regression changes detected!")
         for change in reg_changes[:10]:
             console.append(f"  [{change['id']}] {change['name']}:")
             console.append(f"    Score:    {change['old_score']} -> {change['new_score']}")
             console.append(f"    Decision: {change['old_decision']} -> {change['new_decision']}")
             console.append(f"    Profile:  {change['old_profile']} -> {change['new_profile']}")
-        if len(reg_changes) > 10:
-            console.append(f"  ... and {len(reg_changes) - 10} more changes.")
+        if reg_count > 10:
+            console.append(f"  ... and {reg_count - 10} more changes.")
     else:
         console.append("Regression: No changes in scores detected compared to baseline.")
+    missing = report_data.get("missing_baseline_count", 0)
+    if missing:
+        console.append(f"Not in baseline: {missing} scenarios (new, or beyond the reader's look-ahead window)")
+        for entry in report_data.get("missing_baseline", [])[:10]:
+            console.append(f"  [{entry['id']}] {entry['name']}")
     console.append("-------------------------------------------")
 
     # Failed scenarios
     fails = report_data["failed_scenarios"]
     if fails:
-        console.append(f"FAILURES ({len(fails)}):")
+        console.append(f"FAILURES ({report_data['failed']}):")
         for f in fails:
             console.append(f"  [{f['id']}] {f['name']}: {f['error']}")
+        if report_data["failed"] > len(fails):
+            console.append(f"  ... and {report_data['failed'] - len(fails)} more failures.")
     else:
         console.append("All assertions passed successfully!")
     console.append("===========================================")
@@ -86,7 +94,7 @@ def generate_report(report_data):
     md.append("## Regression Verification")
     if reg_changes:
         md.append(f"> [!WARNING]")
-        md.append(f"> {len(reg_changes)} scenarios changed scores compared to the baseline expected_results.json. This might indicate weight changes or regression bugs.")
+        md.append(f"> {reg_count} scenarios changed scores compared to the baseline expected_results.jsonl. This might indicate weight changes or regression bugs.")
         md.append("")
         md.append("| Scenario ID | Scenario Name | Previous Score | New Score | Previous Profile | New Profile |")
         md.append("| :--- | :--- | :--- | :--- | :--- | :--- |")
@@ -95,6 +103,9 @@ def generate_report(report_data):
     else:
         md.append("> [!NOTE]")
         md.append("> No regression changes detected. Scoring behavior matches the saved baseline exactly.")
+    if missing:
+        md.append("")
+        md.append(f"{missing} scenarios had no baseline entry and were not compared.")
     md.append("")
 
     # Failures table
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""
+verify_query_plans.py
+
+EXPLAINs the hot queries of the routers and services against a seeded
+database, and fails when any of them reads a table without the index that
+migration 021 (or another migration) added for it. A query that starts doing a
+sequential scan — because a filter changed or an index was dropped — is
+caught before it reaches production.
+
+SQLite: a query passes when its plan SEARCHes the table with the expected
+index; a SCAN of the table fails it.
+
+PostgreSQL: a query passes when the plan uses the expected index with an
+Index Cond and has no Seq Scan on the table. The check runs with
+enable_seqscan = off, so it asks whether an index can serve the predicate,
+independent of the table statistics of the database checked (on small or
+skewed data the planner rightly prefers a scan). Pass --planner-default to
+see the plans the planner would actually choose.
+
+Usage (from backend/):
+    python verify_query_plans.py                          # temporary SQLite DB, 20,000 seeded SMEs
+    python verify_query_plans.py --smes 2000
+    python verify_query_plans.py --database-url postgresql://... [--seed] [--planner-default]
+
+--seed creates the tables and seeds them, so it expects an empty database.
+Without it, the queries are checked against the data already there.
+"""
+import os
+import sys
+import argparse
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, func, insert, select, text, tuple_
+
+from database import Base
+from models import (
+    User, SME, Invoice, Verification, FinanceRequest, SmeOutcome, CreditScore,
+)
+from services.scoring_service import _invoice_aggregates, _latest_verifications
+from services.portfolio_analytics_service import FINANCED_STATUSES
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    used_by: str
+    table: str
+    indexes: tuple[str, ...]     # any of these serves the query
+    statement: Callable
+
+
+HOT_QUERIES: tuple[HotQuery, ...] = (
+    HotQuery("sme_by_user", "current user's SME (most SME routes)", "smes", ("ix_smes_user_id",),
+             lambda: select(SME).where(SME.user_id == 7).limit(1)),
+    HotQuery("sme_by_registration_number", "/api/v1/sme/score", "smes", ("ix_smes_cipc_registration_number",),
+             lambda: select(SME).where(SME.cipc_registration_number == "2020/000007/07").limit(1)),
+    HotQuery("invoices_for_sme", "/smes/dashboard, /invoices", "invoices", ("ix_invoices_sme_id_status",),
+             lambda: select(Invoice).where(Invoice.sme_id == 7).order_by(Invoice.created_at.desc())),
+    HotQuery("invoice_aggregates", "scoring evidence", "invoices", ("ix_invoices_sme_id_status",),
+             lambda: select(*_invoice_aggregates()).where(Invoice.sme_id == 7)),
+    HotQuery("invoices_by_status", "invoice status filters", "invoices", ("ix_invoices_status",),
+             lambda: select(func.count(Invoice.id)).where(Invoice.status == "overdue")),
+    HotQuery("latest_verifications", "scoring evidence", "verifications",
+             ("ix_verifications_sme_id_doc_type_submitted_at",),
+             lambda: _latest_verifications(Verification.sme_id == 7)),
+    HotQuery("pending_verifications", "/verifications/pending", "verifications", ("ix_verifications_status",),
+             lambda: select(Verification).where(Verification.status == "pending")),
+    HotQuery("financed_totals", "/lenders/portfolio-analytics", "finance_requests",
+             ("ix_finance_requests_status_sme_id",),
+             lambda: select(func.sum(FinanceRequest.approved_amount), func.sum(FinanceRequest.platform_fee))
+             .where(FinanceRequest.status.in_(FINANCED_STATUSES))),
+    HotQuery("pending_finance_requests", "/lenders/available-smes, pending queue", "finance_requests",
+             ("ix_finance_requests_status_sme_id",),
+             lambda: select(FinanceRequest.sme_id, func.count(FinanceRequest.id))
+             .where(FinanceRequest.status == "pending").group_by(FinanceRequest.sme_id)),
+    HotQuery("available_smes_by_revenue", "/lenders/available-smes?sort=revenue", "smes", ("ix_smes_revenue_id",),
+             lambda: select(SME.id).where(tuple_(SME.revenue, SME.id) > tuple_(100500, 500))
+             .order_by(SME.revenue, SME.id).limit(101)),
+    HotQuery("finance_requests_for_sme", "/smes/dashboard, /finance/requests/{sme_id}", "finance_requests",
+             ("ix_finance_requests_sme_id_status",),
+             lambda: select(FinanceRequest).where(FinanceRequest.sme_id == 7)
+             .order_by(FinanceRequest.created_at.desc())),
+    HotQuery("sme_finance_requests_by_status", "per-SME request status checks", "finance_requests",
+             ("ix_finance_requests_sme_id_status", "ix_finance_requests_status_sme_id"),
+             lambda: select(FinanceRequest).where(FinanceRequest.sme_id == 7, FinanceRequest.status == "pending")),
+    HotQuery("outcomes_by_status", "/outcomes/analytics", "sme_outcomes", ("ix_sme_outcomes_outcome_status",),
+             lambda: select(func.count(SmeOutcome.id)).where(SmeOutcome.outcome_status == "defaulted")),
+    HotQuery("credit_score_history", "/credit-scores/history", "credit_scores", ("ix_credit_scores_sme_id_created_at",),
+             lambda: select(CreditScore).where(CreditScore.sme_id == 7).order_by(CreditScore.created_at.desc())),
+)
+
+
+# ── Seeding ───────────────────────────────────────────────────────────────────
+
+def seed(engine, smes: int, batch: int = 5000) -> None:
+    """Creates the tables and fills them with a portfolio of `smes` SMEs and their history."""
+    Base.metadata.create_all(bind=engine)
+    base = datetime(2024, 1, 1)
+    invoice_statuses = ["paid"] * 14 + ["pending"] * 5 + ["overdue"]
+    request_statuses = ["paid"] * 8 + ["funded"] * 6 + ["approved", "approved", "rejected", "rejected", "pending", "closed"]
+    outcome_statuses = ["repaid"] * 6 + ["active"] * 3 + ["defaulted"]
+    doc_types = ["cipc", "tax_clearance", "bank_statement"]
+
+    with engine.begin() as conn:
+        for start in range(1, smes + 1, batch):
+            ids = range(start, min(start + batch, smes + 1))
+            conn.execute(insert(User.__table__), [
+                {"id": i, "username": f"plan{i}", "email": f"plan{i}@example.com", "hashed_password": "x", "role": "sme"}
+                for i in ids
+            ])
+            conn.execute(insert(SME.__table__), [
+                {"id": i, "name": f"Plan {i}", "industry": "Retail", "revenue": 100000 + i, "years_active": i % 12,
+                 "user_id": i, "province": "Gauteng", "cipc_registration_number": f"2020/{i:06d}/07",
+                 "created_at": base}
+                for i in ids
+            ])
+            conn.execute(insert(Invoice.__table__), [
+                {"id": i * 5 + n, "sme_id": i, "client_name": "Client", "amount": 1000 + n,
+                 "status": invoice_statuses[(i + n) % len(invoice_statuses)],
+                 "created_at": base + timedelta(days=n), "due_date": base + timedelta(days=n + 30)}
+                for i in ids for n in range(5)
+            ])
+            conn.execute(insert(Verification.__table__), [
+                {"sme_id": i, "doc_type": doc, "status": "pending" if (i + n) % 10 == 0 else "approved",
+                 "submitted_at": base + timedelta(days=n)}
+                for i in ids for n, doc in enumerate(doc_types)
+            ])
+            conn.execute(insert(FinanceRequest.__table__), [
+                {"id": i * 2 + n, "sme_id": i, "invoice_id": i * 5 + n, "amount_requested": 500,
+                 "status": request_statuses[(i + n) % len(request_statuses)], "created_at": base}
+                for i in ids for n in range(2)
+            ])
+            conn.execute(insert(SmeOutcome.__table__), [
+                {"finance_request_id": i * 2, "sme_id": i, "score_at_funding": 60.0, "amount": 500,
+                 "outstanding_recommendations": [], "outcome_status": outcome_statuses[i % len(outcome_statuses)]}
+                for i in ids if i % 4 == 0
+            ])
+            conn.execute(insert(CreditScore.__table__), [
+                {"sme_id": i, "score": 50.0 + n, "created_at": base + timedelta(days=30 * n)}
+                for i in ids for n in range(2)
+            ])
+        conn.execute(text("ANALYZE"))
+
+
+# ── Plan inspection ───────────────────────────────────────────────────────────
+
+def _compile(conn, statement) -> str:
+    return str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _sqlite_check(conn, query: HotQuery) -> tuple[bool, str]:
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + _compile(conn, query.statement())).all()
+    details = [row[-1] for row in rows]
+    on_table = [d for d in details if d.split(" ")[1:2] == [query.table]]
+    searched = any(
+        d.startswith("SEARCH ") and any(f"INDEX {index} " in f"{d} " for index in query.indexes) for d in on_table
+    )
+    scanned = any(d.startswith("SCAN ") for d in on_table)
+    return searched and not scanned, " | ".join(details)
+
+
+def _walk(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def _postgres_check(conn, query: HotQuery) -> tuple[bool, str]:
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + _compile(conn, query.statement())).scalar()
+    nodes = list(_walk(plan[0]["Plan"]))
+    seq_scan = any(n["Node Type"] == "Seq Scan" and n.get("Relation Name") == query.table for n in nodes)
+    indexed = any(n.get("Index Name") in query.indexes and "Index Cond" in n for n in nodes)
+    summary = " | ".join(
+        f"{n['Node Type']}" + (f" on {n['Relation Name']}" if "Relation Name" in n else "")
+        + (f" using {n['Index Name']}" if "Index Name" in n else "")
+        for n in nodes
+    )
+    return indexed and not seq_scan, summary
+
+
+def verify(engine, planner_default: bool = False) -> list[tuple[HotQuery, bool, str]]:
+    """[(query, uses its index, plan summary)] for every HOT_QUERIES entry."""
+    results = []
+    with engine.connect() as conn:
+        postgres = conn.dialect.name == "postgresql"
+        if postgres and not planner_default:
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        for query in HOT_QUERIES:
+            check = _postgres_check if postgres else _sqlite_check
+            results.append((query, *check(conn, query)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assert that the hot router queries use their indexes")
+    parser.add_argument("--database-url", help="Database to check (default: a temporary seeded SQLite file)")
+    parser.add_argument("--seed", action="store_true", help="Create and seed the tables of --database-url first")
+    parser.add_argument("--smes", type=int, default=20000, help="SMEs to seed")
+    parser.add_argument("--planner-default", action="store_true",
+                        help="PostgreSQL: leave enable_seqscan on and report the planner's own choice")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'plans.db')}"
+        engine = create_engine(url)
+        if args.seed or not args.database_url:
+            print(f"Seeding {args.smes:,} SMEs ...")
+            seed(engine, args.smes)
+        results = verify(engine, planner_default=args.planner_default)
+        engine.dispose()
+
+    failures = 0
+    for query, ok, plan in results:
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {query.name:<32} {' / '.join(query.indexes):<46} ({query.used_by})")
+        if not ok:
+            print(f"     plan: {plan}")
+    print(f"\n{len(results) - failures}/{len(results)} hot queries use their index")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
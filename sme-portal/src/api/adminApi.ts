@@ -1,4 +1,4 @@
-import api from "./client";
+import api, { getAllPages } from "./client";
 
 export interface VerificationItem {
   id: number;
@@ -13,10 +13,10 @@ export interface VerificationItem {
 }
 
 export const AdminApi = {
-  listPendingVerifications: () => api.get<VerificationItem[]>("/verifications/pending"),
+  listPendingVerifications: () => getAllPages<VerificationItem>("/verifications/pending"),
   approveVerification: (id: number, notes?: string) => api.put<VerificationItem>(`/verifications/approve/${id}`, { reviewer_notes: notes }),
   rejectVerification: (id: number, notes?: string) => api.put<VerificationItem>(`/verifications/reject/${id}`, { reviewer_notes: notes }),
-  listAPIKeys: () => api.get<any[]>("/admin/api-keys"),
+  listAPIKeys: () => getAllPages<any>("/admin/api-keys"),
   generateAPIKey: (name: string, consumerType: string) => api.post<any>("/api/v1/keys/generate", { name, consumer_type: consumerType }),
   revokeAPIKey: (id: number) => api.delete<any>(`/admin/api-keys/${id}`),
 };
@@ -1,4 +1,4 @@
-import axios from "axios";
+import axios, { AxiosRequestConfig, AxiosResponse } from "axios";
 
 const api = axios.create({
   baseURL: process.env.REACT_APP_API_URL || "http://127.0.0.1:8000",
@@ -23,4 +23,23 @@ api.interceptors.response.use(
   }
 );
 
+// List endpoints are keyset-paginated: each page carries the cursor of the
+// next one in X-Next-Cursor. Follows it to the last page and returns every
+// row in one response, so callers see the same full list as before.
+export async function getAllPages<T>(
+  url: string,
+  config: AxiosRequestConfig = {}
+): Promise<AxiosResponse<T[]>> {
+  const params = { limit: 500, ...config.params };
+  let response = await api.get<T[]>(url, { ...config, params });
+  const rows = [...response.data];
+  let cursor = response.headers["x-next-cursor"];
+  while (cursor) {
+    response = await api.get<T[]>(url, { ...config, params: { ...params, cursor } });
+    rows.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  }
+  return { ...response, data: rows };
+}
+
 export default api;
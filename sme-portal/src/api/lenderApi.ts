@@ -1,4 +1,4 @@
-import api from "./client";
+import api, { getAllPages } from "./client";
 
 export interface LenderProfile {
   id: number;
@@ -48,7 +48,7 @@ export const LenderApi = {
     api.post<LenderProfile>("/lenders/register", data),
 
   // SME browsing
-  getAvailableSMEs: () => api.get<AvailableSme[]>("/lenders/available-smes"),
+  getAvailableSMEs: () => getAllPages<AvailableSme>("/lenders/available-smes"),
 
   // Finance request management
   getPendingRequests: () =>
@@ -70,5 +70,5 @@ export const LenderApi = {
     api.get(`/invoices/sme/${smeId}`),
 
   getSMECreditScores: (smeId: number) =>
-    api.get(`/credit-scores/sme/${smeId}`),
+    getAllPages<any>(`/credit-scores/sme/${smeId}`),
 };
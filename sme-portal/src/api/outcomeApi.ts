@@ -1,4 +1,4 @@
-import api from "./client";
+import api, { getAllPages } from "./client";
 
 export interface FollowedRecommendation {
   category: string;
@@ -52,7 +52,7 @@ export interface CheckinSubmit {
 }
 
 export const OutcomeApi = {
-  getHistory: () => api.get<SmeOutcome[]>("/outcomes/history"),
+  getHistory: () => getAllPages<SmeOutcome>("/outcomes/history"),
   submitCheckin: (outcomeId: number, data: CheckinSubmit) =>
     api.post<SmeOutcome>(`/outcomes/${outcomeId}/checkin`, data),
 };
@@ -1,4 +1,4 @@
-import api from "./client";
+import api, { getAllPages } from "./client";
 
 export interface DashboardInvoiceItem {
   id: number;
@@ -72,7 +72,7 @@ export interface SMECreate {
 }
 
 export const SMEApi = {
-  getAll: () => api.get<SME[]>("/smes"),
+  getAll: () => getAllPages<SME>("/smes"),
   getOne: (id: number) => api.get<SME>(`/smes/${id}`),
   create: (data: SMECreate) => api.post<SME>("/smes", data),
   update: (id: number, data: SMECreate) => api.put<SME>(`/smes/${id}`, data),
@@ -83,7 +83,7 @@ export const SMEApi = {
   getSmeDetails: (id: number) => api.get(`/smes/${id}`),
   getSmeInvoices: (id: number) => api.get(`/invoices/sme/${id}`),
 
-  getCreditScore: (id: number) => api.get(`/credit-scores/sme/${id}`),
+  getCreditScore: (id: number) => getAllPages<any>(`/credit-scores/sme/${id}`),
   getCreditDecision: (id: number) => api.get(`/credit-scores/decision/${id}`),
   getCreditScoreDetails: (id: number) => api.get(`/credit-scores/details/${id}`),
   getFinanceRequests: (id: number) => api.get(`/finance/requests/${id}`)
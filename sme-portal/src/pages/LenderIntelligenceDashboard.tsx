@@ -27,7 +27,7 @@ import {
   Cell
 } from "recharts";
 import LenderLayout from "../components/lender/LenderLayout";
-import api from "../api/client";
+import api, { getAllPages } from "../api/client";
 import { formatZAR } from "../utils/format";
 
 interface AnalyticsData {
@@ -94,7 +94,7 @@ export default function LenderIntelligenceDashboard() {
       try {
         const [analyticsRes, smesRes] = await Promise.all([
           api.get<AnalyticsData>("/lenders/portfolio-analytics"),
-          api.get<AvailableSME[]>("/lenders/available-smes")
+          getAllPages<AvailableSME>("/lenders/available-smes")
         ]);
         setAnalytics(analyticsRes.data);
         setAvailableSmes(smesRes.data || []);